@@ -83,6 +83,16 @@ class RAGQueryRequest(BaseModel):
         le=50,
         description="Minimum results count to trigger re-ranking"
     )
+    enable_diversity: Optional[bool] = Field(
+        None,
+        description="Drop redundant chunks with maximal marginal relevance selection"
+    )
+    diversity_lambda: Optional[float] = Field(
+        None,
+        ge=0.0,
+        le=1.0,
+        description="Relevance weight of diversity selection, from 0 (diversity only) to 1 (relevance only)"
+    )
     
     @field_validator('query')
     @classmethod
@@ -149,6 +159,8 @@ async def rag_query_use_case(
         # Smart defaults for optimal search quality (no environment variables needed)
         reranking_enabled = request.enable_reranking if request.enable_reranking is not None else True
         reranking_threshold = request.reranking_threshold if request.reranking_threshold is not None else 8
+        diversity_enabled = request.enable_diversity if request.enable_diversity is not None else True
+        diversity_lambda = request.diversity_lambda if request.diversity_lambda is not None else 0.7
         
         # If re-ranking enabled, request more results to have candidates for re-ranking
         search_limit = request.max_chunks
@@ -186,6 +198,11 @@ async def rag_query_use_case(
             reranking_enabled, reranking_threshold
         )
         
+        # Step 2.6: Drop near-duplicate chunks so they do not waste prompt tokens
+        vector_results = await _apply_diversity_if_enabled(
+            vector_service, vector_results, request.max_chunks, diversity_enabled, diversity_lambda
+        )
+        
         # Step 3: Build context from vector results
         context_parts = []
         for i, result in enumerate(vector_results, 1):
@@ -391,6 +408,53 @@ async def _apply_reranking_if_enabled(
         return vector_results
 
 
+async def _apply_diversity_if_enabled(
+    vector_service,
+    vector_results: List[Dict[str, Any]],
+    max_chunks: int,
+    diversity_enabled: bool,
+    diversity_lambda: float
+) -> List[Dict[str, Any]]:
+    """
+    Select up to max_chunks diverse results with maximal marginal relevance if enabled.
+    
+    Redundancy is measured on the chunks' stored embeddings, and only
+    between chunks of the same collection, since collections may be
+    embedded with different models.
+    
+    Args:
+        vector_service: Vector service instance providing stored embeddings
+        vector_results: Results from vector search, best first
+        max_chunks: Maximum number of chunks to return
+        diversity_enabled: Whether diversity selection is enabled
+        diversity_lambda: Weight of relevance against diversity
+        
+    Returns:
+        Selected results or original results if selection disabled/failed
+    """
+    if not diversity_enabled or len(vector_results) <= 1 or not hasattr(vector_service, 'get_result_vectors'):
+        return vector_results
+    
+    try:
+        from tools.knowledge_base.diversity import mmr_select, pairwise_similarity
+        
+        vectors = await vector_service.get_result_vectors(vector_results)
+        if not isinstance(vectors, list) or len(vectors) != len(vector_results):
+            return vector_results
+        
+        groups = [result.get('collection_name') or '' for result in vector_results]
+        selected = mmr_select(
+            [result.get('similarity_score', 0.0) for result in vector_results],
+            pairwise_similarity(vectors, groups),
+            max_chunks,
+            diversity_lambda
+        )
+        return [vector_results[position] for position in selected]
+    except Exception:
+        # Graceful fallback to original results on any selection error
+        return vector_results
+
+
 async def _rerank_with_llm(
     llm_service: LLMService,
     query: str,
@@ -130,17 +130,24 @@ async def _execute_enhanced_vector_search(
         max_expansions=max_variants - 1  # -1 because original query is included
     )
     
-    # Execute searches for all query variants
+    # Execute searches for all query variants, in one batch if the service supports it
     all_results = []
-    for query_variant in expanded_queries:
-        try:
-            variant_results = await vector_service.search_vectors(
-                query_variant, collection_name, limit, similarity_threshold
-            )
+    if hasattr(vector_service, 'batch_search_vectors'):
+        batch = await vector_service.batch_search_vectors(
+            expanded_queries, collection_name, limit, similarity_threshold
+        )
+        for variant_results in batch['results']:
             all_results.extend(variant_results)
-        except Exception:
-            # Continue with other queries if one fails
-            continue
+    else:
+        for query_variant in expanded_queries:
+            try:
+                variant_results = await vector_service.search_vectors(
+                    query_variant, collection_name, limit, similarity_threshold
+                )
+                all_results.extend(variant_results)
+            except Exception:
+                # Continue with other queries if one fails
+                continue
     
     # Deduplicate results by content hash
     deduplicated_results = _deduplicate_results(all_results, query)
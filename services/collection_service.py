@@ -419,4 +419,31 @@ class CollectionService(ICollectionService):
                 raise Exception(result.get("error", "File deletion failed"))
         except Exception as e:
             logger.error(f"Error deleting file {file_path} from {collection_name}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    async def get_collection_changes(self, collection_name: str, since_version: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Get the writes made to a collection after a version.
+        
+        Args:
+            collection_name: Name of the collection
+            since_version: Last version the caller has seen
+            limit: Maximum number of changes to return
+            
+        Returns:
+            The collection's current version, its changes oldest first, and
+            whether the caller has to resynchronize from scratch
+        """
+        try:
+            # Use configurable collection manager (may be async)
+            result = await self.collection_manager.get_collection_changes(
+                collection_name, since_version, limit
+            )
+            
+            if result.get("success", False):
+                return result
+            else:
+                raise Exception(result.get("error", "Failed to read collection changes"))
+        except Exception as e:
+            logger.error(f"Error reading changes of collection {collection_name}: {str(e)}")
+            raise
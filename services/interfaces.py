@@ -262,6 +262,21 @@ class ICollectionService(ABC):
             Status information about the deletion
         """
         pass
+    
+    @abstractmethod
+    async def get_collection_changes(self, collection_name: str, since_version: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Get the writes made to a collection after a version.
+        
+        Args:
+            collection_name: Name of the collection
+            since_version: Last version the caller has seen
+            limit: Maximum number of changes to return
+            
+        Returns:
+            The collection's current version and its changes, oldest first
+        """
+        pass
 
 
 class IVectorSyncService(ABC):
@@ -328,6 +343,42 @@ class IVectorSyncService(ABC):
         pass
     
     
+    @abstractmethod
+    async def batch_search_vectors(
+        self, queries: List[str], collection_id: Optional[str] = None, limit: int = 10,
+        similarity_threshold: float = 0.2, fuse: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Search vectors for several queries at once.
+        
+        Args:
+            queries: Search query texts
+            collection_id: Optional collection to search in
+            limit: Maximum number of results per query
+            similarity_threshold: Minimum similarity score
+            fuse: Whether to also merge the per-query results into one ranking
+            
+        Returns:
+            Dictionary with 'results', a list of VectorSearchResult objects per
+            query, and 'fused', the merged ranking or None
+        """
+        pass
+    
+    
+    @abstractmethod
+    async def get_result_vectors(self, results: List[Dict[str, Any]]) -> List[Optional[List[float]]]:
+        """
+        Look up the stored embeddings of search results.
+        
+        Args:
+            results: Search results with collection name and chunk metadata
+            
+        Returns:
+            The stored vector of each result, or None where it is unknown
+        """
+        pass
+    
+    
     @abstractmethod
     async def delete_collection_vectors(self, collection_id: str) -> Dict[str, Any]:
         """
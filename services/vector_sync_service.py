@@ -132,11 +132,11 @@ class VectorSyncService(IVectorSyncService):
                 collection_manager=self.collection_service.collection_manager if self.collection_service else None
             )
             
-            # Handle force vector deletion if requested
+            # A force resync rebuilds the vectors in a staging namespace and swaps it in,
+            # so searches keep using the current vectors until the rebuild is complete
             force_delete_vectors = config.get("force_delete_vectors", False) if config else False
             if force_delete_vectors:
-                logger.info(f"Force resync requested - deleting all vectors for collection '{collection_id}'")
-                await self._delete_collection_vectors(collection_id, vector_sync_api.vector_store)
+                logger.info(f"Force resync requested - rebuilding all vectors for collection '{collection_id}'")
             
             # Prepare sync request
             from tools.vector_sync_api import SyncCollectionRequest
@@ -351,7 +351,8 @@ class VectorSyncService(IVectorSyncService):
         limit: int = 10, 
         similarity_threshold: float = 0.2,
         enable_context_expansion: bool = False,
-        relationship_filter: Optional[Dict[str, Any]] = None
+        relationship_filter: Optional[Dict[str, Any]] = None,
+        exhaustive: bool = False
     ) -> List[VectorSearchResult]:
         """
         Search vectors using semantic similarity.
@@ -360,6 +361,8 @@ class VectorSyncService(IVectorSyncService):
             query: Search query text
             collection_id: Optional collection to search in
             limit: Maximum number of results
+            exhaustive: Search every collection in a global search instead of
+                only those whose centroids best match the query
             
         Returns:
             List of VectorSearchResult objects
@@ -428,7 +431,8 @@ class VectorSyncService(IVectorSyncService):
                 limit=limit,
                 similarity_threshold=similarity_threshold,
                 enable_context_expansion=enable_context_expansion,
-                relationship_filter=relationship_filter
+                relationship_filter=relationship_filter,
+                exhaustive=exhaustive
             )
             
             # Perform vector search using the shared instance
@@ -462,6 +466,100 @@ class VectorSyncService(IVectorSyncService):
             logger.error(f"Error searching vectors with query '{query}': {str(e)}")
             return []
     
+    async def batch_search_vectors(
+        self,
+        queries: List[str],
+        collection_id: Optional[str] = None,
+        limit: int = 10,
+        similarity_threshold: float = 0.2,
+        fuse: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Search vectors for several queries with one embedding batch and one index query.
+        
+        Args:
+            queries: Search query texts
+            collection_id: Optional collection to search in
+            limit: Maximum number of results per query
+            similarity_threshold: Minimum similarity score
+            fuse: Whether to also merge the per-query results into one ranking
+            
+        Returns:
+            Dictionary with 'results', a list of VectorSearchResult objects per
+            query, and 'fused', the merged ranking or None
+        """
+        if not self.vector_available:
+            logger.debug("Vector service not available, returning empty results")
+            return {'results': [[] for _ in queries], 'fused': [] if fuse else None}
+        
+        try:
+            from tools.vector_sync_api import DEFAULT_SEARCH_MODE
+            from tools.knowledge_base.async_vector_store import AsyncVectorStore
+            
+            store = AsyncVectorStore(self._get_vector_store())
+            hybrid = DEFAULT_SEARCH_MODE == "hybrid"
+            if collection_id:
+                batch = await store.namespace(collection_id).batch_similarity_search(
+                    queries, k=limit, score_threshold=similarity_threshold, hybrid=hybrid, fuse=fuse
+                )
+            else:
+                batch = await store.batch_similarity_search_namespaces(
+                    queries, k=limit, score_threshold=similarity_threshold, hybrid=hybrid, fuse=fuse
+                )
+            
+            def to_search_result(result: Dict[str, Any]) -> VectorSearchResult:
+                metadata = dict(result.get('metadata') or {})
+                return VectorSearchResult(
+                    content=result.get('content', ''),
+                    metadata=metadata,
+                    score=result.get('score', 0.0),
+                    collection_name=metadata.get('collection_name', collection_id or ''),
+                    file_path=metadata.get('source_file', '')
+                )
+            
+            return {
+                'results': [[to_search_result(result) for result in results] for results in batch['results']],
+                'fused': [to_search_result(result) for result in batch['fused']] if fuse else None
+            }
+            
+        except Exception as e:
+            logger.error(f"Error batch searching vectors with {len(queries)} queries: {str(e)}")
+            return {'results': [[] for _ in queries], 'fused': [] if fuse else None}
+    
+    async def get_result_vectors(self, results: List[Dict[str, Any]]) -> List[Optional[List[float]]]:
+        """
+        Look up the stored embeddings of search results without re-embedding them.
+        
+        Args:
+            results: Search results with 'collection_name' and the chunk's
+                'chunk_id' in 'metadata'
+            
+        Returns:
+            The stored vector of each result, or None where it is unknown
+        """
+        if not self.vector_available:
+            return [None] * len(results)
+        
+        from tools.knowledge_base.async_vector_store import AsyncVectorStore
+        
+        vector_store = self._get_vector_store()
+        store = AsyncVectorStore(vector_store)
+        chunk_ids: Dict[str, List[str]] = {}
+        for result in results:
+            chunk_id = (result.get('metadata') or {}).get('chunk_id')
+            if chunk_id and result.get('collection_name'):
+                chunk_ids.setdefault(result['collection_name'], []).append(chunk_id)
+        
+        stored: Dict[str, Dict[str, List[float]]] = {}
+        for collection_name, ids in chunk_ids.items():
+            if vector_store.has_namespace(collection_name):
+                stored[collection_name] = await store.namespace(collection_name).get_stored_vectors(ids)
+        
+        return [
+            stored.get(result.get('collection_name'), {}).get((result.get('metadata') or {}).get('chunk_id'))
+            for result in results
+        ]
+    
     async def delete_collection_vectors(self, collection_id: str) -> Dict[str, Any]:
         """
         Delete all vectors associated with a collection.
@@ -557,49 +655,191 @@ class VectorSyncService(IVectorSyncService):
                 "deleted_count": 0
             }
     
-    async def _delete_collection_vectors(self, collection_id: str, vector_store=None):
+    async def collect_orphaned_vectors(self, collection_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Internal helper to delete all vectors for a collection.
-        Used by force resync functionality.
+        Delete the vectors of files that were removed from collections.
+        
+        Syncs delete the vectors of removed files themselves; this cleans up
+        vectors left behind before they did.
         
         Args:
-            collection_id: ID of the collection
-            vector_store: Optional vector store instance
+            collection_id: ID of the collection to clean up. Cleans up all
+                collections if None.
+            
+        Returns:
+            Dictionary with the deleted files and chunk counts per collection
         """
+        if not self.vector_available:
+            return {"success": False, "error": "Vector dependencies not available"}
+        
         try:
-            logger.info(f"Deleting all vectors for collection '{collection_id}'")
-            
-            # Use provided vector store or default
-            if not vector_store and not self.vector_store:
-                from tools.knowledge_base.vector_store import VectorStore
-                # Use centralized vector database path
-                vector_db_path = str(Context42Config.get_vector_db_path())
-                vector_store = VectorStore(persist_directory=vector_db_path)
-            else:
-                vector_store = vector_store or self.vector_store
+            from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
             
-            # Try to delete collection from ChromaDB
-            try:
-                # Get or create collection client
-                client = vector_store.get_chroma_client()
+            vector_store = self._get_vector_store()
+            cache_key = f"sync_{collection_id}" if collection_id else "sync_gc"
+            sync_manager = self._sync_manager_cache.get(cache_key)
+            if sync_manager is None:
+                if self.collection_service and self.storage_config['storage_mode'] == 'filesystem':
+                    sync_collection_manager = self.collection_service.collection_manager
+                else:
+                    from tools.knowledge_base.database_collection_adapter import DatabaseCollectionAdapter
+                    sync_collection_manager = DatabaseCollectionAdapter(self.collections_db_path)
                 
-                # Delete collection if it exists
-                try:
-                    client.delete_collection(name=collection_id)
-                    logger.info(f"Successfully deleted ChromaDB collection '{collection_id}'")
-                except Exception as e:
-                    if "does not exist" in str(e).lower():
-                        logger.info(f"Collection '{collection_id}' doesn't exist in ChromaDB - nothing to delete")
-                    else:
-                        logger.warning(f"Error deleting ChromaDB collection '{collection_id}': {e}")
-                        
-            except Exception as e:
-                logger.error(f"Error accessing ChromaDB for collection '{collection_id}': {e}")
-                # Don't fail the entire operation if ChromaDB access fails
+                sync_manager = IntelligentSyncManager(
+                    vector_store=vector_store,
+                    collection_manager=sync_collection_manager,
+                    persistent_db_path=self.collections_db_path
+                )
+                self._sync_manager_cache.set(cache_key, sync_manager)
+            
+            result = await sync_manager.collect_orphaned_vectors(collection_id)
+            logger.info(f"Collected {result['chunks_deleted']} orphaned vectors")
+            return {"success": True, **result}
+        except Exception as e:
+            logger.error(f"Error collecting orphaned vectors: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    async def fork_collection(
+        self,
+        collection_id: str,
+        new_collection_id: str,
+        include_patterns: Optional[List[str]] = None,
+        exclude_patterns: Optional[List[str]] = None,
+        description: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Copy a collection's files into a new collection, reusing their vectors.
+        
+        No file is re-chunked or re-embedded; the fork is searchable as soon
+        as this returns.
+        
+        Args:
+            collection_id: ID of the collection to fork
+            new_collection_id: ID of the new collection
+            include_patterns: Glob patterns of file paths to copy (all files if omitted)
+            exclude_patterns: Glob patterns of file paths not to copy
+            description: Description of the new collection
+            
+        Returns:
+            Dictionary with the copied files and the number of reused chunks
+        """
+        if not self.vector_available:
+            return {"success": False, "error": "Vector dependencies not available"}
+        
+        try:
+            from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+            
+            vector_store = self._get_vector_store()
+            cache_key = f"sync_{collection_id}"
+            sync_manager = self._sync_manager_cache.get(cache_key)
+            if sync_manager is None:
+                if self.collection_service and self.storage_config['storage_mode'] == 'filesystem':
+                    sync_collection_manager = self.collection_service.collection_manager
+                else:
+                    from tools.knowledge_base.database_collection_adapter import DatabaseCollectionAdapter
+                    sync_collection_manager = DatabaseCollectionAdapter(self.collections_db_path)
                 
+                sync_manager = IntelligentSyncManager(
+                    vector_store=vector_store,
+                    collection_manager=sync_collection_manager,
+                    persistent_db_path=self.collections_db_path
+                )
+                self._sync_manager_cache.set(cache_key, sync_manager)
+            
+            result = await sync_manager.fork_collection(
+                collection_id, new_collection_id, include_patterns, exclude_patterns, description
+            )
+            logger.info(f"Forked collection {collection_id} into {new_collection_id}")
+            return {"success": True, **result}
+        except Exception as e:
+            logger.error(f"Error forking collection {collection_id} into {new_collection_id}: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def _get_vector_store(self):
+        """Get the shared vector store, creating it at the centralized path if needed."""
+        if not self.vector_store:
+            from tools.knowledge_base.vector_store import VectorStore
+            vector_db_path = str(Context42Config.get_vector_db_path())
+            self.vector_store = VectorStore(persist_directory=vector_db_path)
+        return self.vector_store
+    
+    def _vector_collection_name(self, collection_id: str) -> Optional[str]:
+        """Get the logical vector collection holding a file collection's chunks.
+        
+        Only looks the namespace up: VectorStore.namespace() would create an
+        empty one for an unknown collection.
+        
+        Returns:
+            The logical collection name, or None if the collection has no vectors
+        """
+        vector_store = self._get_vector_store()
+        if not vector_store.has_namespace(collection_id):
+            return None
+        return vector_store.namespace_name(collection_id)
+    
+    def _get_reembed_jobs(self):
+        """Get the re-embed job manager, created on first use."""
+        if getattr(self, '_reembed_jobs', None) is None:
+            from tools.knowledge_base.reembed_job import ReembedJobManager
+            self._reembed_jobs = ReembedJobManager()
+        return self._reembed_jobs
+    
+    async def reembed_collection(self, collection_id: str, model_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Start re-embedding a collection's vectors with another model.
+        
+        The new vectors are built in a shadow collection in the background;
+        searches keep using the current vectors until the shadow is complete
+        and the collection is switched over.
+        
+        Args:
+            collection_id: ID of the collection
+            model_name: Model to re-embed with. Uses RAG_MODEL_NAME if None.
+            
+        Returns:
+            Dictionary with the started job's status
+        """
+        if not self.vector_available:
+            return {"success": False, "error": "Vector dependencies not available"}
+        
+        try:
+            import os
+            from tools.knowledge_base.embeddings import DEFAULT_MODEL_NAME
+            
+            vector_store = self._get_vector_store()
+            vector_collection = self._vector_collection_name(collection_id)
+            if vector_collection is None:
+                return {"success": False, "error": f"Vectors of collection '{collection_id}' not found"}
+            model_name = model_name or os.getenv("RAG_MODEL_NAME", DEFAULT_MODEL_NAME)
+            job = self._get_reembed_jobs().start(vector_store, vector_collection, model_name)
+            logger.info(f"Started re-embedding vectors of '{collection_id}' with {model_name}")
+            return {"success": True, "job": job.to_dict()}
+        except Exception as e:
+            logger.error(f"Error starting re-embed for collection {collection_id}: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    async def get_reembed_status(self, collection_id: str) -> Dict[str, Any]:
+        """
+        Get the status of the latest re-embed job of a collection.
+        
+        Args:
+            collection_id: ID of the collection
+            
+        Returns:
+            Dictionary with the job status, or job None if none was started
+        """
+        if not self.vector_available:
+            return {"success": False, "error": "Vector dependencies not available"}
+        
+        try:
+            vector_collection = self._vector_collection_name(collection_id)
+            if vector_collection is None:
+                return {"success": False, "error": f"Vectors of collection '{collection_id}' not found"}
+            job = self._get_reembed_jobs().get(vector_collection)
+            return {"success": True, "job": job.to_dict() if job else None}
         except Exception as e:
-            logger.error(f"Error in _delete_collection_vectors for '{collection_id}': {e}")
-            # Don't raise exception - let sync continue even if vector deletion fails
+            logger.error(f"Error getting re-embed status for collection {collection_id}: {str(e)}")
+            return {"success": False, "error": str(e)}
     
     async def get_model_info(self) -> dict:
         """
@@ -660,6 +900,10 @@ class VectorSyncService(IVectorSyncService):
                 except Exception as e:
                     logger.debug(f"Could not get additional model properties: {e}")
             
+            # Resident models and per-collection assignments from the shared registry
+            from tools.knowledge_base.embeddings import get_embedding_registry
+            model_properties['registry'] = get_embedding_registry().get_stats()
+            
             return {
                 "model_name": model_name,
                 "device": device,
@@ -73,4 +73,35 @@ def cleanup_database_connections():
             try:
                 obj.close()
             except Exception:
-                pass
\ No newline at end of file
+                pass
+
+@pytest.fixture
+def fake_models():
+    """Route embedding model loading to offline fakes; yields the fresh registry."""
+    from tests.factories import EmbeddingModelFactory
+
+    with EmbeddingModelFactory.fake_models() as registry:
+        yield registry
+
+
+@pytest.fixture
+def vector_store(tmp_path, fake_models):
+    """Empty vector store under tmp_path whose collection is embedded with small-model."""
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection(embedding_model="small-model")
+    return store
+
+
+@pytest.fixture
+def search_store(vector_store):
+    """Vector store holding SEARCH_CHUNKS as c0..c3, each with its index as metadata 'n'."""
+    from tests.factories import SEARCH_CHUNKS
+
+    vector_store.add_documents(
+        documents=SEARCH_CHUNKS,
+        metadatas=[{"n": i} for i in range(len(SEARCH_CHUNKS))],
+        ids=[f"c{i}" for i in range(len(SEARCH_CHUNKS))]
+    )
+    return vector_store
@@ -1,5 +1,6 @@
 """Mock factories for testing."""
 import re
+from contextlib import contextmanager
 from unittest.mock import AsyncMock, MagicMock
 from typing import Dict, Any, Union, Optional
 
@@ -235,4 +236,87 @@ def create_security_test_mock(blocked_patterns=None, success_patterns=None):
     
     response_config['default'] = 'success'
     
-    return AsyncWebCrawlerMockFactory.create_mock(response_config=response_config)
\ No newline at end of file
+    return AsyncWebCrawlerMockFactory.create_mock(response_config=response_config)
+
+class FakeSentenceTransformer:
+    """Deterministic, offline SentenceTransformer replacement.
+    
+    Texts are embedded as normalized bag-of-words hashes, so texts sharing
+    words are similar. The reported parameter size is configurable per model
+    name to exercise the embedding registry's memory budget.
+    """
+    
+    dimension = 32
+    sizes_mb: Dict[str, int] = {"small-model": 100, "medium-model": 200, "large-model": 300}
+    loads: list = []
+    
+    def __init__(self, model_name, device=None, cache_folder=None):
+        self.model_name = model_name
+        self.max_seq_length = 128
+        FakeSentenceTransformer.loads.append(model_name)
+    
+    def parameters(self):
+        size_bytes = self.sizes_mb.get(self.model_name, 50) * 1024 * 1024
+        parameter = MagicMock()
+        parameter.numel.return_value = size_bytes // 4
+        parameter.element_size.return_value = 4
+        return [parameter]
+    
+    def _embed(self, text):
+        import hashlib
+        import numpy as np
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            bucket = int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dimension
+            vector[bucket] += 1.0
+        if not vector.any():
+            vector[0] = 1.0
+        return vector / np.linalg.norm(vector)
+    
+    def encode(self, texts, **kwargs):
+        import numpy as np
+        if isinstance(texts, str):
+            return self._embed(texts)
+        return np.array([self._embed(text) for text in texts], dtype=np.float32)
+
+
+class EmbeddingModelFactory:
+    """Factory for patching embedding models with offline fakes."""
+    
+    @staticmethod
+    @contextmanager
+    def fake_models(memory_budget_mb: Optional[float] = None):
+        """Route SentenceTransformer loading to FakeSentenceTransformer.
+        
+        Yields the fresh global embedding registry and resets it afterwards.
+        """
+        from unittest.mock import patch
+        from tools.knowledge_base import embeddings
+        from tools.knowledge_base.dependencies import rag_deps
+        
+        real_get_component = rag_deps.get_component
+        
+        def get_component(name):
+            if name == 'SentenceTransformer':
+                return FakeSentenceTransformer
+            return real_get_component(name)
+        
+        embeddings.reset_embedding_service_singleton()
+        FakeSentenceTransformer.loads = []
+        with patch.object(rag_deps, 'get_component', side_effect=get_component):
+            registry = embeddings.get_embedding_registry()
+            if memory_budget_mb is not None:
+                registry.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+            try:
+                yield registry
+            finally:
+                embeddings.reset_embedding_service_singleton()
+
+
+# Unrelated chunks for search tests; c1 holds an exact identifier
+SEARCH_CHUNKS = [
+    "python decorators wrap functions",
+    "connections fail with ERR_CONN_RESET when the peer closes the socket",
+    "rust ownership rules prevent data races",
+    "kubernetes pods run containers",
+]
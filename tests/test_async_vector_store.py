@@ -0,0 +1,97 @@
+"""Tests for the executor-backed async VectorStore facade."""
+
+import asyncio
+import threading
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store holding a few chunks."""
+    vector_store.add_documents(
+        documents=["python decorators wrap functions", "rust ownership rules"],
+        metadatas=[{"n": 0}, {"n": 1}],
+        ids=["c0", "c1"]
+    )
+    return vector_store
+
+
+@pytest.fixture
+def facade(store):
+    from tools.knowledge_base.async_vector_store import AsyncVectorStore, OperationMetrics
+
+    read_executor = ThreadPoolExecutor(max_workers=2)
+    write_executor = ThreadPoolExecutor(max_workers=1)
+    yield AsyncVectorStore(store, read_executor, write_executor, OperationMetrics())
+    read_executor.shutdown()
+    write_executor.shutdown()
+
+
+def test_operations_run_off_the_event_loop(facade):
+    async def scenario():
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def record_thread():
+            threads.append(threading.get_ident())
+
+        await facade.run_read("probe", record_thread)
+        await facade.namespace("docs").add_documents(["kubernetes pods"], metadatas=[{}], ids=["d0"])
+        results = await facade.similarity_search("rust ownership", k=1)
+        document = await facade.get_document("c0")
+        return loop_thread, threads, results, document
+
+    loop_thread, threads, results, document = asyncio.run(scenario())
+
+    assert threads and threads[0] != loop_thread
+    assert results[0]["id"] == "c1"
+    assert document["content"] == "python decorators wrap functions"
+    assert facade.store.namespace("docs").count() == 1
+
+
+def test_slow_write_does_not_block_reads(facade):
+    release = threading.Event()
+
+    async def scenario():
+        write = asyncio.ensure_future(facade.run_write("slow_write", release.wait, 10))
+        await asyncio.sleep(0.05)
+        results = await asyncio.wait_for(facade.similarity_search("python decorators", k=1), timeout=5)
+        write_pending = not write.done()
+        release.set()
+        await write
+        return results, write_pending
+
+    results, write_pending = asyncio.run(scenario())
+
+    assert write_pending
+    assert results[0]["id"] == "c0"
+
+
+def test_operations_are_timed(facade):
+    async def scenario():
+        await facade.count()
+        await facade.count()
+        with pytest.raises(ValueError):
+            await facade.run_write("broken", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+    asyncio.run(scenario())
+    metrics = facade.metrics.snapshot()
+
+    assert metrics["count"]["count"] == 2
+    assert metrics["count"]["errors"] == 0
+    assert metrics["count"]["max_run_seconds"] >= metrics["count"]["avg_run_seconds"] >= 0
+    assert metrics["broken"]["errors"] == 1
@@ -0,0 +1,95 @@
+"""Tests for multi-query batch vector search."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+QUERIES = ["python decorators", "rust ownership", "kubernetes pods"]
+
+
+def test_batch_matches_single_searches(search_store):
+    batch = search_store.batch_similarity_search(QUERIES, k=2)
+
+    assert batch["fused"] is None
+    assert batch["results"] == [search_store.similarity_search(query, k=2) for query in QUERIES]
+
+
+def test_queries_are_embedded_and_searched_once(search_store):
+    collection = search_store._current_collection()
+
+    with patch.object(search_store, "_embed_texts", wraps=search_store._embed_texts) as embed, \
+            patch.object(type(collection), "query", autospec=True, side_effect=type(collection).query) as query:
+        search_store.batch_similarity_search(QUERIES, k=2)
+
+    assert embed.call_count == 1
+    assert embed.call_args.args[0] == QUERIES
+    assert query.call_count == 1
+
+
+def test_fused_ranking_rewards_chunks_matched_by_several_queries(search_store):
+    batch = search_store.batch_similarity_search(["python decorators", "python functions", "kubernetes"], k=4, fuse=True)
+
+    fused = batch["fused"]
+    scores = [result["fusion_score"] for result in fused]
+    assert scores == sorted(scores, reverse=True)
+    assert len({result["id"] for result in fused}) == len(fused)
+    assert fused[0]["id"] == "c0"
+    assert fused[0]["matched_queries"] == 3
+
+
+def test_hybrid_batch_matches_single_hybrid_searches(search_store):
+    batch = search_store.batch_similarity_search(["ERR_CONN_RESET", "rust"], k=2, hybrid=True)
+
+    assert batch["results"] == [search_store.hybrid_search(query, k=2) for query in ["ERR_CONN_RESET", "rust"]]
+    assert batch["results"][0][0]["id"] == "c1"
+
+
+def test_each_query_keeps_its_own_results(search_store):
+    queries = ["python decorators", "rust ownership", "zzz", "kubernetes pods"]
+
+    batch = search_store.batch_similarity_search(queries, k=3, score_threshold=0.1, hybrid=True, fuse=True)
+
+    # One query matches nothing while its neighbours in the batch do
+    assert [[result["id"] for result in results] for results in batch["results"]] == [["c0"], ["c2"], [], ["c3"]]
+    assert batch["results"] == [search_store.hybrid_search(query, k=3, score_threshold=0.1) for query in queries]
+    # Fusing across queries does not write back into the per-query results
+    assert all("matched_queries" not in result for results in batch["results"] for result in results)
+    assert {result["id"]: result["matched_queries"] for result in batch["fused"]} == {"c0": 1, "c2": 1, "c3": 1}
+
+
+def test_batch_search_across_namespaces(search_store):
+    search_store.namespace("docs").add_documents(documents=["kubernetes services"], metadatas=[{}], ids=["d0"])
+
+    batch = search_store.batch_similarity_search_namespaces(["kubernetes", "python"], k=1, collection_names=["docs"])
+
+    assert [[result["id"] for result in results] for results in batch["results"]] == [["d0"], ["d0"]]
+    assert search_store.batch_similarity_search([], k=1) == {"results": [], "fused": None}
+
+
+def test_service_batch_search(search_store):
+    from services.vector_sync_service import VectorSyncService
+
+    service = VectorSyncService(vector_store=search_store)
+    service.vector_available = True
+
+    batch = asyncio.run(service.batch_search_vectors(QUERIES, limit=1, similarity_threshold=0.0, fuse=True))
+
+    assert [len(results) for results in batch["results"]] == [0, 0, 0]
+    search_store.namespace("docs").add_documents(documents=["python decorators"], metadatas=[{"source_file": "a.md"}], ids=["d0"])
+    batch = asyncio.run(service.batch_search_vectors(QUERIES, "docs", limit=1, similarity_threshold=0.0, fuse=True))
+    assert batch["results"][0][0].file_path == "a.md"
+    assert batch["results"][0][0].collection_name == "docs"
+    assert batch["fused"][0].content == "python decorators"
@@ -0,0 +1,111 @@
+"""Tests for collection version counters and the change feed."""
+
+import asyncio
+import pytest
+import sys
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.change_feed import ChangeFeed, record_change, FILE_SAVED, FILE_CHANGE_TYPES
+from tools.knowledge_base.persistent_sync_manager import DatabaseCollectionManager
+
+
+def test_file_writes_bump_the_collection_version(tmp_path):
+    manager = DatabaseCollectionManager(str(tmp_path / "collections.db"))
+    manager.create_collection("docs")
+
+    assert manager.create_file("docs", "a.md", "one")["version"] == 1
+    manager.create_file("docs", "b.md", "two", folder="guides")
+    manager.delete_file("docs", "a.md")
+    manager.delete_file("docs", "missing.md")
+
+    changes = manager.change_feed.changes_since("docs", 1)
+    assert changes["current_version"] == 3
+    assert [(c["version"], c["change_type"], c["file_path"]) for c in changes["changes"]] == [
+        (2, "file_saved", "guides/b.md"), (3, "file_deleted", "a.md")
+    ]
+    assert not changes["reset_required"] and not changes["has_more"]
+
+
+def test_versions_survive_collection_recreation(tmp_path):
+    manager = DatabaseCollectionManager(str(tmp_path / "collections.db"))
+    manager.create_collection("docs")
+    manager.create_file("docs", "a.md", "one")
+    manager.delete_collection("docs")
+    manager.create_collection("docs")
+    manager.create_file("docs", "a.md", "one")
+
+    changes = manager.change_feed.changes_since("docs", 1)
+    assert [c["change_type"] for c in changes["changes"]] == ["collection_deleted", "file_saved"]
+    assert manager.change_feed.current_version("docs") == 3
+
+
+def test_trimmed_changes_require_a_reset(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    with sqlite3.connect(feed.db_path) as conn:
+        for n in range(5):
+            record_change(conn, "docs", FILE_SAVED, f"{n}.md", retention=2)
+
+    assert feed.changes_since("docs", 3)["reset_required"] is False
+    assert feed.changes_since("docs", 2)["reset_required"] is True
+    assert feed.changes_since("docs", 5) == {
+        "collection_name": "docs", "since_version": 5, "current_version": 5,
+        "changes": [], "has_more": False, "reset_required": False
+    }
+    page = feed.changes_since("docs", 3, limit=1)
+    assert [c["version"] for c in page["changes"]] == [4] and page["has_more"]
+
+
+def test_filesystem_store_records_writes(tmp_path):
+    from tools.filesystem_collection_manager import FilesystemCollectionManager
+
+    async def scenario():
+        manager = FilesystemCollectionManager(tmp_path / "files", tmp_path / "metadata.db", auto_reconcile=False)
+        await manager.create_collection("docs")
+        await manager.save_file("docs", "a.md", "one")
+        await manager.delete_file("docs", "a.md")
+        return await manager.get_collection_changes("docs")
+
+    changes = asyncio.run(scenario())
+    assert changes["success"] and changes["current_version"] == 2
+    assert [c["change_type"] for c in changes["changes"]] == ["file_saved", "file_deleted"]
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_sync_logs_chunk_writes_and_detects_changes_from_the_feed(vector_store, tmp_path):
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager, SYNC_CURSOR
+    from tools.knowledge_base.vector_sync_schemas import calculate_file_hash
+
+    with patch('tools.knowledge_base.rag_tools.get_rag_service', return_value=None):
+        manager = IntelligentSyncManager(vector_store=vector_store, persistent_db_path=str(tmp_path / "sync.db"))
+    files = manager.collection_manager
+    files.create_collection("docs")
+    files.save_file("docs", "a.md", "# Guide\n\nPython decorators wrap functions.")
+
+    content = files.read_file("docs", "a.md")["content"]
+    result = manager._process_single_file("docs", {
+        'path': 'a.md', 'content': content, 'current_hash': calculate_file_hash(content)
+    })
+    manager._mark_files_synced("docs", 1)
+
+    feed = files.change_feed
+    upserted = feed.changes_since("docs", 1)["changes"]
+    assert [c["change_type"] for c in upserted] == ["chunks_upserted"]
+    assert len(upserted[0]["chunk_ids"]) == result["chunks_created"] > 0
+
+    # Hashing is skipped while the feed shows no file changes since the synced version
+    with patch.object(manager, '_get_collection_files', side_effect=AssertionError("re-read files")):
+        assert asyncio.run(manager._quick_change_detection("docs")) is False
+        files.save_file("docs", "a.md", "# Guide\n\nRust ownership rules.")
+        files.save_file("docs", "b.md", "# Other")
+        assert asyncio.run(manager._quick_change_detection("docs")) is True
+        assert asyncio.run(manager._get_changed_files_count("docs")) == 2
+    assert feed.get_cursor(SYNC_CURSOR, "docs") == 1
+    assert {c["file_path"] for c in feed.changes_since("docs", 1, change_types=FILE_CHANGE_TYPES)["changes"]} == {"a.md", "b.md"}
+    manager.shutdown()
@@ -0,0 +1,150 @@
+"""Tests for chunk-level incremental upserts when synced files change."""
+
+import pytest
+import sys
+import hashlib
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+PARAGRAPHS = [
+    "Python decorators wrap functions with extra behaviour.",
+    "Rust ownership rules prevent data races at compile time.",
+    "Kubernetes schedules pods onto nodes in a cluster.",
+    "Postgres indexes speed up selective queries.",
+    "Terraform modules package reusable infrastructure.",
+]
+
+
+class ParagraphProcessor:
+    """Content processor stub: one chunk per paragraph with position-dependent IDs."""
+
+    def process_content(self, content, source_metadata=None):
+        chunks = []
+        paragraphs = [p for p in content.split("\n\n") if p.strip()]
+        for index, paragraph in enumerate(paragraphs):
+            content_hash = hashlib.md5(paragraph.encode()).hexdigest()[:8]
+            chunks.append({
+                'id': f"chunk_{content_hash}_{index}",
+                'content': paragraph,
+                'metadata': {'chunk_index': index, 'total_chunks': len(paragraphs)}
+            })
+        return chunks
+
+
+@pytest.fixture
+def sync_setup(vector_store, fake_models, tmp_path):
+    """Sync manager over a real vector store, its 'docs' namespace and a log of embedded texts."""
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+
+    with patch('tools.knowledge_base.rag_tools.get_rag_service', return_value=None):
+        manager = IntelligentSyncManager(
+            vector_store=vector_store,
+            persistent_db_path=str(tmp_path / "sync.db")
+        )
+    manager.content_processor = ParagraphProcessor()
+
+    service = fake_models.get_service("small-model")
+    embedded = []
+    original_encode = service.encode_batch
+
+    def counting_encode(texts, *args, **kwargs):
+        embedded.extend(texts)
+        return original_encode(texts, *args, **kwargs)
+
+    with patch.object(service, 'encode_batch', side_effect=counting_encode):
+        yield manager, vector_store.namespace("docs"), embedded
+    manager.shutdown()
+
+
+def _sync(manager, content):
+    from tools.knowledge_base.vector_sync_schemas import calculate_file_hash
+
+    return manager._process_single_file("docs", {
+        'path': 'guide.md',
+        'content': content,
+        'current_hash': calculate_file_hash(content)
+    })
+
+
+def test_editing_one_paragraph_only_reembeds_the_edit(sync_setup):
+    manager, store, embedded = sync_setup
+    _sync(manager, "\n\n".join(PARAGRAPHS))
+    first_ids = list(manager.file_mappings["docs"]["guide.md"].chunk_ids)
+    embedded.clear()
+
+    edited = list(PARAGRAPHS)
+    edited[2] = "Kubernetes deployments roll out new pod versions."
+    edited.insert(0, "A new introduction paragraph.")
+    result = _sync(manager, "\n\n".join(edited))
+
+    mapping = manager.file_mappings["docs"]["guide.md"]
+    assert sorted(embedded) == sorted([edited[0], edited[3]])
+    assert result['chunks_created'] == 2
+    assert result['chunks_deleted'] == 1
+    assert result['chunks_unchanged'] == 4
+    # Unchanged paragraphs keep their stored IDs even though they moved
+    assert mapping.chunk_ids[1] == first_ids[0]
+    assert mapping.chunk_ids[5] == first_ids[4]
+    assert first_ids[2] not in store.list_document_ids()
+    assert store.count() == 6
+    assert store.get_document(first_ids[0])['metadata']['chunk_index'] == 1
+
+
+def test_unchanged_resync_embeds_nothing(sync_setup):
+    manager, store, embedded = sync_setup
+    content = "\n\n".join(PARAGRAPHS)
+    _sync(manager, content)
+    embedded.clear()
+
+    result = _sync(manager, content)
+
+    assert embedded == []
+    assert result['chunks_unchanged'] == len(PARAGRAPHS)
+    assert store.count() == len(PARAGRAPHS)
+
+
+def test_mapping_without_chunk_hashes_is_diffed_from_stored_documents(sync_setup):
+    manager, store, embedded = sync_setup
+    _sync(manager, "\n\n".join(PARAGRAPHS))
+    # Mappings saved before chunk hashes were recorded
+    manager.file_mappings["docs"]["guide.md"].chunk_hashes = []
+    embedded.clear()
+
+    result = _sync(manager, "\n\n".join(PARAGRAPHS[:4]))
+
+    assert embedded == []
+    assert result['chunks_deleted'] == 1
+    assert store.count() == 4
+
+
+def test_chunk_hashes_persist_in_file_mappings(tmp_path):
+    from tools.knowledge_base.persistent_sync_manager import PersistentSyncManager
+    from tools.knowledge_base.vector_sync_schemas import FileVectorMapping
+
+    persistent = PersistentSyncManager(str(tmp_path / "sync.db"))
+    persistent.db_manager.create_collection("docs")
+    persistent.db_manager.create_file("docs", "guide.md", "content")
+    mapping = FileVectorMapping(
+        collection_name="docs",
+        file_path="guide.md",
+        file_hash="0" * 32,
+        chunk_ids=["a", "b"],
+        chunk_hashes=["1" * 32, "2" * 32],
+        chunk_count=2
+    )
+
+    assert persistent.save_file_mapping(mapping)
+    loaded = persistent.load_collection_mappings("docs")["guide.md"]
+
+    assert loaded.chunk_hashes == ["1" * 32, "2" * 32]
@@ -0,0 +1,115 @@
+"""Tests for forking a collection without re-embedding its files."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.vector_sync_schemas import SyncStatus
+
+pytestmark = pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+
+FILES = {
+    ("", "a.md"): "# Decorators\n\nPython decorators wrap functions and return new callables.",
+    ("", "b.md"): "# Ownership\n\nRust ownership rules prevent data races at compile time.",
+    ("drafts", "c.md"): "# Generators\n\nPython generators yield values lazily.",
+}
+
+
+@pytest.fixture
+def synced(vector_store, tmp_path):
+    """Sync manager over a filesystem collection 'docs' whose three files are synced."""
+    from tools.filesystem_collection_manager import FilesystemCollectionManager
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+
+    files = FilesystemCollectionManager(tmp_path / "files", tmp_path / "metadata.db", auto_reconcile=False)
+    with patch('tools.knowledge_base.rag_tools.get_rag_service', return_value=None):
+        manager = IntelligentSyncManager(
+            vector_store=vector_store, collection_manager=files, persistent_db_path=str(tmp_path / "sync.db")
+        )
+
+    async def setup():
+        await files.create_collection("docs")
+        for (folder, name), content in FILES.items():
+            await files.save_file("docs", name, content, folder)
+        return await manager.sync_collection("docs")
+
+    assert asyncio.run(setup()).success
+    yield manager, files, vector_store
+    manager.shutdown()
+
+
+def test_fork_reuses_vectors_and_mappings(synced):
+    manager, files, store = synced
+    docs = store.namespace("docs")
+
+    with patch.object(manager, '_process_single_file', side_effect=AssertionError("re-embedded")):
+        result = asyncio.run(manager.fork_collection("docs", "variant"))
+
+    variant = store.namespace("variant")
+    ids = sorted(docs.list_document_ids())
+    assert sorted(result["files"]) == ["a.md", "b.md", "drafts/c.md"]
+    assert result["chunks_copied"] == len(ids) and result["file_mappings"] == 3
+    assert sorted(variant.list_document_ids()) == ids
+    assert variant.get_stored_vectors(ids) == docs.get_stored_vectors(ids)
+    assert asyncio.run(files.read_file("variant", "c.md", "drafts"))["content"] == FILES[("drafts", "c.md")]
+
+    hit = variant.similarity_search("decorators", k=1)[0]
+    assert hit["metadata"]["collection_name"] == "variant"
+    assert asyncio.run(manager.get_collection_sync_status("variant")).status == SyncStatus.IN_SYNC
+
+    # The fork is already synced and evolves independently of its source
+    assert asyncio.run(manager.sync_collection("variant")).files_processed == 0
+    asyncio.run(files.delete_file("variant", "b.md"))
+    assert asyncio.run(manager.sync_collection("variant")).chunks_deleted > 0
+    assert sorted(docs.list_document_ids()) == ids
+
+
+def test_fork_applies_file_filters(synced):
+    manager, files, store = synced
+
+    result = asyncio.run(manager.fork_collection(
+        "docs", "python", include_patterns=["*.md"], exclude_patterns=["b.md"]
+    ))
+
+    python = store.namespace("python")
+    assert sorted(result["files"]) == ["a.md", "drafts/c.md"]
+    assert set(python.get_file_chunk_counts()) == {"a.md", "drafts/c.md"}
+    assert python.count() == result["chunks_copied"]
+    assert not python._lexical.search(python.collection_name, "ownership")
+    assert set(manager.file_mappings["python"]) == {"a.md", "drafts/c.md"}
+    assert asyncio.run(manager.sync_collection("python")).files_processed == 0
+
+
+def test_fork_rejects_missing_source_and_existing_target(synced):
+    manager, files, store = synced
+
+    with pytest.raises(ValueError):
+        asyncio.run(manager.fork_collection("missing", "variant"))
+    with pytest.raises(ValueError):
+        asyncio.run(manager.fork_collection("docs", "docs"))
+    assert not store.has_namespace("variant")
+
+
+def test_copied_references_point_at_the_copys_files(vector_store):
+    text = "Python decorators wrap functions."
+    files = {("docs", "guide.md"): f"# Guide\n\n{text}"}
+    vector_store.set_document_reader(lambda collection, path: files.get((collection, path)))
+    docs = vector_store.namespace("docs")
+    docs.set_collection_document_storage("reference")
+    docs.add_documents([text], metadatas=[{"collection_name": "docs", "source_file": "guide.md"}], ids=["p"])
+
+    files[("fork", "guide.md")] = files[("docs", "guide.md")]
+    assert vector_store.copy_namespace("docs", "fork", file_paths=["guide.md"]) == 1
+
+    # Editing the source file does not break the fork's references
+    files[("docs", "guide.md")] = "Rewritten."
+    fork = vector_store.namespace("fork")._current_collection()
+    assert fork.inner.get(ids=["p"], include=["metadatas"])["metadatas"][0]["doc_collection"] == "fork"
+    assert fork.get(ids=["p"])["documents"] == [text]
@@ -0,0 +1,147 @@
+"""Tests for per-collection vector namespaces."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store whose collection is embedded with small-model."""
+    return vector_store
+
+
+def _add(store, collection_name, texts):
+    store.namespace(collection_name).add_documents(
+        documents=texts,
+        metadatas=[{"collection_name": collection_name, "n": i} for i in range(len(texts))],
+        ids=[f"{collection_name}_{i}" for i in range(len(texts))]
+    )
+
+
+def _physical_names(store):
+    return sorted(collection.name for collection in store.client.list_collections())
+
+
+def test_namespaces_are_isolated_physical_collections(store):
+    _add(store, "docs", ["python decorators wrap functions", "rust ownership rules"])
+    _add(store, "notes", ["python decorators in my notes"])
+
+    docs = store.namespace("docs")
+    assert docs.count() == 2
+    assert store.namespace("notes").count() == 1
+    assert store.count() == 0
+    assert docs._current_collection().name != store.namespace("notes")._current_collection().name
+    assert docs.get_collection_embedding_model() == "small-model"
+    assert {result["id"] for result in docs.similarity_search("python decorators", k=5)} == {"docs_0", "docs_1"}
+    assert sorted(store.list_namespaces()) == ["docs", "notes"]
+    assert store.list_collections() == ["crawl4ai_documents"]
+
+
+def test_search_across_namespaces_merges_by_score(store):
+    _add(store, "docs", ["python decorators wrap functions", "rust ownership rules"])
+    _add(store, "notes", ["kubernetes pods"])
+
+    results = store.similarity_search_namespaces("kubernetes pods", k=2)
+
+    assert len(results) == 2
+    assert results[0]["id"] == "notes_0"
+    assert results[0]["score"] >= results[1]["score"]
+
+
+def test_delete_drops_the_namespace(store):
+    _add(store, "docs", ["python decorators wrap functions", "rust ownership rules"])
+    _add(store, "notes", ["kubernetes pods"])
+    physical_name = store.namespace("docs")._current_collection().name
+
+    assert store.delete_namespace("docs") == 2
+    assert physical_name not in _physical_names(store)
+    assert not store.has_namespace("docs")
+    assert store.namespace("notes").count() == 1
+    assert store.delete_namespace("docs") == 0
+
+
+def test_rename_moves_the_route_without_copying(store):
+    _add(store, "docs", ["python decorators wrap functions"])
+    physical_name = store.namespace("docs")._current_collection().name
+
+    store.rename_namespace("docs", "archive")
+
+    archive = store.namespace("archive")
+    assert archive._current_collection().name == physical_name
+    assert archive.count() == 1
+    assert not store.has_namespace("docs")
+    with pytest.raises(KeyError):
+        store.rename_namespace("docs", "other")
+    _add(store, "notes", ["kubernetes pods"])
+    with pytest.raises(ValueError):
+        store.rename_namespace("notes", "archive")
+
+
+def test_copy_reuses_stored_vectors(store):
+    from tools.knowledge_base.embeddings import get_embedding_registry
+
+    _add(store, "docs", ["python decorators wrap functions", "rust ownership rules"])
+    service = get_embedding_registry().get_service("small-model")
+
+    with patch.object(service, "encode_batch") as encode_batch:
+        copied = store.copy_namespace("docs", "docs-copy")
+    encode_batch.assert_not_called()
+
+    copy = store.namespace("docs-copy")
+    assert copied == 2
+    assert copy._current_collection().name != store.namespace("docs")._current_collection().name
+    assert copy.similarity_search("rust ownership", k=1)[0]["id"] == "docs_1"
+    # The copy is independent of its source
+    store.delete_namespace("docs")
+    assert copy.count() == 2
+
+
+def test_quantized_namespace_copy(store):
+    store.set_collection_vector_storage("int8")
+    _add(store, "docs", ["python decorators wrap functions", "rust ownership rules"])
+
+    store.copy_namespace("docs", "docs-copy")
+
+    copy = store.namespace("docs-copy")
+    assert copy._collection_vector_storage(copy._current_collection()) == "int8"
+    assert copy.similarity_search("rust ownership", k=1)[0]["id"] == "docs_1"
+
+
+def test_records_in_shared_collection_are_adopted(store):
+    store.add_documents(
+        documents=["python decorators wrap functions", "kubernetes pods"],
+        metadatas=[{"collection_name": "docs"}, {"collection_name": "notes"}],
+        ids=["docs_0", "notes_0"]
+    )
+
+    docs = store.namespace("docs")
+
+    assert docs.list_document_ids() == ["docs_0"]
+    assert store.list_document_ids() == ["notes_0"]
+    assert docs.similarity_search("python decorators", k=1)[0]["id"] == "docs_0"
+
+
+def test_namespace_can_be_reembedded(store):
+    from tools.knowledge_base.reembed_job import ReembedJob
+
+    _add(store, "docs", ["python decorators wrap functions", "rust ownership rules"])
+    logical_name = store.namespace_name("docs")
+
+    status = ReembedJob(store, logical_name, "medium-model", throttle_seconds=0).run()
+
+    assert status["state"] == "completed"
+    assert store.namespace("docs").get_collection_embedding_model() == "medium-model"
+    assert store.namespace("docs").similarity_search("rust ownership", k=1)[0]["id"] == "docs_1"
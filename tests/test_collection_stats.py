@@ -0,0 +1,143 @@
+"""Tests for incrementally maintained collection statistics."""
+
+import pytest
+import sys
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.database_collection_adapter import DatabaseCollectionAdapter
+
+
+def _chunk(path, chunk_type, **relationships):
+    return {"source_file": path, "chunk_type": chunk_type, **relationships}
+
+
+@pytest.fixture
+def docs(vector_store):
+    """'docs' namespace with three chunks of two files."""
+    docs = vector_store.namespace("docs")
+    docs.add_documents(
+        documents=["alpha", "beta gamma", "délta"],
+        metadatas=[
+            _chunk("a.md", "header_section", next_chunk_id="c1"),
+            _chunk("a.md", "paragraph", previous_chunk_id="c0", section_siblings=["c0"]),
+            _chunk("b.md", "paragraph", overlap_sources=["c1"]),
+        ],
+        ids=["c0", "c1", "c2"]
+    )
+    return docs
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_stats_are_exact_counts(docs):
+    stats = docs.get_collection_stats()
+
+    assert stats["total_documents"] == 3
+    assert stats["total_bytes"] == len("alpha") + len("beta gamma") + len("délta".encode("utf-8"))
+    assert stats["file_count"] == 2
+    assert stats["chunk_types"] == {"header_section": 1, "paragraph": 2}
+    assert stats["relationship_counts"] == {
+        "chunks_with_overlap": 1, "expansion_eligible": 3,
+        "has_sequential_neighbors": 2, "has_section_siblings": 1
+    }
+    assert stats["relationship_analysis"]["has_sequential_neighbors"] == "66.7%"
+    assert docs.get_file_chunk_counts() == {"a.md": 2, "b.md": 1}
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_writes_replace_a_chunks_previous_contribution(docs):
+    docs.upsert_documents(["alpha alpha"], metadatas=[_chunk("b.md", "code")], ids=["c0"])
+    docs.update_metadatas(["c1"], [_chunk("a.md", "list")])
+    docs.delete_documents(["c2"])
+
+    stats = docs.get_collection_stats()
+    assert stats["total_bytes"] == len("alpha alpha") + len("beta gamma")
+    assert stats["chunk_types"] == {"code": 1, "list": 1}
+    assert stats["relationship_counts"] == {
+        "chunks_with_overlap": 0, "expansion_eligible": 2,
+        "has_sequential_neighbors": 0, "has_section_siblings": 0
+    }
+    assert docs.get_file_chunk_counts() == {"a.md": 1, "b.md": 1}
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_stats_follow_namespace_copies_and_renames(docs):
+    docs.copy_namespace("docs", "copy")
+    docs.rename_namespace("copy", "moved")
+
+    assert docs.namespace("moved").get_file_chunk_counts() == {"a.md": 2, "b.md": 1}
+    docs.delete_collection(docs.namespace_name("moved"))
+    assert docs._stats.get_stats(docs.namespace_name("moved"))["chunks"] == 0
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_missing_counters_are_repaired_off_the_read_path(docs):
+    docs._stats.drop_collection(docs.collection_name)
+
+    with patch.object(docs, '_repair_stats_in_background') as repair:
+        stats = docs.get_collection_stats()
+    assert stats["stats_repair_pending"] is True and stats["chunk_types"] == {}
+    repair.assert_called_once_with(docs.collection_name)
+
+    assert docs.repair_collection_stats()["chunks"] == 3
+    stats = docs.get_collection_stats()
+    assert stats["stats_repair_pending"] is False
+    assert stats["chunk_types"] == {"header_section": 1, "paragraph": 2}
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_missing_counters_are_rebuilt_in_the_background(docs):
+    docs._stats.drop_collection(docs.collection_name)
+
+    with patch('tools.knowledge_base.vector_store.COMPACTION_IDLE_WAIT_SECONDS', 0):
+        docs.get_file_chunk_counts()
+        deadline = time.time() + 30
+        while docs.get_collection_stats()["stats_repair_pending"] and time.time() < deadline:
+            time.sleep(0.05)
+
+    assert docs.get_file_chunk_counts() == {"a.md": 2, "b.md": 1}
+
+
+def test_file_counters_are_maintained_on_write(tmp_path):
+    adapter = DatabaseCollectionAdapter(str(tmp_path / "collections.db"))
+    adapter.create_collection("docs")
+    adapter.save_file("docs", "a.md", "1234")
+    adapter.save_file("docs", "b.md", "12", folder="sub")
+    adapter.save_file("docs", "a.md", "123456")
+    adapter.delete_file("docs", "b.md", folder="sub")
+    adapter.delete_file("docs", "missing.md")
+
+    info = adapter.get_collection_info("docs")["collection"]
+    assert (info["file_count"], info["total_size"]) == (1, 6)
+    assert adapter.list_collections()[0]["file_count"] == 1
+    assert adapter.get_collection_info("nope")["success"] is False
+
+
+def test_file_counters_are_backfilled_for_old_databases(tmp_path):
+    db_path = tmp_path / "collections.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE collections (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL, description TEXT DEFAULT '',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE collection_files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, collection_name TEXT NOT NULL, filename TEXT NOT NULL,
+                folder TEXT DEFAULT '', content TEXT NOT NULL, content_hash TEXT NOT NULL, size INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(collection_name, filename, folder)
+            );
+            INSERT INTO collections (name) VALUES ('docs');
+            INSERT INTO collection_files (collection_name, filename, content, content_hash, size)
+                VALUES ('docs', 'a.md', 'abc', 'h1', 3), ('docs', 'b.md', 'de', 'h2', 2);
+        """)
+
+    info = DatabaseCollectionAdapter(str(db_path)).get_collection_info("docs")["collection"]
+    assert (info["file_count"], info["total_size"]) == (2, 5)
@@ -0,0 +1,92 @@
+"""Tests for batched neighbor fetching during context expansion."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+CHUNKS = [
+    "python decorators wrap functions",
+    "python decorators can take arguments",
+    "python decorators preserve metadata with functools",
+    "rust ownership rules prevent data races",
+    "kubernetes pods run containers",
+]
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store holding a chain of sequentially linked chunks."""
+    metadatas = []
+    for i in range(len(CHUNKS)):
+        metadata = {"chunk_index": i}
+        if i > 0:
+            metadata["previous_chunk_id"] = f"c{i - 1}"
+        if i < len(CHUNKS) - 1:
+            metadata["next_chunk_id"] = f"c{i + 1}"
+        metadatas.append(metadata)
+    vector_store.add_documents(documents=CHUNKS, metadatas=metadatas, ids=[f"c{i}" for i in range(len(CHUNKS))])
+    return vector_store
+
+
+def _counting_gets(store):
+    collection = store._current_collection()
+    original_get = type(collection).get
+    calls = []
+
+    def counting_get(self, *args, **kwargs):
+        calls.append(kwargs.get("ids"))
+        return original_get(self, *args, **kwargs)
+
+    return patch.object(type(collection), "get", counting_get), calls
+
+
+def test_expansion_fetches_all_neighbors_in_one_call(store):
+    patcher, calls = _counting_gets(store)
+
+    with patcher:
+        results = store.search_with_relationships("python decorators", k=3, expand_context=True)
+
+    base = [result for result in results if "expansion_source" not in result]
+    context = [result for result in results if "expansion_source" in result]
+    assert len(base) == 3
+    assert len(calls) == 1
+    # Shared neighbors are requested once
+    assert len(calls[0]) == len(set(calls[0]))
+    expected = {
+        (result["id"], neighbor)
+        for result in base
+        for neighbor in (result["metadata"].get("previous_chunk_id"), result["metadata"].get("next_chunk_id"))
+        if neighbor
+    }
+    assert {(result["expansion_source"], result["id"]) for result in context} == expected
+    assert all(result["content"] == CHUNKS[int(result["id"][1:])] for result in context)
+
+
+def test_missing_neighbors_are_skipped(store):
+    store.delete_documents(["c1"])
+
+    results = store._expand_search_context(
+        [{"id": "c0", "metadata": {"next_chunk_id": "c1"}}, {"id": "c2", "metadata": {"next_chunk_id": "c3"}}],
+        2
+    )
+
+    assert [(result["expansion_source"], result["id"]) for result in results[2:]] == [("c2", "c3")]
+
+
+def test_fallback_relationship_search_maps_chunks_by_id(store):
+    related = store._fallback_relationship_search("c2", "sequential", max_results=5)
+
+    assert [chunk["id"] for chunk in related] == ["c1", "c3"]
+    assert [chunk["content"] for chunk in related] == [CHUNKS[1], CHUNKS[3]]
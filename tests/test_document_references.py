@@ -0,0 +1,136 @@
+"""Tests for chunk documents stored by reference to their source files."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.document_references import (
+    FileContentCache, REFERENCE_KEYS, content_hash, locate_text
+)
+
+pytestmark = pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+
+GUIDE = "# Guide\n\nPython decorators wrap functions.\n\nRust ownership rules prevent data races."
+
+
+@pytest.fixture
+def store(vector_store):
+    files = {}
+    vector_store.set_document_reader(lambda collection, path: files.get((collection, path)))
+    docs = vector_store.namespace("docs")
+    docs.set_collection_document_storage("reference")
+    return vector_store, docs, files
+
+
+def _metadata(path="guide.md"):
+    return {"collection_name": "docs", "source_file": path}
+
+
+def test_chunks_found_in_their_file_are_stored_by_reference(store):
+    vector_store, docs, files = store
+    files[("docs", "guide.md")] = GUIDE
+    docs.add_documents(
+        ["Python decorators wrap functions.", "Not in the file."],
+        metadatas=[_metadata(), _metadata()], ids=["a", "b"]
+    )
+
+    raw = docs._current_collection().inner.get(ids=["a", "b"], include=["documents", "metadatas"])
+    stored = dict(zip(raw["ids"], zip(raw["documents"], raw["metadatas"])))
+    assert stored["a"][0] == "" and stored["a"][1]["doc_hash"] == content_hash(GUIDE)
+    assert stored["b"][0] == "Not in the file." and "doc_start" not in stored["b"][1]
+
+    results = docs.similarity_search("decorators", k=2)
+    by_id = {result["id"]: result for result in results}
+    assert by_id["a"]["content"] == "Python decorators wrap functions."
+    assert not set(REFERENCE_KEYS) & set(by_id["a"]["metadata"])
+    assert docs.get_collection_stats()["document_storage"] == "reference"
+
+
+def test_copied_namespaces_keep_resolving(store):
+    vector_store, docs, files = store
+    files[("docs", "guide.md")] = GUIDE
+    docs.add_documents(["Rust ownership rules prevent data races."], metadatas=[_metadata()], ids=["r"])
+
+    vector_store.copy_namespace("docs", "docs-copy")
+    copy = vector_store.namespace("docs-copy")
+    assert copy.get_collection_stats()["document_storage"] == "reference"
+    assert copy._current_collection().get(ids=["r"])["documents"] == ["Rust ownership rules prevent data races."]
+
+
+def test_stale_references_are_repointed_or_restored_inline(store):
+    vector_store, docs, files = store
+    files[("docs", "guide.md")] = GUIDE
+    texts = ["Python decorators wrap functions.", "Rust ownership rules prevent data races."]
+    docs.add_documents(texts, metadatas=[_metadata(), _metadata()], ids=["p", "r"])
+    collection = docs._current_collection()
+
+    # The file moves on; the references taken from the old content no longer resolve
+    files[("docs", "guide.md")] = "Intro.\n\nPython decorators wrap functions."
+    vector_store.set_document_reader(lambda collection, path: files.get((collection, path)))
+    assert collection.get(ids=["p"])["documents"] == [""]
+
+    docs.update_metadatas(["p", "r"], [_metadata(), _metadata()], documents=texts)
+    current = dict(zip(*(lambda got: (got["ids"], got["documents"]))(collection.get(ids=["p", "r"]))))
+    assert current == {"p": texts[0], "r": texts[1]}
+    raw = collection.inner.get(ids=["p", "r"], include=["documents"])
+    assert dict(zip(raw["ids"], raw["documents"])) == {"p": "", "r": texts[1]}
+
+
+def test_storage_can_only_change_while_empty(store):
+    vector_store, docs, files = store
+    with pytest.raises(ValueError):
+        docs.set_collection_document_storage("compressed")
+    docs.add_documents(["Inline text."], metadatas=[_metadata()], ids=["x"])
+    with pytest.raises(ValueError):
+        docs.set_collection_document_storage("inline")
+
+
+def test_cache_is_bounded_and_verifies_hashes():
+    files = {("docs", "a.md"): "aaaa", ("docs", "b.md"): "bbbb"}
+    cache = FileContentCache(max_bytes=6)
+    cache.set_reader(lambda collection, path: files.get((collection, path)))
+    reference = {"doc_collection": "docs", "doc_path": "a.md", "doc_hash": content_hash("aaaa"),
+                 "doc_start": 1, "doc_end": 3}
+
+    assert cache.resolve(reference) == "aa"
+    cache.load("docs", "b.md")
+    assert list(cache._entries) == [("docs", "b.md")]
+    files[("docs", "a.md")] = "changed"
+    assert cache.resolve(reference) is None
+    assert cache.resolve({"doc_path": "a.md"}) is None
+
+
+def test_text_is_located_despite_whitespace_changes():
+    assert locate_text("a  b\n\nc d", "b\n\nc") == (3, 7)
+    assert locate_text("a  b\n\nc d", "a b  \nc") == (0, 7)
+    assert locate_text("a b c", "b d") is None
+
+
+def test_sync_stores_chunks_by_reference(vector_store, tmp_path):
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+    from tools.knowledge_base.vector_sync_schemas import calculate_file_hash
+
+    with patch('tools.knowledge_base.rag_tools.get_rag_service', return_value=None):
+        manager = IntelligentSyncManager(vector_store=vector_store, persistent_db_path=str(tmp_path / "sync.db"))
+    docs = vector_store.namespace("docs")
+    docs.set_collection_document_storage("reference")
+    files = manager.collection_manager
+    files.create_collection("docs")
+    files.save_file("docs", "guide.md", GUIDE, folder="notes")
+
+    content = files.read_file("docs", "guide.md", folder="notes")["content"]
+    manager._process_single_file("docs", {
+        'path': 'notes/guide.md', 'content': content, 'current_hash': calculate_file_hash(content)
+    })
+
+    # The markdown chunker re-joins lines, so the chunk differs from the file in whitespace only
+    collection = docs._current_collection()
+    assert collection.inner.get(include=["documents"])["documents"] == [""]
+    assert collection.get()["documents"] == [GUIDE]
+    manager.shutdown()
@@ -0,0 +1,175 @@
+"""Tests for the multi-model embedding registry."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available, rag_deps
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+MB = 1024 * 1024
+
+
+class FakeParameter:
+    """Parameter stand-in exposing the size accessors used for budgeting."""
+
+    def __init__(self, size_bytes):
+        self.size_bytes = size_bytes
+
+    def numel(self):
+        return self.size_bytes // 4
+
+    def element_size(self):
+        return 4
+
+
+class FakeSentenceTransformer:
+    """Deterministic SentenceTransformer replacement sized by model name."""
+
+    loads = []
+    sizes_mb = {"small-model": 100, "medium-model": 200, "large-model": 300}
+
+    def __init__(self, model_name, device=None, cache_folder=None):
+        self.model_name = model_name
+        FakeSentenceTransformer.loads.append(model_name)
+
+    def parameters(self):
+        return [FakeParameter(self.sizes_mb.get(self.model_name, 50) * MB)]
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return np.full(4, float(len(texts)), dtype=np.float32)
+        return np.array([[float(len(text))] * 4 for text in texts], dtype=np.float32)
+
+
+def _fake_component(name):
+    if name == 'SentenceTransformer':
+        return FakeSentenceTransformer
+    return rag_deps.components[name]
+
+
+@pytest.fixture
+def registry():
+    """Fresh global registry with a 400 MB budget and a fake model loader."""
+    from tools.knowledge_base import embeddings
+
+    embeddings.reset_embedding_service_singleton()
+    FakeSentenceTransformer.loads = []
+    with patch.object(rag_deps, 'get_component', side_effect=_fake_component):
+        registry = embeddings.get_embedding_registry()
+        registry.memory_budget_bytes = 400 * MB
+        yield registry
+    embeddings.reset_embedding_service_singleton()
+
+
+def test_same_model_returns_shared_service(registry):
+    from tools.knowledge_base.embeddings import EmbeddingService
+
+    first = EmbeddingService(model_name="small-model")
+    second = registry.get_service("small-model")
+
+    assert first is second
+    assert FakeSentenceTransformer.loads == ["small-model"]
+
+
+def test_multiple_models_stay_resident_within_budget(registry):
+    from tools.knowledge_base.embeddings import EmbeddingService
+
+    small = EmbeddingService(model_name="small-model")
+    medium = EmbeddingService(model_name="medium-model")
+
+    assert small is not medium
+    assert registry.resident_models() == ["small-model", "medium-model"]
+    assert small.model is not None and medium.model is not None
+
+
+def test_least_recently_used_model_is_evicted(registry):
+    from tools.knowledge_base.embeddings import EmbeddingService
+
+    small = EmbeddingService(model_name="small-model")
+    medium = EmbeddingService(model_name="medium-model")
+
+    # Using the small model makes the medium one the eviction candidate
+    small.encode_text("hello")
+    large = EmbeddingService(model_name="large-model")
+
+    assert registry.resident_models() == ["small-model", "large-model"]
+    assert medium.model is None
+    assert large.model is not None
+    assert registry.resident_bytes <= registry.memory_budget_bytes
+
+
+def test_evicted_model_reloads_lazily(registry):
+    from tools.knowledge_base.embeddings import EmbeddingService
+
+    medium = EmbeddingService(model_name="medium-model")
+    EmbeddingService(model_name="large-model")
+    EmbeddingService(model_name="small-model")
+    assert medium.model is None
+
+    embedding = medium.encode_text("abc")
+
+    assert embedding == [3.0] * 4
+    assert FakeSentenceTransformer.loads.count("medium-model") == 2
+    assert "medium-model" in registry.resident_models()
+
+
+def test_model_larger_than_budget_is_kept(registry):
+    from tools.knowledge_base.embeddings import EmbeddingService
+
+    registry.memory_budget_bytes = 50 * MB
+    service = EmbeddingService(model_name="large-model")
+
+    assert service.model is not None
+    assert registry.resident_models() == ["large-model"]
+
+
+def test_collection_model_assignment(registry):
+    registry.assign_collection_model("docs", "medium-model")
+
+    service = registry.get_service_for_collection("docs", default_model="small-model")
+    fallback = registry.get_service_for_collection("other", default_model="small-model")
+
+    assert service.model_name == "medium-model"
+    assert fallback.model_name == "small-model"
+    assert registry.get_stats()["collection_models"] == {"docs": "medium-model"}
+
+
+def test_vector_store_embeds_with_collection_model(registry, tmp_path):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection("assigned", embedding_model="small-model")
+    store.add_documents(
+        documents=["alpha", "beta gamma"],
+        metadatas=[{"source": "a"}, {"source": "b"}],
+        ids=["a", "b"]
+    )
+
+    results = store.similarity_search("alpha", k=1)
+
+    assert store.get_collection_embedding_model("assigned") == "small-model"
+    assert results[0]["id"] == "a"
+    assert "small-model" in registry.resident_models()
+
+
+def test_vector_store_rejects_model_switch_on_populated_collection(registry, tmp_path):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection("assigned", embedding_model="small-model")
+    store.add_documents(documents=["alpha"], metadatas=[{"source": "a"}], ids=["a"])
+
+    with pytest.raises(ValueError):
+        store.set_collection_embedding_model("medium-model", "assigned")
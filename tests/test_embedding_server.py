@@ -0,0 +1,124 @@
+"""Tests for the shared embedding server and its client mode."""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.embedding_server import (
+    OP_ENCODE,
+    EmbeddingServer,
+    EmbeddingServerClient,
+    decode_request,
+    decode_response,
+    encode_request,
+    encode_response
+)
+from tests.factories import FakeSentenceTransformer
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+@pytest.fixture
+def server(tmp_path, fake_models):
+    """Embedding server on a temporary socket, backed by offline fake models."""
+    server = EmbeddingServer(str(tmp_path / "embeddings.sock"), batch_window_ms=50).start_in_thread()
+    try:
+        yield server
+    finally:
+        server.stop()
+        fake_models.server_socket = None
+
+
+def test_protocol_round_trip():
+    message = encode_request(OP_ENCODE, "small-model", ["héllo", ""])
+    assert decode_request(message[4:]) == (OP_ENCODE, "small-model", ["héllo", ""])
+
+    matrix = np.arange(6, dtype=np.float32).reshape(2, 3)
+    assert np.array_equal(decode_response(encode_response(matrix)[4:]), matrix)
+    with pytest.raises(RuntimeError, match="boom"):
+        decode_response(encode_response(error="boom")[4:])
+
+
+def test_client_encodes_like_local_model(server):
+    client = EmbeddingServerClient(server.socket_path)
+
+    remote = client.encode(["rust ownership", "python decorators"], model_name="small-model")
+    local = FakeSentenceTransformer("small-model").encode(["rust ownership", "python decorators"])
+
+    assert client.ping()
+    assert remote.shape == (2, FakeSentenceTransformer.dimension)
+    assert np.allclose(remote, local)
+    client.close()
+
+
+def test_concurrent_requests_are_batched(server):
+    results = {}
+
+    def encode(worker):
+        client = EmbeddingServerClient(server.socket_path)
+        results[worker] = client.encode([f"text from worker {worker}"], model_name="small-model")
+        client.close()
+
+    threads = [threading.Thread(target=encode, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(results) == 8
+    assert server.stats["requests"] == 8
+    assert server.stats["batches"] < 8
+    # Each client gets the rows for its own texts back
+    expected = FakeSentenceTransformer("small-model").encode(["text from worker 3"])
+    assert np.allclose(results[3], expected)
+
+
+def test_server_errors_are_reported_to_client(server):
+    from tools.knowledge_base.dependencies import rag_deps
+
+    client = EmbeddingServerClient(server.socket_path)
+    rag_deps.get_component.side_effect = RuntimeError("model unavailable")
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        client.encode(["text"], model_name="unknown-model")
+    client.close()
+
+
+def test_embedding_service_forwards_encodes_to_server(server):
+    from tools.knowledge_base.embeddings import EmbeddingService, get_embedding_registry
+
+    get_embedding_registry().server_socket = server.socket_path
+    service = EmbeddingService(model_name="medium-model")
+    assert FakeSentenceTransformer.loads == []
+
+    embeddings = service.encode_batch(["kubernetes pods", "postgres indexes"])
+    single = service.encode_text("kubernetes pods")
+
+    # Both encodes went to the server, which loaded the model once
+    assert server.stats["requests"] == 2
+    assert FakeSentenceTransformer.loads == ["medium-model"]
+    assert np.allclose(embeddings[0], single, atol=1e-6)
+
+
+def test_embedding_service_falls_back_to_local_model(tmp_path, fake_models):
+    from tools.knowledge_base.embeddings import EmbeddingService
+
+    fake_models.server_socket = str(tmp_path / "missing.sock")
+    service = EmbeddingService(model_name="small-model")
+
+    embedding = service.encode_text("fallback text")
+
+    assert len(embedding) == FakeSentenceTransformer.dimension
+    assert service.model is not None
+    fake_models.server_socket = None
@@ -0,0 +1,94 @@
+"""Tests for centroid-based routing of global searches across collections."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.collection_centroids import summarize_vectors, score_summary
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+TOPICS = {
+    "python": ["python decorators wrap functions", "python generators yield values lazily"],
+    "rust": ["rust ownership rules prevent data races", "rust borrow checker enforces lifetimes"],
+    "kubernetes": ["kubernetes pods run containers", "kubernetes services route traffic to pods"],
+    "postgres": ["postgres vacuum reclaims dead tuples", "postgres indexes speed up lookups"],
+}
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store with one namespace per topic and fresh centroids."""
+    for topic, chunks in TOPICS.items():
+        view = vector_store.namespace(topic)
+        view.add_documents(documents=chunks, metadatas=[{}] * len(chunks), ids=[f"{topic}{i}" for i in range(len(chunks))])
+        assert view.refresh_collection_centroid()
+    return vector_store
+
+
+def test_summary_vectors_are_unit_centroids():
+    vectors = np.array([[1, 0, 0], [0.9, 0.1, 0], [0, 0, 1], [0, 0.1, 0.9]], dtype=np.float32)
+
+    summary = summarize_vectors(vectors, summary_count=2)
+
+    assert summary.shape == (3, 3)
+    assert np.allclose(np.linalg.norm(summary, axis=1), 1.0)
+    # Either cluster matches its own members better than the overall centroid does
+    assert score_summary([1, 0, 0], summary) > float(summary[0] @ np.array([1, 0, 0]))
+
+
+def test_namespaces_are_ranked_by_centroid(store):
+    ranked = store.rank_namespaces("rust borrow checker ownership")
+
+    assert ranked[0][0] == "rust"
+    assert all(score is not None for _, score in ranked)
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+def test_pruned_search_only_queries_top_collections(store):
+    with patch.object(type(store), "similarity_search", autospec=True,
+                      side_effect=type(store).similarity_search) as search:
+        pruned = store.similarity_search_namespaces("kubernetes pods", k=2, max_collections=1)
+
+    assert search.call_count == 1
+    assert search.call_args.args[0].collection_name == store.namespace_name("kubernetes")
+    exhaustive = store.similarity_search_namespaces("kubernetes pods", k=2)
+    assert pruned[0]["id"] == exhaustive[0]["id"] == "kubernetes0"
+    assert all(r["id"].startswith("kubernetes") for r in pruned)
+
+
+def test_stale_and_new_collections_are_never_pruned(store):
+    store.namespace("rust").add_documents(documents=["rust macros generate code"], metadatas=[{}], ids=["rust9"])
+    store.namespace("docs").add_documents(documents=["postgres replication"], metadatas=[{}], ids=["docs0"])
+
+    ranked = dict(store.rank_namespaces("python decorators"))
+    assert ranked["rust"] is None and ranked["docs"] is None
+    assert store.namespace("rust").centroid_needs_refresh()
+
+    results = store.similarity_search_namespaces("postgres replication", k=1, max_collections=1)
+    assert results[0]["id"] == "docs0"
+
+    store.namespace("rust").refresh_collection_centroid()
+    assert not store.namespace("rust").centroid_needs_refresh()
+
+
+def test_centroids_follow_namespace_lifecycle(store):
+    store.rename_namespace("rust", "systems")
+    assert dict(store.rank_namespaces("rust ownership"))["systems"] is not None
+
+    store.copy_namespace("systems", "systems-copy")
+    assert dict(store.rank_namespaces("rust ownership"))["systems-copy"] is not None
+
+    store.delete_namespace("systems")
+    assert store._centroids.get_vectors([store.namespace_name("systems")]) == {}
@@ -0,0 +1,96 @@
+"""Tests for hybrid lexical and vector retrieval."""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.lexical_index import LexicalIndex, build_match_query
+from tests.factories import SEARCH_CHUNKS
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+def test_build_match_query_quotes_terms():
+    assert build_match_query('ERR_CONN_RESET "OR" (foo*)') == '"err_conn_reset" OR "or" OR "foo"'
+    assert build_match_query("?!") == ""
+
+
+def test_lexical_index_ranks_by_bm25(tmp_path):
+    index = LexicalIndex(str(tmp_path / "lexical.db"))
+    index.index_chunks("docs", ["a", "b"], ["socket socket timeout", "socket closed"])
+    index.index_chunks("other", ["c"], ["socket socket socket"])
+
+    assert [chunk_id for chunk_id, _ in index.search("docs", "socket timeout")] == ["a", "b"]
+    index.index_chunks("docs", ["a"], ["nothing relevant"])
+    assert [chunk_id for chunk_id, _ in index.search("docs", "socket")] == ["b"]
+    assert index.count("docs") == 2
+
+
+def test_exact_identifier_is_found(search_store):
+    results = search_store.hybrid_search("ERR_CONN_RESET", k=2)
+
+    assert results[0]["id"] == "c1"
+    assert results[0]["lexical_rank"] == 1
+    assert results[0]["content"] == SEARCH_CHUNKS[1]
+    assert results[0]["metadata"]["n"] == 1
+
+
+def test_score_threshold_drops_chunks_without_a_vector_hit(search_store):
+    collection = search_store._current_collection()
+    dense = search_store.similarity_search("python decorators", k=1)
+
+    unfiltered = search_store._fuse_hybrid(collection, dense, ["c1", "c0"], 4, None, 60)
+    filtered = search_store._fuse_hybrid(collection, dense, ["c1", "c0"], 4, None, 60, score_threshold=0.2)
+
+    assert [(r["id"], r["score"]) for r in unfiltered][-1] == ("c1", 0.0)
+    assert [r["id"] for r in filtered] == ["c0"]
+    assert filtered[0]["lexical_rank"] == 2
+
+
+def test_results_are_ordered_by_fusion_score(search_store):
+    results = search_store.hybrid_search("python decorators", k=4, rrf_k=60)
+
+    scores = [result["fusion_score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    top = results[0]
+    assert top["id"] == "c0"
+    expected = sum(1.0 / (60 + rank) for rank in (top["dense_rank"], top["lexical_rank"]) if rank)
+    assert top["fusion_score"] == pytest.approx(expected)
+
+
+def test_filter_applies_to_lexical_hits(search_store):
+    results = search_store.hybrid_search("ERR_CONN_RESET", k=4, filter={"n": {"$ne": 1}})
+
+    assert "c1" not in {result["id"] for result in results}
+
+
+def test_writes_keep_the_index_in_sync(search_store):
+    search_store.update_documents(["c2"], ["tokio tasks are lightweight"], [{"n": 2}])
+    search_store.delete_documents(["c1"])
+
+    assert search_store._lexical.search(search_store.collection_name, "ERR_CONN_RESET") == []
+    assert search_store._lexical.search(search_store.collection_name, "ownership") == []
+    assert [chunk_id for chunk_id, _ in search_store._lexical.search(search_store.collection_name, "tokio")] == ["c2"]
+
+
+def test_namespace_lifecycle_moves_the_index(search_store):
+    docs = search_store.namespace("docs")
+    docs.add_documents(documents=["retry on ERR_QUOTA_EXCEEDED"], metadatas=[{}], ids=["d0"])
+
+    search_store.copy_namespace("docs", "docs-copy")
+    search_store.rename_namespace("docs", "archive")
+
+    assert search_store.namespace("archive").hybrid_search("ERR_QUOTA_EXCEEDED", k=1)[0]["id"] == "d0"
+    assert search_store.namespace("docs-copy").hybrid_search("ERR_QUOTA_EXCEEDED", k=1)[0]["id"] == "d0"
+    results = search_store.similarity_search_namespaces("ERR_QUOTA_EXCEEDED", k=2, hybrid=True)
+    assert [result["id"] for result in results] == ["d0", "d0"]
+    search_store.delete_namespace("archive")
+    assert search_store._lexical.count(search_store.namespace_name("archive")) == 0
@@ -0,0 +1,153 @@
+"""Tests for tombstone accounting and background index compaction."""
+
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.index_compaction import CompactionJob, ForegroundActivity, TombstoneLog
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store whose 'docs' namespace holds ten chunks."""
+    vector_store.namespace("docs").add_documents(
+        documents=[f"chunk number {i} about topic {i % 3}" for i in range(10)],
+        metadatas=[{"n": i} for i in range(10)],
+        ids=[f"c{i}" for i in range(10)]
+    )
+    return vector_store
+
+
+def test_deletes_are_counted_as_tombstones(store):
+    docs = store.namespace("docs")
+    docs.delete_documents(["c0", "c1", "c2", "missing"])
+
+    assert docs.tombstone_count() == 3
+    assert docs.tombstone_ratio() == pytest.approx(0.3)
+    assert docs.get_collection_stats()["tombstones"] == 3
+
+
+def test_compaction_rebuilds_live_records_with_their_vectors(store):
+    docs = store.namespace("docs")
+    docs.delete_documents([f"c{i}" for i in range(6)])
+    before = docs.get_stored_vectors(["c7", "c9"])
+    physical_before = docs._current_collection().name
+
+    status = CompactionJob(docs, docs.collection_name, batch_size=3, throttle_seconds=0).run()
+
+    assert status["state"] == "completed"
+    assert status["tombstones"] == 6 and status["processed_documents"] == 4
+    assert docs._current_collection().name != physical_before
+    # The replaced collection is dropped once in-flight searches are done
+    deadline = time.time() + 30
+    while physical_before in [c.name for c in store.client.list_collections()] and time.time() < deadline:
+        time.sleep(0.05)
+    assert physical_before not in [c.name for c in store.client.list_collections()]
+    assert sorted(docs.list_document_ids()) == ["c6", "c7", "c8", "c9"]
+    assert docs.get_stored_vectors(["c7", "c9"]) == before
+    assert docs.tombstone_count() == 0
+    assert docs.similarity_search("topic", k=10)
+
+
+def test_quantized_collections_are_compacted(store):
+    quantized = store.namespace("quantized")
+    quantized.set_collection_vector_storage("int8")
+    quantized.add_documents(
+        documents=["alpha", "beta", "gamma"], metadatas=[{}, {}, {}], ids=["a", "b", "g"]
+    )
+    quantized.delete_documents(["a"])
+    expected = quantized.get_stored_vectors(["b", "g"])
+
+    status = CompactionJob(quantized, quantized.collection_name, throttle_seconds=0).run()
+
+    assert status["state"] == "completed"
+    assert quantized.get_stored_vectors(["b", "g"]) == expected
+    assert len(quantized._get_quantized_index(quantized._current_collection())) == 2
+
+
+def test_deletes_past_the_threshold_schedule_compaction(store, monkeypatch):
+    import tools.knowledge_base.vector_store as vector_store_module
+
+    monkeypatch.setattr(vector_store_module, "COMPACTION_MIN_TOMBSTONES", 2)
+    monkeypatch.setattr(vector_store_module, "COMPACTION_TOMBSTONE_RATIO", 0.25)
+    docs = store.namespace("docs")
+
+    docs.delete_documents(["c0", "c1"])
+    assert vector_store_module.get_compaction_manager().get(docs, docs.collection_name) is None
+
+    docs.delete_documents(["c2"])
+    job = vector_store_module.get_compaction_manager().get(docs, docs.collection_name)
+    assert job is not None and job.wait(timeout=30)
+    assert job.state == "completed"
+    assert docs.tombstone_count() == 0 and docs.count() == 7
+
+
+def test_compaction_waits_for_foreground_searches():
+    activity = ForegroundActivity()
+    entered, release = threading.Event(), threading.Event()
+
+    def search():
+        with activity.track():
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=search)
+    thread.start()
+    entered.wait(5)
+    assert activity.wait_idle(timeout=0.05) is False
+    release.set()
+    assert activity.wait_idle(timeout=5) is True
+    thread.join()
+
+
+def test_route_switches_wait_for_writes_in_flight():
+    from tools.knowledge_base.collection_routing import RouteSwitchLock
+
+    lock = RouteSwitchLock()
+    events = []
+    writing, release = threading.Event(), threading.Event()
+
+    def write():
+        with lock.writing():
+            writing.set()
+            release.wait(5)
+            events.append("write")
+
+    def switch():
+        with lock.switching():
+            events.append("switch")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    writing.wait(5)
+    switcher = threading.Thread(target=switch)
+    switcher.start()
+    switcher.join(0.1)
+    assert switcher.is_alive()
+    release.set()
+    writer.join(5)
+    switcher.join(5)
+    assert events == ["write", "switch"]
+
+
+def test_tombstone_log_persists(tmp_path):
+    log = TombstoneLog(str(tmp_path / "tombstones.db"))
+    log.record("docs", 3)
+    log.record("docs", 0)
+    log.record("docs", 2)
+
+    assert TombstoneLog(log.db_path).count("docs") == 5
+    log.clear("docs")
+    assert TombstoneLog(log.db_path).count("docs") == 0
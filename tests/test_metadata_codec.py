@@ -0,0 +1,110 @@
+"""Tests for the compact chunk metadata codec."""
+
+import copy
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.metadata_codec import (
+    CODEC_VERSION, LazyMetadata, encode_metadata, decode_metadata
+)
+
+CHUNK_METADATA = {
+    'source_file': 'guide.md',
+    'chunk_index': 3,
+    'contains_code': True,
+    'programming_language': None,
+    'header_hierarchy': ['# Guide', '## Setup'],
+    'overlap_sources': [],
+    'overlap_regions': [(0, 12)],
+    'extra': {'nested': 1},
+}
+
+
+def test_encode_keeps_scalars_and_packs_the_rest():
+    stored = encode_metadata(CHUNK_METADATA)
+
+    assert all(isinstance(value, (str, int, float, bool)) for value in stored.values())
+    assert stored['source_file'] == 'guide.md'
+    assert stored['contains_code'] is True
+    assert stored['_codec'] == CODEC_VERSION
+    assert 'programming_language' not in stored
+    assert 'header_hierarchy' not in stored
+    assert json.loads(stored['_packed']) == {
+        'header_hierarchy': ['# Guide', '## Setup'],
+        'overlap_regions': [[0, 12]],
+        'extra': {'nested': 1},
+    }
+
+
+def test_packed_fields_are_decoded_on_first_access():
+    metadata = decode_metadata(encode_metadata(CHUNK_METADATA))
+
+    assert isinstance(metadata, LazyMetadata)
+    assert metadata['chunk_index'] == 3
+    assert metadata.get('source_file') == 'guide.md'
+    assert not metadata.decoded
+    assert metadata['header_hierarchy'] == ['# Guide', '## Setup']
+    assert metadata.decoded
+    assert metadata['overlap_sources'] == []
+    assert metadata.get('section_siblings') == []
+    assert '_packed' not in metadata and '_codec' not in metadata
+
+
+def test_lazy_metadata_behaves_like_a_dict():
+    metadata = decode_metadata(encode_metadata(CHUNK_METADATA))
+    metadata['header_hierarchy'] = ['# Other']
+    expected = {key: value for key, value in metadata.items()}
+
+    assert expected['header_hierarchy'] == ['# Other']
+    assert expected['overlap_regions'] == [[0, 12]]
+    assert json.loads(json.dumps(metadata)) == expected
+    assert dict(metadata) == expected
+    assert metadata == expected
+    assert {**metadata} == expected
+    assert copy.deepcopy(metadata) == expected
+    assert type(metadata.copy()) is dict
+
+
+def test_legacy_records_are_decoded():
+    legacy = {
+        'source_file': 'old.md',
+        'overlap_sources': '["chunk_001"]',
+        'header_hierarchy': '# Title > ## Section',
+    }
+    metadata = decode_metadata(legacy)
+
+    assert not metadata.decoded
+    assert metadata['overlap_sources'] == ['chunk_001']
+    assert metadata['header_hierarchy'] == []
+    assert decode_metadata({}) == {}
+
+
+def test_rewritten_legacy_record_ignores_stale_list_strings():
+    stored = {'overlap_sources': '["stale"]'}
+    stored.update(encode_metadata({'overlap_sources': ['fresh']}))
+
+    assert decode_metadata(stored)['overlap_sources'] == ['fresh']
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_vector_store_round_trip(vector_store):
+    vector_store.add_documents(
+        documents=["python decorators wrap functions", "rust ownership rules"],
+        metadatas=[{'n': 0, 'section_siblings': ['c1']}, {'n': 1}],
+        ids=["c0", "c1"]
+    )
+    vector_store.update_metadatas(["c0"], [{'n': 0}])
+
+    results = vector_store.similarity_search("python decorators", k=2, filter={'n': 0})
+    raw = vector_store.query(query_texts=["python decorators"], n_results=1)
+
+    assert results[0]['metadata']['section_siblings'] == []
+    assert raw['metadatas'][0][0]['n'] == 0
+    assert '_packed' not in raw['metadatas'][0][0]
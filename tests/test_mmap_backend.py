@@ -0,0 +1,146 @@
+"""Tests for the memory-mapped vector backend."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.mmap_backend import MmapVectorClient
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+@pytest.fixture
+def client(tmp_path):
+    return MmapVectorClient(str(tmp_path))
+
+
+@pytest.fixture
+def collection(client):
+    collection = client.create_collection("docs", metadata={"embedding_model": "small-model"})
+    collection.add(
+        ids=["a", "b", "c"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        metadatas=[{"n": 1, "kind": "x"}, {"n": 2}, {"n": True, "kind": "y"}],
+        documents=["alpha", "beta", "gamma"]
+    )
+    return collection
+
+
+def test_query_returns_cosine_distances(collection):
+    results = collection.query(query_embeddings=[[1.0, 0.0]], n_results=2)
+
+    assert results["ids"] == [["a", "c"]]
+    assert results["documents"] == [["alpha", "gamma"]]
+    assert results["distances"][0] == pytest.approx([0.0, 1.0 - np.sqrt(0.5)])
+
+
+@pytest.mark.parametrize("where, expected", [
+    ({"n": 1}, ["a"]),
+    ({"n": True}, ["c"]),
+    ({"n": {"$ne": 1}}, ["b", "c"]),
+    ({"n": {"$gte": 2}}, ["b"]),
+    ({"kind": {"$in": ["x", "y"]}}, ["a", "c"]),
+    ({"kind": {"$nin": ["x"]}}, ["b", "c"]),
+    ({"$or": [{"n": 2}, {"kind": "y"}]}, ["b", "c"]),
+    ({"$and": [{"n": {"$lt": 5}}, {"kind": "x"}]}, ["a"]),
+])
+def test_where_filters_match_chromadb_semantics(collection, where, expected):
+    assert collection.get(where=where, include=[])["ids"] == expected
+    assert sorted(collection.query(query_embeddings=[[1.0, 0.0]], n_results=5, where=where)["ids"][0]) == expected
+
+
+def test_write_semantics(collection):
+    collection.add(ids=["a"], embeddings=[[0.0, 1.0]], documents=["ignored"])
+    collection.update(ids=["a", "missing"], metadatas=[{"extra": 1}, {"extra": 2}])
+    collection.upsert(ids=["b", "d"], embeddings=[[1.0, 0.0], [0.0, 1.0]], metadatas=[{"n": 5}, {}], documents=["beta2", "delta"])
+
+    records = collection.get(ids=["a", "b", "d", "missing"], include=["documents", "metadatas"])
+    assert records["ids"] == ["a", "b", "d"]
+    assert records["documents"] == ["alpha", "beta2", "delta"]
+    assert records["metadatas"][0] == {"n": 1, "kind": "x", "extra": 1}
+    assert records["metadatas"][1] == {"n": 5}
+    assert collection.count() == 4
+    assert collection.query(query_embeddings=[[1.0, 0.0]], n_results=2)["ids"][0] == ["a", "b"]
+
+
+def test_delete_and_compact(collection):
+    collection.delete(ids=["a"])
+    collection.delete(where={"kind": "y"})
+
+    assert collection.count() == 1
+    assert collection.query(query_embeddings=[[1.0, 0.0]], n_results=3)["ids"] == [["b"]]
+    assert collection.compact() == 2
+    assert collection.get(ids=["b"], include=["embeddings"])["embeddings"] == [[0.0, 1.0]]
+
+
+def test_collections_persist_across_clients(client, collection, tmp_path):
+    collection.modify(metadata={"embedding_model": "medium-model"})
+
+    reopened = MmapVectorClient(str(tmp_path)).get_collection("docs")
+
+    assert reopened.metadata == {"embedding_model": "medium-model"}
+    assert reopened.count() == 3
+    assert reopened.query(query_embeddings=[[0.0, 1.0]], n_results=1)["ids"] == [["b"]]
+    client.delete_collection("docs")
+    assert [c.name for c in MmapVectorClient(str(tmp_path)).list_collections()] == []
+    with pytest.raises(ValueError):
+        client.get_collection("docs")
+
+
+def test_ivf_index_finds_nearest_neighbors(client):
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(8, 16))
+    vectors = np.repeat(centers, 50, axis=0) + rng.normal(scale=0.05, size=(400, 16))
+    collection = client.create_collection("large")
+    collection.add(ids=[str(i) for i in range(400)], embeddings=vectors)
+
+    exact = collection.query(query_embeddings=[centers[3]], n_results=10)["ids"][0]
+    with patch("tools.knowledge_base.mmap_backend.IVF_MIN_ROWS", 100):
+        approximate = collection.query(query_embeddings=[centers[3]], n_results=10)["ids"][0]
+        assert collection._ivf is not None
+        collection.add(ids=["new"], embeddings=[centers[3]])
+        assert collection.query(query_embeddings=[centers[3]], n_results=1)["ids"] == [["new"]]
+
+    assert len(set(exact) & set(approximate)) >= 9
+
+
+def test_vector_store_runs_on_mmap_backend(tmp_path, fake_models):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"), backend="mmap")
+    store.get_or_create_collection(embedding_model="small-model")
+    store.add_documents(
+        documents=["python decorators wrap functions", "rust ownership rules", "kubernetes pods"],
+        metadatas=[{"n": 0, "previous_chunk_id": ""}, {"n": 1}, {"n": 2}],
+        ids=["c0", "c1", "c2"]
+    )
+    docs = store.namespace("docs")
+    docs.add_documents(documents=["retry on ERR_QUOTA_EXCEEDED"], metadatas=[{}], ids=["d0"])
+
+    assert type(store.client).__name__ == "MmapVectorClient"
+    assert store.similarity_search("rust ownership", k=1)[0]["id"] == "c1"
+    assert store.similarity_search("rust ownership", k=3, filter={"n": {"$ne": 1}})[0]["id"] != "c1"
+    assert "d0" not in {result["id"] for result in store.hybrid_search("ERR_QUOTA_EXCEEDED", k=3)}
+    assert docs.hybrid_search("ERR_QUOTA_EXCEEDED", k=1)[0]["id"] == "d0"
+    store.delete_documents(["c1"])
+    assert store.count() == 2
+    assert store.delete_namespace("docs") == 1
+    assert store.list_collections() == ["crawl4ai_documents"]
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    with pytest.raises(ValueError):
+        VectorStore(persist_directory=str(tmp_path / "db"), backend="faiss")
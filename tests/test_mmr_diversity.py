@@ -0,0 +1,110 @@
+"""Tests for maximal marginal relevance selection of RAG context chunks."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.diversity import mmr_select, pairwise_similarity
+from application_layer.rag_query import _apply_diversity_if_enabled
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+CHUNKS = [
+    "python decorators wrap functions",
+    "python decorators wrap functions",
+    "rust ownership rules prevent data races",
+]
+
+
+def test_mmr_skips_near_duplicates():
+    vectors = [[1, 0], [1, 0.01], [0, 1]]
+    similarity = pairwise_similarity(vectors, ["a", "a", "a"])
+
+    assert mmr_select([0.9, 0.89, 0.6], similarity, k=2) == [0, 2]
+    # Relevance only keeps the score order
+    assert mmr_select([0.9, 0.89, 0.6], similarity, k=2, lambda_mult=1.0, duplicate_threshold=None) == [0, 1]
+    # Exact duplicates are dropped even if that leaves fewer than k picks
+    assert mmr_select([0.9, 0.89], pairwise_similarity([[1, 0], [1, 0]], ["a", "a"]), k=2) == [0]
+
+
+def test_similarity_is_only_compared_within_a_group():
+    similarity = pairwise_similarity([[1, 0], [1, 0], None], ["a", "b", "a"])
+
+    assert np.allclose(similarity, [[1, 0, 0], [0, 1, 0], [0, 0, 0]])
+
+
+class StoredVectorService:
+    """Vector service stub serving the stored vectors of a real store."""
+
+    vector_available = True
+
+    def __init__(self, store):
+        from services.vector_sync_service import VectorSyncService
+
+        self.service = VectorSyncService(vector_store=store)
+        self.service.vector_available = True
+
+    async def get_result_vectors(self, results):
+        return await self.service.get_result_vectors(results)
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store whose 'docs' namespace holds two identical chunks and one distinct chunk."""
+    vector_store.namespace("docs").add_documents(
+        documents=CHUNKS,
+        metadatas=[{"chunk_id": f"c{i}"} for i in range(len(CHUNKS))],
+        ids=[f"c{i}" for i in range(len(CHUNKS))]
+    )
+    return vector_store
+
+
+def _results(ids):
+    return [
+        {"content": CHUNKS[int(i[1])], "metadata": {"chunk_id": i}, "collection_name": "docs",
+         "similarity_score": 0.9 - n * 0.01}
+        for n, i in enumerate(ids)
+    ]
+
+
+def test_stored_vectors_are_read_without_embedding(store):
+    view = store.namespace("docs")
+
+    with patch.object(type(view), "_embed_texts", side_effect=AssertionError("re-embedded")):
+        vectors = view.get_stored_vectors(["c2", "missing", "c0"])
+
+    assert set(vectors) == {"c0", "c2"}
+    assert len(vectors["c0"]) == 32
+
+
+def test_rag_context_drops_redundant_chunks(store):
+    service = StoredVectorService(store)
+    results = _results(["c0", "c1", "c2"]) + [{"content": "unknown", "metadata": {}, "collection_name": "other"}]
+
+    selected = asyncio.run(_apply_diversity_if_enabled(service, results, 3, True, 0.7))
+
+    assert [result["content"] for result in selected] == [CHUNKS[0], CHUNKS[2], "unknown"]
+    assert asyncio.run(_apply_diversity_if_enabled(service, results, 3, False, 0.7)) == results
+
+
+def test_rag_context_falls_back_without_stored_vectors():
+    class NoVectors:
+        async def get_result_vectors(self, results):
+            raise RuntimeError("vector store unavailable")
+
+    results = _results(["c0", "c1"])
+
+    assert asyncio.run(_apply_diversity_if_enabled(NoVectors(), results, 1, True, 0.7)) == results
+    assert asyncio.run(_apply_diversity_if_enabled(object(), results, 1, True, 0.7)) == results
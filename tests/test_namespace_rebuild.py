@@ -0,0 +1,180 @@
+"""Tests for rebuilding a collection's namespace in staging and swapping it in."""
+
+import asyncio
+import time
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store whose 'docs' namespace holds two chunks."""
+    vector_store.namespace("docs").add_documents(
+        documents=["python decorators", "rust ownership"],
+        metadatas=[{"source_file": "a.md"}, {"source_file": "b.md"}],
+        ids=["old-a", "old-b"]
+    )
+    return vector_store
+
+
+def _physical_names(store):
+    return {collection.name for collection in store.client.list_collections()}
+
+
+def test_searches_use_the_old_namespace_until_the_swap(store):
+    docs = store.namespace("docs")
+    old_physical = docs._current_collection().name
+
+    staging = store.begin_namespace_rebuild("docs")
+    staging.add_documents(["python generators"], metadatas=[{"source_file": "a.md"}], ids=["new-a"])
+
+    assert {r["id"] for r in docs.similarity_search("python", k=5)} == {"old-a", "old-b"}
+    assert store.list_namespaces() == ["docs"]
+    assert store.namespace("docs").get_file_chunk_counts() == {"a.md": 1, "b.md": 1}
+
+    assert store.commit_namespace_rebuild("docs") == 2
+
+    assert {r["id"] for r in docs.similarity_search("python", k=5)} == {"new-a"}
+    assert {r["id"] for r in docs.hybrid_search("generators", k=5)} == {"new-a"}
+    assert docs.get_file_chunk_counts() == {"a.md": 1}
+    assert not store._routes.has_route(store._rebuild_name("docs"))
+
+    # The replaced collection is dropped in the background
+    deadline = time.time() + 30
+    while old_physical in _physical_names(store) and time.time() < deadline:
+        time.sleep(0.05)
+    assert old_physical not in _physical_names(store)
+
+
+def test_aborted_rebuild_leaves_the_namespace_untouched(store):
+    staging = store.begin_namespace_rebuild("docs")
+    staging.add_documents(["python generators"], metadatas=[{}], ids=["new-a"])
+    staging_physical = staging._current_collection().name
+
+    assert store.abort_namespace_rebuild("docs") is True
+    assert store.abort_namespace_rebuild("docs") is False
+    assert staging_physical not in _physical_names(store)
+    assert sorted(store.namespace("docs").list_document_ids()) == ["old-a", "old-b"]
+    with pytest.raises(ValueError):
+        store.commit_namespace_rebuild("docs")
+
+
+def test_interrupted_rebuild_is_started_over(store):
+    store.begin_namespace_rebuild("docs").add_documents(["stale"], metadatas=[{}], ids=["stale"])
+
+    staging = store.begin_namespace_rebuild("docs")
+
+    assert staging.count() == 0
+
+
+def _start_slow_compaction(docs):
+    job = docs.compact_collection(batch_size=1, throttle_seconds=0.5, idle_wait_seconds=0)
+    deadline = time.time() + 30
+    while not docs._routes.get_shadow(docs.collection_name) and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_rebuild_cancels_a_running_compaction(store):
+    docs = store.namespace("docs")
+    job = _start_slow_compaction(docs)
+
+    staging = store.begin_namespace_rebuild("docs")
+    staging.add_documents(["python generators"], metadatas=[{}], ids=["new-a"])
+
+    assert job.state == "cancelled"
+    assert store.commit_namespace_rebuild("docs") == 2
+    assert docs.list_document_ids() == ["new-a"]
+
+
+def test_rebuild_names_the_job_building_a_shadow(store):
+    docs = store.namespace("docs")
+    job = _start_slow_compaction(docs)
+    try:
+        with patch.object(store, '_stop_compaction'):
+            with pytest.raises(ValueError, match="being compacted"):
+                store.begin_namespace_rebuild("docs")
+    finally:
+        job.cancel()
+        job.wait(timeout=30)
+
+    store.begin_shadow_collection(docs.collection_name, embedding_model="small-model")
+    with pytest.raises(ValueError, match="being re-embedded"):
+        store.begin_namespace_rebuild("docs")
+    with pytest.raises(ValueError, match="being re-embedded"):
+        store.rename_namespace("docs", "moved")
+
+
+@pytest.fixture
+def synced(vector_store, tmp_path):
+    """Sync manager over a filesystem collection 'docs' with two synced files."""
+    from tools.filesystem_collection_manager import FilesystemCollectionManager
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+
+    files = FilesystemCollectionManager(tmp_path / "files", tmp_path / "metadata.db", auto_reconcile=False)
+    with patch('tools.knowledge_base.rag_tools.get_rag_service', return_value=None):
+        manager = IntelligentSyncManager(
+            vector_store=vector_store, collection_manager=files, persistent_db_path=str(tmp_path / "sync.db")
+        )
+
+    async def setup():
+        await files.create_collection("docs")
+        await files.save_file("docs", "a.md", "# Decorators\n\nPython decorators wrap functions.")
+        await files.save_file("docs", "b.md", "# Ownership\n\nRust ownership rules prevent data races.")
+        return await manager.sync_collection("docs")
+
+    assert asyncio.run(setup()).success
+    yield manager, files, vector_store
+    manager.shutdown()
+
+
+def test_rebuild_sync_swaps_in_a_complete_namespace(synced):
+    manager, files, store = synced
+    docs = store.namespace("docs")
+    before = docs.count()
+    asyncio.run(files.save_file("docs", "c.md", "# Generators\n\nPython generators yield values lazily."))
+
+    result = asyncio.run(manager.sync_collection("docs", rebuild=True))
+
+    assert result.success and result.chunks_deleted == before
+    assert set(docs.get_file_chunk_counts()) == {"a.md", "b.md", "c.md"}
+    assert set(manager.file_mappings["docs"]) == {"a.md", "b.md", "c.md"}
+    assert not manager._rebuilds
+    feed = manager.change_feed.changes_since("docs", 0, limit=100)["changes"]
+    assert [c["change_type"] for c in feed][-4:] == [
+        "vectors_deleted", "chunks_upserted", "chunks_upserted", "chunks_upserted"
+    ]
+
+    # An incremental sync afterwards finds nothing to do
+    assert asyncio.run(manager.sync_collection("docs")).files_processed == 0
+
+
+def test_failed_rebuild_keeps_serving_the_old_vectors(synced):
+    manager, files, store = synced
+    docs = store.namespace("docs")
+    ids = sorted(docs.list_document_ids())
+    mappings = dict(manager.file_mappings["docs"])
+    process = manager._process_single_file
+
+    def fail_on_b(collection_name, file_info):
+        if file_info['path'] == "b.md":
+            return {'errors': ["b.md failed"]}
+        return process(collection_name, file_info)
+
+    with patch.object(manager, '_process_single_file', side_effect=fail_on_b):
+        result = asyncio.run(manager.sync_collection("docs", rebuild=True))
+
+    assert "b.md failed" in result.errors
+    assert sorted(docs.list_document_ids()) == ids
+    assert manager.file_mappings["docs"] == mappings
+    assert not store._routes.has_route(store._rebuild_name("docs"))
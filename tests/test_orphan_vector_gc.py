@@ -0,0 +1,90 @@
+"""Tests for deleting the vectors of files removed from a collection."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+
+pytestmark = pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+
+FILES = {
+    "a.md": "# Decorators\n\nPython decorators wrap functions and return new callables.",
+    "b.md": "# Ownership\n\nRust ownership rules prevent data races at compile time.",
+}
+
+
+@pytest.fixture
+def synced(vector_store, tmp_path):
+    """Sync manager over a filesystem collection 'docs' whose two files are synced."""
+    from tools.filesystem_collection_manager import FilesystemCollectionManager
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+
+    files = FilesystemCollectionManager(tmp_path / "files", tmp_path / "metadata.db", auto_reconcile=False)
+    with patch('tools.knowledge_base.rag_tools.get_rag_service', return_value=None):
+        manager = IntelligentSyncManager(
+            vector_store=vector_store, collection_manager=files, persistent_db_path=str(tmp_path / "sync.db")
+        )
+
+    async def setup():
+        await files.create_collection("docs")
+        for name, content in FILES.items():
+            await files.save_file("docs", name, content)
+        return await manager.sync_collection("docs")
+
+    assert asyncio.run(setup()).success
+    yield manager, files, vector_store.namespace("docs")
+    manager.shutdown()
+
+
+def test_sync_deletes_chunks_of_deleted_files(synced):
+    manager, files, docs = synced
+    b_chunks = docs.get_file_chunk_counts()["b.md"]
+    total = docs.count()
+
+    asyncio.run(files.delete_file("docs", "b.md"))
+    result = asyncio.run(manager.sync_collection("docs"))
+
+    assert result.success and result.chunks_deleted == b_chunks
+    assert docs.count() == total - b_chunks
+    assert docs.get_file_chunk_counts() == {"a.md": total - b_chunks}
+    assert "b.md" not in manager.file_mappings["docs"]
+    assert docs.tombstone_count() == b_chunks
+
+    # Removing the last file empties the collection's vectors too
+    asyncio.run(files.delete_file("docs", "a.md"))
+    assert asyncio.run(manager.sync_collection("docs")).success
+    assert docs.count() == 0
+
+
+def test_gc_finds_orphans_without_file_mappings(synced):
+    manager, files, docs = synced
+    asyncio.run(files.delete_file("docs", "a.md"))
+    # A restarted process of an earlier version kept no mappings or statistics for these files
+    manager.file_mappings.clear()
+    docs._stats.drop_collection(docs.collection_name)
+
+    result = asyncio.run(manager.collect_orphaned_vectors())
+
+    assert result["collections"]["docs"]["files"] == ["a.md"]
+    assert result["chunks_deleted"] > 0
+    assert set(docs.get_file_chunk_counts()) == {"b.md"}
+    assert asyncio.run(manager.collect_orphaned_vectors("docs"))["chunks_deleted"] == 0
+
+
+def test_gc_skips_collections_whose_files_cannot_be_listed(synced):
+    manager, files, docs = synced
+    total = docs.count()
+
+    with patch.object(manager, '_list_collection_files', return_value=None):
+        result = asyncio.run(manager.collect_orphaned_vectors("docs"))
+        assert asyncio.run(manager.sync_collection("docs")).chunks_deleted == 0
+
+    assert result == {"collections": {}, "chunks_deleted": 0}
+    assert docs.count() == total
@@ -0,0 +1,169 @@
+"""Tests for quantized vector storage with exact float32 rescoring."""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.quantized_index import QuantizedVectorIndex
+from tools.knowledge_base.vector_benchmarks import (
+    benchmark_quantized_recall,
+    generate_clustered_vectors
+)
+
+
+@pytest.fixture
+def corpus():
+    vectors = generate_clustered_vectors(600, 64, clusters=12, seed=7)
+    return vectors[:500], vectors[500:]
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_rescored_search_matches_exact_search(tmp_path, corpus, dtype):
+    vectors, queries = corpus
+    index = QuantizedVectorIndex(str(tmp_path / dtype), dtype=dtype, rescore_multiplier=4)
+    index.add([str(i) for i in range(len(vectors))], vectors)
+
+    for query in queries[:20]:
+        exact = np.argsort(-(vectors @ query))[:5]
+        found = index.search(query, 5)
+        assert [int(vector_id) for vector_id, _ in found] == list(exact)
+        # Returned scores are exact float32 cosine similarities
+        assert found[0][1] == pytest.approx(float(vectors[exact[0]] @ query), abs=1e-5)
+
+
+def test_index_persists_and_reloads(tmp_path, corpus):
+    vectors, queries = corpus
+    index = QuantizedVectorIndex(str(tmp_path / "idx"), dtype="int8")
+    index.add([f"doc-{i}" for i in range(50)], vectors[:50])
+    expected = index.search(queries[0], 3)
+    index.close()
+
+    reloaded = QuantizedVectorIndex(str(tmp_path / "idx"), dtype="float16")
+
+    assert reloaded.dtype == "int8"
+    assert len(reloaded) == 50
+    assert reloaded.search(queries[0], 3) == expected
+
+
+def test_delete_and_overwrite_survive_reload(tmp_path, corpus):
+    vectors, _ = corpus
+    index = QuantizedVectorIndex(str(tmp_path / "idx"), dtype="int8")
+    index.add(["a", "b", "c"], vectors[:3])
+
+    # Plain add keeps existing vectors, overwrite replaces them
+    index.add(["a"], vectors[[10]])
+    assert index.search(vectors[0], 1)[0][0] == "a"
+    index.add(["a"], vectors[[10]], overwrite=True)
+    assert index.search(vectors[10], 1)[0][0] == "a"
+
+    assert index.delete(["b"]) == 1
+    assert "b" not in index
+    index.close()
+
+    reloaded = QuantizedVectorIndex(str(tmp_path / "idx"))
+    assert reloaded.memory_usage()["vectors"] == 2
+    assert reloaded.search(vectors[10], 1)[0][0] == "a"
+    assert {vector_id for vector_id, _ in reloaded.search(vectors[1], 5)} == {"a", "c"}
+
+
+def test_many_small_batches_append_without_rewriting(tmp_path, corpus):
+    vectors, queries = corpus
+    index = QuantizedVectorIndex(str(tmp_path / "idx"), dtype="int8")
+    for start in range(0, 300, 3):
+        index.add([str(i) for i in range(start, start + 3)], vectors[start:start + 3])
+    index.delete(["0", "1"])
+
+    # The header stays fixed-size; ids and deletes are appended to the row log
+    assert "row_ids" not in (tmp_path / "idx" / "index.json").read_text()
+    assert len((tmp_path / "idx" / "rows.log").read_text().splitlines()) == 101
+
+    expected = index.search(queries[0], 5)
+    index.close()
+    reloaded = QuantizedVectorIndex(str(tmp_path / "idx"))
+    assert len(reloaded) == 298
+    assert reloaded.search(queries[0], 5) == expected
+
+
+def test_version_one_index_is_migrated(tmp_path, corpus):
+    vectors, _ = corpus
+    index = QuantizedVectorIndex(str(tmp_path / "idx"), dtype="float16")
+    index.add(["a", "b", "c"], vectors[:3])
+    index.close()
+    (tmp_path / "idx" / "rows.log").unlink()
+    (tmp_path / "idx" / "index.json").write_text(json.dumps(
+        {"version": 1, "dtype": "float16", "dimension": 64, "row_ids": ["a", None, "c"]}
+    ))
+
+    reloaded = QuantizedVectorIndex(str(tmp_path / "idx"))
+
+    assert len(reloaded) == 2 and "b" not in reloaded
+    assert reloaded.search(vectors[2], 1)[0][0] == "c"
+    assert len(QuantizedVectorIndex(str(tmp_path / "idx"))) == 2
+
+
+def test_search_respects_allowed_ids(tmp_path, corpus):
+    vectors, _ = corpus
+    index = QuantizedVectorIndex(str(tmp_path / "idx"), dtype="float16")
+    index.add([str(i) for i in range(20)], vectors[:20])
+
+    found = index.search(vectors[0], 5, allowed_ids=["3", "4", "missing"])
+
+    assert {vector_id for vector_id, _ in found} == {"3", "4"}
+
+
+def test_benchmark_reports_recall_and_memory(corpus):
+    vectors, queries = corpus
+    results = benchmark_quantized_recall(vectors, queries[:20], k=5, rescore_multipliers=(4,))
+    by_storage = {result.storage: result for result in results}
+
+    assert set(by_storage) == {"float32", "float16", "int8"}
+    assert by_storage["int8"].recall_at_k >= 0.95
+    assert by_storage["int8"].bytes_per_vector < by_storage["float16"].bytes_per_vector
+    assert by_storage["float16"].compression_ratio == pytest.approx(2.0)
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_vector_store_quantized_collection(tmp_path, fake_models):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection("compact", embedding_model="small-model")
+    store.set_collection_vector_storage("int8", "compact")
+    store.add_documents(
+        documents=["python decorators explained", "rust ownership rules", "python generators"],
+        metadatas=[{"lang": "python"}, {"lang": "rust"}, {"lang": "python"}],
+        ids=["d1", "d2", "d3"]
+    )
+
+    results = store.similarity_search("rust ownership", k=2)
+    filtered = store.similarity_search("rust ownership", k=2, filter={"lang": "python"})
+    store.delete_documents(["d2"])
+    after_delete = store.similarity_search("rust ownership", k=3)
+    stats = store.get_collection_stats("compact")
+
+    assert results[0]["id"] == "d2"
+    assert results[0]["content"] == "rust ownership rules"
+    assert {result["id"] for result in filtered} == {"d1", "d3"}
+    assert "d2" not in {result["id"] for result in after_delete}
+    assert stats["vector_storage"] == "int8"
+    assert stats["quantized_index"]["vectors"] == 2
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_vector_storage_cannot_change_on_populated_collection(tmp_path, fake_models):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection("plain", embedding_model="small-model")
+    store.add_documents(documents=["text"], metadatas=[{"a": 1}], ids=["x"])
+
+    with pytest.raises(ValueError):
+        store.set_collection_vector_storage("int8", "plain")
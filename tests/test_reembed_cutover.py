@@ -0,0 +1,151 @@
+"""Tests for background re-embedding with shadow collection cutover."""
+
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.collection_routing import CollectionRoutingTable
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+DOCUMENTS = [
+    "python decorators wrap functions",
+    "rust ownership and borrowing rules",
+    "python generators yield values lazily",
+    "kubernetes pods and deployments",
+    "postgres indexes speed up queries",
+]
+
+
+@pytest.fixture
+def store(tmp_path, fake_models):
+    """Vector store with a populated 'docs' collection embedded with small-model."""
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"), collection_name="docs")
+    store.get_or_create_collection("docs", embedding_model="small-model")
+    store.add_documents(
+        documents=DOCUMENTS,
+        metadatas=[{"n": i} for i in range(len(DOCUMENTS))],
+        ids=[f"d{i}" for i in range(len(DOCUMENTS))]
+    )
+    return store
+
+
+def _physical_names(store):
+    return sorted(collection.name for collection in store.client.list_collections())
+
+
+def test_job_switches_collection_to_new_model(store):
+    from tools.knowledge_base.reembed_job import ReembedJob
+
+    status = ReembedJob(store, "docs", "medium-model", batch_size=2, throttle_seconds=0).run()
+
+    assert status["state"] == "completed"
+    assert status["processed_documents"] == len(DOCUMENTS)
+    assert status["previous_model"] == "small-model"
+    assert store.get_collection_embedding_model() == "medium-model"
+    assert store.count() == len(DOCUMENTS)
+    assert store.similarity_search("rust ownership", k=1)[0]["id"] == "d1"
+    assert store.list_collections() == ["docs"]
+    # The replaced collection is garbage-collected once in-flight searches are done
+    deadline = time.time() + 30
+    while _physical_names(store) != [status["shadow_collection"]] and time.time() < deadline:
+        time.sleep(0.05)
+    assert _physical_names(store) == [status["shadow_collection"]]
+
+
+def test_searches_use_active_collection_until_commit(store):
+    store.begin_shadow_collection("docs", embedding_model="medium-model")
+    store.copy_to_shadow_collection(["d0", "d1"], "docs")
+
+    assert store.count() == len(DOCUMENTS)
+    assert store.get_collection_embedding_model() == "small-model"
+    assert store.similarity_search("kubernetes pods", k=1)[0]["id"] == "d3"
+    assert store.list_collections() == ["docs"]
+
+
+def test_writes_during_rebuild_are_mirrored(store):
+    store.begin_shadow_collection("docs", embedding_model="medium-model")
+    snapshot = store.list_document_ids("docs")
+
+    store.add_documents(documents=["terraform modules"], metadatas=[{"n": 9}], ids=["new"])
+    store.delete_documents(["d2"])
+    copied = store.copy_to_shadow_collection(snapshot, "docs")
+    store.commit_shadow_collection("docs")
+
+    ids = set(store.list_document_ids())
+    assert copied == len(DOCUMENTS) - 1
+    assert "new" in ids
+    assert "d2" not in ids
+    assert store.similarity_search("terraform modules", k=1)[0]["id"] == "new"
+
+
+def test_abort_discards_shadow(store):
+    shadow = store.begin_shadow_collection("docs", embedding_model="medium-model")
+
+    assert store.abort_shadow_collection("docs")
+    assert shadow.name not in _physical_names(store)
+    assert store.count() == len(DOCUMENTS)
+    assert not store.abort_shadow_collection("docs")
+    # Writes are no longer mirrored
+    store.add_documents(documents=["after abort"], metadatas=[{"n": 7}], ids=["late"])
+
+
+def test_other_store_instances_follow_the_switch(store):
+    from tools.knowledge_base.reembed_job import ReembedJob
+    from tools.knowledge_base.vector_store import VectorStore
+
+    other = VectorStore(persist_directory=store.persist_directory, collection_name="docs")
+    other.get_collection("docs")
+
+    ReembedJob(store, "docs", "medium-model", throttle_seconds=0).run()
+
+    assert other.get_collection_embedding_model() == "medium-model"
+    assert other.similarity_search("postgres indexes", k=1)[0]["id"] == "d4"
+
+
+def test_routes_persist_across_processes(store):
+    from tools.knowledge_base.reembed_job import ReembedJob
+
+    status = ReembedJob(store, "docs", "medium-model", throttle_seconds=0).run()
+    reloaded = CollectionRoutingTable(store._routes.db_path)
+
+    assert reloaded.resolve("docs") == status["shadow_collection"]
+    assert reloaded.logical_name_for("docs") is None
+
+
+def test_manager_runs_one_job_per_collection_and_cancels(store):
+    from tools.knowledge_base.reembed_job import ReembedJobManager
+
+    manager = ReembedJobManager()
+    job = manager.start(store, "docs", "medium-model", batch_size=1, throttle_seconds=0.5)
+
+    with pytest.raises(ValueError):
+        manager.start(store, "docs", "medium-model")
+    assert manager.cancel("docs")
+    assert job.wait(timeout=10)
+
+    assert manager.get("docs").to_dict()["state"] == "cancelled"
+    assert store.get_collection_embedding_model() == "small-model"
+    assert _physical_names(store) == ["docs"]
+
+
+def test_service_does_not_create_namespaces_for_unknown_collections(store):
+    import asyncio
+    from services.vector_sync_service import VectorSyncService
+
+    service = VectorSyncService(vector_store=store)
+
+    assert "not found" in asyncio.run(service.get_reembed_status("missing"))["error"]
+    assert "not found" in asyncio.run(service.reembed_collection("missing"))["error"]
+    assert not store.has_namespace("missing")
@@ -0,0 +1,114 @@
+"""Tests for the SQLite chunk relationship index."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.relationship_index import ChunkRelationshipIndex, relationships_from_metadata
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ChunkRelationshipIndex(str(tmp_path / "relationships.db"))
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store holding three linked chunks and one sibling."""
+    vector_store.add_documents(
+        documents=["first chunk", "second chunk", "third chunk", "sibling chunk"],
+        metadatas=[
+            {"next_chunk_id": "c1"},
+            {"previous_chunk_id": "c0", "next_chunk_id": "c2", "section_siblings": ["s0"]},
+            {"previous_chunk_id": "c1", "overlap_sources": ["c1"]},
+            {"section_siblings": ["c1"]},
+        ],
+        ids=["c0", "c1", "c2", "s0"]
+    )
+    return vector_store
+
+
+def test_relationships_from_metadata():
+    edges = relationships_from_metadata({
+        "previous_chunk_id": "a",
+        "next_chunk_id": "",
+        "overlap_sources": ["b", "c"],
+        "section_siblings": [],
+    })
+
+    assert edges == [("previous", "a", 0), ("overlap", "b", 0), ("overlap", "c", 1)]
+
+
+def test_index_replaces_outgoing_edges(index):
+    index.index_chunks("docs", ["c1"], [{"previous_chunk_id": "c0", "next_chunk_id": "c2"}])
+    index.index_chunks("docs", ["c1"], [{"next_chunk_id": "c3"}])
+
+    assert index.outgoing("docs", ["c1", "c9"]) == {"c1": {"next": ["c3"]}}
+    assert index.related_ids("docs", "c3", ["previous", "next"]) == ["c1"]
+    assert index.related_ids("other", "c3", ["previous", "next"]) == []
+
+
+def test_collection_lifecycle(index):
+    index.index_chunks("docs", ["c1"], [{"next_chunk_id": "c2"}])
+
+    index.copy_collection("docs", "copy")
+    index.rename_collection("docs", "renamed")
+    index.remove_chunks("copy", ["c1"])
+
+    assert index.outgoing("renamed", ["c1"]) == {"c1": {"next": ["c2"]}}
+    assert index.outgoing("docs", ["c1"]) == {}
+    assert not index.has_chunk("copy", "c1")
+    index.drop_collection("renamed")
+    assert not index.has_chunk("renamed", "c1")
+
+
+def test_relationship_lookup_is_an_indexed_read(store):
+    with patch.object(store, "_query_collection") as query:
+        sequential = store.get_chunks_by_relationship("c1", "sequential")
+        siblings = store.get_chunks_by_relationship("c1", "siblings")
+        overlap = store.get_chunks_by_relationship("c1", "overlap")
+
+    query.assert_not_called()
+    assert [chunk["id"] for chunk in sequential] == ["c0", "c2"]
+    assert [chunk["content"] for chunk in sequential] == ["first chunk", "third chunk"]
+    assert [chunk["id"] for chunk in siblings] == ["s0"]
+    # Chunks overlapping with c1 are found through incoming edges
+    assert [chunk["id"] for chunk in overlap] == ["c2"]
+
+
+def test_index_follows_metadata_updates_and_deletes(store):
+    store.update_metadatas(["c2"], [{"previous_chunk_id": "s0"}])
+    store.delete_documents(["c0"])
+
+    # The deleted neighbor is skipped
+    assert [chunk["id"] for chunk in store.get_chunks_by_relationship("c1", "sequential")] == ["c2"]
+    assert [chunk["id"] for chunk in store.get_chunks_by_relationship("c2", "sequential")] == ["s0", "c1"]
+    assert store._relationships.outgoing(store.collection_name, ["c0"]) == {}
+
+
+def test_context_expansion_uses_indexed_edges(store):
+    base = [{"id": "c1", "metadata": {}}]
+
+    expanded = store._expand_search_context(base, 1)
+
+    assert [result["id"] for result in expanded[1:]] == ["c0", "c2", "s0"]
+
+
+def test_deleting_a_namespace_drops_its_edges(store):
+    docs = store.namespace("docs")
+    docs.add_documents(documents=["a", "b"], metadatas=[{"next_chunk_id": "n1"}, {}], ids=["n0", "n1"])
+
+    assert store._relationships.has_chunk(docs.collection_name, "n0")
+    store.delete_namespace("docs")
+    assert not store._relationships.has_chunk(docs.collection_name, "n0")
@@ -0,0 +1,126 @@
+"""Tests for collections split across hash-routed shards."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.sharded_collection import ShardedCollection, shard_for_id
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+CHUNKS = [
+    "python decorators wrap functions",
+    "connections fail with ERR_CONN_RESET when the peer closes the socket",
+    "rust ownership rules prevent data races",
+    "kubernetes pods run containers",
+    "postgres vacuum reclaims dead tuples",
+    "javascript promises resolve asynchronously",
+]
+IDS = [f"c{i}" for i in range(len(CHUNKS))]
+
+
+def _make_store(path, backend, shard_count):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(path), backend=backend)
+    store.get_or_create_collection(embedding_model="small-model")
+    store.set_collection_shards(shard_count)
+    store.add_documents(documents=CHUNKS, metadatas=[{"n": i} for i in range(len(CHUNKS))], ids=IDS)
+    return store
+
+
+@pytest.fixture(params=["chroma", "mmap"])
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def stores(tmp_path, backend, fake_models):
+    """A store with three shards and an unsharded store holding the same chunks."""
+    return _make_store(tmp_path / "sharded", backend, 3), _make_store(tmp_path / "plain", backend, 1)
+
+
+def test_ids_are_routed_stably():
+    assert shard_for_id("c1", 4) == shard_for_id("c1", 4)
+    assert {shard_for_id(f"id{i}", 4) for i in range(64)} == {0, 1, 2, 3}
+
+
+def test_records_are_spread_across_shards(stores):
+    sharded, _ = stores
+    collection = sharded._current_collection()
+
+    assert isinstance(collection, ShardedCollection)
+    assert len(collection.shards) == 3
+    assert sum(shard.count() for shard in collection.shards) == sharded.count() == len(CHUNKS)
+    for shard_index, shard in enumerate(collection.shards):
+        assert all(shard_for_id(doc_id, 3) == shard_index for doc_id in shard.get(include=[])["ids"])
+    assert sharded.list_collections() == [sharded.collection_name]
+
+
+def test_search_matches_unsharded_store(stores):
+    sharded, plain = stores
+
+    for query in ["python decorators", "rust ownership", "database maintenance"]:
+        expected = plain.similarity_search(query, k=len(CHUNKS))
+        results = sharded.similarity_search(query, k=len(CHUNKS))
+        # Chunks with tied scores may come back in either order
+        assert [r["score"] for r in results] == pytest.approx([r["score"] for r in expected])
+        assert {r["id"]: r["score"] for r in results} == pytest.approx({r["id"]: r["score"] for r in expected})
+        assert sharded.similarity_search(query, k=1)[0]["score"] == pytest.approx(expected[0]["score"])
+    assert sharded.hybrid_search("ERR_CONN_RESET", k=1)[0]["id"] == "c1"
+    assert sharded.similarity_search("python", k=2, filter={"n": 2})[0]["id"] == "c2"
+
+
+def test_query_fans_out_to_every_shard(stores):
+    sharded, _ = stores
+    collection = sharded._current_collection()
+
+    with patch.object(type(collection.primary), "query", autospec=True,
+                      side_effect=type(collection.primary).query) as query:
+        sharded.similarity_search("python", k=2)
+
+    assert query.call_count == 3
+
+
+def test_id_operations_reach_the_owning_shard(stores):
+    sharded, _ = stores
+
+    assert sharded.get_document("c3")["content"] == CHUNKS[3]
+    assert {doc["id"] for doc in sharded.get_documents(["c4", "c0"])} == {"c4", "c0"}
+    sharded.update_metadatas(["c3"], [{"n": 30}])
+    assert sharded.get_document("c3")["metadata"]["n"] == 30
+    sharded.delete_documents(["c3", "c5"])
+    assert sharded.count() == len(CHUNKS) - 2
+    assert sharded.get_document("c3") is None
+
+
+def test_shard_count_only_changes_while_empty(stores):
+    sharded, _ = stores
+
+    with pytest.raises(ValueError):
+        sharded.set_collection_shards(2)
+    with pytest.raises(ValueError):
+        sharded.set_collection_shards(0)
+
+
+def test_namespaces_inherit_shards_and_drop_them(stores):
+    sharded, _ = stores
+
+    view = sharded.namespace("docs")
+    view.add_documents(documents=CHUNKS, metadatas=[{}] * len(CHUNKS), ids=IDS)
+    collection = view._current_collection()
+    assert isinstance(collection, ShardedCollection) and len(collection.shards) == 3
+    assert view.similarity_search("kubernetes pods", k=1)[0]["id"] == "c3"
+
+    sharded.delete_namespace("docs")
+    remaining = {c.name for c in sharded.client.list_collections()}
+    assert not any(name.startswith(collection.name) for name in remaining)
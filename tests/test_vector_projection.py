@@ -0,0 +1,143 @@
+"""Tests for dimensionality-reducing collection projections."""
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.projection import VectorProjection
+from tools.knowledge_base.vector_benchmarks import generate_clustered_vectors
+from tests.factories import FakeSentenceTransformer
+
+
+def _low_rank_vectors(count, dimension, rank, seed=3):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, rank)) @ rng.normal(size=(rank, dimension))
+
+
+def test_pca_preserves_neighbors_of_low_rank_data():
+    vectors = _low_rank_vectors(400, 96, rank=16)
+    projection = VectorProjection.fit(vectors, 24, method="pca")
+
+    projected = projection.transform(vectors)
+    original = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = 7
+
+    assert projected.shape == (400, 24)
+    assert np.allclose(np.linalg.norm(projected, axis=1), 1.0, atol=1e-5)
+    exact = set(np.argsort(-(original @ original[query]))[:10])
+    reduced = set(np.argsort(-(projected @ projected[query]))[:10])
+    assert len(exact & reduced) >= 8
+
+
+def test_random_orthogonal_components_are_orthonormal():
+    vectors = generate_clustered_vectors(50, 64)
+    projection = VectorProjection.fit(vectors, 16, method="random_orthogonal")
+
+    gram = projection.components @ projection.components.T
+
+    assert np.allclose(gram, np.eye(16), atol=1e-5)
+    assert projection.mean.tolist() == [0.0] * 64
+
+
+def test_pca_with_small_sample_is_completed_to_target_dimension():
+    vectors = generate_clustered_vectors(5, 64)
+    projection = VectorProjection.fit(vectors, 16, method="pca")
+
+    gram = projection.components @ projection.components.T
+
+    assert projection.target_dimension == 16
+    assert np.allclose(gram, np.eye(16), atol=1e-4)
+
+
+def test_projection_round_trips_through_file(tmp_path):
+    vectors = generate_clustered_vectors(100, 32)
+    projection = VectorProjection.fit(vectors, 8)
+    path = str(tmp_path / "projection.npz")
+
+    projection.save(path)
+    loaded = VectorProjection.load(path)
+
+    assert loaded.describe() == projection.describe()
+    assert np.allclose(loaded.transform(vectors[:3]), projection.transform(vectors[:3]))
+
+
+def test_invalid_target_dimension_is_rejected():
+    with pytest.raises(ValueError):
+        VectorProjection.fit(generate_clustered_vectors(10, 8), 8)
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_vector_store_stores_and_queries_projected_vectors(tmp_path, fake_models):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    documents = [
+        "python decorators wrap functions",
+        "rust ownership and borrowing rules",
+        "python generators yield values lazily",
+        "kubernetes pods and deployments",
+    ]
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection("reduced", embedding_model="small-model")
+    store.set_collection_projection(8, method="random_orthogonal", collection_name="reduced")
+    assert store.projection_needs_fit("reduced")
+
+    store.fit_collection_projection(texts=documents, collection_name="reduced")
+    store.add_documents(
+        documents=documents,
+        metadatas=[{"n": i} for i in range(len(documents))],
+        ids=[f"d{i}" for i in range(len(documents))]
+    )
+    stored = store.collection.get(ids=["d0"], include=["embeddings"])["embeddings"][0]
+    results = store.similarity_search("rust ownership borrowing", k=1)
+
+    # A fresh store picks the saved projection up from disk
+    reopened = VectorStore(persist_directory=str(tmp_path / "db"))
+    reopened.get_collection("reduced")
+    reopened_results = reopened.similarity_search("rust ownership borrowing", k=1)
+    stats = reopened.get_collection_stats("reduced")
+
+    assert len(stored) == 8
+    assert results[0]["id"] == "d1"
+    assert reopened_results[0]["id"] == "d1"
+    assert stats["projection"]["source_dimension"] == FakeSentenceTransformer.dimension
+    assert stats["projection"]["target_dimension"] == 8
+
+
+@pytest.mark.skipif(not is_rag_available(), reason="RAG dependencies not available")
+def test_first_stored_batch_fits_pending_projection(tmp_path, fake_models):
+    from tools.knowledge_base.vector_store import VectorStore
+
+    store = VectorStore(persist_directory=str(tmp_path / "db"))
+    store.get_or_create_collection("reduced")
+    store.set_collection_projection(4, collection_name="reduced")
+    store.add_documents(documents=["alpha beta", "gamma delta"], metadatas=[{"a": 1}, {"a": 2}], ids=["x", "y"])
+
+    assert not store.projection_needs_fit("reduced")
+    assert store.get_collection_embedding_model("reduced") is not None
+    with pytest.raises(ValueError):
+        store.set_collection_projection(2, collection_name="reduced")
+
+
+def test_sync_manager_samples_paragraphs_across_files():
+    from tools.knowledge_base.intelligent_sync_manager import IntelligentSyncManager
+
+    files = [
+        {"content": "first paragraph of file one\n\nsecond paragraph of file one\n\nthird paragraph of file one"},
+        {"content": "only paragraph in file two here"},
+        {"content": "tiny"},
+    ]
+
+    samples = IntelligentSyncManager._sample_projection_texts(files, max_samples=3)
+
+    assert samples == [
+        "first paragraph of file one",
+        "only paragraph in file two here",
+        "second paragraph of file one",
+    ]
@@ -0,0 +1,106 @@
+"""Tests for vector snapshot export and import."""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path for tests
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.knowledge_base.dependencies import is_rag_available
+from tools.knowledge_base.vector_snapshot import read_snapshot, write_snapshot
+
+pytestmark = pytest.mark.skipif(
+    not is_rag_available(),
+    reason="RAG dependencies not available"
+)
+
+CHUNKS = [
+    "python decorators wrap functions",
+    "connections fail with ERR_CONN_RESET when the peer closes the socket",
+    "rust ownership rules prevent data races",
+]
+
+
+@pytest.fixture
+def store(vector_store):
+    """Vector store with a 'docs' namespace holding a few chunks."""
+    vector_store.namespace("docs").add_documents(
+        documents=CHUNKS,
+        metadatas=[{"n": i, "section_siblings": [f"c{j}" for j in range(3) if j != i]} for i in range(3)],
+        ids=[f"c{i}" for i in range(3)]
+    )
+    return vector_store
+
+
+def test_bundle_round_trip(tmp_path):
+    vectors = np.arange(6, dtype=np.float32).reshape(2, 3)
+    manifest = write_snapshot(
+        str(tmp_path / "bundle"), "docs", {"embedding_model": "small-model"},
+        ["a", "b"], ["alpha", "beta"], [{"n": 1}, {}], vectors, file_mappings=[{"file_path": "a.md"}]
+    )
+
+    snapshot = read_snapshot(str(tmp_path / "bundle"))
+
+    assert manifest["count"] == 2 and manifest["dimension"] == 3
+    assert snapshot.manifest["embedding_model"] == "small-model"
+    assert snapshot.ids == ["a", "b"]
+    assert snapshot.metadatas == [{"n": 1}, {}]
+    assert isinstance(snapshot.vectors, np.memmap)
+    assert np.array_equal(snapshot.vectors, vectors)
+    assert snapshot.file_mappings == [{"file_path": "a.md"}]
+    with pytest.raises(ValueError):
+        write_snapshot(str(tmp_path / "bundle"), "docs", {}, [], [], [], np.zeros((0, 0)))
+
+
+def test_invalid_bundles_are_rejected(tmp_path):
+    (tmp_path / "bundle").mkdir()
+    (tmp_path / "bundle" / "manifest.json").write_text(json.dumps({"format": "other"}))
+
+    with pytest.raises(ValueError):
+        read_snapshot(str(tmp_path / "bundle"))
+    with pytest.raises(ValueError):
+        read_snapshot(str(tmp_path / "missing"))
+
+
+def test_export_and_import_without_re_embedding(store, tmp_path):
+    manifest = store.export_namespace("docs", str(tmp_path / "bundle"), file_mappings=[{"file_path": "a.md"}])
+
+    from tools.knowledge_base.vector_store import VectorStore
+
+    target = VectorStore(persist_directory=str(tmp_path / "other"))
+    target.get_or_create_collection(embedding_model="small-model")
+    with patch.object(VectorStore, "_embed_texts", side_effect=AssertionError("re-embedded")):
+        imported = target.import_namespace(str(tmp_path / "bundle"), "copy")
+
+    view = target.namespace("copy")
+    assert manifest["count"] == imported["imported"] == 3
+    assert imported["file_mappings"] == [{"file_path": "a.md"}]
+    assert view.get_collection_embedding_model() == "small-model"
+    assert view.count() == 3
+    assert view.similarity_search("rust ownership", k=1)[0]["id"] == "c2"
+    assert view.hybrid_search("ERR_CONN_RESET", k=1)[0]["id"] == "c1"
+    assert view.get_document("c0")["metadata"]["section_siblings"] == ["c1", "c2"]
+    assert set(target._relationships.related_ids(view.collection_name, "c0", ["sibling"])) == {"c1", "c2"}
+
+    with pytest.raises(ValueError):
+        target.import_namespace(str(tmp_path / "bundle"), "copy")
+    with pytest.raises(KeyError):
+        store.export_namespace("missing", str(tmp_path / "missing"))
+
+
+def test_quantized_collection_round_trip(store, tmp_path):
+    quantized = store.namespace("quantized")
+    quantized.set_collection_vector_storage("int8")
+    quantized.add_documents(documents=CHUNKS, metadatas=[{}] * 3, ids=["c0", "c1", "c2"])
+    store.export_namespace("quantized", str(tmp_path / "bundle"))
+    imported = store.import_namespace(str(tmp_path / "bundle"), "restored")
+    view = store.namespace("restored")
+
+    assert imported["manifest"]["settings"]["vector_storage"] == "int8"
+    assert view.similarity_search("python decorators", k=1)[0]["id"] == "c0"
@@ -55,6 +55,10 @@ def mock_vector_store():
     mock_store.delete_documents = Mock()
     mock_store.similarity_search = Mock(return_value=[])
     mock_store.get_or_create_collection = Mock()
+    # Collection namespaces are views of the same store
+    mock_store.namespace = Mock(return_value=mock_store)
+    mock_store.delete_namespace = Mock(return_value=0)
+    mock_store.similarity_search_namespaces = mock_store.similarity_search
     return mock_store
 
 
@@ -52,6 +52,16 @@ class FilesystemCollectionManager:
         logger.info(f"  Metadata database: {metadata_db_path}")
         logger.info(f"  Auto-reconcile: {auto_reconcile}")
     
+    @property
+    def change_feed(self):
+        """
+        Change feed of the metadata store.
+        
+        Files edited directly on disk only show up in the feed once
+        reconciliation picks them up.
+        """
+        return self.metadata_store.change_feed
+    
     async def create_collection(self, name: str, description: str = "") -> Dict[str, Any]:
         """
         Create collection: filesystem directory + metadata entry.
@@ -491,6 +501,42 @@ class FilesystemCollectionManager:
                 "message": f"Failed to delete file '{filename}'"
             }
     
+    async def get_collection_changes(self, collection_name: str, since_version: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Read the writes made to a collection after a version.
+        
+        Args:
+            collection_name: Name of the collection
+            since_version: Last version the caller has seen
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Result dictionary with the collection's current version and changes
+        """
+        sanitized_collection = self._sanitize_collection_name(collection_name)
+        return await self.metadata_store.get_changes(sanitized_collection, since_version, limit)
+    
+    def read_file_content(self, collection_name: str, file_path: str) -> Optional[str]:
+        """
+        Read a file's current content by its relative path.
+        
+        Synchronous so the vector store can call it while reading search results.
+        
+        Args:
+            collection_name: Name of the collection
+            file_path: Path of the file relative to the collection
+            
+        Returns:
+            The file content, or None if the file does not exist
+        """
+        sanitized_collection = self._sanitize_collection_name(collection_name)
+        folder, _, filename = file_path.replace('\\', '/').rpartition('/')
+        safe_folder = self._sanitize_folder_path(folder)
+        full_path = self.fs_base / sanitized_collection / safe_folder / filename
+        if not full_path.is_file():
+            return None
+        return full_path.read_text(encoding='utf-8')
+    
     async def _reconcile_collections(self):
         """
         Reconcile collections between filesystem and metadata database.
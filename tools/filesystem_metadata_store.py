@@ -17,6 +17,10 @@ import asyncio
 import concurrent.futures
 import threading
 
+from .knowledge_base.change_feed import (
+    ChangeFeed, record_change, FILE_SAVED, FILE_DELETED, COLLECTION_DELETED
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +40,9 @@ class FilesystemMetadataStore:
         # Initialize schema synchronously to avoid async/threading issues
         self._initialize_schema_sync()
         
+        # Version counters and change log of every metadata write
+        self.change_feed = ChangeFeed(str(self.db_path))
+        
         # Create a dedicated thread pool executor for SQLite operations
         self._executor = concurrent.futures.ThreadPoolExecutor(
             max_workers=1, 
@@ -292,6 +299,8 @@ class FilesystemMetadataStore:
             
             # Delete collection (CASCADE will handle files and reconciliation log)
             result = db.execute("DELETE FROM collections WHERE name = ?", (name,))
+            if result.rowcount > 0:
+                record_change(db, name, COLLECTION_DELETED)
             db.commit()
             
             if result.rowcount > 0:
@@ -349,6 +358,7 @@ class FilesystemMetadataStore:
             """, (collection_name, file_path, content_hash, file_size,
                   collection_name, file_path, now,  # For created_at COALESCE
                   now, source_url, vector_sync_status))
+            record_change(db, collection_name, FILE_SAVED, file_path)
             
             db.commit()
             
@@ -490,6 +500,8 @@ class FilesystemMetadataStore:
                 DELETE FROM file_metadata 
                 WHERE collection_name = ? AND file_path = ?
             """, (collection_name, file_path))
+            if result.rowcount > 0:
+                record_change(db, collection_name, FILE_DELETED, file_path)
             db.commit()
             
             if result.rowcount > 0:
@@ -513,6 +525,31 @@ class FilesystemMetadataStore:
                 "error": str(e)
             }
     
+    async def get_changes(self, collection_name: str, since_version: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Read the writes made to a collection after a version.
+        
+        Args:
+            collection_name: Name of the collection
+            since_version: Last version the caller has seen
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Result dictionary with the collection's current version and changes
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            changes = await loop.run_in_executor(
+                self._executor, self.change_feed.changes_since, collection_name, since_version, limit
+            )
+            return {"success": True, **changes}
+        except Exception as e:
+            logger.error(f"Failed to read changes of collection '{collection_name}': {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     async def log_reconciliation(self, collection_name: str, actions: List[Dict[str, Any]],
                                 files_added: int = 0, files_modified: int = 0, files_deleted: int = 0) -> Dict[str, Any]:
         """
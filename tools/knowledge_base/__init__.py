@@ -26,7 +26,7 @@ __version__ = "0.1.0"
 
 # Import main components
 from .vector_store import VectorStore
-from .embeddings import EmbeddingService  
+from .embeddings import EmbeddingService, EmbeddingModelRegistry, get_embedding_registry
 from .content_processor import ContentProcessor
 from .rag_tools import (
     store_crawl_results,
@@ -40,6 +40,8 @@ from .rag_tools import (
 __all__ = [
     "VectorStore",
     "EmbeddingService", 
+    "EmbeddingModelRegistry",
+    "get_embedding_registry",
     "ContentProcessor",
     "store_crawl_results",
     "search_knowledge_base",
@@ -0,0 +1,227 @@
+"""Async facade for VectorStore.
+
+VectorStore is synchronous: every query embeds text and scans vectors on the
+calling thread. Called from async handlers, that blocks the event loop
+shared by the MCP stdio and HTTP servers. AsyncVectorStore runs store
+operations on bounded thread pools instead: reads and writes get separate
+pools, so a slow ingest write never holds up concurrent searches, and every
+operation is timed.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+READ_WORKERS = int(os.getenv("RAG_VECTOR_READ_WORKERS", "4"))
+WRITE_WORKERS = int(os.getenv("RAG_VECTOR_WRITE_WORKERS", "2"))
+
+
+class OperationMetrics:
+    """Thread-safe counters and timings of vector store operations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, wait_seconds: float, run_seconds: float, failed: bool) -> None:
+        """Record one finished operation.
+
+        Args:
+            operation: Operation name.
+            wait_seconds: Time spent queued for a worker.
+            run_seconds: Time spent running on the worker.
+            failed: Whether the operation raised.
+        """
+        with self._lock:
+            stats = self._operations.setdefault(operation, {
+                "count": 0, "errors": 0, "total_wait_seconds": 0.0,
+                "total_run_seconds": 0.0, "max_run_seconds": 0.0
+            })
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["total_wait_seconds"] += wait_seconds
+            stats["total_run_seconds"] += run_seconds
+            stats["max_run_seconds"] = max(stats["max_run_seconds"], run_seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Get the statistics of each operation, including average wait and run times."""
+        with self._lock:
+            snapshot = {}
+            for operation, stats in self._operations.items():
+                snapshot[operation] = dict(
+                    stats,
+                    avg_wait_seconds=stats["total_wait_seconds"] / stats["count"],
+                    avg_run_seconds=stats["total_run_seconds"] / stats["count"]
+                )
+            return snapshot
+
+    def reset(self) -> None:
+        """Forget all recorded operations."""
+        with self._lock:
+            self._operations.clear()
+
+
+_read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="vector-read")
+_write_executor = ThreadPoolExecutor(max_workers=WRITE_WORKERS, thread_name_prefix="vector-write")
+_metrics = OperationMetrics()
+
+
+def get_vector_store_metrics() -> Dict[str, Dict[str, float]]:
+    """Get the timing metrics of operations run through the shared executors."""
+    return _metrics.snapshot()
+
+
+class AsyncVectorStore:
+    """Runs VectorStore operations on bounded read and write executors."""
+
+    def __init__(
+        self,
+        store: VectorStore,
+        read_executor: Optional[ThreadPoolExecutor] = None,
+        write_executor: Optional[ThreadPoolExecutor] = None,
+        metrics: Optional[OperationMetrics] = None
+    ):
+        """Wrap a vector store.
+
+        Args:
+            store: Synchronous vector store.
+            read_executor: Pool for searches and lookups. Uses the shared
+                read pool (RAG_VECTOR_READ_WORKERS threads) if None.
+            write_executor: Pool for writes and deletes. Uses the shared
+                write pool (RAG_VECTOR_WRITE_WORKERS threads) if None.
+            metrics: Where operation timings are recorded. Uses the shared
+                metrics if None.
+        """
+        self.store = store
+        self._read_executor = read_executor or _read_executor
+        self._write_executor = write_executor or _write_executor
+        self.metrics = metrics or _metrics
+
+    def namespace(self, collection_name: str) -> "AsyncVectorStore":
+        """Get the async facade of a collection's namespace, sharing this facade's executors."""
+        return AsyncVectorStore(
+            self.store.namespace(collection_name), self._read_executor, self._write_executor, self.metrics
+        )
+
+    async def _run(self, executor: ThreadPoolExecutor, operation: str, func: Callable, *args, **kwargs) -> Any:
+        submitted = time.perf_counter()
+        timing = {}
+
+        def timed():
+            timing["started"] = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timing["finished"] = time.perf_counter()
+
+        failed = False
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, timed)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            started = timing.get("started", submitted)
+            finished = timing.get("finished", started)
+            self.metrics.record(operation, started - submitted, finished - started, failed)
+
+    async def run_read(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a callable that reads from the store on the read pool.
+
+        Args:
+            operation: Name under which the call is timed.
+            func: Callable to run.
+        """
+        return await self._run(self._read_executor, operation, func, *args, **kwargs)
+
+    async def run_write(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a callable that writes to the store on the write pool.
+
+        Args:
+            operation: Name under which the call is timed.
+            func: Callable to run.
+        """
+        return await self._run(self._write_executor, operation, func, *args, **kwargs)
+
+    # Reads
+
+    async def query(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async VectorStore.query."""
+        return await self.run_read("query", self.store.query, *args, **kwargs)
+
+    async def similarity_search(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Async VectorStore.similarity_search."""
+        return await self.run_read("similarity_search", self.store.similarity_search, *args, **kwargs)
+
+    async def hybrid_search(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Async VectorStore.hybrid_search."""
+        return await self.run_read("hybrid_search", self.store.hybrid_search, *args, **kwargs)
+
+    async def similarity_search_namespaces(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Async VectorStore.similarity_search_namespaces."""
+        return await self.run_read(
+            "similarity_search_namespaces", self.store.similarity_search_namespaces, *args, **kwargs
+        )
+
+    async def batch_similarity_search(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async VectorStore.batch_similarity_search."""
+        return await self.run_read("batch_similarity_search", self.store.batch_similarity_search, *args, **kwargs)
+
+    async def batch_similarity_search_namespaces(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async VectorStore.batch_similarity_search_namespaces."""
+        return await self.run_read(
+            "batch_similarity_search_namespaces", self.store.batch_similarity_search_namespaces, *args, **kwargs
+        )
+
+    async def search_with_relationships(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Async VectorStore.search_with_relationships."""
+        return await self.run_read("search_with_relationships", self.store.search_with_relationships, *args, **kwargs)
+
+    async def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Async VectorStore.get_document."""
+        return await self.run_read("get_document", self.store.get_document, doc_id)
+
+    async def get_documents(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Async VectorStore.get_documents."""
+        return await self.run_read("get_documents", self.store.get_documents, ids)
+
+    async def get_stored_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Async VectorStore.get_stored_vectors."""
+        return await self.run_read("get_stored_vectors", self.store.get_stored_vectors, ids)
+
+    async def count(self, collection_name: Optional[str] = None) -> int:
+        """Async VectorStore.count."""
+        return await self.run_read("count", self.store.count, collection_name)
+
+    # Writes
+
+    async def add_documents(self, *args, **kwargs) -> None:
+        """Async VectorStore.add_documents."""
+        return await self.run_write("add_documents", self.store.add_documents, *args, **kwargs)
+
+    async def upsert_documents(self, *args, **kwargs) -> None:
+        """Async VectorStore.upsert_documents."""
+        return await self.run_write("upsert_documents", self.store.upsert_documents, *args, **kwargs)
+
+    async def update_documents(self, *args, **kwargs) -> None:
+        """Async VectorStore.update_documents."""
+        return await self.run_write("update_documents", self.store.update_documents, *args, **kwargs)
+
+    async def update_metadatas(self, *args, **kwargs) -> None:
+        """Async VectorStore.update_metadatas."""
+        return await self.run_write("update_metadatas", self.store.update_metadatas, *args, **kwargs)
+
+    async def delete_documents(self, ids: List[str]) -> None:
+        """Async VectorStore.delete_documents."""
+        return await self.run_write("delete_documents", self.store.delete_documents, ids)
+
+    async def delete_namespace(self, collection_name: str) -> int:
+        """Async VectorStore.delete_namespace."""
+        return await self.run_write("delete_namespace", self.store.delete_namespace, collection_name)
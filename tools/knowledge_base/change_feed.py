@@ -0,0 +1,229 @@
+"""Per-collection version counters and change log.
+
+Every write to a collection, whether a file save or delete or a chunk upsert
+or delete during sync, bumps the collection's version and appends one compact
+row to a change log in the same SQLite database. Callers that remember the
+last version they saw, such as caches, incremental sync or replicas, can
+then ask what changed since that version in O(changes) instead of re-reading
+and re-hashing the whole collection.
+
+Versions are never reset, not even when a collection is deleted, so a
+consumer cannot confuse a recreated collection with the one it followed.
+Only the newest changes of each collection are kept. A consumer that falls
+further behind is told to resynchronize from scratch.
+"""
+import os
+import json
+import sqlite3
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_versions (
+    collection_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS collection_changes (
+    collection_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    change_type TEXT NOT NULL,
+    file_path TEXT,
+    chunk_ids TEXT,  -- JSON array of chunk IDs, chunk changes only
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (collection_name, version)
+);
+
+-- Last version each consumer has caught up to
+CREATE TABLE IF NOT EXISTS change_cursors (
+    consumer TEXT NOT NULL,
+    collection_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (consumer, collection_name)
+);
+"""
+
+FILE_SAVED = "file_saved"
+FILE_DELETED = "file_deleted"
+COLLECTION_DELETED = "collection_deleted"
+CHUNKS_UPSERTED = "chunks_upserted"
+CHUNKS_DELETED = "chunks_deleted"
+VECTORS_DELETED = "vectors_deleted"
+
+# Changes to the files of a collection, as opposed to its derived vectors
+FILE_CHANGE_TYPES = (FILE_SAVED, FILE_DELETED, COLLECTION_DELETED)
+
+# Changes kept per collection; older ones are trimmed as new ones arrive
+CHANGE_LOG_RETENTION = int(os.getenv("RAG_CHANGE_LOG_RETENTION", "10000"))
+
+
+def record_change(
+    conn: sqlite3.Connection,
+    collection_name: str,
+    change_type: str,
+    file_path: Optional[str] = None,
+    chunk_ids: Optional[Sequence[str]] = None,
+    retention: Optional[int] = None
+) -> int:
+    """Bump a collection's version and log the change on an open connection.
+
+    Runs in the caller's transaction, so the change is committed or rolled
+    back together with the write it describes.
+
+    Args:
+        conn: Connection to a database with the change feed schema.
+        collection_name: Collection that was written.
+        change_type: One of the change type constants.
+        file_path: Logical path of the file the change concerns, if any.
+        chunk_ids: IDs of the chunks the change concerns, if any.
+        retention: Changes to keep for the collection. Defaults to
+            RAG_CHANGE_LOG_RETENTION.
+
+    Returns:
+        The collection's new version.
+    """
+    conn.execute(
+        """INSERT INTO collection_versions (collection_name, version, updated_at)
+           VALUES (?, 1, CURRENT_TIMESTAMP)
+           ON CONFLICT(collection_name) DO UPDATE
+           SET version = version + 1, updated_at = CURRENT_TIMESTAMP""",
+        (collection_name,)
+    )
+    version = conn.execute(
+        "SELECT version FROM collection_versions WHERE collection_name = ?", (collection_name,)
+    ).fetchone()[0]
+    conn.execute(
+        """INSERT INTO collection_changes (collection_name, version, change_type, file_path, chunk_ids)
+           VALUES (?, ?, ?, ?, ?)""",
+        (collection_name, version, change_type, file_path,
+         json.dumps(list(chunk_ids)) if chunk_ids is not None else None)
+    )
+    retention = CHANGE_LOG_RETENTION if retention is None else retention
+    conn.execute(
+        "DELETE FROM collection_changes WHERE collection_name = ? AND version <= ?",
+        (collection_name, version - retention)
+    )
+    return version
+
+
+class ChangeFeed:
+    """Reads and writes the change feed of a SQLite database."""
+
+    def __init__(self, db_path: str):
+        """Open the change feed, creating its tables if needed.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(CHANGE_FEED_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def record(
+        self,
+        collection_name: str,
+        change_type: str,
+        file_path: Optional[str] = None,
+        chunk_ids: Optional[Sequence[str]] = None
+    ) -> int:
+        """Record a change in its own transaction.
+
+        Returns:
+            The collection's new version.
+        """
+        with self._connect() as conn:
+            return record_change(conn, collection_name, change_type, file_path, chunk_ids)
+
+    def current_version(self, collection_name: str) -> int:
+        """Get a collection's version, 0 if it was never written."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version FROM collection_versions WHERE collection_name = ?", (collection_name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def changes_since(
+        self,
+        collection_name: str,
+        since_version: int = 0,
+        limit: int = 1000,
+        change_types: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Get a collection's changes after a version, oldest first.
+
+        Args:
+            collection_name: Collection to read.
+            since_version: Last version the caller has seen.
+            limit: Maximum number of changes to return.
+            change_types: Only return changes of these types. Returns all if None.
+
+        Returns:
+            Dictionary with the collection's current_version, the changes,
+            has_more if the limit cut them off, and reset_required if changes
+            after since_version were already trimmed, in which case the
+            caller has to resynchronize from scratch.
+        """
+        type_filter = ""
+        params: List[Any] = [collection_name, since_version]
+        if change_types is not None:
+            type_filter = f"AND change_type IN ({','.join('?' * len(change_types))})"
+            params.extend(change_types)
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version FROM collection_versions WHERE collection_name = ?", (collection_name,)
+            ).fetchone()
+            current_version = row[0] if row else 0
+            oldest = conn.execute(
+                "SELECT MIN(version) FROM collection_changes WHERE collection_name = ?", (collection_name,)
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"""SELECT version, change_type, file_path, chunk_ids, changed_at FROM collection_changes
+                    WHERE collection_name = ? AND version > ? {type_filter}
+                    ORDER BY version LIMIT ?""",
+                params + [limit + 1]
+            ).fetchall()
+
+        # Versions are consecutive, so a gap before the oldest kept change means trimming
+        reset_required = since_version < current_version and (oldest is None or oldest > since_version + 1)
+        return {
+            "collection_name": collection_name,
+            "since_version": since_version,
+            "current_version": current_version,
+            "changes": [
+                {
+                    "version": version,
+                    "change_type": change_type,
+                    "file_path": file_path,
+                    "chunk_ids": json.loads(chunk_ids) if chunk_ids else [],
+                    "changed_at": changed_at
+                }
+                for version, change_type, file_path, chunk_ids, changed_at in rows[:limit]
+            ],
+            "has_more": len(rows) > limit,
+            "reset_required": reset_required
+        }
+
+    def get_cursor(self, consumer: str, collection_name: str) -> Optional[int]:
+        """Get the last version a consumer has caught up to, None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version FROM change_cursors WHERE consumer = ? AND collection_name = ?",
+                (consumer, collection_name)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, consumer: str, collection_name: str, version: int) -> None:
+        """Store the last version a consumer has caught up to."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO change_cursors (consumer, collection_name, version) VALUES (?, ?, ?)",
+                (consumer, collection_name, version)
+            )
@@ -0,0 +1,198 @@
+"""Centroid and summary vectors of collections for routing global searches.
+
+A global search has to query every collection, so its cost grows with the
+whole corpus. Each collection gets a small matrix of unit vectors: the
+centroid of its stored vectors followed by a few k-means centroids, which
+summarize collections that cover several topics. A global query scores
+every collection by the best cosine similarity to its summary vectors and
+searches only the most relevant ones.
+
+Vectors are refreshed at sync time from a sample of the stored vectors. Any
+other write marks a collection's vectors stale, and stale collections are
+never pruned, so routing cannot hide freshly written chunks.
+"""
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CENTROID_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_centroids (
+    collection_name TEXT PRIMARY KEY,
+    chunk_count INTEGER NOT NULL,
+    dimension INTEGER NOT NULL,
+    vectors BLOB NOT NULL,
+    stale INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Stored vectors sampled per collection when computing its summary vectors
+CENTROID_SAMPLE_SIZE = int(os.getenv("RAG_CENTROID_SAMPLE_SIZE", "2048"))
+# k-means centroids kept per collection next to the overall centroid
+CENTROID_SUMMARY_VECTORS = int(os.getenv("RAG_CENTROID_SUMMARY_VECTORS", "4"))
+CENTROID_KMEANS_ITERATIONS = 10
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def summarize_vectors(
+    vectors: np.ndarray,
+    summary_count: int = CENTROID_SUMMARY_VECTORS,
+    iterations: int = CENTROID_KMEANS_ITERATIONS
+) -> np.ndarray:
+    """Compute the summary vectors of a collection.
+
+    Args:
+        vectors: Stored vectors, one per row.
+        summary_count: Number of k-means centroids to add to the overall centroid.
+        iterations: k-means iterations.
+
+    Returns:
+        Unit vectors, the overall centroid first.
+    """
+    vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+    summary = [vectors.mean(axis=0, keepdims=True)]
+
+    clusters = min(summary_count, len(vectors))
+    if clusters > 1:
+        # Deterministic spread-out seeds keep refreshes reproducible
+        centroids = vectors[np.linspace(0, len(vectors) - 1, clusters).astype(int)]
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(clusters):
+                members = vectors[assignment == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        summary.append(centroids)
+    return _normalize(np.vstack(summary)).astype(np.float32)
+
+
+def score_summary(query_vector: np.ndarray, summary: np.ndarray) -> float:
+    """Score a collection for a query by its closest summary vector."""
+    query = _normalize(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))[0]
+    return float(np.max(summary @ query))
+
+
+class CentroidIndex:
+    """SQLite store of the summary vectors of each collection."""
+
+    def __init__(self, db_path: str):
+        """Open or create the index.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(CENTROID_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def set_vectors(self, collection_name: str, chunk_count: int, vectors: np.ndarray) -> None:
+        """Store freshly computed summary vectors of a collection.
+
+        Args:
+            collection_name: Logical collection name.
+            chunk_count: Number of chunks the vectors summarize.
+            vectors: Summary vectors, one per row.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO collection_centroids
+                   (collection_name, chunk_count, dimension, vectors, stale, updated_at)
+                   VALUES (?, ?, ?, ?, 0, ?)""",
+                (collection_name, chunk_count, vectors.shape[1], vectors.tobytes(),
+                 datetime.now(timezone.utc).isoformat())
+            )
+
+    def get_vectors(self, collection_names: List[str]) -> Dict[str, Tuple[np.ndarray, bool]]:
+        """Get the summary vectors of collections.
+
+        Returns:
+            Mapping of collection name to (vectors, stale) for the collections
+            that have vectors.
+        """
+        if not collection_names:
+            return {}
+        placeholders = ','.join('?' * len(collection_names))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""SELECT collection_name, dimension, vectors, stale FROM collection_centroids
+                    WHERE collection_name IN ({placeholders})""",
+                collection_names
+            ).fetchall()
+        return {
+            name: (np.frombuffer(blob, dtype=np.float32).reshape(-1, dimension), bool(stale))
+            for name, dimension, blob, stale in rows
+        }
+
+    def needs_refresh(self, collection_name: str) -> bool:
+        """Check whether a collection has no summary vectors or stale ones."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stale FROM collection_centroids WHERE collection_name = ?", (collection_name,)
+            ).fetchone()
+        return row is None or bool(row[0])
+
+    def mark_stale(self, collection_name: str) -> None:
+        """Flag a collection's summary vectors as outdated after a write."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE collection_centroids SET stale = 1 WHERE collection_name = ? AND stale = 0",
+                (collection_name,)
+            )
+
+    def drop_collection(self, collection_name: str) -> None:
+        """Remove the summary vectors of a collection."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM collection_centroids WHERE collection_name = ?", (collection_name,))
+
+    def rename_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Move the summary vectors of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE collection_centroids SET collection_name = ? WHERE collection_name = ?",
+                (new_collection_name, collection_name)
+            )
+
+    def copy_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Copy the summary vectors of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO collection_centroids
+                   (collection_name, chunk_count, dimension, vectors, stale, updated_at)
+                   SELECT ?, chunk_count, dimension, vectors, stale, updated_at
+                   FROM collection_centroids WHERE collection_name = ?""",
+                (new_collection_name, collection_name)
+            )
+
+
+_centroid_indexes: Dict[str, CentroidIndex] = {}
+_centroid_indexes_lock = threading.Lock()
+
+
+def get_centroid_index(persist_directory: str) -> CentroidIndex:
+    """Get the shared centroid index for a vector database directory."""
+    db_path = os.path.join(os.path.abspath(persist_directory), "collection_centroids.db")
+    with _centroid_indexes_lock:
+        index = _centroid_indexes.get(db_path)
+        if index is None:
+            index = CentroidIndex(db_path)
+            _centroid_indexes[db_path] = index
+        return index
@@ -0,0 +1,278 @@
+"""Routing table from logical collection names to physical vector collections.
+
+VectorStore callers address collections by logical name. Normally the
+physical ChromaDB collection has the same name, but a collection can be
+rebuilt into a new physical collection (e.g. re-embedding with another
+model) and then switched over atomically by updating its route. Collection
+namespaces (see VectorStore.namespace) are always routed, so renaming one
+only moves its route.
+
+Routes are stored in SQLite next to the vector database. All VectorStore
+instances of a process share one table per database directory, and its
+generation counter lets them notice switches and reopen their collection.
+"""
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+ROUTING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_routes (
+    logical_name TEXT PRIMARY KEY,
+    physical_name TEXT NOT NULL,
+    shadow_name TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+class RouteSwitchLock:
+    """Lets writes run concurrently while keeping route switches apart from them.
+
+    A write holds the lock shared from resolving its physical collection
+    until it and its mirror into a shadow are written. A switch holds it
+    exclusively, so it waits for writes in flight, and no write resolved
+    before the switch lands after it on the collection switched away from.
+    The thread holding the lock exclusively may also write, and a thread
+    already writing may write again.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._writers = 0
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self._held = threading.local()
+
+    @contextmanager
+    def writing(self):
+        """Hold the lock shared for the duration of the block."""
+        me = threading.get_ident()
+        held = getattr(self._held, 'depth', 0)
+        with self._condition:
+            # A thread already writing must not wait for a switch that waits for it
+            if self._owner != me and not held:
+                self._condition.wait_for(lambda: self._owner is None)
+            self._writers += 1
+        self._held.depth = held + 1
+        try:
+            yield
+        finally:
+            self._held.depth = held
+            with self._condition:
+                self._writers -= 1
+                self._condition.notify_all()
+
+    @contextmanager
+    def switching(self):
+        """Hold the lock exclusively for the duration of the block."""
+        me = threading.get_ident()
+        with self._condition:
+            if self._owner != me:
+                self._condition.wait_for(lambda: self._owner is None)
+                self._owner = me
+                # Writes in flight finish first; new ones wait for the switch
+                self._condition.wait_for(lambda: self._writers == 0)
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._owner = None
+                    self._condition.notify_all()
+
+
+class CollectionRoutingTable:
+    """Logical to physical collection routes with pending shadow collections."""
+
+    def __init__(self, db_path: str):
+        """Open or create the routing table.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self.generation = 0
+        self._routes: Dict[str, Dict[str, Optional[str]]] = {}
+        self._mirrors: Dict[str, str] = {}
+        self._mirrored_deletes: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.switch_lock = RouteSwitchLock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(ROUTING_SCHEMA)
+            for row in conn.execute("SELECT logical_name, physical_name, shadow_name FROM collection_routes"):
+                self._routes[row[0]] = {"physical_name": row[1], "shadow_name": row[2]}
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _write(self, logical_name: str, physical_name: str, shadow_name: Optional[str]) -> None:
+        """Persist one route in a single transaction and bump the generation."""
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO collection_routes (logical_name, physical_name, shadow_name, updated_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(logical_name) DO UPDATE SET
+                       physical_name = excluded.physical_name,
+                       shadow_name = excluded.shadow_name,
+                       updated_at = excluded.updated_at""",
+                (logical_name, physical_name, shadow_name, datetime.now(timezone.utc).isoformat())
+            )
+        self._routes[logical_name] = {"physical_name": physical_name, "shadow_name": shadow_name}
+        self.generation += 1
+
+    def resolve(self, logical_name: str) -> str:
+        """Get the physical collection currently serving a logical name."""
+        route = self._routes.get(logical_name)
+        return route["physical_name"] if route else logical_name
+
+    def get_shadow(self, logical_name: str) -> Optional[str]:
+        """Get the physical collection being built to replace a logical name, if any."""
+        route = self._routes.get(logical_name)
+        return route["shadow_name"] if route else None
+
+    def set_shadow(self, logical_name: str, shadow_name: Optional[str]) -> None:
+        """Record (or clear) the shadow collection being built for a logical name."""
+        with self._lock:
+            self._write(logical_name, self.resolve(logical_name), shadow_name)
+
+    def switch(self, logical_name: str, physical_name: str) -> str:
+        """Atomically point a logical name at a new physical collection.
+
+        Clears any pending shadow.
+
+        Returns:
+            The previous physical collection name.
+        """
+        with self._lock:
+            previous = self.resolve(logical_name)
+            self._write(logical_name, physical_name, None)
+            logger.info(f"Switched collection {logical_name}: {previous} -> {physical_name}")
+            return previous
+
+    def remove(self, logical_name: str) -> None:
+        """Forget the route of a logical name."""
+        with self._lock:
+            if logical_name not in self._routes:
+                return
+            with self._connect() as conn:
+                conn.execute("DELETE FROM collection_routes WHERE logical_name = ?", (logical_name,))
+            del self._routes[logical_name]
+            self.generation += 1
+
+    def has_route(self, logical_name: str) -> bool:
+        """Check whether a logical name has an explicit route."""
+        return logical_name in self._routes
+
+    def add_route(self, logical_name: str, physical_name: str) -> str:
+        """Route a logical name to a physical collection unless it is already routed.
+
+        Returns:
+            The physical collection now serving the logical name.
+        """
+        with self._lock:
+            if logical_name not in self._routes:
+                self._write(logical_name, physical_name, None)
+            return self.resolve(logical_name)
+
+    def rename(self, logical_name: str, new_logical_name: str) -> None:
+        """Move a route to a new logical name in a single transaction.
+
+        Raises:
+            KeyError: If the logical name has no route.
+            ValueError: If the new name is already routed.
+        """
+        with self._lock:
+            route = self._routes.get(logical_name)
+            if route is None:
+                raise KeyError(logical_name)
+            if new_logical_name in self._routes:
+                raise ValueError(f"Collection {new_logical_name} already exists")
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE collection_routes SET logical_name = ?, updated_at = ? WHERE logical_name = ?",
+                    (new_logical_name, datetime.now(timezone.utc).isoformat(), logical_name)
+                )
+            self._routes[new_logical_name] = self._routes.pop(logical_name)
+            self.generation += 1
+            logger.info(f"Renamed collection route {logical_name} -> {new_logical_name}")
+
+    def logical_name_for(self, physical_name: str) -> Optional[str]:
+        """Map a physical collection back to its logical name.
+
+        Returns:
+            The logical name, the physical name itself if it is unrouted, or
+            None if it is a shadow that is not serving reads yet.
+        """
+        for logical_name, route in self._routes.items():
+            if route["physical_name"] == physical_name:
+                return logical_name
+            if route["shadow_name"] == physical_name:
+                return None
+        if physical_name in self._routes:
+            # The logical name was switched to another physical collection
+            return None
+        return physical_name
+
+    def start_mirroring(self, physical_name: str, shadow_name: str) -> None:
+        """Mirror writes to a physical collection into a shadow being built.
+
+        Mirroring lives in memory only: a shadow that outlives its process
+        is stale and must be rebuilt.
+        """
+        with self._lock:
+            self._mirrors[physical_name] = shadow_name
+            self._mirrored_deletes[shadow_name] = set()
+
+    def stop_mirroring(self, physical_name: str) -> None:
+        """Stop mirroring writes of a physical collection."""
+        with self._lock:
+            shadow_name = self._mirrors.pop(physical_name, None)
+            if shadow_name is not None:
+                self._mirrored_deletes.pop(shadow_name, None)
+
+    def mirror_target(self, physical_name: str) -> Optional[str]:
+        """Get the shadow collection that writes to a physical collection are mirrored to."""
+        return self._mirrors.get(physical_name)
+
+    def record_mirrored_deletes(self, shadow_name: str, ids: List[str]) -> None:
+        """Remember ids deleted while a shadow is being built so copies skip them."""
+        with self._lock:
+            if shadow_name in self._mirrored_deletes:
+                self._mirrored_deletes[shadow_name].update(ids)
+
+    def mirrored_deletes(self, shadow_name: str) -> Set[str]:
+        """Ids deleted from the active collection since its shadow was started."""
+        with self._lock:
+            return set(self._mirrored_deletes.get(shadow_name, ()))
+
+    def list_routes(self) -> List[Dict[str, Any]]:
+        """List all explicit routes."""
+        return [
+            {"logical_name": logical_name, **route}
+            for logical_name, route in sorted(self._routes.items())
+        ]
+
+
+_routing_tables: Dict[str, CollectionRoutingTable] = {}
+_routing_tables_lock = threading.Lock()
+
+
+def get_routing_table(persist_directory: str) -> CollectionRoutingTable:
+    """Get the shared routing table for a vector database directory."""
+    db_path = os.path.join(os.path.abspath(persist_directory), "collection_routes.db")
+    with _routing_tables_lock:
+        table = _routing_tables.get(db_path)
+        if table is None:
+            table = CollectionRoutingTable(db_path)
+            _routing_tables[db_path] = table
+        return table
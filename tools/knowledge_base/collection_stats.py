@@ -0,0 +1,293 @@
+"""Incrementally maintained chunk statistics per collection.
+
+Collection statistics used to be estimated from a sample of chunk metadata
+on every request, which is slow on large collections and wrong on skewed
+ones. The vector store instead updates this index whenever chunks are
+written or deleted. For each chunk it keeps one row with the source file,
+chunk type, text size and relationship flags. Each collection also has
+counters aggregating those rows: total chunks and bytes, chunks per
+relationship flag, per chunk type and per file. A write replaces the
+chunk's previous contribution to the counters, so reading a collection's
+statistics is a lookup of its counters.
+
+Statistics are keyed by logical collection name, so they survive
+re-embedding a collection into a new physical collection.
+"""
+import os
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_stats (
+    collection_name TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    file_path TEXT,
+    chunk_type TEXT NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    flags INTEGER NOT NULL DEFAULT 0,  -- Bitmask of RELATIONSHIP_FLAGS
+    PRIMARY KEY (collection_name, chunk_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_stats_file ON chunk_stats(collection_name, file_path);
+
+CREATE TABLE IF NOT EXISTS collection_stat_counters (
+    collection_name TEXT NOT NULL,
+    stat TEXT NOT NULL,  -- 'total', 'relationship', 'chunk_type' or 'file'
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (collection_name, stat, key)
+);
+"""
+
+# Relationship flags counted per collection, with the metadata test setting them
+RELATIONSHIP_FLAGS = (
+    ('chunks_with_overlap', lambda metadata: bool(metadata.get('overlap_sources'))),
+    ('expansion_eligible', lambda metadata: bool(metadata.get('context_expansion_eligible'))),
+    ('has_sequential_neighbors', lambda metadata: bool(metadata.get('previous_chunk_id') or metadata.get('next_chunk_id'))),
+    ('has_section_siblings', lambda metadata: bool(metadata.get('section_siblings'))),
+)
+
+UNKNOWN_CHUNK_TYPE = "unknown"
+
+# SQLite limits the number of bound parameters per statement
+_MAX_BOUND_IDS = 500
+
+# (file_path, chunk_type, bytes, flags)
+ChunkRow = Tuple[Optional[str], str, int, int]
+
+
+def _batches(ids: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(ids), _MAX_BOUND_IDS):
+        yield ids[start:start + _MAX_BOUND_IDS]
+
+
+def chunk_flags(metadata: Optional[Dict[str, Any]]) -> int:
+    """Get the relationship flag bitmask of deserialized chunk metadata."""
+    flags = 0
+    for bit, (_, test) in enumerate(RELATIONSHIP_FLAGS):
+        if test(metadata or {}):
+            flags |= 1 << bit
+    return flags
+
+
+def _contributions(row: ChunkRow) -> Counter:
+    """Counter increments a chunk adds to its collection."""
+    file_path, chunk_type, size, flags = row
+    counts = Counter({('total', 'chunks'): 1, ('total', 'bytes'): size, ('chunk_type', chunk_type): 1})
+    if file_path:
+        counts[('file', file_path)] += 1
+    for bit, (name, _) in enumerate(RELATIONSHIP_FLAGS):
+        if flags & (1 << bit):
+            counts[('relationship', name)] += 1
+    return counts
+
+
+class CollectionStatsIndex:
+    """SQLite chunk rows and aggregated counters per collection."""
+
+    def __init__(self, db_path: str):
+        """Open or create the index.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(STATS_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def _load_rows(conn: sqlite3.Connection, collection_name: str, ids: List[str]) -> Dict[str, ChunkRow]:
+        rows = {}
+        for batch in _batches(list(dict.fromkeys(ids))):
+            for chunk_id, file_path, chunk_type, size, flags in conn.execute(
+                f"""SELECT chunk_id, file_path, chunk_type, bytes, flags FROM chunk_stats
+                    WHERE collection_name = ? AND chunk_id IN ({','.join('?' * len(batch))})""",
+                [collection_name, *batch]
+            ):
+                rows[chunk_id] = (file_path, chunk_type, size, flags)
+        return rows
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, collection_name: str, deltas: Counter) -> None:
+        conn.executemany(
+            """INSERT INTO collection_stat_counters (collection_name, stat, key, value)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(collection_name, stat, key) DO UPDATE SET value = value + excluded.value""",
+            [(collection_name, stat, key, value) for (stat, key), value in deltas.items() if value]
+        )
+        conn.execute(
+            "DELETE FROM collection_stat_counters WHERE collection_name = ? AND value = 0 AND stat != 'total'",
+            (collection_name,)
+        )
+
+    def index_chunks(
+        self,
+        collection_name: str,
+        ids: List[str],
+        metadatas: List[Optional[Dict[str, Any]]],
+        documents: Optional[List[Optional[str]]] = None
+    ) -> None:
+        """Replace the statistics of written chunks.
+
+        Args:
+            collection_name: Logical collection name.
+            ids: Chunk IDs.
+            metadatas: Deserialized chunk metadata, parallel to ids.
+            documents: Chunk text, parallel to ids. Chunks keep their
+                previous size if None.
+        """
+        with self._lock, self._connect() as conn:
+            rows = self._load_rows(conn, collection_name, ids)
+            deltas: Counter = Counter()
+            for i, (chunk_id, metadata) in enumerate(zip(ids, metadatas)):
+                metadata = metadata or {}
+                previous = rows.get(chunk_id)
+                if previous is not None:
+                    deltas.subtract(_contributions(previous))
+                document = documents[i] if documents is not None else None
+                size = len(document.encode('utf-8')) if document is not None else (previous[2] if previous else 0)
+                row = (
+                    metadata.get('source_file') or metadata.get('file_path'),
+                    metadata.get('chunk_type') or UNKNOWN_CHUNK_TYPE,
+                    size,
+                    chunk_flags(metadata)
+                )
+                deltas.update(_contributions(row))
+                rows[chunk_id] = row
+
+            conn.executemany(
+                """INSERT OR REPLACE INTO chunk_stats
+                   (collection_name, chunk_id, file_path, chunk_type, bytes, flags)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(collection_name, chunk_id, *rows[chunk_id]) for chunk_id in dict.fromkeys(ids)]
+            )
+            self._apply(conn, collection_name, deltas)
+
+    def remove_chunks(self, collection_name: str, ids: List[str]) -> None:
+        """Remove the statistics of deleted chunks."""
+        with self._lock, self._connect() as conn:
+            rows = self._load_rows(conn, collection_name, ids)
+            deltas: Counter = Counter()
+            for row in rows.values():
+                deltas.subtract(_contributions(row))
+            for batch in _batches(list(rows)):
+                conn.execute(
+                    f"""DELETE FROM chunk_stats
+                        WHERE collection_name = ? AND chunk_id IN ({','.join('?' * len(batch))})""",
+                    [collection_name, *batch]
+                )
+            self._apply(conn, collection_name, deltas)
+
+    def get_stats(self, collection_name: str) -> Dict[str, Any]:
+        """Get a collection's aggregated statistics.
+
+        Returns:
+            Dictionary with total chunks and bytes, the number of files,
+            chunk counts per relationship flag and per chunk type.
+        """
+        with self._connect() as conn:
+            counters = conn.execute(
+                """SELECT stat, key, value FROM collection_stat_counters
+                   WHERE collection_name = ? AND stat IN ('total', 'relationship', 'chunk_type')""",
+                (collection_name,)
+            ).fetchall()
+            file_count = conn.execute(
+                "SELECT COUNT(*) FROM collection_stat_counters WHERE collection_name = ? AND stat = 'file'",
+                (collection_name,)
+            ).fetchone()[0]
+
+        totals = {key: value for stat, key, value in counters if stat == 'total'}
+        relationships = {name: 0 for name, _ in RELATIONSHIP_FLAGS}
+        relationships.update({key: value for stat, key, value in counters if stat == 'relationship'})
+        return {
+            'chunks': totals.get('chunks', 0),
+            'bytes': totals.get('bytes', 0),
+            'files': file_count,
+            'relationships': relationships,
+            'chunk_types': {key: value for stat, key, value in counters if stat == 'chunk_type'}
+        }
+
+    def file_chunk_counts(self, collection_name: str) -> Dict[str, int]:
+        """Get the number of chunks of each file of a collection."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT key, value FROM collection_stat_counters
+                   WHERE collection_name = ? AND stat = 'file' ORDER BY key""",
+                (collection_name,)
+            ).fetchall()
+        return dict(rows)
+
+    def file_chunk_ids(self, collection_name: str, file_paths: List[str]) -> Dict[str, List[str]]:
+        """Get the IDs of the chunks of files of a collection.
+
+        Returns:
+            Dictionary mapping each file path with chunks to their IDs.
+        """
+        chunk_ids: Dict[str, List[str]] = {}
+        with self._connect() as conn:
+            for batch in _batches(list(dict.fromkeys(file_paths))):
+                for file_path, chunk_id in conn.execute(
+                    f"""SELECT file_path, chunk_id FROM chunk_stats
+                        WHERE collection_name = ? AND file_path IN ({','.join('?' * len(batch))})
+                        ORDER BY file_path, chunk_id""",
+                    [collection_name, *batch]
+                ):
+                    chunk_ids.setdefault(file_path, []).append(chunk_id)
+        return chunk_ids
+
+    def drop_collection(self, collection_name: str) -> None:
+        """Forget all statistics of a collection."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM chunk_stats WHERE collection_name = ?", (collection_name,))
+            conn.execute("DELETE FROM collection_stat_counters WHERE collection_name = ?", (collection_name,))
+
+    def rename_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Move all statistics of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            for table in ("chunk_stats", "collection_stat_counters"):
+                conn.execute(
+                    f"UPDATE {table} SET collection_name = ? WHERE collection_name = ?",
+                    (new_collection_name, collection_name)
+                )
+
+    def copy_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Copy all statistics of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO chunk_stats
+                   (collection_name, chunk_id, file_path, chunk_type, bytes, flags)
+                   SELECT ?, chunk_id, file_path, chunk_type, bytes, flags
+                   FROM chunk_stats WHERE collection_name = ?""",
+                (new_collection_name, collection_name)
+            )
+            conn.execute(
+                """INSERT OR REPLACE INTO collection_stat_counters (collection_name, stat, key, value)
+                   SELECT ?, stat, key, value FROM collection_stat_counters WHERE collection_name = ?""",
+                (new_collection_name, collection_name)
+            )
+
+
+_stats_indexes: Dict[str, CollectionStatsIndex] = {}
+_stats_indexes_lock = threading.Lock()
+
+
+def get_collection_stats_index(persist_directory: str) -> CollectionStatsIndex:
+    """Get the shared statistics index for a vector database directory."""
+    db_path = os.path.join(os.path.abspath(persist_directory), "collection_stats.db")
+    with _stats_indexes_lock:
+        index = _stats_indexes.get(db_path)
+        if index is None:
+            index = CollectionStatsIndex(db_path)
+            _stats_indexes[db_path] = index
+        return index
@@ -23,29 +23,18 @@ class DatabaseCollectionAdapter:
     def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
         """Get collection info compatible with filesystem API."""
         try:
-            if not self.db_manager.collection_exists(collection_name):
-                return {"success": False, "error": f"Collection '{collection_name}' not found"}
-            
-            # Get basic collection info
-            collections = self.db_manager.list_collections()
-            collection_data = None
-            for col in collections:
-                if col["name"] == collection_name:
-                    collection_data = col
-                    break
-            
+            # File statistics are maintained on every write, so this is a single-row read
+            collection_data = self.db_manager.get_collection(collection_name)
             if not collection_data:
                 return {"success": False, "error": f"Collection '{collection_name}' not found"}
             
-            # Get file count from database
-            files = self.db_manager.list_collection_files(collection_name)
-            
             return {
                 "success": True,
                 "collection": {
                     "name": collection_data["name"],
                     "description": collection_data["description"],
-                    "file_count": len(files),
+                    "file_count": collection_data["file_count"],
+                    "total_size": collection_data["total_size"],
                     "created_at": collection_data["created_at"],
                     "updated_at": collection_data["updated_at"]
                 }
@@ -112,6 +101,12 @@ class DatabaseCollectionAdapter:
             logger.error(f"Error reading file {filename} from collection {collection_name}: {e}")
             return {"success": False, "error": str(e)}
     
+    def read_file_content(self, collection_name: str, file_path: str) -> Optional[str]:
+        """Read a file's current content by its path, None if it does not exist."""
+        folder, _, filename = file_path.rpartition('/')
+        file_data = self.db_manager.get_file_by_path(collection_name, filename, folder)
+        return file_data["content"] if file_data.get("success") else None
+    
     def create_collection(self, name: str, description: str = "") -> Dict[str, Any]:
         """Create collection in database."""
         return self.db_manager.create_collection(name, description)
@@ -132,6 +127,20 @@ class DatabaseCollectionAdapter:
         """Delete file from database."""
         return self.db_manager.delete_file(collection_name, filename, folder)
     
+    def get_collection_changes(self, collection_name: str, since_version: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """Read the writes made to a collection after a version."""
+        try:
+            changes = self.db_manager.change_feed.changes_since(collection_name, since_version, limit)
+            return {"success": True, **changes}
+        except Exception as e:
+            logger.error(f"Error reading changes of collection {collection_name}: {e}")
+            return {"success": False, "error": str(e)}
+    
+    @property
+    def change_feed(self):
+        """Change feed recording every write made through this adapter."""
+        return self.db_manager.change_feed
+    
     # Compatibility methods for existing interface
     @property
     def collection_manager(self):
@@ -0,0 +1,89 @@
+"""Maximal marginal relevance selection of search results.
+
+Overlapping chunks and query-expansion variants often retrieve several
+near-identical passages. Putting all of them into an LLM prompt spends
+tokens without adding information. MMR picks results one at a time. Each
+pick maximizes
+
+    lambda * relevance - (1 - lambda) * max similarity to the picks so far
+
+so a passage that repeats an earlier pick loses to a slightly less relevant
+passage that says something new. The similarities come from the chunks'
+stored embeddings, and the selection loop is vectorized over candidates.
+"""
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MMR_LAMBDA = 0.7
+# Candidates at least this similar to an earlier pick are dropped outright
+DEFAULT_DUPLICATE_THRESHOLD = 0.95
+
+
+def pairwise_similarity(vectors: Sequence[Optional[Sequence[float]]], groups: Sequence[str]) -> np.ndarray:
+    """Build the cosine similarity matrix of candidates.
+
+    Only candidates of the same group, i.e. the same vector space, are
+    compared. Pairs across groups, and candidates without a vector, get a
+    similarity of 0.
+
+    Args:
+        vectors: Stored vector of each candidate, or None if unknown.
+        groups: Vector space of each candidate, such as its collection.
+
+    Returns:
+        An (n, n) matrix of similarities.
+    """
+    similarity = np.zeros((len(vectors), len(vectors)), dtype=np.float32)
+    members = {}
+    for position, (vector, group) in enumerate(zip(vectors, groups)):
+        if vector is not None:
+            members.setdefault(group, []).append(position)
+
+    for positions in members.values():
+        block = np.asarray([vectors[position] for position in positions], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block = block / np.where(norms == 0, 1, norms)
+        similarity[np.ix_(positions, positions)] = block @ block.T
+    return similarity
+
+
+def mmr_select(
+    relevance: Sequence[float],
+    similarity: np.ndarray,
+    k: int,
+    lambda_mult: float = DEFAULT_MMR_LAMBDA,
+    duplicate_threshold: Optional[float] = DEFAULT_DUPLICATE_THRESHOLD
+) -> List[int]:
+    """Select up to k diverse, relevant candidates with maximal marginal relevance.
+
+    Args:
+        relevance: Relevance score of each candidate, such as its similarity to the query.
+        similarity: Pairwise candidate similarities from pairwise_similarity().
+        k: Maximum number of candidates to select.
+        lambda_mult: Weight of relevance against diversity, from 0 (diversity
+            only) to 1 (relevance only).
+        duplicate_threshold: Drop candidates at least this similar to a
+            selected one. Keeps all candidates if None.
+
+    Returns:
+        Positions of the selected candidates in selection order.
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    remaining = np.ones(len(relevance), dtype=bool)
+    max_similarity = np.zeros(len(relevance), dtype=np.float32)
+    selected: List[int] = []
+
+    while len(selected) < k and remaining.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~remaining] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        remaining[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[best])
+        if duplicate_threshold is not None:
+            remaining &= max_similarity < duplicate_threshold
+    return selected
@@ -0,0 +1,359 @@
+"""Chunk documents stored by reference to their source files.
+
+Synced chunk text is already kept by the collection store, either as
+`collection_files.content` in SQLite or as files on disk. Storing it again
+as the vector index's document payload doubles the index's footprint, and
+overlapping chunks repeat the same text several times.
+
+A collection with 'reference' document storage keeps an empty document for
+each chunk whose text appears verbatim in its source file. The chunk's
+metadata records where to find the text instead: the collection and path of
+the file, the hash of the file content the offsets refer to, and the start
+and end character offsets. Reads rehydrate the text from the collection
+store through a bounded LRU cache of file contents. Chunks whose text cannot
+be found in their file keep their text inline.
+
+The markdown chunker re-joins the lines of a section, so a chunk is also
+located when only its whitespace differs from the file. Such a chunk reads
+back with the file's whitespace.
+
+A reference only resolves while the file still has the content it was taken
+from. After the file changes, its chunks read back empty until the next sync
+points them at the new content.
+"""
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Collection metadata key recording how chunk documents are stored ('inline', 'reference')
+DOCUMENT_STORAGE_METADATA_KEY = "document_storage"
+DEFAULT_DOCUMENT_STORAGE = "inline"
+SUPPORTED_DOCUMENT_STORAGE = ("inline", "reference")
+
+# Chunk metadata keys of a document reference
+REFERENCE_COLLECTION_KEY = "doc_collection"
+REFERENCE_PATH_KEY = "doc_path"
+REFERENCE_HASH_KEY = "doc_hash"
+REFERENCE_START_KEY = "doc_start"
+REFERENCE_END_KEY = "doc_end"
+REFERENCE_KEYS = (
+    REFERENCE_COLLECTION_KEY, REFERENCE_PATH_KEY, REFERENCE_HASH_KEY, REFERENCE_START_KEY, REFERENCE_END_KEY
+)
+
+# Chunk metadata fields naming the source file of a synced chunk
+SOURCE_COLLECTION_FIELD = "collection_name"
+SOURCE_PATH_FIELD = "source_file"
+
+# Memory budget of the file content cache used for rehydration
+DOCUMENT_CACHE_MB = int(os.getenv("RAG_DOCUMENT_CACHE_MB", "64"))
+
+FileReader = Callable[[str, str], Optional[str]]
+
+
+def content_hash(content: str) -> str:
+    """Hash file content the same way the sync manager hashes files."""
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def locate_text(content: str, text: str) -> Optional[Tuple[int, int]]:
+    """Find text in content, allowing whitespace runs to differ.
+
+    Returns:
+        Tuple of (start, end) character offsets, or None if not found.
+    """
+    start = content.find(text)
+    if start >= 0:
+        return start, start + len(text)
+    words = text.split()
+    if not words:
+        return None
+    match = re.search(r"\s+".join(re.escape(word) for word in words), content)
+    return (match.start(), match.end()) if match else None
+
+
+def collection_document_storage(collection: Any) -> str:
+    """Get how a collection stores chunk documents ('inline' or 'reference')."""
+    metadata = getattr(collection, "metadata", None)
+    if isinstance(metadata, dict):
+        storage = metadata.get(DOCUMENT_STORAGE_METADATA_KEY)
+        if isinstance(storage, str) and storage:
+            return storage
+    return DEFAULT_DOCUMENT_STORAGE
+
+
+class FileContentCache:
+    """LRU cache of source file contents, bounded by their total size."""
+
+    def __init__(self, max_bytes: int = DOCUMENT_CACHE_MB * 1024 * 1024):
+        """Create an empty cache.
+
+        Args:
+            max_bytes: Total size of the cached contents, in UTF-8 bytes.
+        """
+        self.max_bytes = max_bytes
+        self.reader: Optional[FileReader] = None
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, str, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def set_reader(self, reader: Optional[FileReader]) -> None:
+        """Set the function reading a file's current content from the collection store.
+
+        Args:
+            reader: Called as reader(collection_name, file_path); returns the
+                content or None if the file does not exist.
+        """
+        self.reader = reader
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all cached contents."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _put(self, key: Tuple[str, str], content: str, digest: str) -> None:
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (content, digest, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def load(self, collection_name: str, file_path: str) -> Optional[Tuple[str, str]]:
+        """Read a file's current content from the collection store and cache it.
+
+        Returns:
+            Tuple of (content, hash), or None if the file cannot be read.
+        """
+        if self.reader is None:
+            return None
+        try:
+            content = self.reader(collection_name, file_path)
+        except Exception as e:
+            logger.warning(f"Failed to read {collection_name}/{file_path} for document references: {str(e)}")
+            return None
+        if content is None:
+            return None
+        digest = content_hash(content)
+        self._put((collection_name, file_path), content, digest)
+        return content, digest
+
+    def resolve(self, metadata: Dict[str, Any]) -> Optional[str]:
+        """Get the text a chunk's document reference points to.
+
+        Returns:
+            The text, or None if the metadata holds no reference or the file
+            no longer has the referenced content.
+        """
+        try:
+            key = (metadata[REFERENCE_COLLECTION_KEY], metadata[REFERENCE_PATH_KEY])
+            digest = metadata[REFERENCE_HASH_KEY]
+            start, end = int(metadata[REFERENCE_START_KEY]), int(metadata[REFERENCE_END_KEY])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        # A cached older version of the file still serves references taken from it
+        if entry is None or entry[1] != digest:
+            loaded = self.load(*key)
+            if loaded is None or loaded[1] != digest:
+                logger.debug(f"Document reference to {key[0]}/{key[1]} is stale")
+                return None
+            entry = loaded
+        return entry[0][start:end]
+
+
+class ReferencedDocumentCollection:
+    """A collection storing chunk documents as references to their source files.
+
+    Exposes the subset of the ChromaDB collection API the vector store uses.
+    Writes replace documents found verbatim in their source file with a
+    reference, and reads rehydrate them.
+    """
+
+    def __init__(self, inner: Any, cache: FileContentCache):
+        """Wrap a (possibly sharded) physical collection.
+
+        Args:
+            inner: Collection holding the records.
+            cache: Cache reading and holding source file contents.
+        """
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self.inner.metadata
+
+    def count(self) -> int:
+        return self.inner.count()
+
+    def modify(self, metadata: Optional[Dict[str, Any]] = None) -> None:
+        self.inner.modify(metadata=metadata)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        self.inner.delete(ids=ids, where=where)
+
+    def dereference(
+        self,
+        documents: Optional[List[str]],
+        metadatas: Optional[List[Dict[str, Any]]]
+    ) -> Tuple[Optional[List[str]], Optional[List[Dict[str, Any]]]]:
+        """Replace documents found in their source files by references.
+
+        Each source file is read once per call, so the references point at
+        its current content.
+
+        Returns:
+            Tuple of (documents, metadatas) to store.
+        """
+        if documents is None or metadatas is None or self.cache.reader is None:
+            return documents, metadatas
+
+        sources: Dict[Tuple[str, str], Optional[Tuple[str, str]]] = {}
+        stored_documents, stored_metadatas = [], []
+        for document, metadata in zip(documents, metadatas):
+            metadata = metadata or {}
+            key = (metadata.get(SOURCE_COLLECTION_FIELD), metadata.get(SOURCE_PATH_FIELD))
+            source = None
+            if document and isinstance(key[0], str) and isinstance(key[1], str):
+                if key not in sources:
+                    sources[key] = self.cache.load(*key)
+                source = sources[key]
+            # Any occurrence of the text slices back to the same text
+            span = locate_text(source[0], document) if source else None
+            if span is None:
+                stored_documents.append(document)
+                stored_metadatas.append(metadata)
+                continue
+            stored_documents.append("")
+            stored_metadatas.append({
+                **metadata,
+                REFERENCE_COLLECTION_KEY: key[0],
+                REFERENCE_PATH_KEY: key[1],
+                REFERENCE_HASH_KEY: source[1],
+                REFERENCE_START_KEY: span[0],
+                REFERENCE_END_KEY: span[1],
+            })
+        return stored_documents, stored_metadatas
+
+    def _rehydrate(self, documents: Optional[List[str]], metadatas: Optional[List[Dict[str, Any]]]) -> None:
+        """Resolve referenced documents and hide reference keys, in place."""
+        if metadatas is None:
+            return
+        for i, metadata in enumerate(metadatas):
+            if not metadata or REFERENCE_START_KEY not in metadata:
+                continue
+            if documents is not None and not documents[i]:
+                documents[i] = self.cache.resolve(metadata) or ""
+            metadatas[i] = {key: value for key, value in metadata.items() if key not in REFERENCE_KEYS}
+
+    def _write(self, method: str, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        documents, metadatas = self.dereference(documents, metadatas)
+        getattr(self.inner, method)(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def add(self, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        self._write("add", ids, embeddings, metadatas, documents)
+
+    def upsert(self, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        self._write("upsert", ids, embeddings, metadatas, documents)
+
+    def update(self, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        # Stored metadata is merged, so metadata-only updates keep their references
+        self._write("update", ids, embeddings, metadatas, documents)
+
+    def repoint(self, ids: List[str], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
+        """Update the metadata of records whose text is unchanged but whose file may have changed.
+
+        References are taken again from the file's current content without
+        re-embedding. Records whose text is no longer found in the file get
+        their text back inline, keeping their stored vectors.
+
+        Args:
+            ids: Document IDs.
+            metadatas: Storage-ready metadata dictionaries.
+            documents: Current text of the documents.
+        """
+        stored_documents, stored_metadatas = self.dereference(documents, metadatas)
+        inline = [i for i, document in enumerate(stored_documents) if document]
+        referenced_before = set()
+        if inline:
+            current = self.inner.get(ids=[ids[i] for i in inline], include=['documents'])
+            referenced_before = {
+                doc_id for doc_id, document in zip(current['ids'], current['documents']) if not document
+            }
+
+        keep = [i for i in range(len(ids)) if ids[i] not in referenced_before]
+        if keep:
+            self.inner.update(ids=[ids[i] for i in keep], metadatas=[stored_metadatas[i] for i in keep])
+        restore = [i for i in range(len(ids)) if ids[i] in referenced_before]
+        if restore:
+            restore_ids = [ids[i] for i in restore]
+            fetched = self.inner.get(ids=restore_ids, include=['embeddings'])
+            vectors = dict(zip(fetched['ids'], fetched['embeddings']))
+            self.inner.update(
+                ids=restore_ids,
+                embeddings=[vectors[doc_id] for doc_id in restore_ids],
+                metadatas=[stored_metadatas[i] for i in restore],
+                documents=[stored_documents[i] for i in restore]
+            )
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("metadatas", "documents")) -> Dict[str, Any]:
+        include = list(include)
+        wants_metadatas = 'metadatas' in include
+        if 'documents' in include and not wants_metadatas:
+            include.append('metadatas')
+        results = self.inner.get(ids=ids, where=where, limit=limit, offset=offset, include=include)
+        self._rehydrate(results.get('documents'), results.get('metadatas'))
+        if not wants_metadatas:
+            results['metadatas'] = None
+        return results
+
+    def query(self, n_results: int = 10, **kwargs) -> Dict[str, Any]:
+        include = list(kwargs.get('include', ("metadatas", "documents", "distances")))
+        wants_metadatas = 'metadatas' in include
+        if 'documents' in include and not wants_metadatas:
+            include.append('metadatas')
+        kwargs['include'] = include
+        results = self.inner.query(n_results=n_results, **kwargs)
+        documents, metadatas = results.get('documents'), results.get('metadatas')
+        for row in range(len(metadatas or [])):
+            self._rehydrate(documents[row] if documents else None, metadatas[row])
+        if not wants_metadatas:
+            results['metadatas'] = None
+        return results
+
+
+_file_content_caches: Dict[str, FileContentCache] = {}
+_file_content_caches_lock = threading.Lock()
+
+
+def get_file_content_cache(persist_directory: str) -> FileContentCache:
+    """Get the shared file content cache of a vector database directory."""
+    key = os.path.abspath(persist_directory)
+    with _file_content_caches_lock:
+        cache = _file_content_caches.get(key)
+        if cache is None:
+            cache = FileContentCache()
+            _file_content_caches[key] = cache
+        return cache
@@ -0,0 +1,395 @@
+"""Local embedding server shared by processes on the same machine.
+
+The server loads each embedding model once and serves encode requests over
+a Unix domain socket. Requests arriving within a short window are merged
+into one model call (dynamic batching), which keeps the CPU busy with a few
+large encodes instead of many small ones. EmbeddingService acts as a client
+when RAG_EMBEDDING_SERVER_SOCKET points at a running server.
+
+Wire format (all integers big-endian, every message prefixed by a 4-byte
+payload length):
+
+    request:  opcode u8 | model name length u16 | model name utf-8 |
+              text count u32 | (text length u32 | text utf-8)*
+    response: status u8 | rows u32 | dimension u32 | rows*dimension float32 (little-endian)
+              or status u8 (error) | message utf-8
+
+Run with:
+    python -m tools.knowledge_base.embedding_server --socket /tmp/rag-embeddings.sock
+"""
+import os
+import socket
+import struct
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .embeddings import get_embedding_registry, _resolve_model_name
+
+logger = logging.getLogger(__name__)
+
+OP_ENCODE = 1
+OP_PING = 2
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+DEFAULT_BATCH_WINDOW_MS = float(os.getenv("RAG_EMBEDDING_SERVER_BATCH_WINDOW_MS", "5"))
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("RAG_EMBEDDING_SERVER_MAX_BATCH_SIZE", "128"))
+
+_LENGTH = struct.Struct("!I")
+_REQUEST_HEADER = struct.Struct("!BH")
+_RESPONSE_HEADER = struct.Struct("!BII")
+
+
+def encode_request(opcode: int, model_name: str = "", texts: Optional[List[str]] = None) -> bytes:
+    """Build a length-prefixed request message."""
+    model_bytes = model_name.encode("utf-8")
+    parts = [_REQUEST_HEADER.pack(opcode, len(model_bytes)), model_bytes]
+    texts = texts or []
+    parts.append(_LENGTH.pack(len(texts)))
+    for text in texts:
+        text_bytes = text.encode("utf-8")
+        parts.append(_LENGTH.pack(len(text_bytes)))
+        parts.append(text_bytes)
+    payload = b"".join(parts)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode_request(payload: bytes) -> Tuple[int, str, List[str]]:
+    """Parse a request payload into (opcode, model name, texts)."""
+    opcode, model_length = _REQUEST_HEADER.unpack_from(payload, 0)
+    offset = _REQUEST_HEADER.size
+    model_name = payload[offset:offset + model_length].decode("utf-8")
+    offset += model_length
+    (count,) = _LENGTH.unpack_from(payload, offset)
+    offset += _LENGTH.size
+    texts = []
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(payload, offset)
+        offset += _LENGTH.size
+        texts.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    return opcode, model_name, texts
+
+
+def encode_response(embeddings: Optional[np.ndarray] = None, error: Optional[str] = None) -> bytes:
+    """Build a length-prefixed response message."""
+    if error is not None:
+        payload = bytes([STATUS_ERROR]) + error.encode("utf-8")
+    else:
+        matrix = np.ascontiguousarray(
+            embeddings if embeddings is not None else np.zeros((0, 0)), dtype="<f4"
+        )
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        payload = _RESPONSE_HEADER.pack(STATUS_OK, matrix.shape[0], matrix.shape[1]) + matrix.tobytes()
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode_response(payload: bytes) -> np.ndarray:
+    """Parse a response payload into a float32 matrix.
+
+    Raises:
+        RuntimeError: If the server reported an error.
+    """
+    if payload[0] == STATUS_ERROR:
+        raise RuntimeError(f"Embedding server error: {payload[1:].decode('utf-8')}")
+    _, rows, dimension = _RESPONSE_HEADER.unpack_from(payload, 0)
+    return np.frombuffer(payload, dtype="<f4", offset=_RESPONSE_HEADER.size).reshape(rows, dimension)
+
+
+class _PendingRequest:
+    """Texts of one client request waiting in a model's batch queue."""
+
+    def __init__(self, texts: List[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+
+
+class EmbeddingServer:
+    """Unix socket server that batches encode requests across clients."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ):
+        """Initialize the server.
+
+        Args:
+            socket_path: Path of the Unix domain socket to listen on.
+            batch_window_ms: How long to wait for more requests before encoding.
+            max_batch_size: Texts per model call; a full batch is encoded at once.
+        """
+        self.socket_path = socket_path
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.stats = {"requests": 0, "texts": 0, "batches": 0}
+
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._batchers: List[asyncio.Task] = []
+        self._writers: set = set()
+        # Models run one batch at a time; encoding releases the GIL in torch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-server")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    async def _encode(self, model_name: str, texts: List[str]) -> np.ndarray:
+        """Queue texts for the next batch of a model and wait for their embeddings."""
+        queue = self._queues.get(model_name)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._queues[model_name] = queue
+            self._batchers.append(asyncio.ensure_future(self._run_batcher(model_name, queue)))
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(_PendingRequest(texts, future))
+        return await future
+
+    async def _run_batcher(self, model_name: str, queue: asyncio.Queue) -> None:
+        """Collect queued requests for one model into batches and encode them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0].texts)
+            deadline = loop.time() + self.batch_window
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            texts = [text for request in batch for text in request.texts]
+            try:
+                embeddings = await loop.run_in_executor(self._executor, self._encode_batch, model_name, texts)
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            offset = 0
+            for request in batch:
+                rows = embeddings[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+                if not request.future.done():
+                    request.future.set_result(rows)
+
+    @staticmethod
+    def _encode_batch(model_name: str, texts: List[str]) -> np.ndarray:
+        """Encode texts with a resident model from the embedding registry."""
+        service = get_embedding_registry().get_service(model_name=model_name)
+        return np.asarray(service._encode_batch_locally(texts), dtype=np.float32)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests of one connection until the client disconnects."""
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_LENGTH.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = _LENGTH.unpack(header)
+                payload = await reader.readexactly(length)
+
+                try:
+                    opcode, model_name, texts = decode_request(payload)
+                    if opcode == OP_PING:
+                        response = encode_response()
+                    elif opcode == OP_ENCODE:
+                        self.stats["requests"] += 1
+                        self.stats["texts"] += len(texts)
+                        embeddings = (await self._encode(_resolve_model_name(model_name or None), texts)
+                                      if texts else np.zeros((0, 0), dtype=np.float32))
+                        response = encode_response(embeddings)
+                    else:
+                        response = encode_response(error=f"Unknown opcode {opcode}")
+                except Exception as e:
+                    logger.error(f"Embedding request failed: {str(e)}")
+                    response = encode_response(error=str(e))
+
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def start(self) -> None:
+        """Start listening on the socket in the running event loop."""
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        logger.info(f"Embedding server listening on {self.socket_path}")
+
+    async def serve_forever(self) -> None:
+        """Start the server and serve until cancelled."""
+        await self.start()
+        self._ready.set()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        """Stop batchers, disconnect clients and remove the socket file."""
+        for batcher in self._batchers:
+            batcher.cancel()
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            try:
+                await asyncio.wait_for(self._server.wait_closed(), 5)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out waiting for embedding server connections to close")
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def start_in_thread(self, timeout: float = 10.0) -> "EmbeddingServer":
+        """Run the server on a background event loop thread.
+
+        Returns:
+            The server, once it is accepting connections.
+        """
+        def run():
+            try:
+                asyncio.run(self.serve_forever())
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=run, name="embedding-server", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError(f"Embedding server did not start on {self.socket_path}")
+        return self
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop a server started with start_in_thread()."""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._executor.shutdown(wait=False)
+
+
+class EmbeddingServerClient:
+    """Blocking client for the embedding server, safe to share between threads."""
+
+    def __init__(self, socket_path: str, timeout: float = 60.0):
+        """Initialize the client.
+
+        Args:
+            socket_path: Path of the server's Unix domain socket.
+            timeout: Socket timeout in seconds.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        """Get this thread's connection, connecting on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            connection.connect(self.socket_path)
+            self._local.connection = connection
+        return connection
+
+    def _receive_exactly(self, connection: socket.socket, size: int) -> bytes:
+        buffer = bytearray()
+        while len(buffer) < size:
+            chunk = connection.recv(size - len(buffer))
+            if not chunk:
+                raise ConnectionError("Embedding server closed the connection")
+            buffer.extend(chunk)
+        return bytes(buffer)
+
+    def _request(self, message: bytes) -> np.ndarray:
+        connection = self._connection()
+        try:
+            connection.sendall(message)
+            (length,) = _LENGTH.unpack(self._receive_exactly(connection, _LENGTH.size))
+            return decode_response(self._receive_exactly(connection, length))
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+
+    def encode(self, texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+        """Encode texts on the server.
+
+        Args:
+            texts: Texts to encode.
+            model_name: Model to use. Uses the server's default if None.
+
+        Returns:
+            Float32 matrix with one row per text.
+        """
+        return self._request(encode_request(OP_ENCODE, model_name or "", texts))
+
+    def ping(self) -> bool:
+        """Check that the server is reachable."""
+        try:
+            self._request(encode_request(OP_PING))
+            return True
+        except (OSError, ConnectionError, RuntimeError):
+            return False
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                connection.close()
+            finally:
+                self._local.connection = None
+
+
+def run_embedding_server_cli(argv: Optional[List[str]] = None) -> None:
+    """Run the embedding server from the command line."""
+    parser = argparse.ArgumentParser(description="Shared local embedding server")
+    parser.add_argument("--socket", default=os.getenv("RAG_EMBEDDING_SERVER_SOCKET", "/tmp/rag-embeddings.sock"),
+                        help="Unix domain socket path")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                        help="Time to collect requests into one batch")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Maximum texts per model call")
+    parser.add_argument("--preload", action="append", default=[],
+                        help="Model to load at startup (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    registry = get_embedding_registry()
+    # This process owns the models; it must not forward to itself
+    registry.server_socket = None
+    for model_name in args.preload:
+        registry.get_service(model_name=model_name)
+
+    server = EmbeddingServer(args.socket, batch_window_ms=args.batch_window_ms, max_batch_size=args.max_batch_size)
+    try:
+        asyncio.run(server.serve_forever())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("Embedding server stopped")
+
+
+if __name__ == "__main__":
+    run_embedding_server_cli()
@@ -1,37 +1,257 @@
 """Embedding service implementation using SentenceTransformers."""
 import os
 import logging
-from typing import List, Union, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Union, Optional, Tuple
 from .dependencies import rag_deps, ensure_rag_available
 
 logger = logging.getLogger(__name__)
 
-# Global singleton instance
-_embedding_service_instance = None
+DEFAULT_MODEL_NAME = "distiluse-base-multilingual-cased-v1"
+DEFAULT_DEVICE = "cpu"
 
-class EmbeddingService:
-    """SentenceTransformers-based embedding service with singleton pattern."""
+# Total RAM the resident models may use before least recently used ones are evicted
+DEFAULT_MODEL_MEMORY_BUDGET_MB = 2048
+# Size assumed for a model whose parameters cannot be inspected
+FALLBACK_MODEL_SIZE_MB = 500
+
+
+def _resolve_model_name(model_name: Optional[str] = None) -> str:
+    """Resolve a model name, falling back to RAG_MODEL_NAME."""
+    return model_name or os.getenv("RAG_MODEL_NAME", DEFAULT_MODEL_NAME)
+
+
+def _resolve_device(device: Optional[str] = None) -> str:
+    """Resolve a device, falling back to RAG_DEVICE."""
+    return device or os.getenv("RAG_DEVICE", DEFAULT_DEVICE)
+
+
+def _estimate_model_bytes(model: Any) -> int:
+    """Estimate the RAM footprint of a loaded model from its parameters.
     
-    def __new__(cls, model_name: Optional[str] = None, device: Optional[str] = None, cache_folder: Optional[str] = None):
-        """Singleton pattern: return existing instance with same config or create new one."""
-        global _embedding_service_instance
+    Args:
+        model: Loaded SentenceTransformer (or any torch module).
+        
+    Returns:
+        Estimated size in bytes.
+    """
+    try:
+        total = 0
+        for parameter in model.parameters():
+            total += int(parameter.numel()) * int(parameter.element_size())
+        if total > 0:
+            return total
+    except Exception:
+        pass
+    return FALLBACK_MODEL_SIZE_MB * 1024 * 1024
+
+
+class EmbeddingModelRegistry:
+    """Keeps several embedding models resident within a RAM budget.
+    
+    One EmbeddingService exists per (model_name, device). Loaded models are
+    tracked in least-recently-used order; when loading a model pushes the
+    resident total over the budget, the least recently used models are
+    unloaded. Unloaded services stay registered and reload lazily on their
+    next use. The most recently used model is never evicted, so a single
+    model larger than the budget still works.
+    
+    The registry also records which model each collection is embedded with.
+    """
+    
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        """Initialize the registry.
+        
+        Args:
+            memory_budget_mb: RAM budget for resident models. Uses
+                RAG_MODEL_MEMORY_BUDGET_MB or the default if None.
+        """
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("RAG_MODEL_MEMORY_BUDGET_MB", DEFAULT_MODEL_MEMORY_BUDGET_MB))
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        
+        self._services: Dict[Tuple[str, str], "EmbeddingService"] = {}
+        self._resident: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._collection_models: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        # Socket of a shared embedding server; services forward encodes to it when set
+        self.server_socket: Optional[str] = os.getenv("RAG_EMBEDDING_SERVER_SOCKET") or None
+    
+    def _get_or_register(self, cls: type, model_name: str, device: str) -> "EmbeddingService":
+        """Return the registered service for a model, creating an empty one if needed."""
+        key = (model_name, device)
+        with self._lock:
+            service = self._services.get(key)
+            if service is None:
+                logger.info(f"Registering EmbeddingService for model: {model_name}")
+                service = object.__new__(cls)
+                self._services[key] = service
+            else:
+                logger.debug(f"Reusing EmbeddingService for model: {model_name}")
+            return service
+    
+    def get_service(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        cache_folder: Optional[str] = None
+    ) -> "EmbeddingService":
+        """Get the embedding service for a model, loading it if necessary.
+        
+        Args:
+            model_name: Model name. Uses RAG_MODEL_NAME if None.
+            device: Device to run the model on. Uses RAG_DEVICE if None.
+            cache_folder: Folder to cache the model.
+            
+        Returns:
+            The shared EmbeddingService for that model.
+        """
+        return EmbeddingService(model_name=model_name, device=device, cache_folder=cache_folder)
+    
+    def mark_loaded(self, service: "EmbeddingService") -> None:
+        """Record a freshly loaded model and evict others if over budget."""
+        key = (service.model_name, service.device)
+        with self._lock:
+            self._resident[key] = _estimate_model_bytes(service.model)
+            self._resident.move_to_end(key)
+            self._evict_over_budget(keep=key)
+    
+    def touch(self, service: "EmbeddingService") -> None:
+        """Mark a model as most recently used."""
+        key = (service.model_name, service.device)
+        with self._lock:
+            if key in self._resident:
+                self._resident.move_to_end(key)
+    
+    def _evict_over_budget(self, keep: Tuple[str, str]) -> None:
+        """Unload least recently used models until the budget is respected."""
+        while self.resident_bytes > self.memory_budget_bytes and len(self._resident) > 1:
+            oldest = next(iter(self._resident))
+            if oldest == keep:
+                break
+            self.unload(*oldest)
+    
+    def unload(self, model_name: str, device: Optional[str] = None) -> bool:
+        """Unload a model from memory while keeping its service registered.
         
-        # Get the configuration that would be used
-        final_model_name = model_name or os.getenv("RAG_MODEL_NAME", "distiluse-base-multilingual-cased-v1")
-        final_device = device or os.getenv("RAG_DEVICE", "cpu")
+        Args:
+            model_name: Model name.
+            device: Device the model runs on. Uses RAG_DEVICE if None.
+            
+        Returns:
+            True if a resident model was unloaded.
+        """
+        key = (model_name, _resolve_device(device))
+        with self._lock:
+            size = self._resident.pop(key, None)
+            service = self._services.get(key)
+            if service is not None:
+                # Callers in the middle of an encode hold their own reference
+                service.model = None
+            if size is None:
+                return False
+            logger.info(f"Evicted embedding model {model_name} ({size / (1024 * 1024):.1f} MB)")
+            return True
+    
+    @property
+    def resident_bytes(self) -> int:
+        """Total estimated size of all resident models."""
+        return sum(self._resident.values())
+    
+    def resident_models(self) -> List[str]:
+        """Names of resident models, least recently used first."""
+        with self._lock:
+            return [model_name for model_name, _ in self._resident]
+    
+    def assign_collection_model(self, collection_name: str, model_name: str) -> None:
+        """Record the embedding model used by a collection.
+        
+        Args:
+            collection_name: Collection name.
+            model_name: Model the collection's vectors are embedded with.
+        """
+        with self._lock:
+            self._collection_models[collection_name] = model_name
+    
+    def unassign_collection_model(self, collection_name: str) -> None:
+        """Forget the model assignment of a collection."""
+        with self._lock:
+            self._collection_models.pop(collection_name, None)
+    
+    def get_collection_model(self, collection_name: str) -> Optional[str]:
+        """Get the model assigned to a collection, if any."""
+        with self._lock:
+            return self._collection_models.get(collection_name)
+    
+    def get_service_for_collection(
+        self,
+        collection_name: str,
+        default_model: Optional[str] = None
+    ) -> "EmbeddingService":
+        """Get the embedding service a collection should be embedded with.
         
-        # Check if we already have an instance with the same configuration
-        if (_embedding_service_instance is not None and
-            _embedding_service_instance.model_name == final_model_name and
-            _embedding_service_instance.device == final_device):
-            logger.info(f"Reusing existing EmbeddingService instance with model: {final_model_name}")
-            return _embedding_service_instance
+        Args:
+            collection_name: Collection name.
+            default_model: Model to use when the collection has no assignment.
+            
+        Returns:
+            The EmbeddingService for the collection's model.
+        """
+        model_name = self.get_collection_model(collection_name) or default_model
+        return self.get_service(model_name=model_name)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get memory usage statistics for the registry.
         
-        # Create new instance
-        logger.info(f"Creating new EmbeddingService instance with model: {final_model_name}")
-        instance = super().__new__(cls)
-        _embedding_service_instance = instance
-        return instance
+        Returns:
+            Dictionary with budget, resident models and assignments.
+        """
+        with self._lock:
+            return {
+                "memory_budget_mb": round(self.memory_budget_bytes / (1024 * 1024), 1),
+                "resident_mb": round(self.resident_bytes / (1024 * 1024), 1),
+                "resident_models": [
+                    {"model_name": model_name, "device": device, "size_mb": round(size / (1024 * 1024), 1)}
+                    for (model_name, device), size in self._resident.items()
+                ],
+                "registered_models": sorted({model_name for model_name, _ in self._services}),
+                "collection_models": dict(self._collection_models)
+            }
+    
+    def clear(self) -> None:
+        """Drop all services and assignments."""
+        with self._lock:
+            for service in self._services.values():
+                service.model = None
+            self._services.clear()
+            self._resident.clear()
+            self._collection_models.clear()
+
+
+# Global registry instance
+_embedding_registry: Optional[EmbeddingModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_embedding_registry() -> EmbeddingModelRegistry:
+    """Get or create the global embedding model registry."""
+    global _embedding_registry
+    if _embedding_registry is None:
+        with _registry_lock:
+            if _embedding_registry is None:
+                _embedding_registry = EmbeddingModelRegistry()
+    return _embedding_registry
+
+
+class EmbeddingService:
+    """SentenceTransformers-based embedding service shared per model via the registry."""
+    
+    def __new__(cls, model_name: Optional[str] = None, device: Optional[str] = None, cache_folder: Optional[str] = None):
+        """Return the registered instance for this model and device, creating it if needed."""
+        return get_embedding_registry()._get_or_register(
+            cls, _resolve_model_name(model_name), _resolve_device(device)
+        )
     
     def __init__(
         self,
@@ -46,18 +266,31 @@ class EmbeddingService:
             device: Device to run the model on ('cpu', 'cuda', etc.).
             cache_folder: Folder to cache the model.
         """
-        # Skip initialization if already initialized (singleton reuse)
-        if hasattr(self, 'model') and self.model is not None:
+        # Skip initialization if already initialized (registry reuse)
+        if getattr(self, 'model', None) is not None:
+            get_embedding_registry().touch(self)
+            return
+        if getattr(self, '_server_client', None) is not None:
             return
             
         ensure_rag_available()
         
-        self.model_name = model_name or os.getenv("RAG_MODEL_NAME", "distiluse-base-multilingual-cased-v1")
-        self.device = device or os.getenv("RAG_DEVICE", "cpu")
-        self.cache_folder = cache_folder
-        self.model = None
+        if not hasattr(self, 'model_name'):
+            self.model_name = _resolve_model_name(model_name)
+            self.device = _resolve_device(device)
+            self.cache_folder = cache_folder
+            self._load_lock = threading.Lock()
+            self._server_client = None
+            self.model = None
         
-        self._load_model()
+        server_socket = get_embedding_registry().server_socket
+        if server_socket:
+            from .embedding_server import EmbeddingServerClient
+            self._server_client = EmbeddingServerClient(server_socket)
+            logger.info(f"EmbeddingService for {self.model_name} uses embedding server at {server_socket}")
+            return
+        
+        self._ensure_model_loaded()
         logger.info(f"EmbeddingService initialized with model: {self.model_name}")
     
     def _load_model(self):
@@ -70,11 +303,44 @@ class EmbeddingService:
                 device=self.device,
                 cache_folder=self.cache_folder
             )
+            get_embedding_registry().mark_loaded(self)
             logger.info("Model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load model {self.model_name}: {str(e)}")
             raise
     
+    def _ensure_model_loaded(self) -> Any:
+        """Return the loaded model, reloading it if the registry evicted it."""
+        model = self.model
+        if model is None:
+            with self._load_lock:
+                if self.model is None:
+                    logger.info(f"Reloading evicted model: {self.model_name}")
+                    self._load_model()
+                model = self.model
+        get_embedding_registry().touch(self)
+        return model
+    
+    def _encode_remote(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Encode texts on the embedding server.
+        
+        Returns:
+            Embeddings, or None if the server is unreachable. The service then
+            stops using the server and loads the model locally.
+        """
+        client = self._server_client
+        if client is None:
+            return None
+        try:
+            return client.encode(texts, model_name=self.model_name).tolist()
+        except (OSError, ConnectionError) as e:
+            logger.warning(
+                f"Embedding server at {client.socket_path} unreachable ({str(e)}); "
+                f"loading {self.model_name} locally"
+            )
+            self._server_client = None
+            return None
+    
     def encode_text(self, text: str) -> List[float]:
         """Encode a single text into embeddings.
         
@@ -88,7 +354,11 @@ class EmbeddingService:
             Exception: If encoding fails.
         """
         try:
-            embedding = self.model.encode(text, convert_to_tensor=False)
+            remote = self._encode_remote([text])
+            if remote is not None:
+                return remote[0]
+            
+            embedding = self._ensure_model_loaded().encode(text, convert_to_tensor=False)
             # Ensure it's a list of floats
             np = rag_deps.get_component('numpy')
             if isinstance(embedding, np.ndarray):
@@ -123,6 +393,22 @@ class EmbeddingService:
             logger.warning("Empty text list provided for batch encoding")
             return []
         
+        try:
+            remote = self._encode_remote(texts)
+            if remote is not None:
+                return remote
+            return self._encode_batch_locally(texts, batch_size, show_progress_bar)
+        except Exception as e:
+            logger.error(f"Failed to encode batch: {str(e)}")
+            raise
+    
+    def _encode_batch_locally(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress_bar: bool = False
+    ) -> List[List[float]]:
+        """Encode a batch of texts with the model loaded in this process."""
         try:
             logger.info(f"Encoding batch of {len(texts)} texts")
             
@@ -134,7 +420,7 @@ class EmbeddingService:
             if batch_size is not None:
                 encode_kwargs["batch_size"] = batch_size
             
-            embeddings = self.model.encode(texts, **encode_kwargs)
+            embeddings = self._ensure_model_loaded().encode(texts, **encode_kwargs)
             
             # Ensure embeddings are lists of floats
             np = rag_deps.get_component('numpy')
@@ -244,13 +530,20 @@ class EmbeddingService:
         Args:
             model_name: New model name to load. Uses current if None.
         """
-        if model_name:
-            self.model_name = model_name
+        registry = get_embedding_registry()
+        if model_name and model_name != self.model_name:
+            # The registry keys services by model name, so switching models
+            # hands back the (possibly new) service for the requested model
+            return registry.get_service(model_name=model_name, device=self.device, cache_folder=self.cache_folder)
         
         logger.info(f"Reloading model: {self.model_name}")
+        registry.unload(self.model_name, self.device)
         self._load_model()
+        return self
 
 def reset_embedding_service_singleton():
-    """Reset the global singleton instance. Useful for tests."""
-    global _embedding_service_instance
-    _embedding_service_instance = None
\ No newline at end of file
+    """Reset the global embedding registry. Useful for tests."""
+    global _embedding_registry
+    if _embedding_registry is not None:
+        _embedding_registry.clear()
+    _embedding_registry = None
\ No newline at end of file
@@ -0,0 +1,350 @@
+"""Tombstone accounting and background compaction of vector collections.
+
+Deleting a record does not shrink a vector index. ChromaDB's HNSW graph and
+the mmap and quantized backends only mark deleted entries, filter them out
+of every query, and keep them in memory and on disk. Collections that are
+re-synced often accumulate dead entries, and searches slow down as they
+traverse them.
+
+VectorStore counts every delete as a tombstone of the physical collection
+it hit. Once tombstones make up RAG_COMPACTION_TOMBSTONE_RATIO of a
+collection, a background job rebuilds it. Live records are copied with their
+stored vectors into a shadow collection in small throttled batches, writes
+made meanwhile are mirrored, and the collection's route is switched
+atomically. Each batch waits for in-flight searches to finish, so compaction
+runs in the gaps between foreground queries.
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Share of tombstones in a collection at which it is compacted
+COMPACTION_TOMBSTONE_RATIO = float(os.getenv("RAG_COMPACTION_TOMBSTONE_RATIO", "0.2"))
+# Tombstones a collection needs before it is compacted at all
+COMPACTION_MIN_TOMBSTONES = int(os.getenv("RAG_COMPACTION_MIN_TOMBSTONES", "1000"))
+DEFAULT_COMPACTION_BATCH_SIZE = int(os.getenv("RAG_COMPACTION_BATCH_SIZE", "256"))
+DEFAULT_COMPACTION_THROTTLE_SECONDS = float(os.getenv("RAG_COMPACTION_THROTTLE_SECONDS", "0.05"))
+# Longest a batch waits for foreground searches to finish before it runs anyway
+COMPACTION_IDLE_WAIT_SECONDS = float(os.getenv("RAG_COMPACTION_IDLE_WAIT_SECONDS", "5"))
+
+TOMBSTONE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_tombstones (
+    physical_name TEXT PRIMARY KEY,
+    tombstones INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+"""
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class TombstoneLog:
+    """Count of deleted records still held by each physical collection."""
+
+    def __init__(self, db_path: str):
+        """Open or create the tombstone log.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(TOMBSTONE_SCHEMA)
+            for physical_name, tombstones in conn.execute(
+                "SELECT physical_name, tombstones FROM collection_tombstones"
+            ):
+                self._counts[physical_name] = tombstones
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def record(self, physical_name: str, count: int) -> int:
+        """Add tombstones to a physical collection.
+
+        Returns:
+            The collection's tombstone count.
+        """
+        if count <= 0:
+            return self.count(physical_name)
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    """INSERT INTO collection_tombstones (physical_name, tombstones, updated_at)
+                       VALUES (?, ?, ?)
+                       ON CONFLICT(physical_name) DO UPDATE SET
+                           tombstones = tombstones + excluded.tombstones,
+                           updated_at = excluded.updated_at""",
+                    (physical_name, count, _now())
+                )
+            self._counts[physical_name] = self._counts.get(physical_name, 0) + count
+            return self._counts[physical_name]
+
+    def count(self, physical_name: str) -> int:
+        """Get the tombstone count of a physical collection."""
+        return self._counts.get(physical_name, 0)
+
+    def clear(self, physical_name: str) -> None:
+        """Forget the tombstones of a physical collection that was dropped or rebuilt."""
+        with self._lock:
+            if self._counts.pop(physical_name, None) is None:
+                return
+            with self._connect() as conn:
+                conn.execute("DELETE FROM collection_tombstones WHERE physical_name = ?", (physical_name,))
+
+
+class ForegroundActivity:
+    """Tracks in-flight foreground searches so background work can yield to them."""
+
+    def __init__(self):
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @contextmanager
+    def track(self):
+        """Mark a foreground operation as running for the duration of the block."""
+        with self._condition:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if self._active == 0:
+                    self._condition.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no foreground operation is running.
+
+        Returns:
+            True if idle, False if the timeout passed first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._active == 0, timeout)
+
+
+# Searches of all vector stores of the process compete for the same CPU
+foreground_activity = ForegroundActivity()
+
+
+class CompactionJob:
+    """Rebuild one collection without its tombstones."""
+
+    def __init__(
+        self,
+        vector_store: Any,
+        collection_name: str,
+        batch_size: int = DEFAULT_COMPACTION_BATCH_SIZE,
+        throttle_seconds: float = DEFAULT_COMPACTION_THROTTLE_SECONDS,
+        idle_wait_seconds: float = COMPACTION_IDLE_WAIT_SECONDS
+    ):
+        """Initialize the job.
+
+        Args:
+            vector_store: VectorStore holding the collection.
+            collection_name: Logical name of the collection to compact.
+            batch_size: Records copied per batch.
+            throttle_seconds: Pause between batches.
+            idle_wait_seconds: Longest wait for foreground searches before a batch.
+        """
+        self.vector_store = vector_store
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.throttle_seconds = max(0.0, throttle_seconds)
+        self.idle_wait_seconds = max(0.0, idle_wait_seconds)
+
+        self.state = JOB_PENDING
+        self.tombstones = 0
+        self.total_documents = 0
+        self.processed_documents = 0
+        self.shadow_collection: Optional[str] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.state in (JOB_PENDING, JOB_RUNNING)
+
+    def run(self) -> Dict[str, Any]:
+        """Run the job in the calling thread.
+
+        Returns:
+            Final job status.
+        """
+        store = self.vector_store
+        self.state = JOB_RUNNING
+        self.started_at = _now()
+
+        try:
+            self.tombstones = store.tombstone_count(self.collection_name)
+            shadow = store.begin_shadow_collection(self.collection_name, reuse_projection=True)
+            self.shadow_collection = shadow.name
+
+            # Records added from now on are mirrored, so a snapshot of ids is complete
+            ids = store.list_document_ids(self.collection_name)
+            self.total_documents = len(ids)
+            logger.info(
+                f"Compacting {self.collection_name}: {self.total_documents} live records, "
+                f"{self.tombstones} tombstones"
+            )
+
+            for start in range(0, len(ids), self.batch_size):
+                if self._cancel_event.is_set():
+                    store.abort_shadow_collection(self.collection_name)
+                    self.state = JOB_CANCELLED
+                    logger.info(f"Compaction of {self.collection_name} cancelled")
+                    return self.to_dict()
+
+                foreground_activity.wait_idle(self.idle_wait_seconds)
+                batch = ids[start:start + self.batch_size]
+                store.copy_to_shadow_collection(batch, self.collection_name, reuse_vectors=True)
+                self.processed_documents += len(batch)
+                if self.throttle_seconds:
+                    time.sleep(self.throttle_seconds)
+
+            previous = store.commit_shadow_collection(self.collection_name, drop_previous=False)
+            # Searches that resolved the old collection before the switch may still be reading it
+            store._drop_in_background(previous)
+            self.state = JOB_COMPLETED
+            logger.info(f"Compaction of {self.collection_name} completed")
+        except Exception as e:
+            self.state = JOB_FAILED
+            self.error = str(e)
+            logger.error(f"Compaction of {self.collection_name} failed: {str(e)}")
+            try:
+                store.abort_shadow_collection(self.collection_name)
+            except Exception as abort_error:
+                logger.warning(f"Failed to discard shadow of {self.collection_name}: {str(abort_error)}")
+        finally:
+            self.finished_at = _now()
+
+        return self.to_dict()
+
+    def start(self) -> threading.Thread:
+        """Run the job in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self.run, name=f"compact-{self.collection_name}", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def cancel(self) -> None:
+        """Ask the job to stop after the current batch and discard the shadow."""
+        self._cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a started job to finish.
+
+        Returns:
+            True if the job is no longer running.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_active
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job status for API responses."""
+        progress = (self.processed_documents / self.total_documents * 100
+                    if self.total_documents else (100.0 if self.state == JOB_COMPLETED else 0.0))
+        return {
+            "collection_name": self.collection_name,
+            "state": self.state,
+            "tombstones": self.tombstones,
+            "total_documents": self.total_documents,
+            "processed_documents": self.processed_documents,
+            "progress_percentage": round(progress, 1),
+            "shadow_collection": self.shadow_collection,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class CompactionManager:
+    """Track compaction jobs, at most one active job per collection."""
+
+    def __init__(self):
+        self._jobs: Dict[Tuple[str, str], CompactionJob] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(vector_store: Any, collection_name: str) -> Tuple[str, str]:
+        return os.path.abspath(vector_store.persist_directory), collection_name
+
+    def start(self, vector_store: Any, collection_name: str, **job_options: Any) -> Optional[CompactionJob]:
+        """Start compacting a collection in the background.
+
+        Returns:
+            The started job, or None if the collection is already being compacted.
+        """
+        with self._lock:
+            key = self._key(vector_store, collection_name)
+            existing = self._jobs.get(key)
+            if existing is not None and existing.is_active:
+                return None
+            job = CompactionJob(vector_store, collection_name, **job_options)
+            self._jobs[key] = job
+            job.start()
+            return job
+
+    def get(self, vector_store: Any, collection_name: str) -> Optional[CompactionJob]:
+        """Get the latest job of a collection."""
+        return self._jobs.get(self._key(vector_store, collection_name))
+
+    def cancel(self, vector_store: Any, collection_name: str) -> bool:
+        """Cancel the active job of a collection.
+
+        Returns:
+            True if an active job was asked to stop.
+        """
+        job = self.get(vector_store, collection_name)
+        if job is None or not job.is_active:
+            return False
+        job.cancel()
+        return True
+
+
+_tombstone_logs: Dict[str, TombstoneLog] = {}
+_tombstone_logs_lock = threading.Lock()
+_compaction_manager = CompactionManager()
+
+
+def get_tombstone_log(persist_directory: str) -> TombstoneLog:
+    """Get the shared tombstone log for a vector database directory."""
+    db_path = os.path.join(os.path.abspath(persist_directory), "tombstones.db")
+    with _tombstone_logs_lock:
+        log = _tombstone_logs.get(db_path)
+        if log is None:
+            log = TombstoneLog(db_path)
+            _tombstone_logs[db_path] = log
+        return log
+
+
+def get_compaction_manager() -> CompactionManager:
+    """Get the process-wide compaction job manager."""
+    return _compaction_manager
@@ -7,9 +7,11 @@ and vector storage, with incremental processing and comprehensive error handling
 
 import os
 import asyncio
+import fnmatch
 import logging
 import time
 import json
+from collections import defaultdict, deque
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Set, Tuple, Callable
@@ -23,12 +25,19 @@ from .vector_sync_schemas import (
 )
 from .enhanced_content_processor import EnhancedContentProcessor
 from .vector_store import VectorStore
+from .async_vector_store import AsyncVectorStore
 from .dependencies import is_rag_available
 from .database_collection_adapter import DatabaseCollectionAdapter
 from .persistent_sync_manager import PersistentSyncManager
+from .change_feed import (
+    CHUNKS_UPSERTED, CHUNKS_DELETED, VECTORS_DELETED, FILE_CHANGE_TYPES, CHANGE_LOG_RETENTION
+)
 
 logger = logging.getLogger(__name__)
 
+# Consumer name of the change feed cursors marking the file versions last synced
+SYNC_CURSOR = "vector_sync"
+
 
 class IntelligentSyncManager:
     """
@@ -62,8 +71,14 @@ class IntelligentSyncManager:
             raise ImportError("RAG dependencies required for vector sync")
         
         self.vector_store = vector_store
+        # Runs store operations called from async methods off the event loop
+        self.async_vector_store = AsyncVectorStore(vector_store)
         # Use provided collection manager or create database-only manager
         self.collection_manager = collection_manager or DatabaseCollectionAdapter(persistent_db_path)
+        # Collections storing documents by reference read chunk text back from the file store
+        read_file_content = getattr(self.collection_manager, 'read_file_content', None)
+        if read_file_content is not None:
+            vector_store.set_document_reader(read_file_content)
         self.config = config or SyncConfiguration()
         
         # Content processor for intelligent chunking
@@ -78,11 +93,15 @@ class IntelligentSyncManager:
         
         # Persistent storage manager
         self.persistent_sync = PersistentSyncManager(persistent_db_path)
+        # Chunk writes are logged next to the file writes of the same database
+        self.change_feed = self.persistent_sync.db_manager.change_feed
         
         # State tracking - now loads from persistent storage
         self.sync_status: Dict[str, VectorSyncStatus] = {}
         self.file_mappings: Dict[str, Dict[str, FileVectorMapping]] = {}  # collection -> file_path -> mapping
         self.active_jobs: Dict[str, SyncJobSpec] = {}
+        # Collections being rebuilt: staging 'vector_store' view and the 'file_mappings' built so far
+        self._rebuilds: Dict[str, Dict[str, Any]] = {}
         
         # Load existing sync statuses from database
         self._load_persistent_state()
@@ -193,7 +212,8 @@ class IntelligentSyncManager:
         self,
         collection_name: str,
         force_reprocess: bool = False,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        rebuild: bool = False
     ) -> SyncResult:
         """
         Sync a collection with intelligent incremental processing.
@@ -202,6 +222,9 @@ class IntelligentSyncManager:
             collection_name: Name of collection to sync
             force_reprocess: If True, ignore file hashes and reprocess everything
             progress_callback: Optional callback for progress updates
+            rebuild: If True, reprocess everything into a staging namespace
+                and swap it in once complete. Searches keep using the current
+                vectors until then, and keep them if the rebuild fails.
             
         Returns:
             SyncResult with operation details
@@ -220,6 +243,10 @@ class IntelligentSyncManager:
         # Save initial sync status to persistent storage
         self._save_sync_status_persistent(collection_name)
         
+        # File writes after this version may be missed by this sync
+        file_feed = self._file_change_feed()
+        start_version = file_feed.current_version(collection_name) if file_feed else None
+        
         # Create sync result
         result = SyncResult(
             job_id=job_id,
@@ -235,12 +262,27 @@ class IntelligentSyncManager:
                 result.errors.append(f"Collection '{collection_name}' does not exist")
                 return result
             
+            if rebuild:
+                await self._begin_rebuild(collection_name)
+                force_reprocess = True
+            
             # Get collection files info
-            files_info = await self._get_collection_files(collection_name)
+            files_info = await self._list_collection_files(collection_name)
+            
+            # Chunks of files removed since the last sync are deleted before any new chunks are stored
+            if files_info is not None and not rebuild:
+                deleted_files = self._identify_deleted_files(collection_name, files_info)
+                if deleted_files:
+                    result.chunks_deleted = await self._remove_deleted_files(collection_name, deleted_files)
+            files_info = files_info or []
             
             if not files_info:
                 logger.warning(f"Collection '{collection_name}' has no files to sync")
+                if rebuild:
+                    result.chunks_deleted = await self._commit_rebuild(collection_name)
+                await self._refresh_centroid_if_needed(collection_name)
                 sync_status.status = SyncStatus.IN_SYNC
+                self._mark_files_synced(collection_name, start_version)
                 result.success = True
                 return result
             
@@ -254,16 +296,25 @@ class IntelligentSyncManager:
             
             if not files_to_process:
                 logger.info(f"No files need processing in collection '{collection_name}'")
+                if rebuild:
+                    result.chunks_deleted = await self._commit_rebuild(collection_name)
+                await self._refresh_centroid_if_needed(collection_name)
                 sync_status.status = SyncStatus.IN_SYNC
+                self._mark_files_synced(collection_name, start_version)
                 result.success = True
                 return result
             
             logger.info(f"Processing {len(files_to_process)} files in collection '{collection_name}'")
             sync_status.changed_files_count = len(files_to_process)
             
+            # Fit a configured projection on a sample of the incoming content
+            # before the first vectors are stored
+            await self._fit_projection_if_needed(collection_name, files_to_process)
+            
             # Process files in batches
             total_chunks_created = 0
             total_chunks_updated = 0
+            total_chunks_deleted = 0
             processed_files = 0
             
             for batch_start in range(0, len(files_to_process), self.config.batch_size):
@@ -277,6 +328,7 @@ class IntelligentSyncManager:
                 
                 total_chunks_created += batch_result['chunks_created']
                 total_chunks_updated += batch_result['chunks_updated']
+                total_chunks_deleted += batch_result['chunks_deleted']
                 processed_files += len(batch_files)
                 
                 # Update progress
@@ -290,10 +342,22 @@ class IntelligentSyncManager:
                 result.errors.extend(batch_result.get('errors', []))
                 result.warnings.extend(batch_result.get('warnings', []))
             
+            # A rebuild missing any file would lose its vectors, so only a complete one is swapped in
+            if rebuild:
+                if result.errors:
+                    await self._abort_rebuild(collection_name)
+                    result.warnings.append("Rebuild discarded; the previous vectors are still served")
+                else:
+                    total_chunks_deleted += await self._commit_rebuild(collection_name)
+            
+            # Keep the collection's summary vectors current for global search routing
+            await self._refresh_centroid_if_needed(collection_name)
+            
             # Update final results
             result.files_processed = processed_files
             result.chunks_created = total_chunks_created
             result.chunks_updated = total_chunks_updated
+            result.chunks_deleted += total_chunks_deleted
             result.completed_at = datetime.now(timezone.utc)
             result.total_duration = (result.completed_at - result.started_at).total_seconds()
             
@@ -312,6 +376,7 @@ class IntelligentSyncManager:
                 sync_status.errors = result.errors[-10:]  # Keep last 10 errors
             else:
                 sync_status.status = SyncStatus.IN_SYNC
+                self._mark_files_synced(collection_name, start_version)
             
             # Save final sync status to persistent storage
             self._save_sync_status_persistent(collection_name)
@@ -338,6 +403,9 @@ class IntelligentSyncManager:
             # Clean up progress tracking
             sync_status.sync_progress = None
             
+            if collection_name in self._rebuilds:
+                await self._abort_rebuild(collection_name)
+            
             # CRITICAL FIX: Reset status if still SYNCING (prevents orphaned "syncing" collections)
             if sync_status.status == SyncStatus.SYNCING:
                 # If we reach finally with SYNCING status, something went wrong
@@ -357,6 +425,159 @@ class IntelligentSyncManager:
         
         return result
     
+    def _vector_namespace(self, collection_name: str) -> VectorStore:
+        """Get the vector namespace a sync of a collection writes to.
+        
+        That is the collection's staging namespace while it is rebuilt.
+        """
+        rebuild = self._rebuilds.get(collection_name)
+        if rebuild is not None:
+            return rebuild['vector_store']
+        return self.vector_store.namespace(collection_name)
+    
+    async def _begin_rebuild(self, collection_name: str) -> None:
+        """Start writing a collection's sync into a staging namespace."""
+        staging = await self.async_vector_store.run_write(
+            "begin_namespace_rebuild", self.vector_store.begin_namespace_rebuild, collection_name
+        )
+        self._rebuilds[collection_name] = {'vector_store': staging, 'file_mappings': {}}
+        logger.info(f"Rebuilding vectors of collection '{collection_name}' in a staging namespace")
+    
+    async def _commit_rebuild(self, collection_name: str) -> int:
+        """Swap a collection's rebuilt namespace in and install its file mappings.
+        
+        Returns:
+            Number of chunks replaced.
+        """
+        rebuild = self._rebuilds.pop(collection_name)
+        replaced = await self.async_vector_store.run_write(
+            "commit_namespace_rebuild", self.vector_store.commit_namespace_rebuild, collection_name
+        )
+        
+        mappings = rebuild['file_mappings']
+        previous = set(self.file_mappings.get(collection_name, {}))
+        previous.update(self.persistent_sync.load_collection_mappings(collection_name))
+        self.persistent_sync.delete_file_mappings(
+            collection_name, [file_path for file_path in previous if file_path not in mappings]
+        )
+        for mapping in mappings.values():
+            if not self.persistent_sync.save_file_mapping(mapping):
+                logger.warning(f"Failed to save persistent file mapping for {mapping.file_path}")
+        self.file_mappings[collection_name] = mappings
+        
+        # Chunk writes are only logged once they are served
+        self._record_chunk_change(collection_name, VECTORS_DELETED)
+        for mapping in mappings.values():
+            self._record_chunk_change(collection_name, CHUNKS_UPSERTED, mapping.file_path, mapping.chunk_ids)
+        
+        logger.info(f"Swapped in rebuilt vectors of collection '{collection_name}', replacing {replaced} chunks")
+        return replaced
+    
+    async def _abort_rebuild(self, collection_name: str) -> None:
+        """Discard a collection's staging namespace, keeping its current vectors."""
+        self._rebuilds.pop(collection_name, None)
+        try:
+            await self.async_vector_store.run_write(
+                "abort_namespace_rebuild", self.vector_store.abort_namespace_rebuild, collection_name
+            )
+            logger.info(f"Discarded rebuild of collection '{collection_name}'")
+        except Exception as e:
+            # The next rebuild of the collection discards the staging namespace
+            logger.warning(f"Could not discard rebuild of collection '{collection_name}': {e}")
+    
+    def _file_change_feed(self):
+        """Get the change feed that sees every file write, or None.
+        
+        Only the database store qualifies: files of the filesystem store can be
+        edited on disk without passing through its change feed.
+        """
+        if isinstance(self.collection_manager, DatabaseCollectionAdapter):
+            return self.collection_manager.change_feed
+        return None
+    
+    def _mark_files_synced(self, collection_name: str, version: Optional[int]) -> None:
+        """Remember the file version a successful sync has caught up to."""
+        if version is None:
+            return
+        try:
+            self._file_change_feed().set_cursor(SYNC_CURSOR, collection_name, version)
+        except Exception as e:
+            # Change detection falls back to comparing file hashes
+            logger.warning(f"Could not store synced version of collection '{collection_name}': {e}")
+    
+    def _record_chunk_change(
+        self,
+        collection_name: str,
+        change_type: str,
+        file_path: Optional[str] = None,
+        chunk_ids: Optional[List[str]] = None
+    ) -> None:
+        """Log a vector write of a sync in the collection's change feed."""
+        if chunk_ids is not None and not chunk_ids:
+            return
+        try:
+            self.change_feed.record(collection_name, change_type, file_path, chunk_ids)
+        except Exception as e:
+            logger.warning(f"Could not record {change_type} in collection '{collection_name}': {e}")
+    
+    async def _fit_projection_if_needed(self, collection_name: str, files: List[Dict[str, Any]]) -> None:
+        """Fit the collection namespace's pending projection on paragraphs sampled from files."""
+        try:
+            vector_store = self._vector_namespace(collection_name)
+            if not vector_store.projection_needs_fit():
+                return
+            
+            samples = self._sample_projection_texts(files, self.config.projection_sample_size)
+            if not samples:
+                return
+            
+            await self.async_vector_store.run_write(
+                "fit_collection_projection", vector_store.fit_collection_projection, texts=samples
+            )
+            logger.info(f"Fitted collection projection on {len(samples)} sampled paragraphs")
+        except Exception as e:
+            # add_documents falls back to fitting on the first stored batch
+            logger.warning(f"Could not fit projection before sync: {e}")
+    
+    async def _refresh_centroid_if_needed(self, collection_name: str) -> None:
+        """Recompute the collection namespace's summary vectors if writes made them stale."""
+        try:
+            vector_store = self.vector_store.namespace(collection_name)
+            if not vector_store.centroid_needs_refresh():
+                return
+            await self.async_vector_store.run_read(
+                "refresh_collection_centroid", vector_store.refresh_collection_centroid
+            )
+        except Exception as e:
+            # Collections without fresh summary vectors are still searched, just never pruned
+            logger.warning(f"Could not refresh centroid of collection '{collection_name}': {e}")
+    
+    @staticmethod
+    def _sample_projection_texts(files: List[Dict[str, Any]], max_samples: int) -> List[str]:
+        """Sample paragraphs evenly across files for fitting a projection."""
+        per_file = []
+        for file_info in files:
+            paragraphs = [
+                paragraph.strip() for paragraph in file_info.get('content', '').split('\n\n')
+                if len(paragraph.strip()) >= 20
+            ]
+            if paragraphs:
+                per_file.append(paragraphs)
+        
+        # Round-robin across files so no single large file dominates the sample
+        samples = []
+        position = 0
+        while per_file and len(samples) < max_samples:
+            remaining = [paragraphs for paragraphs in per_file if position < len(paragraphs)]
+            if not remaining:
+                break
+            for paragraphs in remaining:
+                samples.append(paragraphs[position])
+                if len(samples) >= max_samples:
+                    break
+            position += 1
+        return samples
+    
     async def _identify_changed_files(
         self,
         collection_name: str,
@@ -448,6 +669,104 @@ class IntelligentSyncManager:
         logger.info(f"Found {len(changed_files)} changed files out of {len(files_info)} total")
         return changed_files
     
+    def _identify_deleted_files(self, collection_name: str, files_info: List[Dict[str, Any]]) -> List[str]:
+        """Identify files that have stored chunks but are no longer in the collection.
+        
+        Files are known from their sync mappings and from the source files
+        recorded with the stored chunks, so chunks whose mapping was lost
+        are found too.
+        """
+        current_paths = {file_info.get('path') for file_info in files_info}
+        known_paths = set(self.file_mappings.get(collection_name, {}))
+        try:
+            if self.vector_store.has_namespace(collection_name):
+                known_paths.update(self.vector_store.namespace(collection_name).get_file_chunk_counts())
+        except Exception as e:
+            logger.warning(f"Could not list stored files of collection '{collection_name}': {e}")
+        
+        deleted_files = sorted(path for path in known_paths - current_paths if path)
+        if deleted_files:
+            logger.info(f"Found {len(deleted_files)} deleted files in collection '{collection_name}'")
+        return deleted_files
+    
+    async def _remove_deleted_files(self, collection_name: str, file_paths: List[str]) -> int:
+        """Delete the chunks and file mappings of files removed from a collection.
+        
+        Returns:
+            Number of chunks deleted.
+        """
+        collection_mappings = self.file_mappings.get(collection_name, {})
+        vector_store = self.vector_store.namespace(collection_name)
+        
+        chunk_ids = {
+            file_path: list(collection_mappings[file_path].chunk_ids)
+            for file_path in file_paths if file_path in collection_mappings
+        }
+        stored = await self.async_vector_store.run_read(
+            "get_file_chunk_ids", vector_store.get_file_chunk_ids, file_paths
+        )
+        for file_path, ids in stored.items():
+            chunk_ids[file_path] = list(dict.fromkeys(chunk_ids.get(file_path, []) + ids))
+        
+        # All orphaned chunks go in one delete, which also counts them as tombstones for compaction
+        ids = [chunk_id for file_ids in chunk_ids.values() for chunk_id in file_ids]
+        if ids:
+            await self.async_vector_store.run_write("delete_documents", vector_store.delete_documents, ids)
+        for file_path in file_paths:
+            self._record_chunk_change(collection_name, CHUNKS_DELETED, file_path, chunk_ids.get(file_path, []))
+            collection_mappings.pop(file_path, None)
+        self.persistent_sync.delete_file_mappings(collection_name, file_paths)
+        
+        logger.info(f"Deleted {len(ids)} chunks of {len(file_paths)} deleted files in collection '{collection_name}'")
+        return len(ids)
+    
+    async def collect_orphaned_vectors(self, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """Delete the chunks of files that were removed from collections.
+        
+        Syncs do this for the collection they process. This collects the
+        orphans left behind by earlier versions, which never deleted the
+        chunks of removed files.
+        
+        Args:
+            collection_name: Collection to clean up. Cleans up every
+                collection with stored chunks if None.
+            
+        Returns:
+            Dictionary with the deleted 'files' and the number of
+            'chunks_deleted' per collection, and the total 'chunks_deleted'.
+        """
+        if collection_name is not None:
+            collection_names = [collection_name]
+        else:
+            collection_names = sorted(set(self.vector_store.list_namespaces()) | set(self.file_mappings))
+        
+        collections = {}
+        for name in collection_names:
+            # A failed listing must not be mistaken for an empty collection
+            files_info = await self._list_collection_files(name)
+            if files_info is None:
+                logger.warning(f"Skipping garbage collection of '{name}': its files could not be listed")
+                continue
+            
+            # Stale statistics would hide the stored files that are gone
+            if self.vector_store.has_namespace(name):
+                namespace = self.vector_store.namespace(name)
+                if namespace.get_collection_stats().get('stats_repair_pending'):
+                    await self.async_vector_store.run_write(
+                        "repair_collection_stats", namespace.repair_collection_stats
+                    )
+            
+            deleted_files = self._identify_deleted_files(name, files_info)
+            chunks_deleted = await self._remove_deleted_files(name, deleted_files) if deleted_files else 0
+            if deleted_files:
+                await self._refresh_centroid_if_needed(name)
+            collections[name] = {'files': deleted_files, 'chunks_deleted': chunks_deleted}
+        
+        return {
+            'collections': collections,
+            'chunks_deleted': sum(collection['chunks_deleted'] for collection in collections.values())
+        }
+    
     async def _process_file_batch(
         self,
         collection_name: str,
@@ -458,6 +777,7 @@ class IntelligentSyncManager:
         batch_result = {
             'chunks_created': 0,
             'chunks_updated': 0,
+            'chunks_deleted': 0,
             'errors': [],
             'warnings': []
         }
@@ -468,12 +788,13 @@ class IntelligentSyncManager:
             future = self.executor.submit(self._process_single_file, collection_name, file_info)
             futures.append((future, file_info))
         
-        # Collect results
+        # Collect results without blocking the event loop
         for future, file_info in futures:
             try:
-                result = future.result(timeout=300)  # 5 minute timeout per file
+                result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=300)  # 5 minute timeout per file
                 batch_result['chunks_created'] += result.get('chunks_created', 0)
                 batch_result['chunks_updated'] += result.get('chunks_updated', 0)
+                batch_result['chunks_deleted'] += result.get('chunks_deleted', 0)
                 
                 if result.get('errors'):
                     batch_result['errors'].extend(result['errors'])
@@ -496,6 +817,8 @@ class IntelligentSyncManager:
         result = {
             'chunks_created': 0,
             'chunks_updated': 0,
+            'chunks_deleted': 0,
+            'chunks_unchanged': 0,
             'errors': [],
             'warnings': []
         }
@@ -526,61 +849,8 @@ class IntelligentSyncManager:
                     chunk, collection_name, file_path, current_hash
                 )
                 
-                # Prepare for vector storage - serialize enums to strings for vector DB compatibility
-                metadata_dict = chunk_meta.model_dump()
-                
-                # Convert all non-primitive values to compatible types for vector DB (ChromaDB)
-                def serialize_for_vector_db(obj):
-                    """Recursively convert non-primitive values to ChromaDB compatible types.
-                    
-                    ChromaDB only accepts: str, int, float, bool
-                    ChromaDB REJECTS: None, empty lists [], complex objects
-                    """
-                    from datetime import datetime
-                    
-                    if isinstance(obj, dict):
-                        # Clean dictionary - remove None values and empty lists
-                        result = {}
-                        for k, v in obj.items():
-                            serialized_v = serialize_for_vector_db(v)
-                            # Skip None values and empty lists - ChromaDB rejects them
-                            if serialized_v is not None:
-                                if isinstance(serialized_v, list) and len(serialized_v) == 0:
-                                    # Skip empty lists entirely
-                                    continue
-                                else:
-                                    result[k] = serialized_v
-                        return result
-                    elif isinstance(obj, list):
-                        if len(obj) == 0:
-                            # Return None for empty lists, will be filtered out by dict handling
-                            return None
-                        # ChromaDB does NOT accept lists at all - convert to string
-                        # Process list items first, then join as string
-                        processed_items = []
-                        for item in obj:
-                            processed_item = serialize_for_vector_db(item)
-                            if processed_item is not None:
-                                processed_items.append(str(processed_item))
-                        # Join list elements into a single string
-                        return " > ".join(processed_items) if processed_items else None
-                    elif obj is None:
-                        # Return None as-is, will be filtered out by dict handling
-                        return None
-                    elif hasattr(obj, 'value'):  # Enum object
-                        return obj.value
-                    elif isinstance(obj, datetime):  # DateTime objects
-                        return obj.isoformat()
-                    elif isinstance(obj, bool):  # Explicit bool handling
-                        return obj
-                    elif isinstance(obj, (str, int, float)):  # Primitive types
-                        return obj
-                    elif hasattr(obj, '__dict__'):  # Complex object, convert to string
-                        return str(obj)
-                    else:
-                        return obj
-                
-                metadata_dict = serialize_for_vector_db(metadata_dict)
+                # Enums and datetimes become JSON values; the vector store packs the lists
+                metadata_dict = chunk_meta.model_dump(mode='json', exclude_none=True)
                 
                 # CRITICAL FIX: Make chunk IDs collection-specific to prevent ChromaDB overwrites
                 # ChromaDB uses IDs as unique keys - same ID overwrites existing data
@@ -590,39 +860,65 @@ class IntelligentSyncManager:
                 vector_chunks.append({
                     'id': collection_specific_id,
                     'content': chunk['content'],
+                    'content_hash': calculate_file_hash(chunk['content']),
                     'metadata': metadata_dict
                 })
                 chunk_metadatas.append(chunk_meta)
             
-            # Remove old chunks for this file if they exist
-            existing_mapping = self.file_mappings.get(collection_name, {}).get(file_path)
-            if existing_mapping and existing_mapping.chunk_ids:
+            # Each collection's chunks live in its own vector namespace
+            vector_store = self._vector_namespace(collection_name)
+            rebuild = self._rebuilds.get(collection_name)
+            
+            # Diff against the chunks stored for the previous version of the file;
+            # a rebuild starts from an empty namespace
+            existing_mapping = None if rebuild else self.file_mappings.get(collection_name, {}).get(file_path)
+            diff = self._diff_file_chunks(existing_mapping, vector_chunks)
+            
+            if self._use_enhanced_storage():
+                # Link chunks by their final IDs before storing them, so the
+                # vector store indexes the relationships with the chunks
+                self._enhance_chunk_relationships(collection_name, vector_chunks)
+            
+            if diff['removed_ids']:
                 try:
-                    self.vector_store.delete_documents(existing_mapping.chunk_ids)
-                    result['chunks_updated'] = len(existing_mapping.chunk_ids)
+                    vector_store.delete_documents(diff['removed_ids'])
+                    result['chunks_deleted'] = len(diff['removed_ids'])
+                    self._record_chunk_change(collection_name, CHUNKS_DELETED, file_path, diff['removed_ids'])
                 except Exception as e:
                     logger.warning(f"Could not delete old chunks for {file_path}: {str(e)}")
             
-            # Add new chunks to vector store with enhanced metadata support
-            if self._use_enhanced_storage():
-                # Use enhanced storage with relationship-aware metadata
-                self.vector_store.add_documents(
-                    [chunk['content'] for chunk in vector_chunks],
-                    metadatas=[chunk['metadata'] for chunk in vector_chunks],
-                    ids=[chunk['id'] for chunk in vector_chunks]
+            # Unchanged chunks keep their vectors; only position and file metadata are refreshed
+            if diff['unchanged']:
+                vector_store.update_metadatas(
+                    [chunk['id'] for chunk in diff['unchanged']],
+                    [chunk['metadata'] for chunk in diff['unchanged']],
+                    documents=[chunk['content'] for chunk in diff['unchanged']]
                 )
-                
-                # After storage, enhance with relationship data if supported
-                self._enhance_chunk_relationships(collection_name, vector_chunks)
-            else:
-                # Fallback to standard storage
-                self.vector_store.add_documents(
-                    [chunk['content'] for chunk in vector_chunks],
-                    metadatas=[chunk['metadata'] for chunk in vector_chunks],
-                    ids=[chunk['id'] for chunk in vector_chunks]
+            
+            # New and edited chunks are embedded; edits reusing a stored ID replace it
+            previous_ids = set(existing_mapping.chunk_ids) if existing_mapping else set()
+            created = [chunk for chunk in diff['changed'] if chunk['id'] not in previous_ids]
+            replaced = [chunk for chunk in diff['changed'] if chunk['id'] in previous_ids]
+            if created:
+                vector_store.add_documents(
+                    [chunk['content'] for chunk in created],
+                    metadatas=[chunk['metadata'] for chunk in created],
+                    ids=[chunk['id'] for chunk in created]
+                )
+            if replaced:
+                vector_store.upsert_documents(
+                    [chunk['content'] for chunk in replaced],
+                    metadatas=[chunk['metadata'] for chunk in replaced],
+                    ids=[chunk['id'] for chunk in replaced]
+                )
+            if not rebuild:
+                self._record_chunk_change(
+                    collection_name, CHUNKS_UPSERTED, file_path, [chunk['id'] for chunk in diff['changed']]
                 )
             
-            result['chunks_created'] = len(vector_chunks)
+            result['chunks_created'] = len(created)
+            result['chunks_updated'] = len(replaced)
+            result['chunks_unchanged'] = len(diff['unchanged'])
             
             # Update file mapping
             file_mapping = FileVectorMapping(
@@ -630,6 +926,7 @@ class IntelligentSyncManager:
                 file_path=file_path,
                 file_hash=current_hash,
                 chunk_ids=[chunk['id'] for chunk in vector_chunks],
+                chunk_hashes=[chunk['content_hash'] for chunk in vector_chunks],
                 chunk_count=len(vector_chunks),
                 last_synced=datetime.now(timezone.utc),
                 sync_status=SyncStatus.IN_SYNC,
@@ -637,6 +934,12 @@ class IntelligentSyncManager:
                 chunking_strategy=self.config.chunking_strategy
             )
             
+            # A rebuild's mappings are installed when it is swapped in
+            if rebuild:
+                rebuild['file_mappings'][file_path] = file_mapping
+                logger.debug(f"Processed file {file_path} for rebuild: {len(vector_chunks)} chunks")
+                return result
+            
             # Store mapping in RAM and persistent storage
             if collection_name not in self.file_mappings:
                 self.file_mappings[collection_name] = {}
@@ -656,6 +959,71 @@ class IntelligentSyncManager:
         
         return result
     
+    def _stored_chunk_hashes(self, mapping: Optional[FileVectorMapping]) -> List[Optional[str]]:
+        """Get the content hashes of a file's stored chunks, parallel to its chunk IDs.
+        
+        Mappings saved before chunk hashes were recorded are hashed from the
+        stored chunk documents instead.
+        """
+        if not mapping or not mapping.chunk_ids:
+            return []
+        if len(mapping.chunk_hashes) == len(mapping.chunk_ids):
+            return list(mapping.chunk_hashes)
+        
+        try:
+            stored = {
+                document['id']: calculate_file_hash(document['content'])
+                for document in self.vector_store.namespace(mapping.collection_name).get_documents(mapping.chunk_ids)
+                if document.get('content') is not None
+            }
+        except Exception as e:
+            logger.warning(f"Could not read stored chunks of {mapping.file_path}: {str(e)}")
+            stored = {}
+        return [stored.get(chunk_id) for chunk_id in mapping.chunk_ids]
+    
+    def _diff_file_chunks(
+        self,
+        existing_mapping: Optional[FileVectorMapping],
+        vector_chunks: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Match a file's new chunks against its stored chunks by content hash.
+        
+        A new chunk with the same content as a stored chunk takes over the
+        stored chunk's ID, so its vector is kept even if the chunk moved
+        within the file. Chunk IDs in vector_chunks are updated in place.
+        
+        Returns:
+            Dictionary with 'unchanged' and 'changed' chunks and the
+            'removed_ids' of stored chunks that no longer exist.
+        """
+        old_ids = existing_mapping.chunk_ids if existing_mapping else []
+        available = defaultdict(deque)
+        for chunk_id, chunk_hash in zip(old_ids, self._stored_chunk_hashes(existing_mapping)):
+            if chunk_hash:
+                available[chunk_hash].append(chunk_id)
+        
+        unchanged, changed = [], []
+        for chunk in vector_chunks:
+            matches = available.get(chunk['content_hash'])
+            if matches:
+                chunk['id'] = matches.popleft()
+                unchanged.append(chunk)
+            else:
+                changed.append(chunk)
+        
+        kept_ids = {chunk['id'] for chunk in unchanged}
+        for chunk in changed:
+            # Identical chunks appearing twice get distinct IDs
+            if chunk['id'] in kept_ids:
+                chunk['id'] = f"{chunk['id']}_{chunk['content_hash'][:8]}"
+            kept_ids.add(chunk['id'])
+        
+        return {
+            'unchanged': unchanged,
+            'changed': changed,
+            'removed_ids': [chunk_id for chunk_id in old_ids if chunk_id not in kept_ids]
+        }
+    
     def _enhance_chunk_relationships(self, collection_name: str, vector_chunks: List[Dict[str, Any]]):
         """Enhance chunks with relationship data for overlap-aware processing."""
         try:
@@ -777,11 +1145,8 @@ class IntelligentSyncManager:
     ) -> Dict[str, Any]:
         """Standard vector search fallback."""
         try:
-            # Get or create collection
-            self.vector_store.get_or_create_collection(collection_name)
-            
-            # Perform search
-            results = self.vector_store.query(
+            # Search only the collection's own namespace
+            results = self.vector_store.namespace(collection_name).query(
                 query_texts=[query],
                 n_results=limit
             )
@@ -836,14 +1201,18 @@ class IntelligentSyncManager:
     
     async def _get_collection_files(self, collection_name: str) -> List[Dict[str, Any]]:
         """Get list of files in collection."""
+        return await self._list_collection_files(collection_name) or []
+    
+    async def _list_collection_files(self, collection_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Get list of files in collection, or None if they could not be listed."""
         try:
             result = await self.collection_manager.list_files_in_collection(collection_name)
             if result.get('success'):
                 return result.get('files', [])
-            return []
+            return None
         except Exception as e:
             logger.error(f"Error listing files for collection {collection_name}: {str(e)}")
-            return []
+            return None
     
     async def _count_collection_chunks(self, collection_name: str) -> int:
         """Count total chunks for a collection in vector store."""
@@ -891,17 +1260,11 @@ class IntelligentSyncManager:
         )
         
         try:
-            # Get all chunk IDs for this collection
-            collection_mappings = self.file_mappings.get(collection_name, {})
-            all_chunk_ids = []
-            for mapping in collection_mappings.values():
-                all_chunk_ids.extend(mapping.chunk_ids)
-            
-            if all_chunk_ids:
-                # Delete from vector store
-                self.vector_store.delete_documents(all_chunk_ids)
-                result.chunks_deleted = len(all_chunk_ids)
-                logger.info(f"Deleted {len(all_chunk_ids)} chunks for collection '{collection_name}'")
+            # Dropping the namespace deletes every chunk without enumerating them
+            result.chunks_deleted = await self.async_vector_store.delete_namespace(collection_name)
+            if result.chunks_deleted:
+                logger.info(f"Deleted {result.chunks_deleted} chunks for collection '{collection_name}'")
+            self._record_chunk_change(collection_name, VECTORS_DELETED)
             
             # Clear mappings
             if collection_name in self.file_mappings:
@@ -924,6 +1287,184 @@ class IntelligentSyncManager:
             result.errors.append(str(e))
         
         return result
+
+    async def export_collection_snapshot(self, collection_name: str, path: str) -> Dict[str, Any]:
+        """Export a collection's vectors and file mappings to a snapshot bundle.
+
+        Args:
+            collection_name: Collection to export.
+            path: Bundle directory to create.
+
+        Returns:
+            The bundle's manifest.
+        """
+        file_mappings = [
+            mapping.model_dump(mode='json')
+            for mapping in self.file_mappings.get(collection_name, {}).values()
+        ]
+        return await self.async_vector_store.run_read(
+            "export_namespace", self.vector_store.export_namespace, collection_name, path, file_mappings
+        )
+
+    async def import_collection_snapshot(self, path: str, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """Import a snapshot bundle without re-embedding its chunks.
+
+        The bundle's file mappings are restored too, so the next sync of the
+        collection only processes files that changed since the export.
+
+        Args:
+            path: Bundle directory.
+            collection_name: Collection to import into. Uses the bundle's
+                collection name if None.
+
+        Returns:
+            Dictionary with the 'collection_name', the number of chunks
+            'imported', the number of 'file_mappings' and the 'manifest'.
+        """
+        imported = await self.async_vector_store.run_write(
+            "import_namespace", self.vector_store.import_namespace, path, collection_name
+        )
+        collection_name = imported['collection_name']
+
+        mappings = {}
+        for data in imported['file_mappings']:
+            mapping = FileVectorMapping(**dict(data, collection_name=collection_name))
+            mappings[mapping.file_path] = mapping
+            if not self.persistent_sync.save_file_mapping(mapping):
+                logger.warning(f"Failed to save persistent file mapping for {mapping.file_path}")
+        self.file_mappings[collection_name] = mappings
+
+        logger.info(f"Imported {imported['imported']} chunks and {len(mappings)} file mappings into '{collection_name}'")
+        return {
+            'collection_name': collection_name,
+            'imported': imported['imported'],
+            'file_mappings': len(mappings),
+            'manifest': imported['manifest']
+        }
+
+    async def fork_collection(
+        self,
+        source_collection: str,
+        target_collection: str,
+        include_patterns: Optional[List[str]] = None,
+        exclude_patterns: Optional[List[str]] = None,
+        description: str = ""
+    ) -> Dict[str, Any]:
+        """Copy a collection's files with their vectors, without re-embedding.
+        
+        The stored chunk vectors and file mappings of the copied files are
+        reused, so the fork is searchable right away and its next sync only
+        processes files that changed since the source was last synced.
+        
+        Args:
+            source_collection: Collection to fork.
+            target_collection: Name of the new collection.
+            include_patterns: Glob patterns of file paths to copy. Copies all
+                files if None or empty.
+            exclude_patterns: Glob patterns of file paths not to copy.
+            description: Description of the new collection.
+            
+        Returns:
+            Dictionary with the 'collection_name', the copied 'files', the
+            number of 'chunks_copied' and the number of 'file_mappings'.
+            
+        Raises:
+            ValueError: If the source collection does not exist, or the
+                target collection cannot be created.
+        """
+        files_info = await self._list_collection_files(source_collection)
+        if files_info is None:
+            raise ValueError(f"Collection '{source_collection}' not found")
+        if await self._collection_exists(target_collection):
+            raise ValueError(f"Collection '{target_collection}' already exists")
+        
+        files_info = [
+            file_info for file_info in files_info
+            if file_info.get('path') and self._file_selected(file_info['path'], include_patterns, exclude_patterns)
+        ]
+        file_paths = [file_info['path'] for file_info in files_info]
+        
+        created = await self.collection_manager.create_collection(target_collection, description)
+        if not created.get('success'):
+            error = created.get('error') or created.get('message', 'Unknown error')
+            logger.error(f"Failed to create fork '{target_collection}' of '{source_collection}': {error}")
+            raise ValueError(f"Could not create collection '{target_collection}': {error}")
+        
+        try:
+            # Files come first so chunks stored by reference resolve against the fork's own files
+            for file_info in files_info:
+                folder = file_info.get('folder', '')
+                read_result = await self.collection_manager.read_file(source_collection, file_info['name'], folder)
+                if not read_result.get('success'):
+                    raise ValueError(f"Could not read file {file_info['path']}: {read_result.get('error', 'Unknown error')}")
+                saved = await self.collection_manager.save_file(
+                    target_collection, file_info['name'], read_result.get('content', ''), folder
+                )
+                if not saved.get('success'):
+                    raise ValueError(f"Could not copy file {file_info['path']}: {saved.get('error', 'Unknown error')}")
+            
+            chunks_copied = 0
+            if self.vector_store.has_namespace(source_collection):
+                chunks_copied = await self.async_vector_store.run_write(
+                    "copy_namespace", self.vector_store.copy_namespace,
+                    source_collection, target_collection, file_paths
+                )
+        except Exception as e:
+            logger.error(f"Failed to fork collection '{source_collection}' into '{target_collection}': {str(e)}")
+            await self.collection_manager.delete_collection(target_collection)
+            raise
+        
+        source_mappings = (
+            self.file_mappings.get(source_collection)
+            or self.persistent_sync.load_collection_mappings(source_collection)
+            or {}
+        )
+        mappings = {}
+        for file_path in file_paths:
+            if file_path not in source_mappings:
+                continue
+            mapping = FileVectorMapping(**dict(source_mappings[file_path].model_dump(), collection_name=target_collection))
+            mappings[file_path] = mapping
+            if not self.persistent_sync.save_file_mapping(mapping):
+                logger.warning(f"Failed to save persistent file mapping for {file_path}")
+            self._record_chunk_change(target_collection, CHUNKS_UPSERTED, file_path, list(mapping.chunk_ids))
+        self.file_mappings[target_collection] = mappings
+        
+        if mappings:
+            # Live change detection marks the fork out of sync if any copied file was not synced
+            self.sync_status[target_collection] = VectorSyncStatus(
+                collection_name=target_collection,
+                sync_enabled=self.config.enabled,
+                status=SyncStatus.IN_SYNC,
+                last_sync=datetime.now(timezone.utc),
+                total_files=len(file_paths),
+                synced_files=len(mappings),
+                total_chunks=chunks_copied,
+                chunk_count=chunks_copied
+            )
+            self._save_sync_status_persistent(target_collection)
+        
+        logger.info(
+            f"Forked '{source_collection}' into '{target_collection}': "
+            f"{len(file_paths)} files, {chunks_copied} chunks reused"
+        )
+        return {
+            'collection_name': target_collection,
+            'files': file_paths,
+            'chunks_copied': chunks_copied,
+            'file_mappings': len(mappings)
+        }
+    
+    @staticmethod
+    def _file_selected(
+        file_path: str,
+        include_patterns: Optional[List[str]],
+        exclude_patterns: Optional[List[str]]
+    ) -> bool:
+        """Check a file path against include and exclude glob patterns."""
+        if include_patterns and not any(fnmatch.fnmatch(file_path, pattern) for pattern in include_patterns):
+            return False
+        return not any(fnmatch.fnmatch(file_path, pattern) for pattern in exclude_patterns or [])
     
     def get_sync_statistics(self) -> Dict[str, Any]:
         """Get overall sync statistics."""
@@ -960,10 +1501,19 @@ class IntelligentSyncManager:
         """
         Quick change detection without full file processing.
         
-        Compares current file hashes with stored file mappings to detect changes.
-        Returns True if any files have changed since last sync.
+        Reads the change feed since the last synced version when it sees every
+        file write. Otherwise compares current file hashes with stored file
+        mappings. Returns True if any files have changed since last sync.
         """
         try:
+            file_feed = self._file_change_feed()
+            synced_version = file_feed.get_cursor(SYNC_CURSOR, collection_name) if file_feed else None
+            if synced_version is not None:
+                changes = file_feed.changes_since(
+                    collection_name, synced_version, limit=1, change_types=FILE_CHANGE_TYPES
+                )
+                return changes['reset_required'] or bool(changes['changes'])
+            
             # Get current files in collection
             files_info = await self._get_collection_files(collection_name)
             if not files_info:
@@ -1043,6 +1593,15 @@ class IntelligentSyncManager:
         Similar to _quick_change_detection but returns the actual count.
         """
         try:
+            file_feed = self._file_change_feed()
+            synced_version = file_feed.get_cursor(SYNC_CURSOR, collection_name) if file_feed else None
+            if synced_version is not None:
+                changes = file_feed.changes_since(
+                    collection_name, synced_version, limit=CHANGE_LOG_RETENTION, change_types=FILE_CHANGE_TYPES
+                )
+                if not changes['reset_required'] and not changes['has_more']:
+                    return len({change['file_path'] for change in changes['changes'] if change['file_path']})
+            
             files_info = await self._get_collection_files(collection_name)
             if not files_info:
                 return 0
@@ -0,0 +1,197 @@
+"""Full-text BM25 index over chunk text for hybrid retrieval.
+
+Dense retrieval misses exact identifiers, error codes and API names that a
+lexical match finds trivially. The vector store mirrors every chunk it
+writes into this SQLite FTS5 index, keyed by logical collection name and
+chunk id, so hybrid searches can run a BM25 query next to the vector query
+and fuse both rankings.
+"""
+import os
+import re
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Underscores are part of identifiers such as ERR_CONN_RESET or snake_case names
+LEXICAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lexical_chunks (
+    id INTEGER PRIMARY KEY,
+    collection_name TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    UNIQUE (collection_name, chunk_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lexical_chunks_fts USING fts5(
+    content,
+    tokenize = "unicode61 tokenchars '_'"
+);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_MAX_BOUND_IDS = 500
+_QUERY_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching any of its terms.
+
+    Terms are quoted so FTS5 operators and punctuation in the query are
+    taken literally.
+
+    Returns:
+        The MATCH expression, or an empty string if the query has no terms.
+    """
+    terms = list(dict.fromkeys(term.lower() for term in _QUERY_TERM_PATTERN.findall(query)))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def _batches(ids: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(ids), _MAX_BOUND_IDS):
+        yield ids[start:start + _MAX_BOUND_IDS]
+
+
+class LexicalIndex:
+    """SQLite FTS5 index of chunk text per collection."""
+
+    def __init__(self, db_path: str):
+        """Open or create the index.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(LEXICAL_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def _delete_rows(conn: sqlite3.Connection, collection_name: str, ids: List[str]) -> None:
+        for batch in _batches(list(ids)):
+            placeholders = ','.join('?' * len(batch))
+            rows = [row[0] for row in conn.execute(
+                f"SELECT id FROM lexical_chunks WHERE collection_name = ? AND chunk_id IN ({placeholders})",
+                [collection_name, *batch]
+            )]
+            if rows:
+                row_placeholders = ','.join('?' * len(rows))
+                conn.execute(f"DELETE FROM lexical_chunks_fts WHERE rowid IN ({row_placeholders})", rows)
+                conn.execute(f"DELETE FROM lexical_chunks WHERE id IN ({row_placeholders})", rows)
+
+    def index_chunks(self, collection_name: str, ids: List[str], documents: List[str]) -> None:
+        """Add or replace the text of chunks.
+
+        Args:
+            collection_name: Logical collection name.
+            ids: Chunk IDs.
+            documents: Chunk texts, parallel to ids.
+        """
+        with self._lock, self._connect() as conn:
+            self._delete_rows(conn, collection_name, ids)
+            for chunk_id, document in zip(ids, documents):
+                cursor = conn.execute(
+                    "INSERT INTO lexical_chunks (collection_name, chunk_id) VALUES (?, ?)",
+                    (collection_name, chunk_id)
+                )
+                conn.execute(
+                    "INSERT INTO lexical_chunks_fts (rowid, content) VALUES (?, ?)",
+                    (cursor.lastrowid, document or "")
+                )
+
+    def remove_chunks(self, collection_name: str, ids: List[str]) -> None:
+        """Remove deleted chunks from the index."""
+        with self._lock, self._connect() as conn:
+            self._delete_rows(conn, collection_name, ids)
+
+    def search(self, collection_name: str, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Rank a collection's chunks against a query with BM25.
+
+        Args:
+            collection_name: Logical collection name.
+            query: Free-text query.
+            limit: Maximum number of hits.
+
+        Returns:
+            (chunk_id, bm25_score) pairs, best first. Higher scores are better.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT c.chunk_id, bm25(lexical_chunks_fts) AS rank
+                   FROM lexical_chunks_fts
+                   JOIN lexical_chunks c ON c.id = lexical_chunks_fts.rowid
+                   WHERE lexical_chunks_fts MATCH ? AND c.collection_name = ?
+                   ORDER BY rank
+                   LIMIT ?""",
+                (match, collection_name, limit)
+            ).fetchall()
+        # FTS5 reports BM25 as a negative number, lower is better
+        return [(chunk_id, -rank) for chunk_id, rank in rows]
+
+    def count(self, collection_name: str) -> int:
+        """Count the indexed chunks of a collection."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM lexical_chunks WHERE collection_name = ?", (collection_name,)
+            ).fetchone()[0]
+
+    def drop_collection(self, collection_name: str) -> None:
+        """Remove all chunks of a collection."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """DELETE FROM lexical_chunks_fts WHERE rowid IN
+                   (SELECT id FROM lexical_chunks WHERE collection_name = ?)""",
+                (collection_name,)
+            )
+            conn.execute("DELETE FROM lexical_chunks WHERE collection_name = ?", (collection_name,))
+
+    def rename_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Move all chunks of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE lexical_chunks SET collection_name = ? WHERE collection_name = ?",
+                (new_collection_name, collection_name)
+            )
+
+    def copy_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Copy all chunks of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                """SELECT c.chunk_id, f.content FROM lexical_chunks c
+                   JOIN lexical_chunks_fts f ON f.rowid = c.id
+                   WHERE c.collection_name = ?""",
+                (collection_name,)
+            ).fetchall()
+            for chunk_id, content in rows:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO lexical_chunks (collection_name, chunk_id) VALUES (?, ?)",
+                    (new_collection_name, chunk_id)
+                )
+                if cursor.rowcount:
+                    conn.execute(
+                        "INSERT INTO lexical_chunks_fts (rowid, content) VALUES (?, ?)",
+                        (cursor.lastrowid, content)
+                    )
+
+
+_lexical_indexes: Dict[str, LexicalIndex] = {}
+_lexical_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(persist_directory: str) -> LexicalIndex:
+    """Get the shared lexical index for a vector database directory."""
+    db_path = os.path.join(os.path.abspath(persist_directory), "lexical_index.db")
+    with _lexical_indexes_lock:
+        index = _lexical_indexes.get(db_path)
+        if index is None:
+            index = LexicalIndex(db_path)
+            _lexical_indexes[db_path] = index
+        return index
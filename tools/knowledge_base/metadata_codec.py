@@ -0,0 +1,260 @@
+"""Compact storage codec for chunk metadata.
+
+ChromaDB only stores scalar metadata values. Chunk metadata used to be made
+storable by JSON-encoding each list field into its own string, and every
+search result decoded all of them again, whether or not the caller looked
+at them.
+
+Codec version 2 keeps scalar fields as typed top-level values, so `where`
+filters keep working on them, and packs every non-scalar value into a single
+compact JSON blob. Reads return a LazyMetadata mapping that only decodes the
+blob once a caller touches a packed field or the mapping as a whole. Records
+written before the codec existed are still decoded, just as lazily.
+"""
+import json
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CODEC_VERSION = 2
+CODEC_VERSION_KEY = "_codec"
+PACKED_FIELDS_KEY = "_packed"
+
+# Fields that hold lists; older records store each as its own JSON string
+LIST_FIELDS = frozenset({
+    'overlap_sources', 'overlap_regions', 'section_siblings',
+    'header_hierarchy', 'expansion_candidates'
+})
+
+# List fields every decoded record has; empty ones are not written
+DEFAULT_LIST_FIELDS = ('overlap_sources', 'overlap_regions', 'section_siblings', 'header_hierarchy')
+
+_SCALAR_TYPES = (str, int, float, bool)
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def _load_list(text: str) -> Any:
+    """Decode a JSON-encoded list field, defaulting to an empty list."""
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+class LazyMetadata(dict):
+    """Chunk metadata whose packed fields are decoded on first use.
+
+    Scalar fields are available straight away. Looking up a field that is
+    not a stored scalar, or reading the mapping as a whole, decodes the
+    packed fields once and merges them in. Values set before that keep
+    precedence over packed ones.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self, scalars: Dict[str, Any], pending: Optional[Callable[[], Dict[str, Any]]] = None):
+        """Create the mapping.
+
+        Args:
+            scalars: Fields that are available without decoding.
+            pending: Returns the packed fields when called, or None if
+                there are none.
+        """
+        super().__init__(scalars)
+        self._pending = pending
+
+    def _decode(self) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        for key, value in pending().items():
+            dict.setdefault(self, key, value)
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the packed fields have been decoded."""
+        return self._pending is None
+
+    def __getitem__(self, key):
+        if self._pending is not None and not dict.__contains__(self, key):
+            self._decode()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if self._pending is not None and not dict.__contains__(self, key):
+            self._decode()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        if self._pending is not None and not dict.__contains__(self, key):
+            self._decode()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._decode()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._decode()
+        return dict.__len__(self)
+
+    def __bool__(self):
+        return self._pending is not None or dict.__len__(self) > 0
+
+    def keys(self):
+        self._decode()
+        return dict.keys(self)
+
+    def values(self):
+        self._decode()
+        return dict.values(self)
+
+    def items(self):
+        self._decode()
+        return dict.items(self)
+
+    def copy(self) -> Dict[str, Any]:
+        self._decode()
+        return dict(dict.items(self))
+
+    def __delitem__(self, key):
+        self._decode()
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        self._decode()
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._decode()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if self._pending is not None and not dict.__contains__(self, key):
+            self._decode()
+        return dict.setdefault(self, key, default)
+
+    def __eq__(self, other):
+        self._decode()
+        if isinstance(other, LazyMetadata):
+            other._decode()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __or__(self, other):
+        self._decode()
+        return dict.__or__(dict(dict.items(self)), other)
+
+    def __repr__(self):
+        self._decode()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+
+def encode_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode chunk metadata for storage.
+
+    Scalar values stay top-level, None values are dropped, and everything
+    else is packed into one compact JSON string. List fields passed as JSON
+    strings, as older callers do, are packed as the lists they encode.
+
+    Args:
+        metadata: Chunk metadata.
+
+    Returns:
+        Metadata containing only scalar values.
+    """
+    stored: Dict[str, Any] = {}
+    packed: Dict[str, Any] = {}
+
+    for key, value in metadata.items():
+        if key == CODEC_VERSION_KEY or key == PACKED_FIELDS_KEY:
+            continue
+        if key in LIST_FIELDS:
+            if value is None:
+                value = []
+            elif isinstance(value, str):
+                value = _load_list(value)
+            elif isinstance(value, tuple):
+                value = list(value)
+            if isinstance(value, list):
+                value = [list(item) if isinstance(item, tuple) else item for item in value]
+            if value or key not in DEFAULT_LIST_FIELDS:
+                packed[key] = value
+        elif value is None:
+            continue
+        elif isinstance(value, _SCALAR_TYPES):
+            stored[key] = value
+        else:
+            packed[key] = value
+
+    stored.setdefault('overlap_percentage', 0.0)
+    stored.setdefault('context_expansion_eligible', True)
+    stored['stored_at'] = time.time()
+    stored[CODEC_VERSION_KEY] = CODEC_VERSION
+    # Written even when empty: metadata updates merge, and must replace stale packed fields
+    stored[PACKED_FIELDS_KEY] = json.dumps(packed, separators=_COMPACT_SEPARATORS, default=str)
+    return stored
+
+
+def decode_metadata(stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Decode stored chunk metadata without unpacking its packed fields yet.
+
+    Args:
+        stored: Metadata as returned by the vector database.
+
+    Returns:
+        A LazyMetadata mapping, or `stored` itself if it is empty.
+    """
+    if not stored:
+        return stored
+
+    version = stored.get(CODEC_VERSION_KEY)
+    if version is None:
+        return _decode_legacy(stored)
+    if version > CODEC_VERSION:
+        logger.warning(f"Decoding metadata written by newer codec version {version}")
+
+    # A record rewritten from the legacy layout may still carry stale list strings
+    scalars = {
+        key: value for key, value in stored.items()
+        if key not in LIST_FIELDS and key != CODEC_VERSION_KEY and key != PACKED_FIELDS_KEY
+    }
+    packed = stored.get(PACKED_FIELDS_KEY)
+
+    def unpack() -> Dict[str, Any]:
+        try:
+            fields = json.loads(packed) if packed else {}
+        except (json.JSONDecodeError, TypeError):
+            logger.warning("Discarding undecodable packed metadata fields")
+            fields = {}
+        for field in DEFAULT_LIST_FIELDS:
+            fields.setdefault(field, [])
+        return fields
+
+    return LazyMetadata(scalars, unpack)
+
+
+def _decode_legacy(stored: Dict[str, Any]) -> LazyMetadata:
+    """Decode metadata stored with one JSON string per list field."""
+    scalars = {}
+    encoded = {}
+    for key, value in stored.items():
+        if key in LIST_FIELDS and isinstance(value, str):
+            encoded[key] = value
+        else:
+            scalars[key] = value
+
+    if not encoded:
+        return LazyMetadata(scalars)
+    return LazyMetadata(scalars, lambda: {key: _load_list(value) for key, value in encoded.items()})
@@ -0,0 +1,678 @@
+"""In-process vector backend with memory-mapped vector storage.
+
+A dependency-light alternative to ChromaDB's PersistentClient for
+collections of up to about a million chunks. Vectors are stored L2-normalized
+as float32 rows in one memory-mapped file per collection and searched
+exactly with a numpy matrix product; documents and metadata live in SQLite.
+Opening a collection maps its vector file instead of loading an index, so
+startup is near-instant and query latency does not depend on a server.
+
+Large collections can additionally be searched through an inverted-file
+(IVF) index: vectors are clustered with k-means and a query scores only the
+rows of its nearest clusters. The IVF index is built in memory on the first
+query once a collection reaches RAG_MMAP_IVF_MIN_ROWS vectors, and retrained
+when the collection has doubled since.
+
+MmapVectorClient and MmapCollection implement the subset of ChromaDB's client
+and collection API that VectorStore uses, so the store runs unchanged on
+either backend. Select it with RAG_VECTOR_BACKEND=mmap.
+
+Files in the backend directory:
+    catalog.db         - collections, documents and metadata
+    vectors/<id>.f32   - float32 rows of a collection, memory-mapped
+"""
+import os
+import json
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from .quantized_index import normalize_vectors
+
+logger = logging.getLogger(__name__)
+
+# Live vectors at which a collection is searched through an IVF index; 0 disables IVF
+IVF_MIN_ROWS = int(os.getenv("RAG_MMAP_IVF_MIN_ROWS", "50000"))
+# Clusters scored per query by the IVF index
+IVF_NPROBE = int(os.getenv("RAG_MMAP_IVF_NPROBE", "8"))
+IVF_TRAIN_ITERATIONS = 10
+# Training sample size per cluster
+IVF_SAMPLES_PER_LIST = 64
+# Rows scored at a time when assigning rows to clusters
+ASSIGN_BLOCK_ROWS = 65536
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    metadata TEXT,
+    dimension INTEGER,
+    row_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    collection_id INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    document TEXT,
+    metadata TEXT,
+    PRIMARY KEY (collection_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_records_row ON records (collection_id, row);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_MAX_BOUND_IDS = 500
+_COMPARISON_OPERATORS = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+EmbeddingFunction = Callable[[List[str]], List[List[float]]]
+
+
+def _batches(ids: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(ids), _MAX_BOUND_IDS):
+        yield ids[start:start + _MAX_BOUND_IDS]
+
+
+def _value_clause(path: str, value: Any) -> Tuple[str, List[Any]]:
+    """SQL matching a metadata field of the same type that equals a value."""
+    if isinstance(value, bool):
+        return "json_type(metadata, ?) = ?", [path, "true" if value else "false"]
+    if isinstance(value, (int, float)):
+        return "(json_type(metadata, ?) IN ('integer', 'real') AND json_extract(metadata, ?) = ?)", [path, path, value]
+    return "(json_type(metadata, ?) = 'text' AND json_extract(metadata, ?) = ?)", [path, path, value]
+
+
+def _field_clause(key: str, condition: Any) -> Tuple[str, List[Any]]:
+    path = '$."' + key.replace('"', '""') + '"'
+    if not isinstance(condition, dict):
+        return _value_clause(path, condition)
+    if len(condition) != 1:
+        raise ValueError(f"Expected one operator for metadata field {key}, got {condition}")
+
+    operator, value = next(iter(condition.items()))
+    if operator in ("$eq", "$ne"):
+        clause, params = _value_clause(path, value)
+        return (clause if operator == "$eq" else f"NOT COALESCE({clause}, 0)"), params
+    if operator in ("$in", "$nin"):
+        clauses = [_value_clause(path, item) for item in value]
+        clause = " OR ".join(part for part, _ in clauses) or "0"
+        params = [param for _, part_params in clauses for param in part_params]
+        return (f"({clause})" if operator == "$in" else f"NOT COALESCE(({clause}), 0)"), params
+    if operator in _COMPARISON_OPERATORS:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Operator {operator} needs a number, got {value!r}")
+        return (
+            "(json_type(metadata, ?) IN ('integer', 'real') "
+            f"AND json_extract(metadata, ?) {_COMPARISON_OPERATORS[operator]} ?)"
+        ), [path, path, value]
+    raise ValueError(f"Unsupported metadata operator: {operator}")
+
+
+def where_to_sql(where: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """Translate a ChromaDB metadata filter into a SQL condition over the records table.
+
+    Supports field equality, $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin,
+    $and and $or. As in ChromaDB, values only match fields of the same type.
+
+    Returns:
+        Tuple of (condition, parameters).
+    """
+    clauses = []
+    params: List[Any] = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [where_to_sql(part) for part in condition]
+            joiner = " AND " if key == "$and" else " OR "
+            clause = joiner.join(f"({part})" for part, _ in parts) or ("1" if key == "$and" else "0")
+            part_params = [param for _, sub_params in parts for param in sub_params]
+        else:
+            clause, part_params = _field_clause(key, condition)
+        clauses.append(clause)
+        params.extend(part_params)
+    return " AND ".join(f"({clause})" for clause in clauses) or "1", params
+
+
+class _IVFIndex:
+    """Inverted lists of vector rows clustered around k-means centroids."""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, trained_rows: int):
+        self.centroids = centroids
+        self.assignments = assignments
+        self.trained_rows = trained_rows
+        self._lists = [np.flatnonzero(assignments == cluster) for cluster in range(len(centroids))]
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, live_rows: np.ndarray) -> "_IVFIndex":
+        """Cluster the live rows of a vector matrix with spherical k-means."""
+        list_count = max(1, int(np.sqrt(live_rows.size)))
+        rng = np.random.default_rng(0)
+        sample_size = min(live_rows.size, list_count * IVF_SAMPLES_PER_LIST)
+        sample = np.asarray(vectors[np.sort(rng.choice(live_rows, sample_size, replace=False))])
+
+        centroids = sample[rng.choice(sample_size, list_count, replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            nearest = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(list_count):
+                members = sample[nearest == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+            centroids = normalize_vectors(centroids)
+
+        assignments = np.full(vectors.shape[0], -1, dtype=np.int32)
+        index = cls(centroids, assignments, live_rows.size)
+        index.assign(vectors, live_rows)
+        return index
+
+    def assign(self, vectors: np.ndarray, rows: np.ndarray) -> None:
+        """Assign rows to their nearest cluster."""
+        if self.assignments.size < vectors.shape[0]:
+            grown = np.full(vectors.shape[0], -1, dtype=np.int32)
+            grown[:self.assignments.size] = self.assignments
+            self.assignments = grown
+        for start in range(0, rows.size, ASSIGN_BLOCK_ROWS):
+            block = rows[start:start + ASSIGN_BLOCK_ROWS]
+            self.assignments[block] = np.argmax(np.asarray(vectors[block]) @ self.centroids.T, axis=1)
+        self._lists = [np.flatnonzero(self.assignments == cluster) for cluster in range(len(self.centroids))]
+
+    def candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the clusters nearest to a query."""
+        probes = np.argsort(-(self.centroids @ query))[:nprobe]
+        return np.concatenate([self._lists[cluster] for cluster in probes])
+
+
+class MmapCollection:
+    """A collection of the mmap backend, API-compatible with a ChromaDB collection."""
+
+    def __init__(self, client: "MmapVectorClient", collection_id: int, name: str,
+                 metadata: Optional[Dict[str, Any]], dimension: Optional[int], row_count: int):
+        self._client = client
+        self.id = collection_id
+        self.name = name
+        self.metadata = metadata
+        self.dimension = dimension
+        self._row_count = row_count
+        self._row_ids: List[Optional[str]] = [None] * row_count
+        self._live = np.zeros(row_count, dtype=bool)
+        self._vectors: Optional[np.memmap] = None
+        self._ivf: Optional[_IVFIndex] = None
+        self._unassigned_rows: List[int] = []
+        self._lock = threading.RLock()
+
+        with client._connect() as conn:
+            for chunk_id, row in conn.execute("SELECT id, row FROM records WHERE collection_id = ?", (self.id,)):
+                self._row_ids[row] = chunk_id
+                self._live[row] = True
+        self._open_vectors()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self._client.vectors_directory, f"{self.id}.f32")
+
+    def _open_vectors(self) -> None:
+        """Memory-map the float32 vector file."""
+        if not self._row_count or not self.dimension:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r", shape=(self._row_count, self.dimension)
+        )
+
+    def count(self) -> int:
+        """Number of records in the collection."""
+        return int(self._live.sum())
+
+    def modify(self, name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Rename the collection or replace its metadata."""
+        with self._client._lock, self._client._connect() as conn:
+            if metadata is not None:
+                conn.execute("UPDATE collections SET metadata = ? WHERE id = ?", (json.dumps(metadata), self.id))
+                self.metadata = metadata
+            if name is not None and name != self.name:
+                if self._client._exists(conn, name):
+                    raise ValueError(f"Collection {name} already exists")
+                conn.execute("UPDATE collections SET name = ? WHERE id = ?", (name, self.id))
+                self._client._collections.pop(self.name, None)
+                self._client._collections[name] = self
+                self.name = name
+
+    def _embed(self, documents: Optional[List[str]], embeddings: Optional[Any]) -> Optional[np.ndarray]:
+        if embeddings is not None and len(embeddings):
+            return normalize_vectors(embeddings)
+        if documents is None:
+            return None
+        if self._client.embedding_function is None:
+            raise ValueError(f"Collection {self.name} needs embeddings: the client has no embedding function")
+        return normalize_vectors(self._client.embedding_function(list(documents)))
+
+    def _existing(self, conn: sqlite3.Connection, ids: List[str]) -> Dict[str, Tuple[int, Optional[str], Dict[str, Any]]]:
+        existing = {}
+        for batch in _batches(ids):
+            rows = conn.execute(
+                f"""SELECT id, row, document, metadata FROM records
+                    WHERE collection_id = ? AND id IN ({','.join('?' * len(batch))})""",
+                [self.id, *batch]
+            )
+            for chunk_id, row, document, metadata in rows:
+                existing[chunk_id] = (row, document, json.loads(metadata) if metadata else {})
+        return existing
+
+    def _write(
+        self,
+        ids: Sequence[str],
+        embeddings: Optional[Any],
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]],
+        documents: Optional[Sequence[Optional[str]]],
+        mode: str
+    ) -> None:
+        """Write records; mode is 'add' (skip existing), 'upsert' or 'update' (existing only)."""
+        ids = list(ids)
+        if len(set(ids)) != len(ids):
+            raise ValueError("Expected IDs to be unique")
+        vectors = self._embed(documents, embeddings)
+
+        with self._lock, self._client._connect() as conn:
+            existing = self._existing(conn, ids)
+            positions = [
+                position for position, chunk_id in enumerate(ids)
+                if (chunk_id in existing) == (mode == "update") or mode == "upsert"
+            ]
+            if not positions:
+                return
+
+            if vectors is not None:
+                if self.dimension is None:
+                    self.dimension = int(vectors.shape[1])
+                    conn.execute("UPDATE collections SET dimension = ? WHERE id = ?", (self.dimension, self.id))
+                elif vectors.shape[1] != self.dimension:
+                    raise ValueError(
+                        f"Embedding dimension {vectors.shape[1]} does not match collection dimensionality {self.dimension}"
+                    )
+
+            appends = [position for position in positions if ids[position] not in existing]
+            overwrites = [position for position in positions if ids[position] in existing]
+            if appends and vectors is None:
+                raise ValueError("New records need embeddings or documents to embed")
+            rows = {ids[position]: existing[ids[position]][0] for position in overwrites}
+            for offset, position in enumerate(appends):
+                rows[ids[position]] = self._row_count + offset
+
+            if vectors is not None:
+                self._write_vectors(
+                    [rows[ids[position]] for position in overwrites], vectors[overwrites],
+                    vectors[appends] if appends else None
+                )
+                conn.execute("UPDATE collections SET row_count = ? WHERE id = ?", (self._row_count, self.id))
+
+            records = []
+            for position in positions:
+                chunk_id = ids[position]
+                _, old_document, old_metadata = existing.get(chunk_id, (None, None, {}))
+                metadata = dict(old_metadata)
+                if metadatas is not None and metadatas[position]:
+                    metadata.update(metadatas[position])
+                document = documents[position] if documents is not None else old_document
+                records.append((self.id, chunk_id, rows[chunk_id], document, json.dumps(metadata) if metadata else None))
+            conn.executemany(
+                "INSERT OR REPLACE INTO records (collection_id, id, row, document, metadata) VALUES (?, ?, ?, ?, ?)",
+                records
+            )
+            for chunk_id, row in rows.items():
+                self._row_ids[row] = chunk_id
+                self._live[row] = True
+
+    def _write_vectors(self, rows: List[int], vectors: np.ndarray, appended: Optional[np.ndarray]) -> None:
+        """Overwrite rows in place and append new rows to the vector file."""
+        row_bytes = self.dimension * 4
+        if rows:
+            with open(self._vectors_path, "r+b") as handle:
+                for index, row in enumerate(rows):
+                    handle.seek(row * row_bytes)
+                    handle.write(vectors[index].astype(np.float32).tobytes())
+        if appended is not None and len(appended):
+            with open(self._vectors_path, "ab") as handle:
+                appended.astype(np.float32).tofile(handle)
+            start = self._row_count
+            self._row_count += len(appended)
+            self._row_ids.extend([None] * len(appended))
+            self._live = np.concatenate([self._live, np.zeros(len(appended), dtype=bool)])
+            rows = rows + list(range(start, self._row_count))
+        self._open_vectors()
+        self._unassigned_rows.extend(rows)
+
+    def add(self, ids: Sequence[str], embeddings: Optional[Any] = None,
+            metadatas: Optional[Sequence[Dict[str, Any]]] = None, documents: Optional[Sequence[str]] = None) -> None:
+        """Add records, skipping IDs that already exist."""
+        self._write(ids, embeddings, metadatas, documents, "add")
+
+    def upsert(self, ids: Sequence[str], embeddings: Optional[Any] = None,
+               metadatas: Optional[Sequence[Dict[str, Any]]] = None, documents: Optional[Sequence[str]] = None) -> None:
+        """Add records, replacing the vector and document and merging the metadata of existing IDs."""
+        self._write(ids, embeddings, metadatas, documents, "upsert")
+
+    def update(self, ids: Sequence[str], embeddings: Optional[Any] = None,
+               metadatas: Optional[Sequence[Dict[str, Any]]] = None, documents: Optional[Sequence[str]] = None) -> None:
+        """Update existing records; metadata is merged into the stored metadata."""
+        self._write(ids, embeddings, metadatas, documents, "update")
+
+    def _select(
+        self,
+        conn: sqlite3.Connection,
+        columns: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Tuple]:
+        condition, params = where_to_sql(where) if where else ("1", [])
+        paging = ""
+        if limit is not None or offset:
+            paging = " LIMIT ? OFFSET ?"
+        if ids is None:
+            sql = f"SELECT {columns} FROM records WHERE collection_id = ? AND {condition} ORDER BY row{paging}"
+            page = [limit if limit is not None else -1, offset or 0] if paging else []
+            return conn.execute(sql, [self.id, *params, *page]).fetchall()
+
+        rows = []
+        for batch in _batches(list(dict.fromkeys(ids))):
+            rows.extend(conn.execute(
+                f"""SELECT {columns}, row FROM records
+                    WHERE collection_id = ? AND id IN ({','.join('?' * len(batch))}) AND {condition}""",
+                [self.id, *batch, *params]
+            ))
+        rows.sort(key=lambda row: row[-1])
+        rows = [row[:-1] for row in rows]
+        start = offset or 0
+        return rows[start:start + limit] if limit is not None else rows[start:]
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Sequence[str] = ("metadatas", "documents")
+    ) -> Dict[str, Any]:
+        """Get records by ID and/or metadata filter, in insertion order."""
+        return self._get(ids, where, limit, offset, include)
+
+    def _get(
+        self,
+        ids: Optional[Sequence[str]],
+        where: Optional[Dict[str, Any]],
+        limit: Optional[int],
+        offset: Optional[int],
+        include: Sequence[str]
+    ) -> Dict[str, Any]:
+        with self._client._connect() as conn:
+            rows = self._select(
+                conn, "id, row, document, metadata", list(ids) if ids is not None else None, where, limit, offset
+            )
+        result: Dict[str, Any] = {
+            'ids': [row[0] for row in rows], 'embeddings': None, 'documents': None, 'metadatas': None,
+            'included': list(include)
+        }
+        if 'documents' in include:
+            result['documents'] = [row[2] for row in rows]
+        if 'metadatas' in include:
+            result['metadatas'] = [json.loads(row[3]) if row[3] else None for row in rows]
+        if 'embeddings' in include:
+            result['embeddings'] = [np.array(self._vectors[row[1]]).tolist() for row in rows]
+        return result
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        """Delete records by ID and/or metadata filter.
+
+        Vector rows are only marked free; compact() reclaims them.
+        """
+        with self._lock, self._client._connect() as conn:
+            doomed = self._select(conn, "id, row", list(ids) if ids is not None else None, where)
+            for batch in _batches([chunk_id for chunk_id, _ in doomed]):
+                conn.execute(
+                    f"DELETE FROM records WHERE collection_id = ? AND id IN ({','.join('?' * len(batch))})",
+                    [self.id, *batch]
+                )
+            for _, row in doomed:
+                self._row_ids[row] = None
+                self._live[row] = False
+
+    def query(
+        self,
+        query_embeddings: Optional[Any] = None,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("metadatas", "documents", "distances")
+    ) -> Dict[str, Any]:
+        """Find the nearest records to each query by cosine distance."""
+        queries = self._embed(query_texts, query_embeddings)
+        results: Dict[str, Any] = {'ids': [], 'documents': [], 'metadatas': [], 'distances': [], 'embeddings': None}
+        if queries is None:
+            return results
+
+        with self._lock:
+            allowed_rows = None
+            if where:
+                with self._client._connect() as conn:
+                    allowed_rows = np.array(sorted(row for (row,) in self._select(conn, "row", where=where)), dtype=np.int64)
+            hits = [self._search(query, n_results, allowed_rows) for query in queries]
+
+        wanted = list({chunk_id for query_hits in hits for chunk_id, _ in query_hits})
+        records = {}
+        if wanted:
+            fetched = self._get(wanted, None, None, None, ['documents', 'metadatas'])
+            records = {
+                chunk_id: (fetched['documents'][i], fetched['metadatas'][i])
+                for i, chunk_id in enumerate(fetched['ids'])
+            }
+        for query_hits in hits:
+            kept = [(chunk_id, similarity) for chunk_id, similarity in query_hits if chunk_id in records]
+            results['ids'].append([chunk_id for chunk_id, _ in kept])
+            results['documents'].append([records[chunk_id][0] for chunk_id, _ in kept])
+            results['metadatas'].append([records[chunk_id][1] for chunk_id, _ in kept])
+            results['distances'].append([1.0 - similarity for _, similarity in kept])
+        return results
+
+    def _search(self, query: np.ndarray, k: int, allowed_rows: Optional[np.ndarray]) -> List[Tuple[str, float]]:
+        """Score candidate rows against a normalized query and return the k best (id, similarity)."""
+        if self._vectors is None or k <= 0:
+            return []
+        if query.shape[0] != self.dimension:
+            raise ValueError(f"Query dimension {query.shape[0]} does not match collection dimensionality {self.dimension}")
+
+        if allowed_rows is not None:
+            rows = allowed_rows
+        else:
+            ivf = self._ivf_index()
+            if ivf is not None:
+                rows = np.unique(ivf.candidate_rows(query, IVF_NPROBE))
+                rows = rows[self._live[rows]]
+            else:
+                rows = None
+
+        if rows is None:
+            scores = np.asarray(self._vectors) @ query
+            scores[~self._live] = -np.inf
+            rows = np.arange(self._row_count)
+        else:
+            if rows.size == 0:
+                return []
+            scores = np.asarray(self._vectors[rows]) @ query
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k] if k < scores.size else np.arange(scores.size)
+        top = top[np.argsort(-scores[top])]
+        return [(self._row_ids[rows[i]], float(scores[i])) for i in top]
+
+    def _ivf_index(self) -> Optional[_IVFIndex]:
+        """Get the IVF index, training or extending it as the collection grows."""
+        live_rows = int(self._live.sum())
+        if IVF_MIN_ROWS <= 0 or live_rows < IVF_MIN_ROWS:
+            self._ivf = None
+            return None
+        if self._ivf is None or live_rows >= 2 * self._ivf.trained_rows:
+            self._ivf = _IVFIndex.train(self._vectors, np.flatnonzero(self._live))
+            logger.info(f"Trained IVF index with {len(self._ivf.centroids)} lists for collection {self.name}")
+        elif self._unassigned_rows:
+            self._ivf.assign(self._vectors, np.unique(np.array(self._unassigned_rows, dtype=np.int64)))
+        self._unassigned_rows = []
+        return self._ivf
+
+    def compact(self) -> int:
+        """Rewrite the vector file without freed rows.
+
+        Returns:
+            Number of rows reclaimed.
+        """
+        with self._lock, self._client._connect() as conn:
+            live_rows = np.flatnonzero(self._live)
+            reclaimed = self._row_count - live_rows.size
+            if reclaimed == 0:
+                return 0
+
+            vectors = np.array(self._vectors[live_rows]) if live_rows.size else None
+            tmp_path = self._vectors_path + ".tmp"
+            if vectors is not None:
+                vectors.tofile(tmp_path)
+                os.replace(tmp_path, self._vectors_path)
+            elif os.path.exists(self._vectors_path):
+                os.remove(self._vectors_path)
+            conn.executemany(
+                "UPDATE records SET row = ? WHERE collection_id = ? AND id = ?",
+                [(new_row, self.id, self._row_ids[old_row]) for new_row, old_row in enumerate(live_rows)]
+            )
+            conn.execute("UPDATE collections SET row_count = ? WHERE id = ?", (int(live_rows.size), self.id))
+
+            self._row_ids = [self._row_ids[row] for row in live_rows]
+            self._row_count = int(live_rows.size)
+            self._live = np.ones(self._row_count, dtype=bool)
+            self._ivf = None
+            self._unassigned_rows = []
+            self._open_vectors()
+            logger.info(f"Compacted collection {self.name}, reclaimed {reclaimed} rows")
+            return reclaimed
+
+
+class MmapVectorClient:
+    """Client of the mmap backend, API-compatible with ChromaDB's PersistentClient."""
+
+    def __init__(self, path: str, embedding_function: Optional[EmbeddingFunction] = None):
+        """Open or create a backend directory.
+
+        Args:
+            path: Directory of the vector database.
+            embedding_function: Embeds documents and query texts of writes
+                and queries that come without embeddings.
+        """
+        self.directory = os.path.join(path, "mmap_backend")
+        self.vectors_directory = os.path.join(self.directory, "vectors")
+        self.embedding_function = embedding_function
+        self._collections: Dict[str, MmapCollection] = {}
+        self._lock = threading.RLock()
+
+        os.makedirs(self.vectors_directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(CATALOG_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.path.join(self.directory, "catalog.db"), timeout=30)
+
+    @staticmethod
+    def _exists(conn: sqlite3.Connection, name: str) -> bool:
+        return conn.execute("SELECT 1 FROM collections WHERE name = ?", (name,)).fetchone() is not None
+
+    def _open(self, row: Tuple) -> MmapCollection:
+        collection_id, name, metadata, dimension, row_count = row
+        collection = self._collections.get(name)
+        if collection is None or collection.id != collection_id:
+            collection = MmapCollection(
+                self, collection_id, name, json.loads(metadata) if metadata else None, dimension, row_count
+            )
+            self._collections[name] = collection
+        return collection
+
+    def create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> MmapCollection:
+        """Create a collection.
+
+        Raises:
+            ValueError: If the collection already exists.
+        """
+        with self._lock, self._connect() as conn:
+            if self._exists(conn, name):
+                raise ValueError(f"Collection {name} already exists")
+            cursor = conn.execute(
+                "INSERT INTO collections (name, metadata) VALUES (?, ?)",
+                (name, json.dumps(metadata) if metadata else None)
+            )
+            return self._open((cursor.lastrowid, name, json.dumps(metadata) if metadata else None, None, 0))
+
+    def get_collection(self, name: str) -> MmapCollection:
+        """Get an existing collection.
+
+        Raises:
+            ValueError: If the collection does not exist.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, name, metadata, dimension, row_count FROM collections WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Collection {name} does not exist")
+            return self._open(row)
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> MmapCollection:
+        """Get a collection, creating it if it does not exist."""
+        with self._lock:
+            try:
+                return self.get_collection(name)
+            except ValueError:
+                return self.create_collection(name, metadata)
+
+    def list_collections(self) -> List[MmapCollection]:
+        """List all collections."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("SELECT id, name, metadata, dimension, row_count FROM collections ORDER BY id").fetchall()
+            return [self._open(row) for row in rows]
+
+    def delete_collection(self, name: str) -> None:
+        """Delete a collection with its records and vector file.
+
+        Raises:
+            ValueError: If the collection does not exist.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT id FROM collections WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise ValueError(f"Collection {name} does not exist")
+            conn.execute("DELETE FROM records WHERE collection_id = ?", row)
+            conn.execute("DELETE FROM collections WHERE id = ?", row)
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection._vectors = None
+            vectors_path = os.path.join(self.vectors_directory, f"{row[0]}.f32")
+            if os.path.exists(vectors_path):
+                os.remove(vectors_path)
+
+
+_clients: Dict[str, MmapVectorClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_mmap_client(path: str, embedding_function: Optional[EmbeddingFunction] = None) -> MmapVectorClient:
+    """Get the shared mmap backend client of a vector database directory.
+
+    Collections keep their row maps in memory, so all stores on a directory
+    must share one client.
+    """
+    key = os.path.abspath(path)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = MmapVectorClient(key, embedding_function)
+            _clients[key] = client
+        elif client.embedding_function is None:
+            client.embedding_function = embedding_function
+        return client
@@ -17,6 +17,9 @@ from typing import Dict, Any, List, Optional, Union
 from contextlib import contextmanager
 
 from .vector_sync_schemas import VectorSyncStatus, FileVectorMapping, SyncStatus
+from .change_feed import (
+    ChangeFeed, record_change, FILE_SAVED, FILE_DELETED, COLLECTION_DELETED
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,8 @@ class DatabaseCollectionManager:
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT UNIQUE NOT NULL,
         description TEXT DEFAULT '',
+        file_count INTEGER DEFAULT 0,  -- Maintained on every file write
+        total_size INTEGER DEFAULT 0,  -- Bytes of all files, maintained on every file write
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
@@ -83,6 +88,7 @@ class DatabaseCollectionManager:
         file_path TEXT NOT NULL,   -- Logical path (folder/filename)
         file_hash TEXT NOT NULL,
         chunk_ids TEXT NOT NULL,  -- JSON array of chunk IDs
+        chunk_hashes TEXT,        -- JSON array of chunk content hashes
         chunk_count INTEGER DEFAULT 0,
         last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         sync_status TEXT DEFAULT 'never_synced',
@@ -107,6 +113,8 @@ class DatabaseCollectionManager:
         """Initialize database collection manager with given path."""
         self.db_path = os.path.abspath(db_path)  # Make path absolute
         self._init_database()
+        # Version counters and change log of every collection write
+        self.change_feed = ChangeFeed(self.db_path)
         logger.debug(f"DatabaseCollectionManager initialized with absolute path: {self.db_path}")
         logger.info(f"DatabaseCollectionManager initialized with database: {self.db_path}")
     
@@ -120,6 +128,20 @@ class DatabaseCollectionManager:
         """Initialize database with enhanced schema."""
         with sqlite3.connect(self.db_path) as conn:
             conn.executescript(self.DATABASE_SCHEMA)
+            # Databases created before chunk-level sync lack the chunk hash column
+            mapping_columns = {row[1] for row in conn.execute("PRAGMA table_info(vector_file_mappings)")}
+            if 'chunk_hashes' not in mapping_columns:
+                conn.execute("ALTER TABLE vector_file_mappings ADD COLUMN chunk_hashes TEXT")
+            # Databases created before incremental statistics lack the file counters
+            collection_columns = {row[1] for row in conn.execute("PRAGMA table_info(collections)")}
+            if 'file_count' not in collection_columns:
+                conn.execute("ALTER TABLE collections ADD COLUMN file_count INTEGER DEFAULT 0")
+                conn.execute("ALTER TABLE collections ADD COLUMN total_size INTEGER DEFAULT 0")
+                conn.execute("""
+                    UPDATE collections SET
+                        file_count = (SELECT COUNT(*) FROM collection_files f WHERE f.collection_name = collections.name),
+                        total_size = (SELECT COALESCE(SUM(size), 0) FROM collection_files f WHERE f.collection_name = collections.name)
+                """)
             # Enable foreign keys
             conn.execute("PRAGMA foreign_keys = ON")
             conn.commit()
@@ -185,14 +207,23 @@ class DatabaseCollectionManager:
                 }
             
             with self.get_connection() as conn:
+                previous = conn.execute("""
+                    SELECT size FROM collection_files
+                    WHERE collection_name = ? AND filename = ? AND folder = ?
+                """, (collection_name, filename, folder)).fetchone()
                 cursor = conn.execute("""
                     INSERT OR REPLACE INTO collection_files 
                     (collection_name, filename, folder, content, content_hash, size, updated_at)
                     VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                 """, (collection_name, filename, folder, content, content_hash, file_size))
-                
-                conn.commit()
                 file_id = cursor.lastrowid
+                conn.execute("""
+                    UPDATE collections SET file_count = file_count + ?, total_size = total_size + ?
+                    WHERE name = ?
+                """, (0 if previous else 1, file_size - (previous['size'] if previous else 0), collection_name))
+                file_path = f"{folder}/{filename}" if folder else filename
+                version = record_change(conn, collection_name, FILE_SAVED, file_path)
+                conn.commit()
                 
                 # Update collection updated_at timestamp
                 conn.execute("""
@@ -209,7 +240,8 @@ class DatabaseCollectionManager:
                     "folder": folder,
                     "content_hash": content_hash,
                     "size": file_size,
-                    "path": f"{folder}/{filename}" if folder else filename
+                    "path": file_path,
+                    "version": version
                 }
         except Exception as e:
             logger.error(f"Error creating file {filename} in collection {collection_name}: {e}")
@@ -332,17 +364,27 @@ class DatabaseCollectionManager:
             logger.error(f"Error checking collection existence {collection_name}: {e}")
             return False
     
+    def get_collection(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """Get one collection with its file statistics, None if it does not exist."""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute("""
+                    SELECT name, description, file_count, total_size, created_at, updated_at
+                    FROM collections WHERE name = ?
+                """, (collection_name,)).fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Error getting collection {collection_name}: {e}")
+            return None
+    
     def list_collections(self) -> List[Dict[str, Any]]:
         """List all collections from database."""
         try:
             with self.get_connection() as conn:
                 rows = conn.execute("""
-                    SELECT c.name, c.description, c.created_at, c.updated_at,
-                           COUNT(f.id) as file_count
-                    FROM collections c
-                    LEFT JOIN collection_files f ON c.name = f.collection_name
-                    GROUP BY c.name, c.description, c.created_at, c.updated_at
-                    ORDER BY c.created_at DESC
+                    SELECT name, description, file_count, total_size, created_at, updated_at
+                    FROM collections
+                    ORDER BY created_at DESC
                 """).fetchall()
                 
                 return [
@@ -350,6 +392,7 @@ class DatabaseCollectionManager:
                         "name": row['name'],
                         "description": row['description'],
                         "file_count": row['file_count'],
+                        "total_size": row['total_size'],
                         "created_at": row['created_at'],
                         "updated_at": row['updated_at']
                     }
@@ -377,6 +420,8 @@ class DatabaseCollectionManager:
                 cursor = conn.execute("""
                     DELETE FROM collections WHERE name = ?
                 """, (collection_name,))
+                if cursor.rowcount:
+                    record_change(conn, collection_name, COLLECTION_DELETED)
                 
                 conn.commit()
                 
@@ -402,21 +447,31 @@ class DatabaseCollectionManager:
         """Delete a specific file from a collection."""
         try:
             with self.get_connection() as conn:
-                # Delete the file
-                cursor = conn.execute("""
-                    DELETE FROM collection_files 
+                deleted = conn.execute("""
+                    SELECT size FROM collection_files
                     WHERE collection_name = ? AND filename = ? AND folder = ?
-                """, (collection_name, filename, folder))
+                """, (collection_name, filename, folder)).fetchone()
+                file_path = f"{folder}/{filename}" if folder else filename
+                if deleted:
+                    # Delete the file
+                    conn.execute("""
+                        DELETE FROM collection_files 
+                        WHERE collection_name = ? AND filename = ? AND folder = ?
+                    """, (collection_name, filename, folder))
+                    conn.execute("""
+                        UPDATE collections SET file_count = file_count - 1, total_size = total_size - ?
+                        WHERE name = ?
+                    """, (deleted['size'], collection_name))
+                    record_change(conn, collection_name, FILE_DELETED, file_path)
                 
                 conn.commit()
                 
-                if cursor.rowcount == 0:
+                if not deleted:
                     return {
                         "success": False,
                         "error": f"File '{filename}' not found in collection '{collection_name}'"
                     }
                 
-                file_path = f"{folder}/{filename}" if folder else filename
                 return {
                     "success": True,
                     "message": f"File '{file_path}' deleted successfully from collection '{collection_name}'"
@@ -572,15 +627,16 @@ class PersistentSyncManager:
                 
                 conn.execute("""
                     INSERT OR REPLACE INTO vector_file_mappings
-                    (collection_name, file_id, file_path, file_hash, chunk_ids, 
+                    (collection_name, file_id, file_path, file_hash, chunk_ids, chunk_hashes,
                      chunk_count, last_synced, sync_status, sync_error, processing_time, chunking_strategy)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     mapping.collection_name,
                     file_id,
                     mapping.file_path,
                     mapping.file_hash,
                     json.dumps(mapping.chunk_ids),
+                    json.dumps(mapping.chunk_hashes),
                     mapping.chunk_count,
                     mapping.last_synced.isoformat() if mapping.last_synced else None,
                     mapping.sync_status.value if hasattr(mapping.sync_status, 'value') else str(mapping.sync_status),
@@ -612,6 +668,7 @@ class PersistentSyncManager:
                     
                     # Parse JSON chunk_ids
                     chunk_ids = json.loads(row['chunk_ids']) if row['chunk_ids'] else []
+                    chunk_hashes = json.loads(row['chunk_hashes']) if row['chunk_hashes'] else []
                     
                     # Convert string status back to enum
                     sync_status = SyncStatus(row['sync_status'])
@@ -621,6 +678,7 @@ class PersistentSyncManager:
                         file_path=row['file_path'],
                         file_hash=row['file_hash'],
                         chunk_ids=chunk_ids,
+                        chunk_hashes=chunk_hashes,
                         chunk_count=row['chunk_count'],
                         last_synced=last_synced,
                         sync_status=sync_status,
@@ -651,6 +709,7 @@ class PersistentSyncManager:
                     
                     # Parse JSON chunk_ids
                     chunk_ids = json.loads(row['chunk_ids']) if row['chunk_ids'] else []
+                    chunk_hashes = json.loads(row['chunk_hashes']) if row['chunk_hashes'] else []
                     
                     # Convert string status back to enum
                     sync_status = SyncStatus(row['sync_status'])
@@ -660,6 +719,7 @@ class PersistentSyncManager:
                         file_path=row['file_path'],
                         file_hash=row['file_hash'],
                         chunk_ids=chunk_ids,
+                        chunk_hashes=chunk_hashes,
                         chunk_count=row['chunk_count'],
                         last_synced=last_synced,
                         sync_status=sync_status,
@@ -674,6 +734,23 @@ class PersistentSyncManager:
         except Exception as e:
             logger.error(f"Error loading collection mappings for {collection_name}: {e}")
             return {}
+    
+    def delete_file_mappings(self, collection_name: str, file_paths: List[str]) -> int:
+        """Delete the file mappings of files removed from a collection."""
+        if not file_paths:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.executemany("""
+                    DELETE FROM vector_file_mappings
+                    WHERE collection_name = ? AND file_path = ?
+                """, [(collection_name, file_path) for file_path in file_paths])
+                conn.commit()
+                logger.debug(f"Deleted {cursor.rowcount} file mappings in collection {collection_name}")
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting file mappings in collection {collection_name}: {e}")
+            return 0
 
 
 class LimitedCache:
@@ -0,0 +1,175 @@
+"""Dimensionality-reducing projections for collection vectors.
+
+A projection maps model embeddings (e.g. 512 dims) to fewer dimensions
+(e.g. 128) before they are stored, and is applied to queries the same way.
+It is fitted once per collection and saved next to the vector database so
+stored vectors and later queries always share the same projection.
+
+Supported methods:
+    pca                - principal components of a sample of the collection
+    random_orthogonal  - data-independent random orthonormal basis
+"""
+import os
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_METHODS = ("pca", "random_orthogonal")
+
+
+def _orthonormal_complement(basis: np.ndarray, dimension: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Random orthonormal rows orthogonal to the rows of basis."""
+    candidates = rng.normal(size=(dimension, count))
+    if basis.shape[0]:
+        candidates -= basis.T @ (basis @ candidates)
+    q, _ = np.linalg.qr(candidates)
+    return q[:, :count].T
+
+
+class VectorProjection:
+    """Linear projection from source to target dimensions."""
+
+    def __init__(
+        self,
+        method: str,
+        components: np.ndarray,
+        mean: Optional[np.ndarray] = None,
+        fitted_samples: int = 0
+    ):
+        """Initialize a fitted projection.
+
+        Args:
+            method: 'pca' or 'random_orthogonal'.
+            components: Orthonormal rows, shape (target_dimension, source_dimension).
+            mean: Vector subtracted before projecting (PCA only).
+            fitted_samples: Number of vectors the projection was fitted on.
+        """
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Unknown projection method: {method}")
+        self.method = method
+        self.components = np.asarray(components, dtype=np.float32)
+        self.mean = (np.asarray(mean, dtype=np.float32) if mean is not None
+                     else np.zeros(self.components.shape[1], dtype=np.float32))
+        self.fitted_samples = fitted_samples
+
+    @property
+    def source_dimension(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def target_dimension(self) -> int:
+        return int(self.components.shape[0])
+
+    @classmethod
+    def fit(
+        cls,
+        vectors: Any,
+        target_dimension: int,
+        method: str = "pca",
+        seed: int = 0
+    ) -> "VectorProjection":
+        """Fit a projection on sample vectors.
+
+        With fewer samples than target dimensions, PCA keeps the components
+        the sample supports and fills the rest with a random orthonormal
+        complement.
+
+        Args:
+            vectors: Sample vectors, shape (n, source_dimension).
+            target_dimension: Number of output dimensions.
+            method: 'pca' or 'random_orthogonal'.
+            seed: Random seed for the random basis.
+
+        Returns:
+            The fitted projection.
+        """
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Unknown projection method: {method}")
+
+        sample = np.asarray(vectors, dtype=np.float32)
+        if sample.ndim != 2 or sample.shape[0] == 0:
+            raise ValueError("At least one sample vector is required to fit a projection")
+        source_dimension = sample.shape[1]
+        if not 0 < target_dimension < source_dimension:
+            raise ValueError(
+                f"Target dimension must be between 1 and {source_dimension - 1}, got {target_dimension}"
+            )
+
+        rng = np.random.default_rng(seed)
+        if method == "random_orthogonal":
+            components = _orthonormal_complement(
+                np.zeros((0, source_dimension)), source_dimension, target_dimension, rng
+            )
+            return cls(method, components, fitted_samples=sample.shape[0])
+
+        mean = sample.mean(axis=0)
+        _, singular_values, vt = np.linalg.svd(sample - mean, full_matrices=False)
+        supported = int(np.sum(singular_values > 1e-6 * max(singular_values.max(), 1e-12)))
+        components = vt[:min(supported, target_dimension)]
+        if components.shape[0] < target_dimension:
+            logger.info(
+                f"PCA sample of {sample.shape[0]} vectors supports {components.shape[0]} components; "
+                f"completing to {target_dimension} with a random orthonormal basis"
+            )
+            complement = _orthonormal_complement(
+                components, source_dimension, target_dimension - components.shape[0], rng
+            )
+            components = np.vstack([components, complement])
+        return cls(method, components, mean=mean, fitted_samples=sample.shape[0])
+
+    def transform(self, vectors: Any) -> np.ndarray:
+        """Project vectors and L2-normalize the result.
+
+        Args:
+            vectors: Vectors of shape (n, source_dimension) or (source_dimension,).
+
+        Returns:
+            Projected float32 rows of shape (n, target_dimension).
+        """
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.shape[1] != self.source_dimension:
+            raise ValueError(
+                f"Expected {self.source_dimension}-dimensional vectors, got {array.shape[1]}"
+            )
+        projected = (array - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return projected / norms
+
+    def save(self, path: str) -> None:
+        """Save the projection atomically as an .npz file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            method=np.array(self.method),
+            components=self.components,
+            mean=self.mean,
+            fitted_samples=np.array(self.fitted_samples)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "VectorProjection":
+        """Load a projection saved with save()."""
+        with np.load(path) as data:
+            return cls(
+                str(data["method"]),
+                data["components"],
+                mean=data["mean"],
+                fitted_samples=int(data["fitted_samples"])
+            )
+
+    def describe(self) -> Dict[str, Any]:
+        """Summary of the projection for statistics output."""
+        return {
+            "method": self.method,
+            "source_dimension": self.source_dimension,
+            "target_dimension": self.target_dimension,
+            "fitted_samples": self.fitted_samples
+        }
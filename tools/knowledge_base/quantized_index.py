@@ -0,0 +1,466 @@
+"""Quantized vector index with exact float32 rescoring.
+
+Candidate generation runs over compact int8 or float16 codes held in RAM.
+The full-precision float32 vectors live in a memory-mapped side file and are
+only touched for the top candidates, which are rescored exactly.
+
+Files in the index directory:
+    index.json   - format version, dtype and dimension
+    rows.log     - append-only JSON lines of added row ids and deleted rows
+    codes.bin    - quantized rows (int8 or float16)
+    scales.bin   - per-row float32 scale (int8 only)
+    vectors.f32  - full-precision float32 rows, memory-mapped for rescoring
+
+Writes only append to these files, so adding or deleting a batch costs time
+proportional to the batch rather than to the index. Deleted rows stay in the
+files until collection compaction rebuilds the index.
+"""
+import os
+import json
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+SUPPORTED_DTYPES = ("int8", "float16")
+DEFAULT_RESCORE_MULTIPLIER = 4
+# Rows upcast to float32 at a time while scoring quantized codes
+SCORE_BLOCK_ROWS = 16384
+# Smallest row capacity reserved when the in-memory codes or the float32 file grow
+MIN_CAPACITY_ROWS = 1024
+
+
+def normalize_vectors(vectors: Any) -> np.ndarray:
+    """Return L2-normalized float32 rows."""
+    array = np.asarray(vectors, dtype=np.float32)
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+    norms = np.linalg.norm(array, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return array / norms
+
+
+def quantize_vectors(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Quantize normalized float32 rows.
+
+    Args:
+        vectors: Normalized float32 rows.
+        dtype: 'int8' (symmetric per-row scale) or 'float16'.
+
+    Returns:
+        Tuple of (codes, scales). Scales is None for float16.
+    """
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"Unsupported quantization dtype: {dtype}")
+
+
+class QuantizedVectorIndex:
+    """Cosine-similarity index over quantized vectors with exact rescoring."""
+
+    def __init__(
+        self,
+        directory: str,
+        dtype: str = "int8",
+        rescore_multiplier: int = DEFAULT_RESCORE_MULTIPLIER
+    ):
+        """Open or create an index.
+
+        Args:
+            directory: Directory holding the index files.
+            dtype: Quantization dtype for new indexes ('int8' or 'float16').
+                An existing index keeps the dtype it was created with.
+            rescore_multiplier: Number of candidates per requested result that
+                are rescored with the float32 vectors.
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+
+        self.directory = directory
+        self.dtype = dtype
+        self.rescore_multiplier = max(1, int(rescore_multiplier))
+        self.dimension: Optional[int] = None
+
+        # Row ids in file order; None marks a deleted row
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        # Codes and scales of live rows are views into buffers that grow geometrically
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._code_buffer: Optional[np.ndarray] = None
+        self._scale_buffer: Optional[np.ndarray] = None
+        # The float32 file is preallocated for this many rows and mapped once per growth
+        self._vector_capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    @property
+    def _rows_log_path(self) -> str:
+        return os.path.join(self.directory, "rows.log")
+
+    @property
+    def _codes_path(self) -> str:
+        return os.path.join(self.directory, "codes.bin")
+
+    @property
+    def _scales_path(self) -> str:
+        return os.path.join(self.directory, "scales.bin")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    def _load(self) -> None:
+        """Load an existing index from disk."""
+        if not os.path.exists(self._index_path):
+            return
+
+        with open(self._index_path, "r", encoding="utf-8") as handle:
+            state = json.load(handle)
+
+        self.dtype = state["dtype"]
+        self.dimension = state.get("dimension")
+        if "row_ids" in state:
+            # Version 1 kept the row ids in the header; move them to the row log
+            self._row_ids = state["row_ids"]
+            self._log_rows({"add": self._row_ids}, mode="w")
+            self._save_state()
+        else:
+            self._row_ids = self._read_rows_log()
+        self._rows = {row_id: row for row, row_id in enumerate(self._row_ids) if row_id is not None}
+
+        row_count = len(self._row_ids)
+        if self.dimension and row_count:
+            # Rows appended to the data files but never logged were interrupted; drop them
+            code_bytes = row_count * self.dimension * np.dtype(self.dtype).itemsize
+            self._truncate(self._codes_path, code_bytes)
+            self._code_buffer = np.fromfile(self._codes_path, dtype=self.dtype).reshape(row_count, self.dimension)
+            self._codes = self._code_buffer
+            if self.dtype == "int8":
+                self._truncate(self._scales_path, row_count * 4)
+                self._scale_buffer = np.fromfile(self._scales_path, dtype=np.float32)
+                self._scales = self._scale_buffer
+            self._vector_capacity = os.path.getsize(self._vectors_path) // (self.dimension * 4)
+            self._open_vectors()
+
+        logger.info(f"Loaded quantized index with {len(self._rows)} vectors from {self.directory}")
+
+    @staticmethod
+    def _truncate(path: str, size: int) -> None:
+        """Cut a data file back to size bytes if it is longer."""
+        if os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def _read_rows_log(self) -> List[Optional[str]]:
+        """Replay the row log into row ids in file order."""
+        row_ids: List[Optional[str]] = []
+        if not os.path.exists(self._rows_log_path):
+            return row_ids
+        with open(self._rows_log_path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted write
+                    logger.warning(f"Skipping unreadable row log entry in {self.directory}")
+                    continue
+                row_ids.extend(entry.get("add", []))
+                for row in entry.get("delete", []):
+                    row_ids[row] = None
+        return row_ids
+
+    def _log_rows(self, entry: Dict[str, Any], mode: str = "a") -> None:
+        """Append an entry to the row log."""
+        with open(self._rows_log_path, mode, encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+
+    def _save_state(self) -> None:
+        """Atomically persist the index header."""
+        state = {
+            "version": INDEX_FORMAT_VERSION,
+            "dtype": self.dtype,
+            "dimension": self.dimension
+        }
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self._index_path)
+
+    def _open_vectors(self) -> None:
+        """Memory-map the preallocated float32 side file."""
+        if not self._vector_capacity:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r", shape=(self._vector_capacity, self.dimension)
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self._rows
+
+    def add(self, ids: Sequence[str], vectors: Any, overwrite: bool = False) -> int:
+        """Add vectors to the index.
+
+        Args:
+            ids: Vector ids.
+            vectors: Float vectors, one row per id.
+            overwrite: Replace vectors of ids that already exist. If False,
+                existing ids are skipped (matching ChromaDB's add semantics).
+
+        Returns:
+            Number of vectors written.
+        """
+        if not ids:
+            return 0
+
+        normalized = normalize_vectors(vectors)
+        if len(ids) != normalized.shape[0]:
+            raise ValueError("Number of ids and vectors must match")
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = int(normalized.shape[1])
+                self._save_state()
+            elif normalized.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {normalized.shape[1]} does not match index dimension {self.dimension}"
+                )
+
+            # Later duplicates within a batch win
+            positions: Dict[str, int] = {}
+            for position, vector_id in enumerate(ids):
+                positions[vector_id] = position
+
+            updates = [(self._rows[vector_id], position) for vector_id, position in positions.items()
+                       if vector_id in self._rows and overwrite]
+            appends = [(vector_id, position) for vector_id, position in positions.items()
+                       if vector_id not in self._rows]
+
+            if updates:
+                self._write_rows([row for row, _ in updates], normalized[[position for _, position in updates]])
+            if appends:
+                self._append_rows([vector_id for vector_id, _ in appends],
+                                  normalized[[position for _, position in appends]])
+            return len(updates) + len(appends)
+
+    def _append_rows(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Append new rows to all index files."""
+        codes, scales = quantize_vectors(vectors, self.dtype)
+        start = len(self._row_ids)
+        end = start + len(ids)
+
+        with open(self._codes_path, "ab") as handle:
+            codes.tofile(handle)
+        if scales is not None:
+            with open(self._scales_path, "ab") as handle:
+                scales.tofile(handle)
+        self._reserve_vectors(end)
+        with open(self._vectors_path, "r+b") as handle:
+            handle.seek(start * self.dimension * 4)
+            vectors.astype(np.float32).tofile(handle)
+        # The row log is written last; it decides which rows exist after a crash
+        self._log_rows({"add": ids})
+
+        self._row_ids.extend(ids)
+        for offset, vector_id in enumerate(ids):
+            self._rows[vector_id] = start + offset
+
+        self._code_buffer = self._grow(self._code_buffer, start, end, codes)
+        self._codes = self._code_buffer[:end]
+        if scales is not None:
+            self._scale_buffer = self._grow(self._scale_buffer, start, end, scales)
+            self._scales = self._scale_buffer[:end]
+
+    @staticmethod
+    def _grow(buffer: Optional[np.ndarray], start: int, end: int, rows: np.ndarray) -> np.ndarray:
+        """Write rows at start, doubling the buffer's capacity when it is full."""
+        if buffer is None or buffer.shape[0] < end:
+            capacity = max(end, MIN_CAPACITY_ROWS, 2 * (buffer.shape[0] if buffer is not None else 0))
+            grown = np.empty((capacity,) + rows.shape[1:], dtype=rows.dtype)
+            if buffer is not None:
+                grown[:start] = buffer[:start]
+            buffer = grown
+        buffer[start:end] = rows
+        return buffer
+
+    def _reserve_vectors(self, row_count: int) -> None:
+        """Make room for row_count rows in the float32 file, remapping only when it grows."""
+        if row_count <= self._vector_capacity:
+            return
+        self._vector_capacity = max(row_count, MIN_CAPACITY_ROWS, 2 * self._vector_capacity)
+        with open(self._vectors_path, "ab") as handle:
+            handle.truncate(self._vector_capacity * self.dimension * 4)
+        self._open_vectors()
+
+    def _write_rows(self, rows: List[int], vectors: np.ndarray) -> None:
+        """Overwrite existing rows in place."""
+        codes, scales = quantize_vectors(vectors, self.dtype)
+        code_bytes = self.dimension * codes.itemsize
+        vector_bytes = self.dimension * 4
+
+        with open(self._codes_path, "r+b") as code_file, open(self._vectors_path, "r+b") as vector_file:
+            for index, row in enumerate(rows):
+                code_file.seek(row * code_bytes)
+                code_file.write(codes[index].tobytes())
+                vector_file.seek(row * vector_bytes)
+                vector_file.write(vectors[index].astype(np.float32).tobytes())
+        if scales is not None:
+            with open(self._scales_path, "r+b") as scale_file:
+                for index, row in enumerate(rows):
+                    scale_file.seek(row * 4)
+                    scale_file.write(scales[index].tobytes())
+            self._scales[rows] = scales
+
+        self._codes[rows] = codes
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Delete vectors by id.
+
+        Rows are only marked deleted; compacting the collection rebuilds
+        the index without them.
+
+        Returns:
+            Number of vectors deleted.
+        """
+        with self._lock:
+            deleted = []
+            for vector_id in ids:
+                row = self._rows.pop(vector_id, None)
+                if row is not None:
+                    self._row_ids[row] = None
+                    deleted.append(row)
+            if deleted:
+                self._log_rows({"delete": deleted})
+            return len(deleted)
+
+    def get_vectors(self, ids: Sequence[str]) -> Dict[str, List[float]]:
+        """Get the full-precision vectors for ids present in the index."""
+        with self._lock:
+            return {
+                vector_id: np.array(self._vectors[self._rows[vector_id]]).tolist()
+                for vector_id in ids if vector_id in self._rows
+            }
+
+    def search(
+        self,
+        query_vector: Any,
+        k: int,
+        allowed_ids: Optional[Sequence[str]] = None,
+        rescore_multiplier: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Find the most similar vectors.
+
+        Args:
+            query_vector: Query vector.
+            k: Number of results.
+            allowed_ids: Restrict the search to these ids (e.g. a metadata filter).
+            rescore_multiplier: Override the number of rescored candidates per result.
+
+        Returns:
+            List of (id, cosine similarity) sorted by similarity, descending.
+        """
+        with self._lock:
+            if self._codes is None or not self._rows or k <= 0:
+                return []
+
+            query = normalize_vectors(query_vector)[0]
+            if query.shape[0] != self.dimension:
+                raise ValueError(
+                    f"Query dimension {query.shape[0]} does not match index dimension {self.dimension}"
+                )
+
+            if allowed_ids is None and len(self._rows) == len(self._row_ids):
+                # No filter and no deleted rows: score the code matrix in place
+                rows = np.arange(len(self._row_ids), dtype=np.int64)
+                codes = self._codes
+                scales = self._scales
+            else:
+                if allowed_ids is None:
+                    rows = np.fromiter(self._rows.values(), dtype=np.int64)
+                else:
+                    rows = np.fromiter(
+                        (self._rows[vector_id] for vector_id in allowed_ids if vector_id in self._rows),
+                        dtype=np.int64
+                    )
+                if rows.size == 0:
+                    return []
+                codes = self._codes[rows]
+                scales = self._scales[rows] if self._scales is not None else None
+
+            # Approximate scores over the compact codes
+            approx = self._approximate_scores(codes, query)
+            if scales is not None:
+                approx *= scales
+
+            multiplier = rescore_multiplier or self.rescore_multiplier
+            candidate_count = min(rows.size, max(k, k * multiplier))
+            if candidate_count < rows.size:
+                top = np.argpartition(-approx, candidate_count - 1)[:candidate_count]
+                candidates = rows[top]
+            else:
+                candidates = rows
+
+            # Exact rescoring from the memory-mapped float32 vectors
+            candidates = np.sort(candidates)
+            exact = np.asarray(self._vectors[candidates]) @ query
+            order = np.argsort(-exact)[:k]
+            return [(self._row_ids[candidates[i]], float(exact[i])) for i in order]
+
+    @staticmethod
+    def _approximate_scores(codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Dot products of quantized rows with a query, upcast in bounded blocks.
+
+        Numpy has no BLAS path for int8/float16 matrices, so rows are
+        converted to float32 block by block instead of all at once.
+        """
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], SCORE_BLOCK_ROWS):
+            block = codes[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + block.shape[0]] = block.astype(np.float32) @ query
+        return scores
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Report resident and on-disk sizes.
+
+        Returns:
+            Dictionary with resident (RAM) bytes and float32 side-file bytes.
+        """
+        with self._lock:
+            resident = 0
+            if self._codes is not None:
+                resident += self._codes.nbytes
+            if self._scales is not None:
+                resident += self._scales.nbytes
+            rows = len(self._row_ids)
+            return {
+                "dtype": self.dtype,
+                "dimension": self.dimension,
+                "vectors": len(self._rows),
+                "resident_bytes": resident,
+                "float32_bytes": rows * (self.dimension or 0) * 4,
+                "bytes_per_vector": (resident / rows) if rows else 0.0
+            }
+
+    def close(self) -> None:
+        """Release the memory map."""
+        with self._lock:
+            self._vectors = None
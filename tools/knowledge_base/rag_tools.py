@@ -5,7 +5,7 @@ from typing import Dict, Any, List, Optional, Union
 import json
 
 from tools.knowledge_base.vector_store import VectorStore
-from tools.knowledge_base.embeddings import EmbeddingService  
+from tools.knowledge_base.embeddings import EmbeddingService, get_embedding_registry
 from tools.knowledge_base.content_processor import ContentProcessor
 from tools.error_sanitizer import sanitize_error_message
 import functools
@@ -100,9 +100,16 @@ class RAGService:
                     "chunks_stored": 0
                 }
             
+            # New collections are embedded with this service's model; existing
+            # collections keep the model they were assigned
+            self.vector_store.get_or_create_collection(collection_name, embedding_model=self.model_name)
+            embedding_service = get_embedding_registry().get_service_for_collection(
+                collection_name, default_model=self.model_name
+            )
+            
             # Generate embeddings for chunks
             chunk_texts = [chunk["content"] for chunk in chunks]
-            embeddings = self.embedding_service.encode_batch(chunk_texts)
+            embeddings = embedding_service.encode_batch(chunk_texts)
             
             # Prepare data for storage
             documents = chunk_texts
@@ -110,7 +117,6 @@ class RAGService:
             ids = [chunk["id"] for chunk in chunks]
             
             # Store in vector database
-            self.vector_store.get_or_create_collection(collection_name)
             self.vector_store.add_documents(
                 documents=documents,
                 metadatas=metadatas,
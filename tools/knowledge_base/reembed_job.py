@@ -0,0 +1,216 @@
+"""Background re-embedding of a collection into a new model.
+
+A re-embed job builds a shadow collection with the new model while searches
+keep using the active collection. Documents are copied in small throttled
+batches so the job does not starve interactive queries of CPU or GPU time,
+and writes made in the meantime are mirrored into the shadow. When every
+document is copied, the collection's route is switched atomically and the
+old collection is deleted.
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REEMBED_BATCH_SIZE = int(os.getenv("RAG_REEMBED_BATCH_SIZE", "64"))
+DEFAULT_REEMBED_THROTTLE_SECONDS = float(os.getenv("RAG_REEMBED_THROTTLE_SECONDS", "0.05"))
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ReembedJob:
+    """Rebuild one collection with another embedding model."""
+
+    def __init__(
+        self,
+        vector_store: Any,
+        collection_name: str,
+        model_name: str,
+        batch_size: int = DEFAULT_REEMBED_BATCH_SIZE,
+        throttle_seconds: float = DEFAULT_REEMBED_THROTTLE_SECONDS
+    ):
+        """Initialize the job.
+
+        Args:
+            vector_store: VectorStore holding the collection.
+            collection_name: Logical name of the collection to re-embed.
+            model_name: Model to embed the collection with.
+            batch_size: Documents embedded per batch.
+            throttle_seconds: Pause between batches.
+        """
+        self.vector_store = vector_store
+        self.collection_name = collection_name
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.throttle_seconds = max(0.0, throttle_seconds)
+
+        self.state = JOB_PENDING
+        self.total_documents = 0
+        self.processed_documents = 0
+        self.previous_model: Optional[str] = None
+        self.shadow_collection: Optional[str] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.state in (JOB_PENDING, JOB_RUNNING)
+
+    def run(self) -> Dict[str, Any]:
+        """Run the job in the calling thread.
+
+        Returns:
+            Final job status.
+        """
+        store = self.vector_store
+        self.state = JOB_RUNNING
+        self.started_at = _now()
+
+        try:
+            self.previous_model = store.get_collection_embedding_model(self.collection_name)
+            shadow = store.begin_shadow_collection(self.collection_name, embedding_model=self.model_name)
+            self.shadow_collection = shadow.name
+            store.fit_shadow_projection(self.collection_name)
+
+            # Documents added from now on are mirrored, so a snapshot of ids is complete
+            ids = store.list_document_ids(self.collection_name)
+            self.total_documents = len(ids)
+            logger.info(
+                f"Re-embedding {self.total_documents} documents of {self.collection_name} "
+                f"with {self.model_name}"
+            )
+
+            for start in range(0, len(ids), self.batch_size):
+                if self._cancel_event.is_set():
+                    store.abort_shadow_collection(self.collection_name)
+                    self.state = JOB_CANCELLED
+                    logger.info(f"Re-embed of {self.collection_name} cancelled")
+                    return self.to_dict()
+
+                batch = ids[start:start + self.batch_size]
+                store.copy_to_shadow_collection(batch, self.collection_name)
+                self.processed_documents += len(batch)
+                if self.throttle_seconds:
+                    time.sleep(self.throttle_seconds)
+
+            previous = store.commit_shadow_collection(self.collection_name, drop_previous=False)
+            # Searches that resolved the old collection before the cutover may still be reading it
+            store._drop_in_background(previous)
+            self.state = JOB_COMPLETED
+            logger.info(f"Re-embed of {self.collection_name} with {self.model_name} completed")
+        except Exception as e:
+            self.state = JOB_FAILED
+            self.error = str(e)
+            logger.error(f"Re-embed of {self.collection_name} failed: {str(e)}")
+            try:
+                store.abort_shadow_collection(self.collection_name)
+            except Exception as abort_error:
+                logger.warning(f"Failed to discard shadow of {self.collection_name}: {str(abort_error)}")
+        finally:
+            self.finished_at = _now()
+
+        return self.to_dict()
+
+    def start(self) -> threading.Thread:
+        """Run the job in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self.run, name=f"reembed-{self.collection_name}", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def cancel(self) -> None:
+        """Ask the job to stop after the current batch and discard the shadow."""
+        self._cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a started job to finish.
+
+        Returns:
+            True if the job is no longer running.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_active
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job status for API responses."""
+        progress = (self.processed_documents / self.total_documents * 100
+                    if self.total_documents else (100.0 if self.state == JOB_COMPLETED else 0.0))
+        return {
+            "collection_name": self.collection_name,
+            "model_name": self.model_name,
+            "previous_model": self.previous_model,
+            "state": self.state,
+            "total_documents": self.total_documents,
+            "processed_documents": self.processed_documents,
+            "progress_percentage": round(progress, 1),
+            "shadow_collection": self.shadow_collection,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class ReembedJobManager:
+    """Track re-embed jobs, at most one active job per collection."""
+
+    def __init__(self):
+        self._jobs: Dict[str, ReembedJob] = {}
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        vector_store: Any,
+        collection_name: str,
+        model_name: str,
+        **job_options: Any
+    ) -> ReembedJob:
+        """Start re-embedding a collection in the background.
+
+        A shadow left behind by an earlier process is discarded first.
+
+        Raises:
+            ValueError: If the collection is already being re-embedded.
+        """
+        with self._lock:
+            existing = self._jobs.get(collection_name)
+            if existing is not None and existing.is_active:
+                raise ValueError(f"Collection {collection_name} is already being re-embedded")
+            vector_store.abort_shadow_collection(collection_name)
+
+            job = ReembedJob(vector_store, collection_name, model_name, **job_options)
+            self._jobs[collection_name] = job
+            job.start()
+            return job
+
+    def get(self, collection_name: str) -> Optional[ReembedJob]:
+        """Get the latest job of a collection."""
+        return self._jobs.get(collection_name)
+
+    def cancel(self, collection_name: str) -> bool:
+        """Cancel the active job of a collection.
+
+        Returns:
+            True if an active job was asked to stop.
+        """
+        job = self._jobs.get(collection_name)
+        if job is None or not job.is_active:
+            return False
+        job.cancel()
+        return True
@@ -0,0 +1,242 @@
+"""Adjacency index of chunk relationships.
+
+Chunk relationships (sequential neighbors, section siblings and overlap
+sources) are stored in chunk metadata, where ChromaDB can only hold them as
+JSON strings that cannot be filtered reliably. The vector store mirrors them
+into this SQLite table whenever chunk metadata is written, so relationship
+lookups and context expansion are indexed reads proportional to a chunk's
+degree instead of vector queries.
+
+Edges are keyed by logical collection name, so they survive re-embedding a
+collection into a new physical collection.
+"""
+import os
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chunk metadata fields holding relationships, and the edge type they index as
+RELATIONSHIP_FIELDS = {
+    'previous_chunk_id': 'previous',
+    'next_chunk_id': 'next',
+    'overlap_sources': 'overlap',
+    'section_siblings': 'sibling',
+}
+
+# Relationship types looked up by get_chunks_by_relationship
+RELATIONSHIP_TYPE_EDGES = {
+    'sequential': ('previous', 'next'),
+    'siblings': ('sibling',),
+    'overlap': ('overlap',),
+}
+
+RELATIONSHIP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_relationships (
+    collection_name TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    edge_type TEXT NOT NULL,
+    related_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (collection_name, chunk_id, edge_type, related_id)
+);
+CREATE INDEX IF NOT EXISTS idx_chunk_relationships_related
+    ON chunk_relationships (collection_name, related_id, edge_type);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_MAX_BOUND_IDS = 500
+
+
+def relationships_from_metadata(metadata: Optional[Dict[str, Any]]) -> List[Tuple[str, str, int]]:
+    """Extract (edge_type, related_id, position) edges from deserialized chunk metadata."""
+    edges = []
+    for field, edge_type in RELATIONSHIP_FIELDS.items():
+        value = (metadata or {}).get(field)
+        related_ids = value if isinstance(value, list) else [value]
+        for position, related_id in enumerate(related_ids):
+            if isinstance(related_id, str) and related_id:
+                edges.append((edge_type, related_id, position))
+    return edges
+
+
+def _batches(ids: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(ids), _MAX_BOUND_IDS):
+        yield ids[start:start + _MAX_BOUND_IDS]
+
+
+class ChunkRelationshipIndex:
+    """SQLite adjacency lists of chunk relationships per collection."""
+
+    def __init__(self, db_path: str):
+        """Open or create the index.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(RELATIONSHIP_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def index_chunks(
+        self,
+        collection_name: str,
+        ids: List[str],
+        metadatas: List[Optional[Dict[str, Any]]]
+    ) -> int:
+        """Replace the outgoing edges of chunks with those in their metadata.
+
+        Args:
+            collection_name: Logical collection name.
+            ids: Chunk IDs.
+            metadatas: Deserialized chunk metadata, parallel to ids.
+
+        Returns:
+            Number of edges written.
+        """
+        rows = [
+            (collection_name, chunk_id, edge_type, related_id, position)
+            for chunk_id, metadata in zip(ids, metadatas)
+            for edge_type, related_id, position in relationships_from_metadata(metadata)
+        ]
+        with self._lock, self._connect() as conn:
+            self._delete_chunks(conn, collection_name, ids)
+            conn.executemany(
+                """INSERT OR REPLACE INTO chunk_relationships
+                   (collection_name, chunk_id, edge_type, related_id, position)
+                   VALUES (?, ?, ?, ?, ?)""",
+                rows
+            )
+        return len(rows)
+
+    @staticmethod
+    def _delete_chunks(conn: sqlite3.Connection, collection_name: str, ids: List[str]) -> None:
+        for batch in _batches(list(ids)):
+            conn.execute(
+                f"""DELETE FROM chunk_relationships
+                    WHERE collection_name = ? AND chunk_id IN ({','.join('?' * len(batch))})""",
+                [collection_name, *batch]
+            )
+
+    def remove_chunks(self, collection_name: str, ids: List[str]) -> None:
+        """Forget the outgoing edges of deleted chunks."""
+        with self._lock, self._connect() as conn:
+            self._delete_chunks(conn, collection_name, ids)
+
+    def outgoing(
+        self,
+        collection_name: str,
+        ids: List[str]
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """Get the outgoing edges of chunks.
+
+        Returns:
+            Related chunk IDs by edge type, keyed by chunk ID, in metadata
+            order. Chunks without edges are omitted.
+        """
+        edges: Dict[str, Dict[str, List[str]]] = {}
+        with self._connect() as conn:
+            for batch in _batches(list(dict.fromkeys(ids))):
+                rows = conn.execute(
+                    f"""SELECT chunk_id, edge_type, related_id FROM chunk_relationships
+                        WHERE collection_name = ? AND chunk_id IN ({','.join('?' * len(batch))})
+                        ORDER BY chunk_id, edge_type, position""",
+                    [collection_name, *batch]
+                )
+                for chunk_id, edge_type, related_id in rows:
+                    edges.setdefault(chunk_id, {}).setdefault(edge_type, []).append(related_id)
+        return edges
+
+    def related_ids(
+        self,
+        collection_name: str,
+        chunk_id: str,
+        edge_types: Iterable[str],
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """Get chunks related to a chunk in either direction.
+
+        Args:
+            collection_name: Logical collection name.
+            chunk_id: Center chunk ID.
+            edge_types: Edge types to follow.
+            limit: Maximum number of IDs to return.
+
+        Returns:
+            Related chunk IDs, outgoing edges first, without duplicates.
+        """
+        edge_types = list(edge_types)
+        placeholders = ','.join('?' * len(edge_types))
+        with self._connect() as conn:
+            outgoing = conn.execute(
+                f"""SELECT related_id, edge_type, position FROM chunk_relationships
+                    WHERE collection_name = ? AND chunk_id = ? AND edge_type IN ({placeholders})""",
+                [collection_name, chunk_id, *edge_types]
+            ).fetchall()
+            incoming = conn.execute(
+                f"""SELECT chunk_id FROM chunk_relationships
+                    WHERE collection_name = ? AND related_id = ? AND edge_type IN ({placeholders})
+                    ORDER BY chunk_id""",
+                [collection_name, chunk_id, *edge_types]
+            ).fetchall()
+        outgoing.sort(key=lambda row: (edge_types.index(row[1]), row[2]))
+        related = [row[0] for row in outgoing + incoming if row[0] != chunk_id]
+        related = list(dict.fromkeys(related))
+        return related[:limit] if limit is not None else related
+
+    def has_chunk(self, collection_name: str, chunk_id: str) -> bool:
+        """Check whether a chunk has indexed edges in either direction."""
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT 1 FROM chunk_relationships
+                   WHERE collection_name = ? AND (chunk_id = ? OR related_id = ?) LIMIT 1""",
+                (collection_name, chunk_id, chunk_id)
+            ).fetchone()
+        return row is not None
+
+    def drop_collection(self, collection_name: str) -> None:
+        """Forget all edges of a collection."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM chunk_relationships WHERE collection_name = ?", (collection_name,))
+
+    def rename_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Move all edges of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE chunk_relationships SET collection_name = ? WHERE collection_name = ?",
+                (new_collection_name, collection_name)
+            )
+
+    def copy_collection(self, collection_name: str, new_collection_name: str) -> None:
+        """Copy all edges of a collection to a new name."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO chunk_relationships
+                   (collection_name, chunk_id, edge_type, related_id, position)
+                   SELECT ?, chunk_id, edge_type, related_id, position
+                   FROM chunk_relationships WHERE collection_name = ?""",
+                (new_collection_name, collection_name)
+            )
+
+
+_relationship_indexes: Dict[str, ChunkRelationshipIndex] = {}
+_relationship_indexes_lock = threading.Lock()
+
+
+def get_relationship_index(persist_directory: str) -> ChunkRelationshipIndex:
+    """Get the shared relationship index for a vector database directory."""
+    db_path = os.path.join(os.path.abspath(persist_directory), "chunk_relationships.db")
+    with _relationship_indexes_lock:
+        index = _relationship_indexes.get(db_path)
+        if index is None:
+            index = ChunkRelationshipIndex(db_path)
+            _relationship_indexes[db_path] = index
+        return index
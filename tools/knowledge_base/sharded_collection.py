@@ -0,0 +1,202 @@
+"""Collections split across several physical shards.
+
+A sharded collection keeps its records in N physical collections: the
+routed primary collection is shard 0 and the others are named after it.
+Each record lives in the shard picked by a stable hash of its id, so reads,
+updates and deletes by id go straight to one shard. Queries fan out to all
+shards concurrently and the per-shard rankings, each already sorted by
+distance, are merged into the global top-k with a heap.
+
+ShardedCollection exposes the subset of the ChromaDB collection API the
+vector store uses, so the rest of the store works on it unchanged.
+"""
+import os
+import re
+import heapq
+import hashlib
+import logging
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Collection metadata key holding the number of shards
+SHARD_COUNT_METADATA_KEY = "shard_count"
+
+SHARD_SEARCH_WORKERS = int(os.getenv("RAG_SHARD_SEARCH_WORKERS", str(os.cpu_count() or 4)))
+
+_shard_executor = ThreadPoolExecutor(max_workers=SHARD_SEARCH_WORKERS, thread_name_prefix="vector-shard")
+
+_SHARD_NAME_PATTERN = re.compile(r"__s\d+$")
+
+_RESULT_FIELDS = ("embeddings", "documents", "uris", "data", "metadatas", "distances")
+
+
+def shard_name(primary_name: str, shard: int) -> str:
+    """Get the physical name of a shard; shard 0 is the primary collection itself."""
+    return primary_name if shard == 0 else f"{primary_name}__s{shard}"
+
+
+def is_shard_name(physical_name: str) -> bool:
+    """Check whether a physical collection is a secondary shard of another."""
+    return bool(_SHARD_NAME_PATTERN.search(physical_name))
+
+
+def shard_for_id(record_id: str, shard_count: int) -> int:
+    """Pick the shard of a record from a stable hash of its id."""
+    return int(hashlib.md5(record_id.encode("utf-8")).hexdigest()[:8], 16) % shard_count
+
+
+def collection_shard_count(collection: Any) -> int:
+    """Get the number of shards configured in a collection's metadata."""
+    metadata = getattr(collection, "metadata", None)
+    if isinstance(metadata, dict):
+        count = metadata.get(SHARD_COUNT_METADATA_KEY)
+        if isinstance(count, int) and count > 1:
+            return count
+    return 1
+
+
+class ShardedCollection:
+    """A logical collection whose records are spread over several physical collections."""
+
+    def __init__(self, shards: List[Any]):
+        """Wrap the physical collections of a sharded collection.
+
+        Args:
+            shards: Physical collections, the primary first.
+        """
+        self.shards = shards
+
+    @property
+    def primary(self) -> Any:
+        """The routed physical collection, which holds shard 0 and the settings."""
+        return self.shards[0]
+
+    @property
+    def name(self) -> str:
+        return self.primary.name
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self.primary.metadata
+
+    def _partition(self, ids: List[str]) -> Dict[int, List[int]]:
+        """Group positions of ids by the shard they belong to."""
+        groups: Dict[int, List[int]] = {}
+        for position, record_id in enumerate(ids):
+            groups.setdefault(shard_for_id(record_id, len(self.shards)), []).append(position)
+        return groups
+
+    def _fan_out(self, call: Callable[[int], Any], shards: Optional[List[int]] = None) -> List[Any]:
+        """Call `call(shard)` for several shard numbers concurrently; results come back in order."""
+        shards = list(range(len(self.shards))) if shards is None else shards
+        if len(shards) == 1:
+            return [call(shards[0])]
+        futures = [_shard_executor.submit(call, shard) for shard in shards]
+        return [future.result() for future in futures]
+
+    def _write(self, method: str, ids: List[str], **columns) -> None:
+        for shard, positions in self._partition(ids).items():
+            shard_columns = {
+                key: [values[i] for i in positions]
+                for key, values in columns.items() if values is not None
+            }
+            getattr(self.shards[shard], method)(ids=[ids[i] for i in positions], **shard_columns)
+
+    def add(self, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        self._write("add", ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def upsert(self, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        self._write("upsert", ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def update(self, ids: List[str], embeddings=None, metadatas=None, documents=None) -> None:
+        self._write("update", ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        if ids is None:
+            self._fan_out(lambda shard: self.shards[shard].delete(where=where))
+            return
+        for shard, positions in self._partition(ids).items():
+            self.shards[shard].delete(ids=[ids[i] for i in positions], where=where)
+
+    def count(self) -> int:
+        return sum(self._fan_out(lambda shard: self.shards[shard].count()))
+
+    def modify(self, metadata: Optional[Dict[str, Any]] = None) -> None:
+        self.primary.modify(metadata=metadata)
+        shard_metadata = {
+            key: value for key, value in (metadata or {}).items() if key != SHARD_COUNT_METADATA_KEY
+        } or None
+        for shard in self.shards[1:]:
+            shard.modify(metadata=shard_metadata)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Get records from the shards holding them.
+
+        Records come back grouped by shard. limit and offset apply to that
+        combined order.
+        """
+        if ids is not None:
+            groups = self._partition(ids)
+            results = self._fan_out(
+                lambda shard: self.shards[shard].get(ids=[ids[i] for i in groups[shard]], where=where, **kwargs),
+                list(groups)
+            ) if groups else []
+        else:
+            per_shard_limit = None if limit is None else limit + (offset or 0)
+            results = self._fan_out(
+                lambda shard: self.shards[shard].get(where=where, limit=per_shard_limit, **kwargs)
+            )
+
+        merged: Dict[str, Any] = {"ids": []}
+        for result in results:
+            merged["ids"].extend(result["ids"])
+            for field in _RESULT_FIELDS:
+                if result.get(field) is not None:
+                    merged.setdefault(field, []).extend(list(result[field]))
+        for field in _RESULT_FIELDS:
+            merged.setdefault(field, None)
+        if results:
+            merged["included"] = results[0].get("included")
+
+        if ids is None and (limit is not None or offset):
+            start = offset or 0
+            end = None if limit is None else start + limit
+            for key, values in merged.items():
+                if isinstance(values, list) and key != "included":
+                    merged[key] = values[start:end]
+        return merged
+
+    def query(self, n_results: int = 10, **kwargs) -> Dict[str, Any]:
+        """Query every shard concurrently and merge each query's top n_results.
+
+        Each shard returns its hits sorted by distance, so the global top
+        n_results is a k-way heap merge of the shard rankings.
+        """
+        results = self._fan_out(lambda shard: self.shards[shard].query(n_results=n_results, **kwargs))
+        rows = len(results[0]["ids"])
+        fields = [field for field in _RESULT_FIELDS if results[0].get(field) is not None]
+
+        merged: Dict[str, Any] = {"ids": [], **{field: [] for field in fields}}
+        for row in range(rows):
+            ranked = [
+                [(distance, shard, position) for position, distance in enumerate(result["distances"][row])]
+                for shard, result in enumerate(results)
+            ]
+            top = list(islice(heapq.merge(*ranked), n_results))
+            merged["ids"].append([results[shard]["ids"][row][position] for _, shard, position in top])
+            for field in fields:
+                merged[field].append([results[shard][field][row][position] for _, shard, position in top])
+        for field in _RESULT_FIELDS:
+            merged.setdefault(field, None)
+        merged["included"] = results[0].get("included")
+        return merged
@@ -0,0 +1,163 @@
+"""
+Recall and memory benchmarks for vector storage options.
+
+Compares quantized candidate generation with exact float32 rescoring against
+brute-force float32 search, reporting recall@k next to the resident memory
+per vector so the trade-off can be chosen per collection.
+
+Usage:
+    python -m tools.knowledge_base.vector_benchmarks --vectors 20000 --dimension 512
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .quantized_index import QuantizedVectorIndex, normalize_vectors
+
+
+@dataclass
+class QuantizationBenchmarkResult:
+    """Recall and memory figures for one storage configuration."""
+    storage: str
+    rescore_multiplier: int
+    k: int
+    recall_at_k: float
+    bytes_per_vector: float
+    resident_mb: float
+    float32_mb: float
+    compression_ratio: float
+    avg_query_ms: float
+
+
+def generate_clustered_vectors(
+    count: int,
+    dimension: int,
+    clusters: int = 50,
+    spread: float = 0.35,
+    seed: int = 42
+) -> np.ndarray:
+    """Generate normalized vectors grouped around random centers.
+
+    Clustered data is closer to real embeddings than uniform noise, where
+    every neighbor is almost equally far away.
+    """
+    rng = np.random.default_rng(seed)
+    centers = normalize_vectors(rng.normal(size=(clusters, dimension)))
+    assignments = rng.integers(0, clusters, size=count)
+    vectors = centers[assignments] + spread * rng.normal(size=(count, dimension)) / np.sqrt(dimension)
+    return normalize_vectors(vectors)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[List[int]]:
+    """Brute-force float32 top-k row indices per query."""
+    scores = queries @ vectors.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [list(row[np.argsort(-scores[i, row])]) for i, row in enumerate(top)]
+
+
+def benchmark_quantized_recall(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    storages: Sequence[str] = ("float16", "int8"),
+    rescore_multipliers: Sequence[int] = (1, 2, 4, 8),
+    work_dir: Optional[str] = None
+) -> List[QuantizationBenchmarkResult]:
+    """Measure recall@k and memory for quantized storage configurations.
+
+    Args:
+        vectors: Corpus vectors.
+        queries: Query vectors.
+        k: Number of neighbors to compare.
+        storages: Quantization dtypes to test.
+        rescore_multipliers: Candidate multipliers to test.
+        work_dir: Directory for index files. Uses a temporary one if None.
+
+    Returns:
+        One result per (storage, rescore multiplier).
+    """
+    vectors = normalize_vectors(vectors)
+    queries = normalize_vectors(queries)
+    truth = exact_top_k(vectors, queries, k)
+    ids = [str(i) for i in range(vectors.shape[0])]
+    float32_bytes = vectors.shape[0] * vectors.shape[1] * 4
+
+    results = [
+        QuantizationBenchmarkResult(
+            storage="float32",
+            rescore_multiplier=1,
+            k=k,
+            recall_at_k=1.0,
+            bytes_per_vector=float(vectors.shape[1] * 4),
+            resident_mb=float32_bytes / (1024 * 1024),
+            float32_mb=float32_bytes / (1024 * 1024),
+            compression_ratio=1.0,
+            avg_query_ms=0.0
+        )
+    ]
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for storage in storages:
+            index = QuantizedVectorIndex(f"{tmp_dir}/{storage}", dtype=storage)
+            index.add(ids, vectors)
+            usage = index.memory_usage()
+
+            for multiplier in rescore_multipliers:
+                hits = 0
+                started = time.perf_counter()
+                for query, expected in zip(queries, truth):
+                    found = index.search(query, k, rescore_multiplier=multiplier)
+                    hits += len({int(vector_id) for vector_id, _ in found} & set(expected))
+                elapsed = time.perf_counter() - started
+
+                results.append(QuantizationBenchmarkResult(
+                    storage=storage,
+                    rescore_multiplier=multiplier,
+                    k=k,
+                    recall_at_k=hits / (len(queries) * k),
+                    bytes_per_vector=usage["bytes_per_vector"],
+                    resident_mb=usage["resident_bytes"] / (1024 * 1024),
+                    float32_mb=usage["float32_bytes"] / (1024 * 1024),
+                    compression_ratio=usage["float32_bytes"] / max(usage["resident_bytes"], 1),
+                    avg_query_ms=elapsed * 1000 / max(len(queries), 1)
+                ))
+            index.close()
+
+    return results
+
+
+def run_quantization_benchmark_cli():
+    """Command line entry point printing a recall vs memory table."""
+    parser = argparse.ArgumentParser(description="Quantized vector storage recall/memory benchmark")
+    parser.add_argument("--vectors", type=int, default=20000, help="Number of corpus vectors")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--dimension", type=int, default=512, help="Vector dimension")
+    parser.add_argument("--k", type=int, default=10, help="Neighbors per query")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    corpus = generate_clustered_vectors(args.vectors + args.queries, args.dimension)
+    vectors, queries = corpus[:args.vectors], corpus[args.vectors:]
+    results = benchmark_quantized_recall(vectors, queries, k=args.k)
+
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))
+        return
+
+    print(f"{'storage':<8} {'rescore':>7} {'recall@k':>9} {'B/vector':>9} {'RAM MB':>8} {'ratio':>6} {'ms/query':>9}")
+    for result in results:
+        print(
+            f"{result.storage:<8} {result.rescore_multiplier:>7} {result.recall_at_k:>9.3f} "
+            f"{result.bytes_per_vector:>9.1f} {result.resident_mb:>8.2f} "
+            f"{result.compression_ratio:>6.1f} {result.avg_query_ms:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    run_quantization_benchmark_cli()
@@ -0,0 +1,179 @@
+"""Portable snapshot bundles of a collection's vectors.
+
+A snapshot lets a synced collection move to another node without copying the
+whole vector database or re-embedding its files. A bundle is a directory:
+
+    manifest.json       - format version, collection settings and row count
+    vectors.npy         - float32 vectors as stored, memory-mappable
+    chunks.json.gz      - columns of chunk ids, texts and stored metadata
+    file_mappings.json  - file-to-chunk mappings of the sync manager
+    projection.npz      - fitted projection, if the collection has one
+
+Vectors are stored in collection space, after any projection, so importing
+only writes them back and never runs the embedding model.
+"""
+import os
+import json
+import gzip
+import shutil
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "crawl4ai-vector-snapshot"
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.json.gz"
+FILE_MAPPINGS_FILE = "file_mappings.json"
+PROJECTION_FILE = "projection.npz"
+
+
+@dataclass
+class VectorSnapshot:
+    """Contents of a snapshot bundle; vectors are memory-mapped from the bundle."""
+    path: str
+    manifest: Dict[str, Any]
+    ids: List[str]
+    documents: List[str]
+    metadatas: List[Dict[str, Any]]
+    vectors: np.ndarray
+    file_mappings: List[Dict[str, Any]] = field(default_factory=list)
+    projection_path: Optional[str] = None
+
+
+def write_snapshot(
+    path: str,
+    collection_name: str,
+    settings: Dict[str, Any],
+    ids: List[str],
+    documents: List[str],
+    metadatas: List[Dict[str, Any]],
+    vectors: np.ndarray,
+    file_mappings: Optional[List[Dict[str, Any]]] = None,
+    projection_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Write a snapshot bundle.
+
+    The bundle is assembled next to `path` and moved into place once
+    complete, so an interrupted export never leaves a partial bundle.
+
+    Args:
+        path: Directory to create.
+        collection_name: Collection the records belong to.
+        settings: Collection settings such as the embedding model id.
+        ids: Chunk ids.
+        documents: Chunk texts, parallel to ids.
+        metadatas: Stored chunk metadata, parallel to ids.
+        vectors: Stored float32 vectors, one row per id.
+        file_mappings: Serialized file-to-chunk mappings.
+        projection_path: Fitted projection file to bundle, if any.
+
+    Returns:
+        The bundle's manifest.
+
+    Raises:
+        ValueError: If `path` exists or the columns differ in length.
+    """
+    if os.path.exists(path):
+        raise ValueError(f"Snapshot path already exists: {path}")
+    if not (len(ids) == len(documents) == len(metadatas) == len(vectors)):
+        raise ValueError("Snapshot ids, documents, metadatas and vectors must have the same length")
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=parent)
+    try:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        np.save(os.path.join(staging, VECTORS_FILE), vectors)
+        with gzip.open(os.path.join(staging, CHUNKS_FILE), "wt", encoding="utf-8") as f:
+            json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f, separators=(",", ":"))
+        with open(os.path.join(staging, FILE_MAPPINGS_FILE), "w", encoding="utf-8") as f:
+            json.dump(file_mappings or [], f)
+        if projection_path:
+            shutil.copyfile(projection_path, os.path.join(staging, PROJECTION_FILE))
+
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "collection_name": collection_name,
+            "embedding_model": settings.get("embedding_model"),
+            "settings": settings,
+            "count": len(ids),
+            "dimension": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+            "file_count": len(file_mappings or []),
+            "has_projection": bool(projection_path),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        os.rename(staging, path)
+        logger.info(f"Wrote snapshot of {len(ids)} chunks of {collection_name} to {path}")
+        return manifest
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Read and validate the manifest of a snapshot bundle.
+
+    Raises:
+        ValueError: If `path` is not a snapshot bundle of a supported version.
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ValueError(f"Not a vector snapshot: {path}")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Not a vector snapshot: {path}")
+    if manifest.get("version", 0) > SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {manifest.get('version')} in {path}")
+    return manifest
+
+
+def read_snapshot(path: str) -> VectorSnapshot:
+    """Open a snapshot bundle.
+
+    Args:
+        path: Bundle directory.
+
+    Returns:
+        The bundle's contents, with vectors memory-mapped.
+
+    Raises:
+        ValueError: If the bundle is invalid or its files are inconsistent.
+    """
+    manifest = read_manifest(path)
+    vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+    with gzip.open(os.path.join(path, CHUNKS_FILE), "rt", encoding="utf-8") as f:
+        chunks = json.load(f)
+    file_mappings = []
+    if os.path.exists(os.path.join(path, FILE_MAPPINGS_FILE)):
+        with open(os.path.join(path, FILE_MAPPINGS_FILE), encoding="utf-8") as f:
+            file_mappings = json.load(f)
+    projection_path = os.path.join(path, PROJECTION_FILE)
+
+    snapshot = VectorSnapshot(
+        path=path,
+        manifest=manifest,
+        ids=chunks["ids"],
+        documents=chunks["documents"],
+        metadatas=chunks["metadatas"],
+        vectors=vectors,
+        file_mappings=file_mappings,
+        projection_path=projection_path if os.path.exists(projection_path) else None
+    )
+    if not (manifest["count"] == len(snapshot.ids) == len(snapshot.documents)
+            == len(snapshot.metadatas) == len(vectors)):
+        raise ValueError(f"Snapshot {path} is inconsistent: row counts differ from the manifest")
+    return snapshot
@@ -1,11 +1,129 @@
 """Vector store implementation using ChromaDB for RAG functionality."""
 import os
+import re
+import copy
+import time
+import shutil
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Union
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from .dependencies import rag_deps, ensure_rag_available
+from .embeddings import get_embedding_registry, DEFAULT_MODEL_NAME
+from .collection_routing import get_routing_table
+from .lexical_index import get_lexical_index
+from .metadata_codec import encode_metadata, decode_metadata
+from .sharded_collection import (
+    ShardedCollection,
+    SHARD_COUNT_METADATA_KEY,
+    collection_shard_count,
+    is_shard_name,
+    shard_name
+)
+from .document_references import (
+    ReferencedDocumentCollection,
+    DOCUMENT_STORAGE_METADATA_KEY,
+    SUPPORTED_DOCUMENT_STORAGE,
+    SOURCE_COLLECTION_FIELD,
+    collection_document_storage,
+    get_file_content_cache
+)
+from .collection_stats import get_collection_stats_index
+from .index_compaction import (
+    COMPACTION_IDLE_WAIT_SECONDS,
+    COMPACTION_MIN_TOMBSTONES,
+    COMPACTION_TOMBSTONE_RATIO,
+    foreground_activity,
+    get_compaction_manager,
+    get_tombstone_log
+)
+from .relationship_index import (
+    get_relationship_index,
+    relationships_from_metadata,
+    RELATIONSHIP_TYPE_EDGES
+)
 
 logger = logging.getLogger(__name__)
 
+# Collection metadata key recording the model a collection is embedded with
+EMBEDDING_MODEL_METADATA_KEY = "embedding_model"
+# Collection metadata key recording how vectors are stored ('float32', 'int8', 'float16')
+VECTOR_STORAGE_METADATA_KEY = "vector_storage"
+DEFAULT_VECTOR_STORAGE = "float32"
+# ChromaDB keeps documents and metadata of quantized collections next to this
+# one-dimensional stand-in; the real vectors live in the quantized index
+QUANTIZED_PLACEHOLDER_EMBEDDING = [0.0]
+# Collection metadata keys configuring a dimensionality-reducing projection
+PROJECTION_METHOD_METADATA_KEY = "projection_method"
+PROJECTION_DIMENSION_METADATA_KEY = "projection_dimension"
+# Collection metadata keys a namespace inherits from the store's collection
+NAMESPACE_INHERITED_METADATA_KEYS = (
+    EMBEDDING_MODEL_METADATA_KEY,
+    VECTOR_STORAGE_METADATA_KEY,
+    PROJECTION_METHOD_METADATA_KEY,
+    PROJECTION_DIMENSION_METADATA_KEY,
+    SHARD_COUNT_METADATA_KEY,
+    DOCUMENT_STORAGE_METADATA_KEY,
+)
+# Logical names of per-collection namespaces in the routing table
+NAMESPACE_ROUTE_PREFIX = "namespace:"
+# Logical names of the staging namespaces collections are rebuilt into
+NAMESPACE_REBUILD_ROUTE_PREFIX = "rebuild:"
+# Chunk metadata field that told collections apart in the shared collection
+NAMESPACE_METADATA_KEY = "collection_name"
+# Records copied per batch when copying or adopting a namespace's records
+NAMESPACE_COPY_BATCH_SIZE = 500
+
+# Vector index backend: "chroma" (ChromaDB PersistentClient) or "mmap"
+# (in-process memory-mapped vectors, see mmap_backend.py)
+VECTOR_BACKEND = os.getenv("RAG_VECTOR_BACKEND", "chroma")
+SUPPORTED_VECTOR_BACKENDS = ("chroma", "mmap")
+
+# Reciprocal rank fusion constant; larger values flatten the rank weighting
+DEFAULT_RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+# Candidates retrieved per ranking for hybrid search, relative to k
+HYBRID_CANDIDATE_MULTIPLIER = 4
+
+_namespace_lock = threading.RLock()
+# Runs the lexical half of hybrid searches next to the dense query
+_lexical_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lexical-search")
+_namespace_search_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RAG_NAMESPACE_SEARCH_WORKERS", "4")), thread_name_prefix="namespace-search"
+)
+# Collections whose statistics are being rebuilt in the background, by (directory, name)
+_stats_repairs: set = set()
+_stats_repairs_lock = threading.Lock()
+
+
+def fuse_rankings(
+    rankings: List[List[Dict[str, Any]]],
+    k: int,
+    rrf_k: int = DEFAULT_RRF_K
+) -> List[Dict[str, Any]]:
+    """Merge several rankings of search results with reciprocal rank fusion.
+    
+    Args:
+        rankings: Result lists, each ordered best first.
+        k: Number of results to return.
+        rrf_k: Reciprocal rank fusion constant.
+        
+    Returns:
+        The k best results by 'fusion_score', each once, with its best
+        'score' and the number of rankings it appears in as 'matched_queries'.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for results in rankings:
+        for rank, result in enumerate(results, start=1):
+            entry = fused.get(result['id'])
+            if entry is None:
+                entry = fused[result['id']] = dict(result, fusion_score=0.0, matched_queries=0)
+            entry['fusion_score'] += 1.0 / (rrf_k + rank)
+            entry['matched_queries'] += 1
+            entry['score'] = max(entry['score'], result['score'])
+    return sorted(fused.values(), key=lambda result: result['fusion_score'], reverse=True)[:k]
+
 
 class VectorStore:
     """ChromaDB-based vector store for document embeddings."""
@@ -13,22 +131,48 @@ class VectorStore:
     def __init__(
         self,
         persist_directory: Optional[str] = None,
-        collection_name: str = "crawl4ai_documents"
+        collection_name: str = "crawl4ai_documents",
+        backend: Optional[str] = None
     ):
         """Initialize the vector store.
         
         Args:
             persist_directory: Directory to persist the database. If None, uses memory only.
             collection_name: Name of the collection to use.
+            backend: Vector index backend, "chroma" or "mmap". Uses
+                RAG_VECTOR_BACKEND if None.
         """
         ensure_rag_available()
         
         self.persist_directory = persist_directory or os.getenv("RAG_DB_PATH", "./rag_db")
         self.collection_name = collection_name
+        self.backend = backend or VECTOR_BACKEND
+        if self.backend not in SUPPORTED_VECTOR_BACKENDS:
+            raise ValueError(f"Unsupported vector backend: {self.backend}")
         self.client = None
         self.collection = None
+        self._quantized_indexes: Dict[str, Any] = {}
+        self._projections: Dict[str, Any] = {}
+        self._shards: Dict[str, List[Any]] = {}
+        self._routes = None
+        self._relationships = None
+        self._lexical = None
+        self._centroids = None
+        self._documents = None
+        self._tombstones = None
+        self._stats = None
+        self._route_generation = -1
+        self._namespace_views: Dict[str, "VectorStore"] = {}
         
         self._initialize_client()
+        self._routes = get_routing_table(self.persist_directory)
+        self._relationships = get_relationship_index(self.persist_directory)
+        self._lexical = get_lexical_index(self.persist_directory)
+        from .collection_centroids import get_centroid_index
+        self._centroids = get_centroid_index(self.persist_directory)
+        self._documents = get_file_content_cache(self.persist_directory)
+        self._tombstones = get_tombstone_log(self.persist_directory)
+        self._stats = get_collection_stats_index(self.persist_directory)
         logger.info(f"VectorStore initialized with directory: {self.persist_directory}")
     
     def _initialize_client(self):
@@ -41,16 +185,14 @@ class VectorStore:
                 try:
                     # Ensure directory exists
                     os.makedirs(expanded_path, exist_ok=True)
-                    chromadb = rag_deps.get_component('chromadb')
-                    self.client = chromadb.PersistentClient(path=expanded_path)
+                    self.client = self._create_persistent_client(expanded_path)
                     self.persist_directory = expanded_path  # Update with expanded path
                 except OSError as e:
                     if e.errno == 30:  # Read-only file system
                         logger.warning(f"Cannot write to {expanded_path} (read-only filesystem). Falling back to /tmp.")
                         fallback_path = f"/tmp/crawl4ai-rag-db"
                         os.makedirs(fallback_path, exist_ok=True)
-                        chromadb = rag_deps.get_component('chromadb')
-                        self.client = chromadb.PersistentClient(path=fallback_path)
+                        self.client = self._create_persistent_client(fallback_path)
                         self.persist_directory = fallback_path
                     else:
                         raise
@@ -59,16 +201,35 @@ class VectorStore:
                 chromadb = rag_deps.get_component('chromadb')
                 self.client = chromadb.Client()
             
-            logger.info(f"ChromaDB client initialized successfully at {self.persist_directory if self.persist_directory else 'memory'}")
+            logger.info(f"{self.backend} vector client initialized successfully at {self.persist_directory if self.persist_directory else 'memory'}")
         except Exception as e:
-            logger.error(f"Failed to initialize ChromaDB client: {str(e)}")
+            logger.error(f"Failed to initialize {self.backend} vector client: {str(e)}")
             raise
     
-    def create_collection(self, collection_name: Optional[str] = None) -> Any:
+    def _create_persistent_client(self, path: str) -> Any:
+        """Create the client of the configured backend for a database directory."""
+        if self.backend == "mmap":
+            from .mmap_backend import get_mmap_client
+            return get_mmap_client(path, embedding_function=self._embed_with_default_model)
+        chromadb = rag_deps.get_component('chromadb')
+        return chromadb.PersistentClient(path=path)
+    
+    @staticmethod
+    def _embed_with_default_model(texts: List[str]) -> List[List[float]]:
+        """Embed texts of collections without an assigned model on backends lacking a default embedding function."""
+        return get_embedding_registry().get_service().encode_batch(texts)
+    
+    def create_collection(
+        self,
+        collection_name: Optional[str] = None,
+        embedding_model: Optional[str] = None
+    ) -> Any:
         """Create a new collection.
         
         Args:
             collection_name: Name of the collection. Uses default if None.
+            embedding_model: Model to embed the collection with. Uses
+                ChromaDB's default embedding function if None.
             
         Returns:
             The created collection object.
@@ -77,9 +238,18 @@ class VectorStore:
             Exception: If collection creation fails.
         """
         name = collection_name or self.collection_name
+        physical_name = self._routes.resolve(name)
         
         try:
-            self.collection = self.client.create_collection(name=name)
+            self._route_generation = self._routes.generation
+            if embedding_model:
+                self.collection = self.client.create_collection(
+                    name=physical_name,
+                    metadata={EMBEDDING_MODEL_METADATA_KEY: embedding_model}
+                )
+                get_embedding_registry().assign_collection_model(physical_name, embedding_model)
+            else:
+                self.collection = self.client.create_collection(name=physical_name)
             self.collection_name = name
             logger.info(f"Created collection: {name}")
             return self.collection
@@ -102,7 +272,8 @@ class VectorStore:
         name = collection_name or self.collection_name
         
         try:
-            self.collection = self.client.get_collection(name=name)
+            self._route_generation = self._routes.generation
+            self.collection = self._open_physical(self._routes.resolve(name))
             self.collection_name = name
             logger.info(f"Retrieved collection: {name}")
             return self.collection
@@ -110,11 +281,17 @@ class VectorStore:
             logger.error(f"Failed to get collection {name}: {str(e)}")
             raise
     
-    def get_or_create_collection(self, collection_name: Optional[str] = None) -> Any:
+    def get_or_create_collection(
+        self,
+        collection_name: Optional[str] = None,
+        embedding_model: Optional[str] = None
+    ) -> Any:
         """Get or create a collection.
         
         Args:
             collection_name: Name of the collection. Uses default if None.
+            embedding_model: Model to assign if the collection has no model
+                assigned yet. Existing assignments are left untouched.
             
         Returns:
             The collection object.
@@ -122,14 +299,707 @@ class VectorStore:
         name = collection_name or self.collection_name
         
         try:
-            self.collection = self.client.get_or_create_collection(name=name)
+            self._route_generation = self._routes.generation
+            self.collection = self._wrap_collection(
+                self.client.get_or_create_collection(name=self._routes.resolve(name))
+            )
             self.collection_name = name
+            if embedding_model and not self._collection_embedding_model(self.collection):
+                self.set_collection_embedding_model(embedding_model, name)
             logger.info(f"Got or created collection: {name}")
             return self.collection
         except Exception as e:
             logger.error(f"Failed to get or create collection {name}: {str(e)}")
             raise
     
+    def _collection_embedding_model(self, collection: Any = None) -> Optional[str]:
+        """Get the embedding model assigned to a collection.
+        
+        The assignment is persisted in the collection's metadata and cached in
+        the embedding registry.
+        
+        Args:
+            collection: ChromaDB collection. Uses current if None.
+            
+        Returns:
+            Model name, or None if the collection uses ChromaDB's default
+            embedding function.
+        """
+        collection = collection if collection is not None else self.collection
+        name = getattr(collection, 'name', None)
+        if not isinstance(name, str):
+            return None
+        
+        registry = get_embedding_registry()
+        model_name = registry.get_collection_model(name)
+        if model_name is None:
+            collection_metadata = getattr(collection, 'metadata', None)
+            if isinstance(collection_metadata, dict):
+                model_name = collection_metadata.get(EMBEDDING_MODEL_METADATA_KEY)
+            if not isinstance(model_name, str) or not model_name:
+                return None
+            registry.assign_collection_model(name, model_name)
+        return model_name
+    
+    def get_collection_embedding_model(self, collection_name: Optional[str] = None) -> Optional[str]:
+        """Get the embedding model assigned to a collection.
+        
+        Args:
+            collection_name: Name of the collection. Uses current if None.
+            
+        Returns:
+            Model name, or None if ChromaDB's default embedding function is used.
+        """
+        return self._collection_embedding_model(self._resolve_collection(collection_name))
+    
+    def set_collection_embedding_model(
+        self,
+        model_name: str,
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Assign the embedding model a collection is embedded with.
+        
+        Args:
+            model_name: Model name.
+            collection_name: Name of the collection. Uses current if None.
+            
+        Raises:
+            ValueError: If the collection already holds vectors from another model.
+        """
+        collection = self._resolve_collection(collection_name)
+        current_model = self._collection_embedding_model(collection)
+        if current_model == model_name:
+            return
+        if collection.count() > 0 and current_model is not None:
+            raise ValueError(
+                f"Collection {collection.name} is embedded with {current_model}; "
+                f"re-embed it before switching to {model_name}"
+            )
+        
+        collection_metadata = dict(collection.metadata or {})
+        collection_metadata[EMBEDDING_MODEL_METADATA_KEY] = model_name
+        collection.modify(metadata=collection_metadata)
+        get_embedding_registry().assign_collection_model(collection.name, model_name)
+        logger.info(f"Assigned embedding model {model_name} to collection {collection.name}")
+    
+    def _current_collection(self) -> Any:
+        """Get the current collection, reopening it if its route was switched."""
+        if not self.collection or self._route_generation != self._routes.generation:
+            self.get_or_create_collection()
+        return self.collection
+    
+    @contextmanager
+    def _writing(self):
+        """Resolve the current collection for a write and hold off route switches until it is done.
+        
+        A write and its mirror into a shadow collection must land before the
+        collection is switched to the shadow; otherwise a write resolved just
+        before the switch reaches a collection that is no longer served.
+        """
+        with self._routes.switch_lock.writing():
+            yield self._current_collection()
+    
+    def _resolve_collection(self, collection_name: Optional[str] = None) -> Any:
+        """Get a collection object without switching the current collection."""
+        if collection_name and collection_name != self.collection_name:
+            return self._open_physical(self._routes.resolve(collection_name))
+        return self._current_collection()
+    
+    def _open_physical(self, physical_name: str) -> Any:
+        """Open a physical collection, together with its shards if it is sharded."""
+        return self._wrap_collection(self.client.get_collection(name=physical_name))
+    
+    def _wrap_collection(self, collection: Any) -> Any:
+        """Wrap a physical collection in the layers its settings ask for.
+        
+        A sharded primary collection is wrapped so its shards are read and
+        written as one, and a collection storing documents by reference so
+        its documents are rehydrated on read.
+        """
+        collection = self._wrap_shards(collection)
+        if collection_document_storage(collection) == "reference":
+            return ReferencedDocumentCollection(collection, self._documents)
+        return collection
+    
+    def _wrap_shards(self, collection: Any) -> Any:
+        """Wrap a sharded primary collection so its shards are read and written as one."""
+        shard_count = collection_shard_count(collection)
+        if shard_count == 1:
+            return collection
+        shards = self._shards.get(collection.name)
+        if shards is None or len(shards) != shard_count - 1:
+            shard_metadata = {
+                key: value for key, value in (collection.metadata or {}).items()
+                if key != SHARD_COUNT_METADATA_KEY
+            }
+            shards = [
+                self.client.get_or_create_collection(
+                    name=shard_name(collection.name, shard), metadata=shard_metadata or None
+                )
+                for shard in range(1, shard_count)
+            ]
+            self._shards[collection.name] = shards
+        # The primary is opened fresh each time so its settings are never stale
+        return ShardedCollection([collection] + shards)
+    
+    def set_collection_shards(self, shard_count: int, collection_name: Optional[str] = None) -> None:
+        """Split a collection's records across several physical shards.
+        
+        Records are placed by a hash of their id, and searches query all
+        shards in parallel. The shard count can only change while the
+        collection is empty; to reshard a populated collection, copy it into
+        a namespace created with the new count.
+        
+        Args:
+            shard_count: Number of shards; 1 disables sharding.
+            collection_name: Logical name of the collection. Uses current if None.
+            
+        Raises:
+            ValueError: If the count is invalid or the collection holds records.
+        """
+        if shard_count < 1:
+            raise ValueError(f"Shard count must be at least 1, got {shard_count}")
+        
+        collection = self._resolve_collection(collection_name)
+        current_count = collection_shard_count(collection)
+        if current_count == shard_count:
+            return
+        if collection.count() > 0:
+            raise ValueError(
+                f"Collection {collection.name} already holds records in {current_count} shard(s); "
+                f"copy it into a new collection to use {shard_count} shards"
+            )
+        
+        if isinstance(collection, ReferencedDocumentCollection):
+            collection = collection.inner
+        primary = collection.primary if isinstance(collection, ShardedCollection) else collection
+        collection_metadata = dict(primary.metadata or {})
+        collection_metadata[SHARD_COUNT_METADATA_KEY] = shard_count
+        primary.modify(metadata=collection_metadata)
+        self._drop_shards(primary.name, keep=shard_count)
+        resharded = self._wrap_shards(primary)
+        if isinstance(resharded, ShardedCollection):
+            resharded.modify(metadata=collection_metadata)
+        if self.collection is not None and self.collection.name == primary.name:
+            self.collection = self._wrap_collection(primary)
+        logger.info(f"Collection {primary.name} now uses {shard_count} shard(s)")
+    
+    def _drop_shards(self, physical_name: str, keep: int = 1) -> None:
+        """Delete the secondary shards of a physical collection beyond the first `keep`."""
+        self._shards.pop(physical_name, None)
+        for existing in self.client.list_collections():
+            if existing.name.startswith(f"{physical_name}__s") and is_shard_name(existing.name):
+                if int(existing.name.rsplit("__s", 1)[1]) >= keep:
+                    self.client.delete_collection(name=existing.name)
+    
+    def _embed_texts(self, texts: List[str], collection: Any = None) -> Optional[List[List[float]]]:
+        """Embed texts with the collection's assigned model.
+        
+        Args:
+            texts: Texts to embed.
+            collection: ChromaDB collection. Uses current if None.
+            
+        Returns:
+            Embeddings, or None to let ChromaDB's default embedding function
+            handle collections without an assigned model.
+        """
+        model_name = self._collection_embedding_model(collection)
+        if not model_name:
+            return None
+        return get_embedding_registry().get_service(model_name=model_name).encode_batch(texts)
+    
+    def _projection_config(self, collection: Any = None) -> Optional[Dict[str, Any]]:
+        """Get the configured projection method and dimension of a collection, if any."""
+        collection = collection if collection is not None else self.collection
+        collection_metadata = getattr(collection, 'metadata', None)
+        if not isinstance(collection_metadata, dict):
+            return None
+        method = collection_metadata.get(PROJECTION_METHOD_METADATA_KEY)
+        dimension = collection_metadata.get(PROJECTION_DIMENSION_METADATA_KEY)
+        if not isinstance(method, str) or not isinstance(dimension, int):
+            return None
+        return {'method': method, 'target_dimension': dimension}
+    
+    def _projection_path(self, collection_name: str) -> str:
+        """Path of the fitted projection stored with a collection."""
+        return os.path.join(self.persist_directory, "projections", f"{collection_name}.npz")
+    
+    def _load_projection(self, collection: Any = None) -> Optional[Any]:
+        """Get the fitted projection of a collection, or None if not fitted."""
+        collection = collection if collection is not None else self.collection
+        if self._projection_config(collection) is None:
+            return None
+        
+        projection = self._projections.get(collection.name)
+        if projection is None:
+            path = self._projection_path(collection.name)
+            if not os.path.exists(path):
+                return None
+            from .projection import VectorProjection
+            projection = VectorProjection.load(path)
+            self._projections[collection.name] = projection
+        return projection
+    
+    def set_collection_projection(
+        self,
+        target_dimension: int,
+        method: str = "pca",
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Store and search a collection's vectors in fewer dimensions.
+        
+        The projection is fitted on the first vectors written to the
+        collection (normally a sample taken at sync time), saved with the
+        collection and applied to queries automatically. Projected
+        collections need explicit embeddings, so the default embedding model
+        is assigned if none is set.
+        
+        Args:
+            target_dimension: Number of dimensions to keep, e.g. 128.
+            method: 'pca' or 'random_orthogonal'.
+            collection_name: Name of the collection. Uses current if None.
+            
+        Raises:
+            ValueError: If the method is unknown or the collection already
+                holds vectors.
+        """
+        from .projection import PROJECTION_METHODS
+        
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Unknown projection method: {method}")
+        if target_dimension <= 0:
+            raise ValueError("Projection dimension must be positive")
+        
+        collection = self._resolve_collection(collection_name)
+        requested = {'method': method, 'target_dimension': target_dimension}
+        if self._projection_config(collection) == requested:
+            return
+        if collection.count() > 0:
+            raise ValueError(
+                f"Collection {collection.name} already holds vectors; "
+                f"re-embed it into a new collection to change its projection"
+            )
+        
+        if not self._collection_embedding_model(collection):
+            self.set_collection_embedding_model(
+                os.getenv("RAG_MODEL_NAME", DEFAULT_MODEL_NAME), collection.name
+            )
+        
+        collection_metadata = dict(collection.metadata or {})
+        collection_metadata[PROJECTION_METHOD_METADATA_KEY] = method
+        collection_metadata[PROJECTION_DIMENSION_METADATA_KEY] = target_dimension
+        collection.modify(metadata=collection_metadata)
+        
+        # A new configuration invalidates any previously fitted projection
+        self._projections.pop(collection.name, None)
+        stale_path = self._projection_path(collection.name)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+        logger.info(f"Collection {collection.name} will store {target_dimension}-dim {method} projected vectors")
+    
+    def projection_needs_fit(self, collection_name: Optional[str] = None) -> bool:
+        """Check whether a collection has a configured but not yet fitted projection."""
+        collection = self._resolve_collection(collection_name)
+        return self._projection_config(collection) is not None and self._load_projection(collection) is None
+    
+    def fit_collection_projection(
+        self,
+        texts: Optional[List[str]] = None,
+        vectors: Optional[List[List[float]]] = None,
+        collection_name: Optional[str] = None
+    ) -> Any:
+        """Fit and save a collection's projection from sample texts or vectors.
+        
+        Args:
+            texts: Sample texts, embedded with the collection's model.
+            vectors: Sample embeddings (used instead of texts).
+            collection_name: Name of the collection. Uses current if None.
+            
+        Returns:
+            The fitted VectorProjection.
+            
+        Raises:
+            ValueError: If no projection is configured or no sample is given.
+        """
+        from .projection import VectorProjection
+        
+        collection = self._resolve_collection(collection_name)
+        config = self._projection_config(collection)
+        if config is None:
+            raise ValueError(f"Collection {collection.name} has no projection configured")
+        if vectors is None:
+            vectors = self._embed_texts(texts or [], collection) if texts else None
+        if not vectors:
+            raise ValueError("Sample texts or vectors are required to fit a projection")
+        
+        projection = VectorProjection.fit(
+            vectors, config['target_dimension'], method=config['method']
+        )
+        projection.save(self._projection_path(collection.name))
+        self._projections[collection.name] = projection
+        logger.info(
+            f"Fitted {config['method']} projection for {collection.name} on {len(vectors)} vectors "
+            f"({projection.source_dimension} -> {projection.target_dimension} dims)"
+        )
+        return projection
+    
+    def _project_vectors(
+        self,
+        vectors: Optional[List[List[float]]],
+        collection: Any = None,
+        fit: bool = False
+    ) -> Optional[List[List[float]]]:
+        """Apply a collection's projection to model embeddings.
+        
+        Args:
+            vectors: Model embeddings.
+            collection: ChromaDB collection. Uses current if None.
+            fit: Fit the projection on these vectors if it is not fitted yet.
+            
+        Returns:
+            Projected vectors, or the input unchanged when the collection has
+            no projection (or the vectors are already projected).
+        """
+        if not vectors:
+            return vectors
+        collection = collection if collection is not None else self.collection
+        if self._projection_config(collection) is None:
+            return vectors
+        
+        projection = self._load_projection(collection)
+        if projection is None:
+            if not fit:
+                return vectors
+            projection = self.fit_collection_projection(vectors=vectors, collection_name=collection.name)
+        if len(vectors[0]) != projection.source_dimension:
+            return vectors
+        return projection.transform(vectors).tolist()
+    
+    def _collection_vector_storage(self, collection: Any = None) -> str:
+        """Get how a collection stores its vectors ('float32', 'int8' or 'float16')."""
+        collection = collection if collection is not None else self.collection
+        collection_metadata = getattr(collection, 'metadata', None)
+        if isinstance(collection_metadata, dict):
+            storage = collection_metadata.get(VECTOR_STORAGE_METADATA_KEY)
+            if isinstance(storage, str) and storage:
+                return storage
+        return DEFAULT_VECTOR_STORAGE
+    
+    def set_collection_vector_storage(
+        self,
+        storage: str,
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Choose how a collection stores its vectors.
+        
+        'int8' and 'float16' keep compact codes in RAM for candidate
+        generation and rescore the top candidates exactly against float32
+        vectors in a memory-mapped side file. 'float32' stores vectors in
+        ChromaDB as usual. Quantized collections need explicit embeddings, so
+        the default embedding model is assigned if none is set.
+        
+        Args:
+            storage: 'float32', 'int8' or 'float16'.
+            collection_name: Name of the collection. Uses current if None.
+            
+        Raises:
+            ValueError: If the storage is unknown or the collection already
+                holds vectors stored differently.
+        """
+        from .quantized_index import SUPPORTED_DTYPES
+        
+        if storage != DEFAULT_VECTOR_STORAGE and storage not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported vector storage: {storage}")
+        
+        collection = self._resolve_collection(collection_name)
+        current_storage = self._collection_vector_storage(collection)
+        if current_storage == storage:
+            return
+        if collection.count() > 0:
+            raise ValueError(
+                f"Collection {collection.name} already stores {current_storage} vectors; "
+                f"re-embed it into a new collection to switch to {storage}"
+            )
+        
+        if storage != DEFAULT_VECTOR_STORAGE and not self._collection_embedding_model(collection):
+            self.set_collection_embedding_model(
+                os.getenv("RAG_MODEL_NAME", DEFAULT_MODEL_NAME), collection.name
+            )
+        
+        collection_metadata = dict(collection.metadata or {})
+        collection_metadata[VECTOR_STORAGE_METADATA_KEY] = storage
+        collection.modify(metadata=collection_metadata)
+        self._quantized_indexes.pop(collection.name, None)
+        logger.info(f"Collection {collection.name} now stores {storage} vectors")
+    
+    def set_collection_document_storage(
+        self,
+        storage: str,
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Choose how a collection stores chunk documents.
+        
+        'reference' stores an empty document for each chunk found verbatim in
+        its source file and reads the text back from the collection store,
+        which needs a document reader to be set. 'inline' stores the text as
+        the document, as usual.
+        
+        Args:
+            storage: 'inline' or 'reference'.
+            collection_name: Logical name of the collection. Uses current if None.
+            
+        Raises:
+            ValueError: If the storage is unknown or the collection holds records.
+        """
+        if storage not in SUPPORTED_DOCUMENT_STORAGE:
+            raise ValueError(f"Unsupported document storage: {storage}")
+        
+        collection = self._resolve_collection(collection_name)
+        current_storage = collection_document_storage(collection)
+        if current_storage == storage:
+            return
+        if collection.count() > 0:
+            raise ValueError(
+                f"Collection {collection.name} already stores {current_storage} documents; "
+                f"copy it into a new collection to switch to {storage}"
+            )
+        
+        if isinstance(collection, ReferencedDocumentCollection):
+            collection = collection.inner
+        collection_metadata = dict(collection.metadata or {})
+        collection_metadata[DOCUMENT_STORAGE_METADATA_KEY] = storage
+        collection.modify(metadata=collection_metadata)
+        if self.collection is not None and self.collection.name == collection.name:
+            primary = collection.primary if isinstance(collection, ShardedCollection) else collection
+            self.collection = self._wrap_collection(primary)
+        logger.info(f"Collection {collection.name} now stores {storage} documents")
+    
+    def set_document_reader(self, reader: Optional[Callable[[str, str], Optional[str]]]) -> None:
+        """Set how documents stored by reference are read back.
+        
+        Args:
+            reader: Called as reader(collection_name, file_path) with the
+                source fields of a chunk's metadata; returns the file's
+                current content or None if it does not exist.
+        """
+        self._documents.set_reader(reader)
+    
+    def _get_quantized_index(self, collection: Any = None) -> Optional[Any]:
+        """Get the quantized index of a collection, or None for float32 storage."""
+        collection = collection if collection is not None else self.collection
+        storage = self._collection_vector_storage(collection)
+        if storage == DEFAULT_VECTOR_STORAGE:
+            return None
+        
+        index = self._quantized_indexes.get(collection.name)
+        if index is None:
+            from .quantized_index import QuantizedVectorIndex
+            index = QuantizedVectorIndex(
+                os.path.join(self.persist_directory, "quantized_vectors", collection.name),
+                dtype=storage,
+                rescore_multiplier=int(os.getenv("RAG_QUANTIZED_RESCORE_MULTIPLIER", "4"))
+            )
+            self._quantized_indexes[collection.name] = index
+        return index
+    
+    def _query_quantized_index(
+        self,
+        collection: Any,
+        index: Any,
+        query_texts: List[str],
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> Dict[str, Any]:
+        """Query a quantized collection and return results in ChromaDB's format."""
+        if not query_embeddings:
+            query_embeddings = self._embed_texts(query_texts, collection)
+        query_embeddings = self._project_vectors(query_embeddings, collection)
+        
+        allowed_ids = None
+        if where:
+            allowed_ids = collection.get(where=where, include=[])['ids']
+        
+        results = {'ids': [], 'documents': [], 'metadatas': [], 'distances': []}
+        for query_embedding in query_embeddings:
+            hits = index.search(query_embedding, n_results, allowed_ids=allowed_ids)
+            hit_ids = [hit_id for hit_id, _ in hits]
+            records = {}
+            if hit_ids:
+                fetched = collection.get(ids=hit_ids, include=['documents', 'metadatas'])
+                for i, doc_id in enumerate(fetched['ids']):
+                    records[doc_id] = (fetched['documents'][i], fetched['metadatas'][i])
+            
+            kept = [(hit_id, similarity) for hit_id, similarity in hits if hit_id in records]
+            results['ids'].append([hit_id for hit_id, _ in kept])
+            results['documents'].append([records[hit_id][0] for hit_id, _ in kept])
+            results['metadatas'].append([records[hit_id][1] for hit_id, _ in kept])
+            results['distances'].append([1.0 - similarity for _, similarity in kept])
+        return results
+    
+    def _query_collection(
+        self,
+        collection: Any,
+        query_texts: List[str],
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> Dict[str, Any]:
+        """Run a ChromaDB query, embedding the query with the collection's model."""
+        # Background compaction yields to searches in flight
+        with foreground_activity.track():
+            return self._run_query(collection, query_texts, n_results, where, query_embeddings)
+    
+    def _run_query(
+        self,
+        collection: Any,
+        query_texts: List[str],
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> Dict[str, Any]:
+        index = self._get_quantized_index(collection)
+        if index is not None:
+            return self._query_quantized_index(
+                collection, index, query_texts, n_results, where, query_embeddings
+            )
+        
+        if not query_embeddings:
+            query_embeddings = self._embed_texts(query_texts, collection)
+        query_embeddings = self._project_vectors(query_embeddings, collection)
+        if query_embeddings:
+            return collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=where
+            )
+        return collection.query(
+            query_texts=query_texts,
+            n_results=n_results,
+            where=where
+        )
+    
+    def _write_collection(
+        self,
+        collection: Any,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        upsert: bool = False
+    ) -> None:
+        """Embed and write already-enhanced records into a specific collection.
+        
+        Args:
+            collection: ChromaDB collection to write to.
+            documents: Document texts.
+            metadatas: Storage-ready metadata dictionaries.
+            ids: Document IDs.
+            embeddings: Pre-computed model embeddings (optional).
+            upsert: Replace existing records instead of keeping them.
+        """
+        if not embeddings:
+            embeddings = self._embed_texts(documents, collection)
+        embeddings = self._project_vectors(embeddings, collection, fit=True)
+        
+        index = self._get_quantized_index(collection)
+        if index is not None:
+            index.add(ids, embeddings, overwrite=upsert)
+            embeddings = [QUANTIZED_PLACEHOLDER_EMBEDDING] * len(ids)
+        
+        write = collection.upsert if upsert else collection.add
+        if embeddings:
+            write(documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+        else:
+            write(documents=documents, metadatas=metadatas, ids=ids)
+    
+    def _delete_from_collection(self, collection: Any, ids: List[str]) -> None:
+        """Delete records from a specific collection and its quantized index.
+        
+        Indexes only mark deleted entries, so the deleted records are
+        counted as tombstones of the collection until it is compacted.
+        """
+        count_before = collection.count()
+        collection.delete(ids=ids)
+        index = self._get_quantized_index(collection)
+        if index is not None:
+            index.delete(ids)
+        self._tombstones.record(collection.name, count_before - collection.count())
+    
+    def _mirror_to_shadow(
+        self,
+        collection: Any,
+        documents: Optional[List[str]],
+        metadatas: Optional[List[Dict[str, Any]]],
+        ids: List[str],
+        delete: bool = False
+    ) -> None:
+        """Repeat a write on the shadow collection being built from this one, if any.
+        
+        Mirrored records are re-embedded with the shadow's model. Failures
+        are logged rather than raised: the active collection is already
+        written, and a shadow that misses writes can be rebuilt.
+        """
+        shadow_name = self._routes.mirror_target(collection.name)
+        if not shadow_name:
+            return
+        
+        try:
+            shadow = self._open_physical(shadow_name)
+            if delete:
+                self._routes.record_mirrored_deletes(shadow_name, ids)
+                self._delete_from_collection(shadow, ids)
+            else:
+                self._write_collection(shadow, documents, metadatas, ids, upsert=True)
+        except Exception as e:
+            logger.warning(f"Failed to mirror write to shadow collection {shadow_name}: {str(e)}")
+    
+    def _index_relationships(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Mirror the relationships in storage-ready metadata into the adjacency index.
+        
+        Failures are logged rather than raised: the relationships are still
+        stored in the chunk metadata, which lookups fall back to.
+        """
+        try:
+            self._relationships.index_chunks(
+                self.collection_name,
+                ids,
+                [self._deserialize_metadata_from_storage(metadata) for metadata in metadatas]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to index relationships of {len(ids)} chunks: {str(e)}")
+    
+    def _index_stats(
+        self,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]],
+        documents: Optional[List[str]] = None
+    ) -> None:
+        """Update the collection's statistics for written chunks, logging rather than raising failures."""
+        try:
+            self._stats.index_chunks(
+                self.collection_name,
+                ids,
+                [self._deserialize_metadata_from_storage(metadata) for metadata in metadatas],
+                documents
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update statistics of {len(ids)} chunks: {str(e)}")
+    
+    def _index_text(self, ids: List[str], documents: List[str]) -> None:
+        """Mirror chunk text into the lexical index, logging rather than raising failures."""
+        try:
+            self._lexical.index_chunks(self.collection_name, ids, documents)
+        except Exception as e:
+            logger.warning(f"Failed to index text of {len(ids)} chunks: {str(e)}")
+    
+    def _invalidate_centroid(self) -> None:
+        """Mark the collection's summary vectors stale after its vectors changed."""
+        try:
+            self._centroids.mark_stale(self.collection_name)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate centroid of {self.collection_name}: {str(e)}")
+    
     def add_documents(
         self,
         documents: List[str],
@@ -148,42 +1018,33 @@ class VectorStore:
         Raises:
             Exception: If adding documents fails.
         """
-        if not self.collection:
-            self.get_or_create_collection()
-        
-        try:
-            # Enhance metadata for overlap-aware storage
-            enhanced_metadatas = [
-                self._enhance_metadata_for_storage(metadata) 
-                for metadata in metadatas
-            ]
-            
-            if embeddings:
-                result = self.collection.add(
-                    documents=documents,
-                    metadatas=enhanced_metadatas,
-                    ids=ids,
-                    embeddings=embeddings
-                )
-            else:
-                result = self.collection.add(
-                    documents=documents,
-                    metadatas=enhanced_metadatas,
-                    ids=ids
-                )
-            
-            # CRITICAL FIX: Force ChromaDB persistence/flush after adding documents
+        with self._writing() as collection:
             try:
-                # Some ChromaDB versions need explicit persistence
-                if hasattr(self.client, 'persist'):
-                    self.client.persist()
-            except Exception:
-                pass  # Persistence may not be supported in all ChromaDB versions
-            
-            logger.info(f"Added {len(documents)} documents to collection with enhanced metadata")
-        except Exception as e:
-            logger.error(f"Failed to add documents: {str(e)}")
-            raise
+                # Enhance metadata for overlap-aware storage
+                enhanced_metadatas = [
+                    self._enhance_metadata_for_storage(metadata) 
+                    for metadata in metadatas
+                ]
+                
+                self._write_collection(collection, documents, enhanced_metadatas, ids, embeddings)
+                self._mirror_to_shadow(collection, documents, enhanced_metadatas, ids)
+                self._index_relationships(ids, enhanced_metadatas)
+                self._index_stats(ids, enhanced_metadatas, documents)
+                self._index_text(ids, documents)
+                self._invalidate_centroid()
+                
+                # CRITICAL FIX: Force ChromaDB persistence/flush after adding documents
+                try:
+                    # Some ChromaDB versions need explicit persistence
+                    if hasattr(self.client, 'persist'):
+                        self.client.persist()
+                except Exception:
+                    pass  # Persistence may not be supported in all ChromaDB versions
+                
+                logger.info(f"Added {len(documents)} documents to collection with enhanced metadata")
+            except Exception as e:
+                logger.error(f"Failed to add documents: {str(e)}")
+                raise
     
     def query(
         self,
@@ -206,22 +1067,21 @@ class VectorStore:
         Raises:
             Exception: If query fails.
         """
-        if not self.collection:
-            self.get_or_create_collection()
+        collection = self._current_collection()
         
         try:
-            if query_embeddings:
-                results = self.collection.query(
-                    query_embeddings=query_embeddings,
-                    n_results=n_results,
-                    where=where
-                )
-            else:
-                results = self.collection.query(
-                    query_texts=query_texts,
-                    n_results=n_results,
-                    where=where
-                )
+            results = self._query_collection(
+                collection,
+                query_texts,
+                n_results=n_results,
+                where=where,
+                query_embeddings=query_embeddings
+            )
+            if results.get('metadatas'):
+                results['metadatas'] = [
+                    [self._deserialize_metadata_from_storage(metadata) for metadata in metadatas]
+                    for metadatas in results['metadatas']
+                ]
             
             logger.info(f"Query returned {len(results.get('documents', [[]])[0])} results")
             return results
@@ -241,7 +1101,17 @@ class VectorStore:
         name = collection_name or self.collection_name
         
         try:
-            self.client.delete_collection(name=name)
+            physical_name = self._routes.resolve(name)
+            shadow_name = self._routes.get_shadow(name)
+            self._drop_physical_collection(physical_name)
+            if shadow_name:
+                self._routes.stop_mirroring(physical_name)
+                self._drop_physical_collection(shadow_name, missing_ok=True)
+            self._routes.remove(name)
+            self._relationships.drop_collection(name)
+            self._lexical.drop_collection(name)
+            self._centroids.drop_collection(name)
+            self._stats.drop_collection(name)
             if name == self.collection_name:
                 self.collection = None
             logger.info(f"Deleted collection: {name}")
@@ -249,119 +1119,1301 @@ class VectorStore:
             logger.error(f"Failed to delete collection {name}: {str(e)}")
             raise
     
-    def list_collections(self) -> List[str]:
-        """List all collections.
+    def _drop_physical_collection(self, physical_name: str, missing_ok: bool = False) -> None:
+        """Delete a physical collection with its quantized index and projection."""
+        try:
+            self.client.delete_collection(name=physical_name)
+        except Exception:
+            if not missing_ok:
+                raise
+        self._drop_shards(physical_name)
+        self._tombstones.clear(physical_name)
+        get_embedding_registry().unassign_collection_model(physical_name)
+        index = self._quantized_indexes.pop(physical_name, None)
+        if index is not None:
+            index.close()
+        shutil.rmtree(os.path.join(self.persist_directory, "quantized_vectors", physical_name), ignore_errors=True)
+        self._projections.pop(physical_name, None)
+        if os.path.exists(self._projection_path(physical_name)):
+            os.remove(self._projection_path(physical_name))
+    
+    def begin_shadow_collection(
+        self,
+        collection_name: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        mirror_writes: bool = True,
+        reuse_projection: bool = False
+    ) -> Any:
+        """Create a shadow collection to rebuild a collection into.
+        
+        The shadow copies the collection's storage and projection settings
+        and is embedded with the given model. Searches keep using the active
+        collection until commit_shadow_collection() switches the route;
+        writes to the active collection are mirrored into the shadow
+        meanwhile so nothing is lost at cutover.
+        
+        Args:
+            collection_name: Logical collection name. Uses current if None.
+            embedding_model: Model for the shadow. Keeps the current model if None.
+            mirror_writes: Repeat writes to the active collection on the shadow.
+            reuse_projection: Copy the active collection's fitted projection,
+                for shadows filled with its stored vectors.
+            
+        Returns:
+            The shadow collection object.
+            
+        Raises:
+            ValueError: If the collection already has a shadow being built.
+        """
+        name = collection_name or self.collection_name
+        if self._routes.get_shadow(name):
+            raise ValueError(f"Collection {name} already has a shadow collection being built")
+        
+        active = self._resolve_collection(name)
+        model_name = (embedding_model or self._collection_embedding_model(active)
+                      or os.getenv("RAG_MODEL_NAME", DEFAULT_MODEL_NAME))
+        shadow_metadata = dict(active.metadata or {})
+        shadow_metadata[EMBEDDING_MODEL_METADATA_KEY] = model_name
+        # Namespace logical names are not valid ChromaDB names; version the physical one
+        base_name = self._routes.resolve(name).split("__v")[0]
+        shadow_name = f"{base_name}__v{int(time.time() * 1000)}"
+        
+        try:
+            shadow = self._wrap_collection(self.client.create_collection(name=shadow_name, metadata=shadow_metadata))
+            get_embedding_registry().assign_collection_model(shadow_name, model_name)
+            projection_path = self._projection_path(active.name)
+            if reuse_projection and os.path.exists(projection_path):
+                os.makedirs(os.path.dirname(self._projection_path(shadow_name)), exist_ok=True)
+                shutil.copyfile(projection_path, self._projection_path(shadow_name))
+            self._routes.set_shadow(name, shadow_name)
+            if mirror_writes:
+                self._routes.start_mirroring(active.name, shadow_name)
+            logger.info(f"Building shadow collection {shadow_name} for {name} with {model_name}")
+            return shadow
+        except Exception as e:
+            logger.error(f"Failed to create shadow collection for {name}: {str(e)}")
+            raise
+    
+    def _shadow_name(self, collection_name: str) -> str:
+        """Get the shadow collection of a logical name or raise ValueError."""
+        shadow_name = self._routes.get_shadow(collection_name)
+        if not shadow_name:
+            raise ValueError(f"Collection {collection_name} has no shadow collection being built")
+        return shadow_name
+    
+    def fit_shadow_projection(self, collection_name: Optional[str] = None, sample_size: int = 1024) -> bool:
+        """Fit the shadow's projection on a sample of the active collection.
+        
+        Args:
+            collection_name: Logical collection name. Uses current if None.
+            sample_size: Number of stored documents to fit on.
+            
+        Returns:
+            True if a projection was fitted, False if none was needed.
+        """
+        name = collection_name or self.collection_name
+        shadow_name = self._shadow_name(name)
+        if not self.projection_needs_fit(shadow_name):
+            return False
+        
+        sample = self._resolve_collection(name).get(limit=sample_size, include=['documents'])
+        texts = [document for document in sample['documents'] if document]
+        if not texts:
+            return False
+        self.fit_collection_projection(texts=texts, collection_name=shadow_name)
+        return True
+    
+    def copy_to_shadow_collection(
+        self,
+        ids: List[str],
+        collection_name: Optional[str] = None,
+        reuse_vectors: bool = False
+    ) -> int:
+        """Re-embed records of the active collection into its shadow.
+        
+        Records deleted from the active collection since the shadow was
+        started are skipped, and records already mirrored into the shadow
+        are kept as they are.
+        
+        Args:
+            ids: Document IDs to copy.
+            collection_name: Logical collection name. Uses current if None.
+            reuse_vectors: Copy the stored vectors instead of re-embedding,
+                for shadows with the active collection's model and projection.
+            
+        Returns:
+            Number of records copied.
+        """
+        name = collection_name or self.collection_name
+        shadow_name = self._shadow_name(name)
+        deleted = self._routes.mirrored_deletes(shadow_name)
+        wanted = [doc_id for doc_id in ids if doc_id not in deleted]
+        if not wanted:
+            return 0
+        
+        active = self._resolve_collection(name)
+        shadow = self._open_physical(shadow_name)
+        if reuse_vectors:
+            copied_ids = []
+            for batch_ids, documents, metadatas, vectors in self._iter_stored_records(active, wanted):
+                self._write_stored_records(shadow, batch_ids, documents, metadatas, vectors)
+                copied_ids.extend(batch_ids)
+        else:
+            records = active.get(ids=wanted, include=['documents', 'metadatas'])
+            copied_ids = records['ids']
+            if copied_ids:
+                self._write_collection(shadow, records['documents'], records['metadatas'], copied_ids)
+        if not copied_ids:
+            return 0
+        
+        # A delete mirrored while this batch was being copied must win
+        late_deletes = self._routes.mirrored_deletes(shadow_name).intersection(copied_ids)
+        if late_deletes:
+            self._delete_from_collection(shadow, list(late_deletes))
+        return len(copied_ids)
+    
+    def commit_shadow_collection(self, collection_name: Optional[str] = None, drop_previous: bool = True) -> str:
+        """Atomically switch a collection to its shadow.
+        
+        Args:
+            collection_name: Logical collection name. Uses current if None.
+            drop_previous: Delete the replaced physical collection right away.
+                Searches that resolved it before the switch may still be
+                reading it, so callers serving searches drop it with
+                _drop_in_background() instead.
+            
+        Returns:
+            Name of the replaced physical collection.
+        """
+        name = collection_name or self.collection_name
+        shadow_name = self._shadow_name(name)
+        
+        try:
+            # Writes in flight reach the shadow through mirroring before the switch
+            with self._routes.switch_lock.switching():
+                previous = self._routes.switch(name, shadow_name)
+                self._routes.stop_mirroring(previous)
+            if name == self.collection_name:
+                self.get_collection(name)
+            if drop_previous:
+                self._drop_physical_collection(previous, missing_ok=True)
+            logger.info(f"Collection {name} now served by {shadow_name}")
+            return previous
+        except Exception as e:
+            logger.error(f"Failed to switch collection {name} to {shadow_name}: {str(e)}")
+            raise
+    
+    def abort_shadow_collection(self, collection_name: Optional[str] = None) -> bool:
+        """Discard the shadow collection being built for a collection.
+        
+        Returns:
+            True if a shadow was discarded.
+        """
+        name = collection_name or self.collection_name
+        shadow_name = self._routes.get_shadow(name)
+        if not shadow_name:
+            return False
+        self._routes.stop_mirroring(self._routes.resolve(name))
+        self._routes.set_shadow(name, None)
+        self._drop_physical_collection(shadow_name, missing_ok=True)
+        logger.info(f"Discarded shadow collection {shadow_name} of {name}")
+        return True
+    
+    def tombstone_count(self, collection_name: Optional[str] = None) -> int:
+        """Count records deleted from a collection since it was last compacted."""
+        name = collection_name or self.collection_name
+        return self._tombstones.count(self._routes.resolve(name))
+    
+    def tombstone_ratio(self, collection_name: Optional[str] = None) -> float:
+        """Share of a collection's index entries that are tombstones."""
+        tombstones = self.tombstone_count(collection_name)
+        if tombstones == 0:
+            return 0.0
+        return tombstones / (tombstones + self.count(collection_name))
+    
+    def compaction_needed(self, collection_name: Optional[str] = None) -> bool:
+        """Check whether a collection holds enough tombstones to be compacted.
+        
+        Collections with a shadow being built are skipped; committing the
+        shadow rebuilds them anyway.
+        """
+        name = collection_name or self.collection_name
+        if self._routes.get_shadow(name):
+            return False
+        if self.tombstone_count(name) < COMPACTION_MIN_TOMBSTONES:
+            return False
+        return self.tombstone_ratio(name) >= COMPACTION_TOMBSTONE_RATIO
+    
+    def compact_collection(self, collection_name: Optional[str] = None, **job_options: Any) -> Optional[Any]:
+        """Start rebuilding a collection without its tombstones in the background.
+        
+        Args:
+            collection_name: Logical collection name. Uses current if None.
+            **job_options: Batch size and throttling options of CompactionJob.
+            
+        Returns:
+            The started CompactionJob, or None if one is already running.
+        """
+        return get_compaction_manager().start(self, collection_name or self.collection_name, **job_options)
+    
+    def _schedule_compaction(self) -> None:
+        """Compact the collection in the background once its tombstones pass the threshold."""
+        try:
+            if self.compaction_needed():
+                self.compact_collection()
+        except Exception as e:
+            logger.warning(f"Failed to schedule compaction of {self.collection_name}: {str(e)}")
+    
+    def list_document_ids(self, collection_name: Optional[str] = None) -> List[str]:
+        """List all document IDs of a collection."""
+        return self._resolve_collection(collection_name).get(include=[])['ids']
+    
+    def list_collections(self) -> List[str]:
+        """List all collections.
+        
+        Shadow collections and collections replaced by a re-embed are hidden;
+        rebuilt collections are listed under their logical name. Namespaces
+        are listed by list_namespaces(); namespaces being rebuilt into are
+        not listed.
         
         Returns:
             List of collection names.
         """
         try:
             collections = self.client.list_collections()
-            collection_names = [col.name for col in collections]
+            collection_names = []
+            for col in collections:
+                if is_shard_name(col.name):
+                    continue
+                logical_name = self._routes.logical_name_for(col.name)
+                if logical_name is None or logical_name.startswith((NAMESPACE_ROUTE_PREFIX, NAMESPACE_REBUILD_ROUTE_PREFIX)):
+                    continue
+                if logical_name not in collection_names:
+                    collection_names.append(logical_name)
             logger.info(f"Found {len(collection_names)} collections")
             return collection_names
         except Exception as e:
-            logger.error(f"Failed to list collections: {str(e)}")
+            logger.error(f"Failed to list collections: {str(e)}")
+            raise
+    
+    @staticmethod
+    def namespace_name(collection_name: str) -> str:
+        """Get the logical vector collection name of a collection's namespace."""
+        return f"{NAMESPACE_ROUTE_PREFIX}{collection_name}"
+    
+    @staticmethod
+    def _new_namespace_physical_name(collection_name: str) -> str:
+        """Build a unique, ChromaDB-safe physical name for a namespace."""
+        slug = re.sub(r'[^a-zA-Z0-9_-]+', '_', collection_name).strip('_-')[:48]
+        digest = hashlib.md5(f"{collection_name}:{time.time_ns()}".encode()).hexdigest()[:10]
+        return f"ns_{slug}_{digest}" if slug else f"ns_{digest}"
+    
+    def namespace(self, collection_name: str) -> "VectorStore":
+        """Get a view of the store scoped to one collection's namespace.
+        
+        Each namespace is a physical ChromaDB collection of its own, reached
+        through the routing table, so its searches never scan other
+        collections' vectors and deleting, renaming or copying it is an
+        index-level operation. A new namespace inherits the embedding model,
+        vector storage and fitted projection of this store's collection, and
+        adopts the records earlier versions kept for it in that collection.
+        
+        The view shares the client, routing table and caches of this store
+        and supports all of its document operations.
+        
+        Args:
+            collection_name: Name of the collection owning the namespace.
+            
+        Returns:
+            VectorStore bound to the namespace.
+        """
+        view = self._namespace_views.get(collection_name)
+        logical_name = self.namespace_name(collection_name)
+        if view is not None and self._routes.has_route(logical_name):
+            return view
+        
+        with _namespace_lock:
+            if not self._routes.has_route(logical_name):
+                self._create_namespace(collection_name)
+            view = copy.copy(self)
+            view.collection_name = logical_name
+            view.collection = None
+            view._route_generation = -1
+            self._namespace_views[collection_name] = view
+            return view
+    
+    def _create_namespace(self, collection_name: str) -> None:
+        """Create and route the physical collection of a new namespace."""
+        logical_name = self.namespace_name(collection_name)
+        physical_name = self._new_namespace_physical_name(collection_name)
+        
+        try:
+            source = self._current_collection()
+            target = self._create_physical_like(source, physical_name)
+            legacy_ids = source.get(where={NAMESPACE_METADATA_KEY: collection_name}, include=[])['ids']
+            if legacy_ids:
+                self._copy_records(source, target, legacy_ids)
+                self._delete_from_collection(source, legacy_ids)
+                adopted = target.get(ids=legacy_ids, include=['documents', 'metadatas'])
+                self._lexical.remove_chunks(self.collection_name, legacy_ids)
+                self._lexical.index_chunks(logical_name, adopted['ids'], adopted['documents'])
+                self._stats.remove_chunks(self.collection_name, legacy_ids)
+                self._stats.index_chunks(
+                    logical_name, adopted['ids'],
+                    [self._deserialize_metadata_from_storage(metadata) for metadata in adopted['metadatas']],
+                    adopted['documents']
+                )
+                logger.info(f"Moved {len(legacy_ids)} records of {collection_name} into its namespace")
+            self._routes.add_route(logical_name, physical_name)
+            logger.info(f"Created namespace {physical_name} for collection {collection_name}")
+        except Exception as e:
+            logger.error(f"Failed to create namespace for collection {collection_name}: {str(e)}")
+            raise
+    
+    def _create_physical_like(self, source: Any, physical_name: str) -> Any:
+        """Create a physical collection with the settings and fitted projection of another."""
+        source_metadata = dict(source.metadata or {})
+        settings = {
+            key: source_metadata[key]
+            for key in NAMESPACE_INHERITED_METADATA_KEYS if key in source_metadata
+        }
+        projection_path = self._projection_path(source.name)
+        return self._create_physical_collection(
+            physical_name, settings, projection_path if os.path.exists(projection_path) else None
+        )
+    
+    def _create_physical_collection(
+        self,
+        physical_name: str,
+        settings: Dict[str, Any],
+        projection_path: Optional[str] = None
+    ) -> Any:
+        """Create a physical collection with the given settings and fitted projection file."""
+        target = self._wrap_collection(self.client.create_collection(name=physical_name, metadata=settings or None))
+        model_name = settings.get(EMBEDDING_MODEL_METADATA_KEY)
+        if model_name:
+            get_embedding_registry().assign_collection_model(physical_name, model_name)
+        if projection_path:
+            os.makedirs(os.path.dirname(self._projection_path(physical_name)), exist_ok=True)
+            shutil.copyfile(projection_path, self._projection_path(physical_name))
+        return target
+    
+    def _iter_stored_records(self, source: Any, ids: Optional[List[str]] = None):
+        """Read records with their stored vectors in batches.
+        
+        Args:
+            source: Collection to read from.
+            ids: Document IDs to read. Reads all records if None.
+            
+        Yields:
+            Tuples of (ids, documents, metadatas, vectors) per batch. Records
+            without a stored vector are skipped.
+        """
+        if ids is None:
+            ids = source.get(include=[])['ids']
+        source_index = self._get_quantized_index(source)
+        
+        for start in range(0, len(ids), NAMESPACE_COPY_BATCH_SIZE):
+            batch = ids[start:start + NAMESPACE_COPY_BATCH_SIZE]
+            include = ['documents', 'metadatas'] + ([] if source_index is not None else ['embeddings'])
+            records = source.get(ids=batch, include=include)
+            if source_index is not None:
+                stored = source_index.get_vectors(records['ids'])
+                rows = [i for i, doc_id in enumerate(records['ids']) if doc_id in stored]
+                vectors = [stored[records['ids'][i]] for i in rows]
+            else:
+                rows = list(range(len(records['ids'])))
+                vectors = [list(vector) for vector in records['embeddings']]
+            if rows:
+                yield (
+                    [records['ids'][i] for i in rows],
+                    [records['documents'][i] for i in rows],
+                    [records['metadatas'][i] for i in rows],
+                    vectors
+                )
+    
+    def _write_stored_records(
+        self,
+        target: Any,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: List[List[float]]
+    ) -> None:
+        """Write records whose metadata and vectors are already in storage form."""
+        target_index = self._get_quantized_index(target)
+        if target_index is not None:
+            target_index.add(ids, vectors, overwrite=True)
+            vectors = [QUANTIZED_PLACEHOLDER_EMBEDDING] * len(ids)
+        target.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=vectors)
+    
+    def _copy_records(self, source: Any, target: Any, ids: Optional[List[str]] = None) -> int:
+        """Copy records between collections with compatible settings, reusing stored vectors.
+        
+        Args:
+            source: Collection to copy from.
+            target: Collection to copy into.
+            ids: Document IDs to copy. Copies all records if None.
+            
+        Returns:
+            Number of records copied.
+        """
+        copied = 0
+        for batch_ids, documents, metadatas, vectors in self._iter_stored_records(source, ids):
+            self._write_stored_records(target, batch_ids, documents, metadatas, vectors)
+            copied += len(batch_ids)
+        return copied
+    
+    def has_namespace(self, collection_name: str) -> bool:
+        """Check whether a collection has a namespace."""
+        return self._routes.has_route(self.namespace_name(collection_name))
+    
+    def list_namespaces(self) -> List[str]:
+        """List the collections that have a namespace."""
+        return [
+            route["logical_name"][len(NAMESPACE_ROUTE_PREFIX):]
+            for route in self._routes.list_routes()
+            if route["logical_name"].startswith(NAMESPACE_ROUTE_PREFIX)
+        ]
+    
+    def delete_namespace(self, collection_name: str) -> int:
+        """Drop a collection's namespace with all of its vectors.
+        
+        Args:
+            collection_name: Name of the collection owning the namespace.
+            
+        Returns:
+            Number of records dropped, 0 if the collection had no namespace.
+        """
+        with _namespace_lock:
+            if not self.has_namespace(collection_name):
+                return 0
+            logical_name = self.namespace_name(collection_name)
+            try:
+                dropped = self.count(logical_name)
+            except Exception:
+                dropped = 0
+            self.delete_collection(logical_name)
+            self._namespace_views.pop(collection_name, None)
+            return dropped
+    
+    def rename_namespace(self, collection_name: str, new_collection_name: str) -> None:
+        """Move a collection's namespace to a new collection name.
+        
+        Only the route changes; no vectors are copied or re-embedded. A
+        compaction of the namespace is cancelled.
+        
+        Raises:
+            KeyError: If the collection has no namespace.
+            ValueError: If the new name already has a namespace, or a
+                re-embed of the namespace is in progress.
+        """
+        logical_name = self.namespace_name(collection_name)
+        self._stop_compaction(logical_name)
+        with _namespace_lock:
+            self._check_no_shadow(logical_name, collection_name)
+            self._routes.rename(logical_name, self.namespace_name(new_collection_name))
+            self._relationships.rename_collection(logical_name, self.namespace_name(new_collection_name))
+            self._lexical.rename_collection(logical_name, self.namespace_name(new_collection_name))
+            self._centroids.rename_collection(logical_name, self.namespace_name(new_collection_name))
+            self._stats.rename_collection(logical_name, self.namespace_name(new_collection_name))
+            self._namespace_views.pop(collection_name, None)
+        logger.info(f"Renamed namespace of {collection_name} to {new_collection_name}")
+    
+    def copy_namespace(
+        self,
+        collection_name: str,
+        new_collection_name: str,
+        file_paths: Optional[List[str]] = None
+    ) -> int:
+        """Copy a collection's namespace to a new collection name.
+        
+        Stored vectors are copied as they are, without re-embedding. The
+        copied chunks' metadata names the new collection, so a namespace
+        storing documents by reference takes them from the new collection's
+        files where they match.
+        
+        Args:
+            collection_name: Name of the collection owning the namespace.
+            new_collection_name: Name of the collection to copy into.
+            file_paths: Source files whose chunks are copied. Copies all
+                chunks if None.
+        
+        Returns:
+            Number of records copied.
+            
+        Raises:
+            KeyError: If the collection has no namespace.
+            ValueError: If the new name already has a namespace.
+        """
+        if not self.has_namespace(collection_name):
+            raise KeyError(collection_name)
+        if self.has_namespace(new_collection_name):
+            raise ValueError(f"Collection {new_collection_name} already exists")
+        
+        logical_name = self.namespace_name(collection_name)
+        new_logical_name = self.namespace_name(new_collection_name)
+        physical_name = self._new_namespace_physical_name(new_collection_name)
+        try:
+            source = self._resolve_collection(logical_name)
+            ids = None
+            if file_paths is not None:
+                chunk_ids = self.get_file_chunk_ids(file_paths, logical_name)
+                ids = [chunk_id for path in chunk_ids for chunk_id in chunk_ids[path]]
+            target = self._create_physical_like(source, physical_name)
+            
+            copied = 0
+            for batch_ids, documents, metadatas, vectors in self._iter_stored_records(source, ids):
+                metadatas = [
+                    self._rename_metadata_collection(metadata, collection_name, new_collection_name)
+                    for metadata in metadatas
+                ]
+                self._write_stored_records(target, batch_ids, documents, metadatas, vectors)
+                copied += len(batch_ids)
+            
+            # Publish the copy only once it is complete
+            with _namespace_lock:
+                if self._routes.add_route(new_logical_name, physical_name) != physical_name:
+                    raise ValueError(f"Collection {new_collection_name} already exists")
+                self._relationships.copy_collection(logical_name, new_logical_name)
+                self._lexical.copy_collection(logical_name, new_logical_name)
+                self._centroids.copy_collection(logical_name, new_logical_name)
+                self._stats.copy_collection(logical_name, new_logical_name)
+                if ids is not None:
+                    # Index rows are copied whole, then trimmed to the copied chunks
+                    copied_ids = set(ids)
+                    excluded = [chunk_id for chunk_id in source.get(include=[])['ids'] if chunk_id not in copied_ids]
+                    self._relationships.remove_chunks(new_logical_name, excluded)
+                    self._lexical.remove_chunks(new_logical_name, excluded)
+                    self._stats.remove_chunks(new_logical_name, excluded)
+                    if excluded:
+                        self._centroids.mark_stale(new_logical_name)
+            logger.info(f"Copied {copied} records of {collection_name} into {new_collection_name}")
+            return copied
+        except Exception as e:
+            logger.error(f"Failed to copy namespace {collection_name} to {new_collection_name}: {str(e)}")
+            self._drop_physical_collection(physical_name, missing_ok=True)
+            raise
+    
+    @staticmethod
+    def _rename_metadata_collection(
+        metadata: Optional[Dict[str, Any]], collection_name: str, new_collection_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Point stored chunk metadata at the collection its chunk is copied into."""
+        if not metadata or metadata.get(SOURCE_COLLECTION_FIELD) != collection_name:
+            return metadata
+        return {**metadata, SOURCE_COLLECTION_FIELD: new_collection_name}
+    
+    def _stop_compaction(self, logical_name: str) -> None:
+        """Cancel a namespace's compaction and wait until its shadow is discarded.
+        
+        Compaction only rebuilds a namespace as it is, so it gives way to
+        changes that replace or move the namespace.
+        """
+        job = get_compaction_manager().get(self, logical_name)
+        if job is not None and job.is_active:
+            logger.info(f"Cancelling compaction of {logical_name}")
+            job.cancel()
+            job.wait()
+    
+    def _check_no_shadow(self, logical_name: str, collection_name: str) -> None:
+        """Raise ValueError naming the job that is building a shadow of a namespace."""
+        shadow_name = self._routes.get_shadow(logical_name)
+        if not shadow_name:
+            return
+        job = get_compaction_manager().get(self, logical_name)
+        if job is not None and job.is_active and job.shadow_collection in (None, shadow_name):
+            raise ValueError(f"Collection {collection_name} is being compacted")
+        raise ValueError(f"Collection {collection_name} is being re-embedded")
+    
+    @staticmethod
+    def _rebuild_name(collection_name: str) -> str:
+        """Get the logical name of the staging namespace a collection is rebuilt into."""
+        return f"{NAMESPACE_REBUILD_ROUTE_PREFIX}{collection_name}"
+    
+    def begin_namespace_rebuild(self, collection_name: str) -> "VectorStore":
+        """Start rebuilding a collection's namespace from scratch.
+        
+        The rebuild is written into an empty staging namespace with the
+        settings and fitted projection of the current one. Searches keep
+        using the current namespace until commit_namespace_rebuild() swaps
+        the staging namespace in. A rebuild left over from an interrupted
+        process is discarded, and a compaction of the namespace is cancelled.
+        
+        Args:
+            collection_name: Name of the collection owning the namespace.
+            
+        Returns:
+            VectorStore bound to the staging namespace.
+            
+        Raises:
+            ValueError: If the namespace is being re-embedded.
+        """
+        logical_name = self.namespace_name(collection_name)
+        staging_name = self._rebuild_name(collection_name)
+        
+        try:
+            self._stop_compaction(logical_name)
+            with _namespace_lock:
+                self._check_no_shadow(logical_name, collection_name)
+                if self._routes.has_route(staging_name):
+                    self.delete_collection(staging_name)
+                
+                source = self.namespace(collection_name)._current_collection()
+                physical_name = self._new_namespace_physical_name(collection_name)
+                self._create_physical_like(source, physical_name)
+                self._routes.add_route(staging_name, physical_name)
+            
+            view = copy.copy(self)
+            view.collection_name = staging_name
+            view.collection = None
+            view._route_generation = -1
+            logger.info(f"Rebuilding namespace of {collection_name} into {physical_name}")
+            return view
+        except Exception as e:
+            logger.error(f"Failed to start rebuilding namespace of {collection_name}: {str(e)}")
+            raise
+    
+    def commit_namespace_rebuild(self, collection_name: str) -> int:
+        """Atomically swap a collection's rebuilt namespace in.
+        
+        The route switch is a single write, so every search sees either the
+        old or the rebuilt namespace. The replaced physical collection is
+        dropped in the background once in-flight searches have finished.
+        A compaction of the replaced namespace is cancelled.
+        
+        Args:
+            collection_name: Name of the collection owning the namespace.
+            
+        Returns:
+            Number of records in the replaced namespace.
+            
+        Raises:
+            ValueError: If no rebuild is in progress, or the namespace is
+                being re-embedded.
+        """
+        logical_name = self.namespace_name(collection_name)
+        staging_name = self._rebuild_name(collection_name)
+        
+        self._stop_compaction(logical_name)
+        with _namespace_lock:
+            if not self._routes.has_route(staging_name):
+                raise ValueError(f"Collection {collection_name} has no namespace rebuild in progress")
+            self._check_no_shadow(logical_name, collection_name)
+            
+            rebuilt = self._routes.resolve(staging_name)
+            if self._routes.has_route(logical_name):
+                replaced = self.count(logical_name)
+                previous = self._routes.switch(logical_name, rebuilt)
+            else:
+                replaced, previous = 0, None
+                self._routes.add_route(logical_name, rebuilt)
+            self._routes.remove(staging_name)
+            
+            for index in (self._relationships, self._lexical, self._centroids, self._stats):
+                index.drop_collection(logical_name)
+                index.rename_collection(staging_name, logical_name)
+            self._namespace_views.pop(collection_name, None)
+        
+        if previous:
+            self._drop_in_background(previous)
+        logger.info(f"Namespace of {collection_name} now served by rebuilt {rebuilt}")
+        return replaced
+    
+    def abort_namespace_rebuild(self, collection_name: str) -> bool:
+        """Discard the staging namespace of a collection's rebuild.
+        
+        Returns:
+            True if a rebuild was discarded.
+        """
+        staging_name = self._rebuild_name(collection_name)
+        with _namespace_lock:
+            if not self._routes.has_route(staging_name):
+                return False
+            self.delete_collection(staging_name)
+        logger.info(f"Discarded namespace rebuild of {collection_name}")
+        return True
+    
+    def _drop_in_background(self, physical_name: str) -> threading.Thread:
+        """Drop a replaced physical collection once in-flight searches have finished."""
+        def drop():
+            foreground_activity.wait_idle(COMPACTION_IDLE_WAIT_SECONDS)
+            try:
+                self._drop_physical_collection(physical_name, missing_ok=True)
+                logger.info(f"Dropped replaced collection {physical_name}")
+            except Exception as e:
+                logger.warning(f"Failed to drop replaced collection {physical_name}: {str(e)}")
+        
+        thread = threading.Thread(target=drop, name=f"drop-{physical_name}", daemon=True)
+        thread.start()
+        return thread
+    
+    def export_namespace(
+        self,
+        collection_name: str,
+        path: str,
+        file_mappings: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Export a collection's namespace to a snapshot bundle.
+        
+        Args:
+            collection_name: Name of the collection owning the namespace.
+            path: Bundle directory to create.
+            file_mappings: Serialized file-to-chunk mappings to include.
+            
+        Returns:
+            The bundle's manifest.
+            
+        Raises:
+            KeyError: If the collection has no namespace.
+            ValueError: If the bundle path already exists.
+        """
+        import numpy as np
+        from .vector_snapshot import write_snapshot
+        
+        if not self.has_namespace(collection_name):
+            raise KeyError(collection_name)
+        
+        try:
+            source = self._resolve_collection(self.namespace_name(collection_name))
+            source_metadata = dict(source.metadata or {})
+            settings = {
+                key: source_metadata[key]
+                for key in NAMESPACE_INHERITED_METADATA_KEYS if key in source_metadata
+            }
+            ids, documents, metadatas, vector_batches = [], [], [], []
+            for batch_ids, batch_documents, batch_metadatas, vectors in self._iter_stored_records(source):
+                ids.extend(batch_ids)
+                documents.extend(batch_documents)
+                metadatas.extend(batch_metadatas)
+                vector_batches.append(np.asarray(vectors, dtype=np.float32))
+            vectors = np.concatenate(vector_batches) if vector_batches else np.zeros((0, 0), dtype=np.float32)
+            
+            projection_path = self._projection_path(source.name)
+            return write_snapshot(
+                path, collection_name, settings, ids, documents, metadatas, vectors,
+                file_mappings=file_mappings,
+                projection_path=projection_path if os.path.exists(projection_path) else None
+            )
+        except Exception as e:
+            logger.error(f"Failed to export namespace {collection_name} to {path}: {str(e)}")
+            raise
+    
+    def import_namespace(self, path: str, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """Import a snapshot bundle as a new namespace, without re-embedding.
+        
+        Args:
+            path: Bundle directory.
+            collection_name: Collection to import into. Uses the bundle's
+                collection name if None.
+            
+        Returns:
+            Dictionary with the 'collection_name', the number of records
+            'imported', the bundle's 'file_mappings' and its 'manifest'.
+            
+        Raises:
+            ValueError: If the bundle is invalid or the collection already
+                has a namespace.
+        """
+        import numpy as np
+        from .vector_snapshot import read_snapshot
+        
+        snapshot = read_snapshot(path)
+        collection_name = collection_name or snapshot.manifest['collection_name']
+        logical_name = self.namespace_name(collection_name)
+        if self.has_namespace(collection_name):
+            raise ValueError(f"Collection {collection_name} already exists")
+        
+        physical_name = self._new_namespace_physical_name(collection_name)
+        try:
+            target = self._create_physical_collection(
+                physical_name, snapshot.manifest.get('settings') or {}, snapshot.projection_path
+            )
+            for start in range(0, len(snapshot.ids), NAMESPACE_COPY_BATCH_SIZE):
+                end = start + NAMESPACE_COPY_BATCH_SIZE
+                ids = snapshot.ids[start:end]
+                self._write_stored_records(
+                    target, ids, snapshot.documents[start:end], snapshot.metadatas[start:end],
+                    np.asarray(snapshot.vectors[start:end], dtype=np.float32).tolist()
+                )
+                metadatas = [
+                    self._deserialize_metadata_from_storage(metadata) for metadata in snapshot.metadatas[start:end]
+                ]
+                self._relationships.index_chunks(logical_name, ids, metadatas)
+                self._stats.index_chunks(logical_name, ids, metadatas, snapshot.documents[start:end])
+                self._lexical.index_chunks(logical_name, ids, snapshot.documents[start:end])
+            # Publish the namespace only once it is complete
+            with _namespace_lock:
+                if self._routes.add_route(logical_name, physical_name) != physical_name:
+                    raise ValueError(f"Collection {collection_name} already exists")
+            logger.info(f"Imported {len(snapshot.ids)} records from {path} into {collection_name}")
+            return {
+                'collection_name': collection_name,
+                'imported': len(snapshot.ids),
+                'file_mappings': snapshot.file_mappings,
+                'manifest': snapshot.manifest
+            }
+        except Exception as e:
+            logger.error(f"Failed to import snapshot {path} into {collection_name}: {str(e)}")
+            self._drop_physical_collection(physical_name, missing_ok=True)
+            if not self.has_namespace(collection_name):
+                self._relationships.drop_collection(logical_name)
+                self._lexical.drop_collection(logical_name)
+                self._stats.drop_collection(logical_name)
+            raise
+    
+    def centroid_needs_refresh(self, collection_name: Optional[str] = None) -> bool:
+        """Check whether a collection's summary vectors are missing or stale."""
+        return self._centroids.needs_refresh(collection_name or self.collection_name)
+    
+    def refresh_collection_centroid(self, collection_name: Optional[str] = None) -> bool:
+        """Recompute a collection's centroid and summary vectors from its stored vectors.
+        
+        Args:
+            collection_name: Logical collection name. Uses current if None.
+            
+        Returns:
+            True if vectors were stored, False if the collection is empty.
+        """
+        import random
+        import numpy as np
+        from .collection_centroids import summarize_vectors, CENTROID_SAMPLE_SIZE
+        
+        name = collection_name or self.collection_name
+        collection = self._resolve_collection(collection_name)
+        ids = collection.get(include=[])['ids']
+        if not ids:
+            self._centroids.drop_collection(name)
+            return False
+        
+        sample = ids if len(ids) <= CENTROID_SAMPLE_SIZE else random.Random(0).sample(ids, CENTROID_SAMPLE_SIZE)
+        vectors = [
+            vector
+            for _, _, _, batch_vectors in self._iter_stored_records(collection, sample)
+            for vector in batch_vectors
+        ]
+        if not vectors:
+            return False
+        self._centroids.set_vectors(name, len(ids), summarize_vectors(np.asarray(vectors, dtype=np.float32)))
+        logger.info(f"Refreshed centroid of {name} from {len(vectors)} of {len(ids)} vectors")
+        return True
+    
+    def rank_namespaces(
+        self,
+        query: str,
+        collection_names: Optional[List[str]] = None
+    ) -> List[Tuple[str, Optional[float]]]:
+        """Score namespaces for a query by their closest summary vector.
+        
+        The query is embedded once per embedding model and projected into
+        each namespace's vector space.
+        
+        Args:
+            query: Query text.
+            collection_names: Namespaces to rank. Ranks all if None.
+            
+        Returns:
+            (collection_name, score) pairs, best first. Namespaces that cannot
+            be scored, because their summary vectors are missing or stale or
+            they have no assigned model, come first with a score of None.
+        """
+        from .collection_centroids import score_summary
+        
+        names = collection_names if collection_names is not None else self.list_namespaces()
+        summaries = self._centroids.get_vectors([self.namespace_name(name) for name in names])
+        query_vectors: Dict[str, List[float]] = {}
+        unscored, scored = [], []
+        
+        for name in names:
+            summary = summaries.get(self.namespace_name(name))
+            view = self.namespace(name)
+            collection = view._current_collection()
+            model_name = view._collection_embedding_model(collection)
+            if summary is None or summary[1] or not model_name:
+                unscored.append((name, None))
+                continue
+            if model_name not in query_vectors:
+                query_vectors[model_name] = view._embed_texts([query], collection)[0]
+            query_vector = view._project_vectors([query_vectors[model_name]], collection)[0]
+            if len(query_vector) != summary[0].shape[1]:
+                unscored.append((name, None))
+                continue
+            scored.append((name, score_summary(query_vector, summary[0])))
+        
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return unscored + scored
+    
+    def similarity_search_namespaces(
+        self,
+        query: str,
+        k: int = 5,
+        score_threshold: float = 0.0,
+        filter: Optional[Dict[str, Any]] = None,
+        collection_names: Optional[List[str]] = None,
+        hybrid: bool = False,
+        max_collections: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Search several namespaces in parallel and merge their results by score.
+        
+        With max_collections set, namespaces are first ranked by their
+        centroid and summary vectors and only the max_collections most
+        relevant ones are searched. Namespaces that cannot be ranked are
+        always searched on top of those.
+        
+        Args:
+            query: Query text.
+            k: Number of results to return.
+            score_threshold: Minimum similarity score.
+            filter: Metadata filter conditions.
+            collection_names: Namespaces to search. Searches all if None.
+            hybrid: Use hybrid_search in each namespace and merge by fusion score.
+            max_collections: Number of ranked namespaces to search. Searches
+                all of them (exhaustive search) if None.
+            
+        Returns:
+            The k best documents across the namespaces.
+        """
+        names = collection_names if collection_names is not None else self.list_namespaces()
+        if max_collections is not None and len(names) > max_collections:
+            ranked = self.rank_namespaces(query, names)
+            unscored = [name for name, score in ranked if score is None]
+            scored = [name for name, score in ranked if score is not None]
+            names = unscored + scored[:max_collections]
+            logger.debug(f"Global search pruned to {len(names)} collections: {names}")
+        
+        def search_namespace(collection_name: str) -> List[Dict[str, Any]]:
+            view = self.namespace(collection_name)
+            search = view.hybrid_search if hybrid else view.similarity_search
+            return search(query, k=k, score_threshold=score_threshold, filter=filter)
+        
+        results = []
+        if len(names) == 1:
+            results.extend(search_namespace(names[0]))
+        else:
+            for namespace_results in _namespace_search_executor.map(search_namespace, names):
+                results.extend(namespace_results)
+        sort_key = 'fusion_score' if hybrid else 'score'
+        results.sort(key=lambda result: result[sort_key], reverse=True)
+        return results[:k]
+    
+    def count(self, collection_name: Optional[str] = None) -> int:
+        """Count documents in collection.
+        
+        Args:
+            collection_name: Name of the collection. Uses current if None.
+            
+        Returns:
+            Number of documents in collection.
+        """
+        collection = self._resolve_collection(collection_name)
+        
+        try:
+            count = collection.count()
+            logger.info(f"Collection has {count} documents")
+            return count
+        except Exception as e:
+            logger.error(f"Failed to count documents: {str(e)}")
+            raise
+    
+    def delete_documents(self, ids: List[str]) -> None:
+        """Delete documents by their IDs.
+        
+        Args:
+            ids: List of document IDs to delete.
+            
+        Raises:
+            Exception: If deletion fails.
+        """
+        with self._writing() as collection:
+            try:
+                self._delete_from_collection(collection, ids)
+                self._mirror_to_shadow(collection, None, None, ids, delete=True)
+                self._relationships.remove_chunks(self.collection_name, ids)
+                self._lexical.remove_chunks(self.collection_name, ids)
+                self._stats.remove_chunks(self.collection_name, ids)
+                self._invalidate_centroid()
+                self._schedule_compaction()
+                logger.info(f"Deleted {len(ids)} documents from collection")
+            except Exception as e:
+                logger.error(f"Failed to delete documents: {str(e)}")
+                raise
+    
+    def _format_search_results(
+        self,
+        results: Dict[str, Any],
+        row: int,
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Convert one query's row of ChromaDB results to scored documents.
+        
+        Args:
+            results: Raw ChromaDB query results.
+            row: Index of the query within the results.
+            score_threshold: Minimum similarity score.
+            
+        Returns:
+            List of documents with metadata and scores.
+        """
+        documents = []
+        if results['documents'] and results['documents'][row]:
+            ids = results['ids'][row] if results['ids'] else []
+            metadatas = results['metadatas'][row] if results['metadatas'] else []
+            distances = results['distances'][row] if results['distances'] else []
+            for i, doc in enumerate(results['documents'][row]):
+                metadata = self._deserialize_metadata_from_storage(metadatas[i] if metadatas else {})
+                distance = distances[i] if distances else 0.0
+                # ChromaDB can return negative cosine distances, handle appropriately
+                score = max(0.0, 1.0 - distance)  # Ensure non-negative scores
+                
+                # Apply score threshold
+                if score >= score_threshold:
+                    documents.append({
+                        'id': ids[i] if ids else '',
+                        'content': doc,
+                        'metadata': metadata,
+                        'score': score
+                    })
+        return documents
+    
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        score_threshold: float = 0.0,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for similar documents.
+        
+        Args:
+            query: Query text.
+            k: Number of results to return.
+            score_threshold: Minimum similarity score.
+            filter: Metadata filter conditions.
+            
+        Returns:
+            List of similar documents with metadata and scores.
+        """
+        collection = self._current_collection()
+        
+        try:
+            # Perform the filtered query
+            results = self._query_collection(
+                collection,
+                [query],
+                n_results=k,
+                where=filter
+            )
+            
+            documents = self._format_search_results(results, 0, score_threshold)
+            
+            logger.info(f"Similarity search returned {len(documents)} results")
+            return documents
+            
+        except Exception as e:
+            logger.error(f"Failed to perform similarity search: {str(e)}")
             raise
     
-    def count(self, collection_name: Optional[str] = None) -> int:
-        """Count documents in collection.
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        score_threshold: float = 0.0,
+        filter: Optional[Dict[str, Any]] = None,
+        rrf_k: int = DEFAULT_RRF_K
+    ) -> List[Dict[str, Any]]:
+        """Search with BM25 and vector similarity and fuse both rankings.
+        
+        The lexical query runs on a worker thread while the vector query runs
+        in the calling thread. Rankings are merged with reciprocal rank
+        fusion, so chunks matching exact identifiers surface even when their
+        embeddings are not close to the query.
         
         Args:
-            collection_name: Name of the collection. Uses current if None.
+            query: Query text.
+            k: Number of results to return.
+            score_threshold: Minimum similarity score. Chunks found only
+                lexically have no similarity score and are left out when a
+                threshold is set.
+            filter: Metadata filter conditions, applied to both rankings.
+            rrf_k: Reciprocal rank fusion constant.
             
         Returns:
-            Number of documents in collection.
+            List of documents with metadata, ordered by 'fusion_score'. 'score'
+            is the vector similarity, 0.0 for chunks found only lexically;
+            'dense_rank' and 'lexical_rank' are 1-based or None.
         """
-        if collection_name and collection_name != self.collection_name:
-            collection = self.client.get_collection(name=collection_name)
-        else:
-            if not self.collection:
-                self.get_or_create_collection()
-            collection = self.collection
+        collection = self._current_collection()
+        candidates = k * HYBRID_CANDIDATE_MULTIPLIER
         
         try:
-            count = collection.count()
-            logger.info(f"Collection has {count} documents")
-            return count
+            lexical_future = _lexical_search_executor.submit(
+                self._lexical.search, self.collection_name, query, candidates
+            )
+            dense_results = self.similarity_search(query, candidates, score_threshold, filter)
+            lexical_ids = [chunk_id for chunk_id, _ in lexical_future.result()]
+            return self._fuse_hybrid(collection, dense_results, lexical_ids, k, filter, rrf_k, score_threshold)
+            
         except Exception as e:
-            logger.error(f"Failed to count documents: {str(e)}")
+            logger.error(f"Failed to perform hybrid search: {str(e)}")
             raise
     
-    def delete_documents(self, ids: List[str]) -> None:
-        """Delete documents by their IDs.
+    def _fuse_hybrid(
+        self,
+        collection: Any,
+        dense_results: List[Dict[str, Any]],
+        lexical_ids: List[str],
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        rrf_k: int,
+        score_threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """Fuse a vector ranking and a BM25 ranking with reciprocal rank fusion.
         
         Args:
-            ids: List of document IDs to delete.
+            collection: Collection the rankings come from.
+            dense_results: Vector hits, best first.
+            lexical_ids: IDs of the BM25 hits, best first.
+            k: Number of results to return.
+            filter: Metadata filter conditions, applied to the lexical hits.
+            rrf_k: Reciprocal rank fusion constant.
+            score_threshold: Similarity threshold the vector hits were cut at.
+                If set, BM25 hits only re-rank vector hits; chunks without a
+                vector hit cannot be shown to meet it and are dropped.
             
-        Raises:
-            Exception: If deletion fails.
+        Returns:
+            The k best documents by 'fusion_score'.
         """
-        if not self.collection:
-            self.get_or_create_collection()
+        if filter and lexical_ids:
+            allowed = set(collection.get(ids=lexical_ids, where=filter, include=[])['ids'])
+            lexical_ids = [chunk_id for chunk_id in lexical_ids if chunk_id in allowed]
         
-        try:
-            self.collection.delete(ids=ids)
-            logger.info(f"Deleted {len(ids)} documents from collection")
-        except Exception as e:
-            logger.error(f"Failed to delete documents: {str(e)}")
-            raise
+        fused: Dict[str, Dict[str, Any]] = {}
+        for rank, result in enumerate(dense_results, start=1):
+            fused[result['id']] = dict(
+                result, dense_rank=rank, lexical_rank=None, fusion_score=1.0 / (rrf_k + rank)
+            )
+        lexical_only = [] if score_threshold > 0 else [chunk_id for chunk_id in lexical_ids if chunk_id not in fused]
+        chunks = self._fetch_chunks(collection, lexical_only, {})
+        for rank, chunk_id in enumerate(lexical_ids, start=1):
+            if chunk_id in fused:
+                fused[chunk_id]['lexical_rank'] = rank
+                fused[chunk_id]['fusion_score'] += 1.0 / (rrf_k + rank)
+            elif chunks.get(chunk_id):
+                fused[chunk_id] = {
+                    'id': chunk_id,
+                    'content': chunks[chunk_id]['content'],
+                    'metadata': chunks[chunk_id]['metadata'],
+                    'score': 0.0,
+                    'dense_rank': None,
+                    'lexical_rank': rank,
+                    'fusion_score': 1.0 / (rrf_k + rank)
+                }
+        
+        documents = sorted(fused.values(), key=lambda result: result['fusion_score'], reverse=True)[:k]
+        logger.info(
+            f"Hybrid search fused {len(dense_results)} vector and {len(lexical_ids)} lexical hits "
+            f"into {len(documents)} results"
+        )
+        return documents
     
-    def similarity_search(
+    def batch_similarity_search(
         self,
-        query: str,
+        queries: List[str],
         k: int = 5,
         score_threshold: float = 0.0,
-        filter: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
-        """Search for similar documents.
+        filter: Optional[Dict[str, Any]] = None,
+        hybrid: bool = False,
+        fuse: bool = False,
+        rrf_k: int = DEFAULT_RRF_K
+    ) -> Dict[str, Any]:
+        """Search for several queries with one embedding batch and one index query.
         
         Args:
-            query: Query text.
-            k: Number of results to return.
+            queries: Query texts.
+            k: Number of results to return per query.
             score_threshold: Minimum similarity score.
             filter: Metadata filter conditions.
+            hybrid: Fuse each query's vector hits with its BM25 hits, as
+                hybrid_search does.
+            fuse: Also merge the per-query rankings into one.
+            rrf_k: Reciprocal rank fusion constant.
             
         Returns:
-            List of similar documents with metadata and scores.
+            Dictionary with 'results', the documents of each query in query
+            order, and 'fused', the k best documents across all queries by
+            'fusion_score' (None unless fuse is set). Fused documents carry
+            their best 'score' and the number of 'matched_queries'.
         """
-        if not self.collection:
-            self.get_or_create_collection()
+        if not queries:
+            return {'results': [], 'fused': [] if fuse else None}
+        
+        collection = self._current_collection()
+        candidates = k * HYBRID_CANDIDATE_MULTIPLIER if hybrid else k
         
         try:
-            # Perform the filtered query
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=k,
-                where=filter
-            )
+            lexical_futures = [
+                _lexical_search_executor.submit(self._lexical.search, self.collection_name, query, candidates)
+                for query in queries
+            ] if hybrid else []
             
-            # Convert ChromaDB results to standard format
-            documents = []
-            if results['documents'] and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    raw_metadata = results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {}
-                    metadata = self._deserialize_metadata_from_storage(raw_metadata)
-                    distance = results['distances'][0][i] if results['distances'] and results['distances'][0] else 0.0
-                    # ChromaDB can return negative cosine distances, handle appropriately
-                    score = max(0.0, 1.0 - distance)  # Ensure non-negative scores
-                    
-                    # Apply score threshold
-                    if score >= score_threshold:
-                        documents.append({
-                            'id': results['ids'][0][i] if results['ids'] and results['ids'][0] else '',
-                            'content': doc,
-                            'metadata': metadata,
-                            'score': score
-                        })
+            results = self._query_collection(collection, queries, n_results=candidates, where=filter)
+            per_query = [self._format_search_results(results, row, score_threshold) for row in range(len(queries))]
+            if hybrid:
+                per_query = [
+                    self._fuse_hybrid(
+                        collection, dense_results, [chunk_id for chunk_id, _ in future.result()], k, filter, rrf_k,
+                        score_threshold
+                    )
+                    for dense_results, future in zip(per_query, lexical_futures)
+                ]
             
-            logger.info(f"Similarity search returned {len(documents)} results")
-            return documents
+            logger.info(f"Batch search of {len(queries)} queries returned {sum(map(len, per_query))} results")
+            return {'results': per_query, 'fused': fuse_rankings(per_query, k, rrf_k) if fuse else None}
             
         except Exception as e:
-            logger.error(f"Failed to perform similarity search: {str(e)}")
+            logger.error(f"Failed to perform batch search: {str(e)}")
             raise
     
+    def batch_similarity_search_namespaces(
+        self,
+        queries: List[str],
+        k: int = 5,
+        score_threshold: float = 0.0,
+        filter: Optional[Dict[str, Any]] = None,
+        collection_names: Optional[List[str]] = None,
+        hybrid: bool = False,
+        fuse: bool = False,
+        rrf_k: int = DEFAULT_RRF_K
+    ) -> Dict[str, Any]:
+        """Batch search several namespaces and merge each query's results by score.
+        
+        Args:
+            queries: Query texts.
+            k: Number of results to return per query.
+            score_threshold: Minimum similarity score.
+            filter: Metadata filter conditions.
+            collection_names: Namespaces to search. Searches all if None.
+            hybrid: Use hybrid search in each namespace and merge by fusion score.
+            fuse: Also merge the per-query rankings into one.
+            rrf_k: Reciprocal rank fusion constant.
+            
+        Returns:
+            Dictionary with 'results' and 'fused', as batch_similarity_search.
+        """
+        per_query: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for collection_name in (collection_names if collection_names is not None else self.list_namespaces()):
+            batch = self.namespace(collection_name).batch_similarity_search(
+                queries, k=k, score_threshold=score_threshold, filter=filter, hybrid=hybrid, rrf_k=rrf_k
+            )
+            for merged, results in zip(per_query, batch['results']):
+                merged.extend(results)
+        sort_key = 'fusion_score' if hybrid else 'score'
+        per_query = [
+            sorted(results, key=lambda result: result[sort_key], reverse=True)[:k]
+            for results in per_query
+        ]
+        return {'results': per_query, 'fused': fuse_rankings(per_query, k, rrf_k) if fuse else None}
+    
     def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific document by ID.
         
@@ -371,11 +2423,10 @@ class VectorStore:
         Returns:
             Document data or None if not found.
         """
-        if not self.collection:
-            self.get_or_create_collection()
+        collection = self._current_collection()
         
         try:
-            results = self.collection.get(ids=[doc_id], include=['documents', 'metadatas'])
+            results = collection.get(ids=[doc_id], include=['documents', 'metadatas'])
             
             if results['documents'] and results['documents'][0]:
                 raw_metadata = results['metadatas'][0] if results['metadatas'] else {}
@@ -392,6 +2443,145 @@ class VectorStore:
             logger.error(f"Failed to get document {doc_id}: {str(e)}")
             raise
     
+    def get_documents(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several documents by ID in one call.
+        
+        Args:
+            ids: Document IDs.
+            
+        Returns:
+            Found documents with content and metadata; missing IDs are skipped.
+        """
+        if not ids:
+            return []
+        collection = self._current_collection()
+        
+        try:
+            results = collection.get(ids=ids, include=['documents', 'metadatas'])
+            return [
+                {
+                    'id': doc_id,
+                    'content': results['documents'][i],
+                    'metadata': self._deserialize_metadata_from_storage(
+                        results['metadatas'][i] if results['metadatas'] else {}
+                    )
+                }
+                for i, doc_id in enumerate(results['ids'])
+            ]
+        except Exception as e:
+            logger.error(f"Failed to get {len(ids)} documents: {str(e)}")
+            raise
+    
+    def get_stored_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored vectors of documents without re-embedding them.
+        
+        Args:
+            ids: Document IDs.
+            
+        Returns:
+            Mapping of document ID to its vector in collection space; missing
+            IDs are skipped.
+        """
+        if not ids:
+            return {}
+        collection = self._current_collection()
+        
+        try:
+            return {
+                doc_id: list(vector)
+                for batch_ids, _, _, vectors in self._iter_stored_records(collection, ids)
+                for doc_id, vector in zip(batch_ids, vectors)
+            }
+        except Exception as e:
+            logger.error(f"Failed to get vectors of {len(ids)} documents: {str(e)}")
+            raise
+    
+    def upsert_documents(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str]
+    ) -> None:
+        """Add documents, replacing any stored documents with the same IDs.
+        
+        Args:
+            documents: List of document texts.
+            metadatas: List of metadata dictionaries.
+            ids: List of document IDs.
+            
+        Raises:
+            Exception: If the upsert fails.
+        """
+        with self._writing() as collection:
+            try:
+                enhanced_metadatas = [
+                    self._enhance_metadata_for_storage(metadata)
+                    for metadata in metadatas
+                ]
+                self._write_collection(collection, documents, enhanced_metadatas, ids, upsert=True)
+                self._mirror_to_shadow(collection, documents, enhanced_metadatas, ids)
+                self._index_relationships(ids, enhanced_metadatas)
+                self._index_stats(ids, enhanced_metadatas, documents)
+                self._index_text(ids, documents)
+                self._invalidate_centroid()
+                logger.info(f"Upserted {len(ids)} documents in collection")
+            except Exception as e:
+                logger.error(f"Failed to upsert documents: {str(e)}")
+                raise
+    
+    def update_metadatas(
+        self,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]],
+        documents: Optional[List[str]] = None
+    ) -> None:
+        """Replace the metadata of stored documents without re-embedding them.
+        
+        Args:
+            ids: List of document IDs.
+            metadatas: List of new metadata dictionaries.
+            documents: Current text of the documents, if known. Collections
+                storing documents by reference use it to point them at
+                their source file's current content.
+            
+        Raises:
+            Exception: If the update fails.
+        """
+        with self._writing() as collection:
+            try:
+                enhanced_metadatas = [
+                    self._enhance_metadata_for_storage(metadata)
+                    for metadata in metadatas
+                ]
+                self._update_or_repoint(collection, ids, enhanced_metadatas, documents)
+                shadow_name = self._routes.mirror_target(collection.name)
+                if shadow_name:
+                    try:
+                        self._update_or_repoint(
+                            self._open_physical(shadow_name), ids, enhanced_metadatas, documents
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to mirror metadata update to {shadow_name}: {str(e)}")
+                self._index_relationships(ids, enhanced_metadatas)
+                self._index_stats(ids, enhanced_metadatas, documents)
+                logger.info(f"Updated metadata of {len(ids)} documents")
+            except Exception as e:
+                logger.error(f"Failed to update document metadata: {str(e)}")
+                raise
+    
+    def _update_or_repoint(
+        self,
+        collection: Any,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]],
+        documents: Optional[List[str]]
+    ) -> None:
+        """Update metadata, re-pointing document references where the collection keeps them."""
+        if documents is not None and isinstance(collection, ReferencedDocumentCollection):
+            collection.repoint(ids, metadatas, documents)
+        else:
+            collection.update(ids=ids, metadatas=metadatas)
+    
     def update_documents(
         self,
         ids: List[str],
@@ -408,31 +2598,47 @@ class VectorStore:
         Raises:
             Exception: If update fails.
         """
-        if not self.collection:
-            self.get_or_create_collection()
-        
-        try:
-            # Enhance metadata for overlap-aware storage
-            enhanced_metadatas = [
-                self._enhance_metadata_for_storage(metadata) 
-                for metadata in metadatas
-            ]
-            
-            self.collection.update(
-                ids=ids,
-                documents=documents,
-                metadatas=enhanced_metadatas
-            )
-            logger.info(f"Updated {len(ids)} documents in collection with enhanced metadata")
-        except Exception as e:
-            logger.error(f"Failed to update documents: {str(e)}")
-            raise
+        with self._writing() as collection:
+            try:
+                # Enhance metadata for overlap-aware storage
+                enhanced_metadatas = [
+                    self._enhance_metadata_for_storage(metadata) 
+                    for metadata in metadatas
+                ]
+                
+                embeddings = self._project_vectors(self._embed_texts(documents, collection), collection, fit=True)
+                index = self._get_quantized_index(collection)
+                if index is not None:
+                    index.add(ids, embeddings, overwrite=True)
+                    embeddings = [QUANTIZED_PLACEHOLDER_EMBEDDING] * len(ids)
+                if embeddings:
+                    collection.update(
+                        ids=ids,
+                        documents=documents,
+                        metadatas=enhanced_metadatas,
+                        embeddings=embeddings
+                    )
+                else:
+                    collection.update(
+                        ids=ids,
+                        documents=documents,
+                        metadatas=enhanced_metadatas
+                    )
+                self._mirror_to_shadow(collection, documents, enhanced_metadatas, ids)
+                self._index_relationships(ids, enhanced_metadatas)
+                self._index_stats(ids, enhanced_metadatas, documents)
+                self._index_text(ids, documents)
+                self._invalidate_centroid()
+                logger.info(f"Updated {len(ids)} documents in collection with enhanced metadata")
+            except Exception as e:
+                logger.error(f"Failed to update documents: {str(e)}")
+                raise
     
     def _enhance_metadata_for_storage(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Enhance metadata for overlap-aware ChromaDB storage.
+        """Encode metadata for overlap-aware ChromaDB storage.
         
-        ChromaDB only supports scalar metadata values (str, int, float, bool, None).
-        Lists and other complex types must be JSON-serialized.
+        ChromaDB only supports scalar metadata values, so list fields and other
+        complex values are packed by the compact metadata codec.
         
         Args:
             metadata: Original metadata dictionary.
@@ -440,73 +2646,12 @@ class VectorStore:
         Returns:
             Enhanced metadata compatible with ChromaDB storage requirements.
         """
-        import json
-        import time
-        
-        enhanced = metadata.copy()
-        
-        # List fields that need JSON serialization for ChromaDB storage
-        list_fields = [
-            'overlap_sources', 'overlap_regions', 'section_siblings',
-            'header_hierarchy', 'expansion_candidates'
-        ]
-        
-        # Convert list fields to JSON strings for ChromaDB compatibility
-        for field in list_fields:
-            if field in enhanced:
-                if enhanced[field] is not None:
-                    if isinstance(enhanced[field], list):
-                        # Convert tuples to lists first, then serialize to JSON
-                        normalized_list = [
-                            list(item) if isinstance(item, tuple) else item
-                            for item in enhanced[field]
-                        ]
-                        enhanced[field] = json.dumps(normalized_list)
-                    elif not isinstance(enhanced[field], str):
-                        # Convert other types to JSON string
-                        enhanced[field] = json.dumps(enhanced[field])
-                else:
-                    # Store null as empty JSON array string
-                    enhanced[field] = "[]"
-        
-        # Add default values for relationship tracking if missing (as JSON strings)
-        if 'overlap_sources' not in enhanced:
-            enhanced['overlap_sources'] = "[]"
-        if 'overlap_regions' not in enhanced:
-            enhanced['overlap_regions'] = "[]"
-        if 'section_siblings' not in enhanced:
-            enhanced['section_siblings'] = "[]"
-        if 'header_hierarchy' not in enhanced:
-            enhanced['header_hierarchy'] = "[]"
-        if 'overlap_percentage' not in enhanced:
-            enhanced['overlap_percentage'] = 0.0
-        if 'context_expansion_eligible' not in enhanced:
-            enhanced['context_expansion_eligible'] = True
-        
-        # Add storage timestamp
-        enhanced['stored_at'] = time.time()
-        
-        # Remove or convert None values as ChromaDB doesn't support them
-        cleaned_metadata = {}
-        for key, value in enhanced.items():
-            if value is None:
-                # Skip None values entirely rather than converting
-                continue
-            elif isinstance(value, (str, int, float, bool)):
-                cleaned_metadata[key] = value
-            else:
-                # This shouldn't happen after our JSON serialization above, but just in case
-                try:
-                    cleaned_metadata[key] = str(value)
-                except:
-                    continue  # Skip problematic values
-        
-        return cleaned_metadata
+        return encode_metadata(metadata)
     
     def _deserialize_metadata_from_storage(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Deserialize metadata retrieved from ChromaDB storage.
         
-        Converts JSON-serialized list fields back to Python lists.
+        Packed list fields are only decoded once they are accessed.
         
         Args:
             metadata: Metadata dictionary from ChromaDB.
@@ -514,29 +2659,7 @@ class VectorStore:
         Returns:
             Metadata with deserialized list fields.
         """
-        import json
-        
-        if not metadata:
-            return metadata
-            
-        deserialized = metadata.copy()
-        
-        # List fields that were JSON-serialized for storage
-        list_fields = [
-            'overlap_sources', 'overlap_regions', 'section_siblings',
-            'header_hierarchy', 'expansion_candidates'
-        ]
-        
-        # Deserialize JSON string fields back to lists
-        for field in list_fields:
-            if field in deserialized and isinstance(deserialized[field], str):
-                try:
-                    deserialized[field] = json.loads(deserialized[field])
-                except (json.JSONDecodeError, TypeError):
-                    # If deserialization fails, default to empty list
-                    deserialized[field] = []
-        
-        return deserialized
+        return decode_metadata(metadata)
     
     def search_with_relationships(
         self,
@@ -556,13 +2679,13 @@ class VectorStore:
         Returns:
             List of search results with relationship metadata.
         """
-        if not self.collection:
-            self.get_or_create_collection()
+        collection = self._current_collection()
         
         try:
             # Perform base query with relationship filters
-            results = self.collection.query(
-                query_texts=[query],
+            results = self._query_collection(
+                collection,
+                [query],
                 n_results=k,
                 where=relationship_filter
             )
@@ -586,7 +2709,7 @@ class VectorStore:
             
             # Apply context expansion if requested
             if expand_context and search_results:
-                search_results = self._expand_search_context(search_results, k)
+                search_results = self._expand_search_context(search_results, k, collection)
             
             logger.info(f"Relationship-aware search returned {len(search_results)} results")
             return search_results
@@ -615,66 +2738,121 @@ class VectorStore:
             'expansion_eligible': metadata.get('context_expansion_eligible', True)
         }
     
+    def _fetch_chunks(
+        self,
+        collection: Any,
+        ids: List[str],
+        cache: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch chunks by ID in one bulk call, serving repeats from a per-request cache.
+        
+        Args:
+            collection: ChromaDB collection to read from.
+            ids: Chunk IDs, possibly with duplicates.
+            cache: Chunks already fetched for this request, keyed by ID.
+                IDs that were not found are cached as None.
+            
+        Returns:
+            The cache, now holding 'content' and deserialized 'metadata' for
+            every requested ID that exists.
+        """
+        missing = list(dict.fromkeys(chunk_id for chunk_id in ids if chunk_id not in cache))
+        if not missing:
+            return cache
+        
+        fetched = collection.get(ids=missing, include=['documents', 'metadatas'])
+        for i, chunk_id in enumerate(fetched['ids']):
+            document = fetched['documents'][i] if fetched['documents'] else None
+            if not document:
+                continue
+            raw_metadata = fetched['metadatas'][i] if fetched['metadatas'] else {}
+            cache[chunk_id] = {
+                'content': document,
+                'metadata': self._deserialize_metadata_from_storage(raw_metadata or {})
+            }
+        for chunk_id in missing:
+            cache.setdefault(chunk_id, None)
+        return cache
+    
     def _expand_search_context(
         self,
         base_results: List[Dict[str, Any]],
-        original_k: int
+        original_k: int,
+        collection: Any = None
     ) -> List[Dict[str, Any]]:
         """Expand search context using chunk relationships.
         
+        Neighbors are read from the relationship index and fetched for all
+        results together in a single call.
+        
         Args:
             base_results: Base search results.
             original_k: Original number of requested results.
+            collection: ChromaDB collection to read from. Uses current if None.
             
         Returns:
             Expanded results with context chunks.
         """
         expanded_results = list(base_results)
         
+        try:
+            indexed_edges = self._relationships.outgoing(
+                self.collection_name, [result['id'] for result in base_results]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read relationship index: {str(e)}")
+            indexed_edges = {}
+        
+        neighbors_by_result = []
         for result in base_results:
-            metadata = result.get('metadata', {})
+            # Indexed edges, or the chunk's own metadata if it predates the index
+            edges = indexed_edges.get(result['id'])
+            if edges is None:
+                metadata = result.get('metadata', {})
+                edges = {}
+                for edge_type, related_id, _ in relationships_from_metadata(metadata):
+                    edges.setdefault(edge_type, []).append(related_id)
             
             # Get neighbor chunks based on relationships
             neighbor_ids = []
             
             # Sequential neighbors
-            if metadata.get('previous_chunk_id'):
-                neighbor_ids.append(metadata['previous_chunk_id'])
-            if metadata.get('next_chunk_id'):
-                neighbor_ids.append(metadata['next_chunk_id'])
+            neighbor_ids.extend(edges.get('previous', [])[:1])
+            neighbor_ids.extend(edges.get('next', [])[:1])
             
             # Overlap sources (highest priority)
-            neighbor_ids.extend(metadata.get('overlap_sources', []))
+            neighbor_ids.extend(edges.get('overlap', []))
             
             # Section siblings (limited to avoid explosion)
-            neighbor_ids.extend(metadata.get('section_siblings', [])[:2])
+            neighbor_ids.extend(edges.get('sibling', [])[:2])
             
-            # Fetch neighbor chunks
-            for neighbor_id in neighbor_ids[:3]:  # Limit to prevent explosion
-                try:
-                    neighbor_results = self.collection.get(
-                        ids=[neighbor_id], 
-                        include=['documents', 'metadatas']
-                    )
-                    
-                    if neighbor_results['documents'] and neighbor_results['documents'][0]:
-                        neighbor_doc = neighbor_results['documents'][0]
-                        raw_neighbor_metadata = neighbor_results['metadatas'][0] if neighbor_results['metadatas'] else {}
-                        neighbor_metadata = self._deserialize_metadata_from_storage(raw_neighbor_metadata)
-                        
-                        expanded_results.append({
-                            'id': neighbor_id,
-                            'content': neighbor_doc,
-                            'metadata': neighbor_metadata,
-                            'score': 0.0,  # Context chunk, not scored
-                            'expansion_source': result['id'],
-                            'expansion_type': 'relationship_based',
-                            'relationship_data': self._extract_relationship_data(neighbor_metadata)
-                        })
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to fetch neighbor chunk {neighbor_id}: {str(e)}")
+            neighbors_by_result.append((result, neighbor_ids[:3]))  # Limit to prevent explosion
+        
+        try:
+            chunks = self._fetch_chunks(
+                collection if collection is not None else self._current_collection(),
+                [neighbor_id for _, neighbor_ids in neighbors_by_result for neighbor_id in neighbor_ids],
+                {}
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fetch neighbor chunks: {str(e)}")
+            return expanded_results
+        
+        for result, neighbor_ids in neighbors_by_result:
+            for neighbor_id in neighbor_ids:
+                chunk = chunks.get(neighbor_id)
+                if chunk is None:
                     continue
+                neighbor_metadata = dict(chunk['metadata'])
+                expanded_results.append({
+                    'id': neighbor_id,
+                    'content': chunk['content'],
+                    'metadata': neighbor_metadata,
+                    'score': 0.0,  # Context chunk, not scored
+                    'expansion_source': result['id'],
+                    'expansion_type': 'relationship_based',
+                    'relationship_data': self._extract_relationship_data(neighbor_metadata)
+                })
         
         return expanded_results
     
@@ -694,55 +2872,33 @@ class VectorStore:
         Returns:
             List of related chunks.
         """
-        if not self.collection:
-            self.get_or_create_collection()
+        collection = self._current_collection()
         
         try:
-            # Define query filters based on relationship type
-            if relationship_type == 'sequential':
-                query_filter = {
-                    '$or': [
-                        {'previous_chunk_id': center_chunk_id},
-                        {'next_chunk_id': center_chunk_id}
-                    ]
-                }
-            elif relationship_type == 'siblings':
-                query_filter = {
-                    'section_siblings': {'$in': [center_chunk_id]}
-                }
-            elif relationship_type == 'overlap':
-                query_filter = {
-                    '$or': [
-                        {'overlap_sources': {'$in': [center_chunk_id]}},
-                        # Note: ChromaDB might not support all MongoDB-style queries
-                        # This is a conceptual implementation
-                    ]
-                }
-            else:
+            edge_types = RELATIONSHIP_TYPE_EDGES.get(relationship_type)
+            if edge_types is None:
                 raise ValueError(f"Unknown relationship type: {relationship_type}")
+            if not self._relationships.has_chunk(self.collection_name, center_chunk_id):
+                # Chunks stored before the index existed only have metadata relationships
+                return self._fallback_relationship_search(center_chunk_id, relationship_type, max_results)
             
-            # Note: ChromaDB's where clause support varies by version
-            # This is a simplified implementation - actual implementation may need adjustment
-            results = self.collection.query(
-                query_texts=[""],  # Empty query to get all matching metadata
-                n_results=max_results,
-                where=query_filter
+            related_ids = self._relationships.related_ids(
+                self.collection_name, center_chunk_id, edge_types, limit=max_results
             )
+            chunks = self._fetch_chunks(collection, related_ids, {})
             
-            # Convert results
             related_chunks = []
-            if results['documents'] and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    raw_metadata = results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {}
-                    metadata = self._deserialize_metadata_from_storage(raw_metadata)
-                    
-                    related_chunks.append({
-                        'id': results['ids'][0][i] if results['ids'] and results['ids'][0] else '',
-                        'content': doc,
-                        'metadata': metadata,
-                        'relationship_type': relationship_type,
-                        'relationship_data': self._extract_relationship_data(metadata)
-                    })
+            for related_id in related_ids:
+                chunk = chunks.get(related_id)
+                if chunk is None:
+                    continue
+                related_chunks.append({
+                    'id': related_id,
+                    'content': chunk['content'],
+                    'metadata': chunk['metadata'],
+                    'relationship_type': relationship_type,
+                    'relationship_data': self._extract_relationship_data(chunk['metadata'])
+                })
             
             logger.info(f"Found {len(related_chunks)} chunks with {relationship_type} relationship")
             return related_chunks
@@ -769,17 +2925,15 @@ class VectorStore:
             List of related chunks using fallback approach.
         """
         try:
-            # First get the center chunk to access its metadata
-            center_results = self.collection.get(
-                ids=[center_chunk_id],
-                include=['documents', 'metadatas']
-            )
+            collection = self._current_collection()
+            chunks: Dict[str, Optional[Dict[str, Any]]] = {}
             
-            if not (center_results['documents'] and center_results['documents'][0]):
+            # First get the center chunk to access its metadata
+            center = self._fetch_chunks(collection, [center_chunk_id], chunks).get(center_chunk_id)
+            if center is None:
                 return []
             
-            raw_center_metadata = center_results['metadatas'][0] if center_results['metadatas'] else {}
-            center_metadata = self._deserialize_metadata_from_storage(raw_center_metadata)
+            center_metadata = center['metadata']
             related_ids = []
             
             # Extract related IDs based on relationship type
@@ -798,27 +2952,21 @@ class VectorStore:
                 return []
             
             # Limit to max_results
-            related_ids = related_ids[:max_results]
-            
-            related_results = self.collection.get(
-                ids=related_ids,
-                include=['documents', 'metadatas']
-            )
+            related_ids = list(dict.fromkeys(related_ids))[:max_results]
+            self._fetch_chunks(collection, related_ids, chunks)
             
             related_chunks = []
-            if related_results['documents']:
-                for i, doc in enumerate(related_results['documents']):
-                    if doc:  # Skip empty documents
-                        raw_metadata = related_results['metadatas'][i] if related_results['metadatas'] else {}
-                        metadata = self._deserialize_metadata_from_storage(raw_metadata)
-                        
-                        related_chunks.append({
-                            'id': related_ids[i],
-                            'content': doc,
-                            'metadata': metadata,
-                            'relationship_type': relationship_type,
-                            'relationship_data': self._extract_relationship_data(metadata)
-                        })
+            for related_id in related_ids:
+                chunk = chunks.get(related_id)
+                if chunk is None:
+                    continue
+                related_chunks.append({
+                    'id': related_id,
+                    'content': chunk['content'],
+                    'metadata': chunk['metadata'],
+                    'relationship_type': relationship_type,
+                    'relationship_data': self._extract_relationship_data(chunk['metadata'])
+                })
             
             logger.info(f"Fallback search found {len(related_chunks)} related chunks")
             return related_chunks
@@ -830,67 +2978,49 @@ class VectorStore:
     def get_collection_stats(self, collection_name: Optional[str] = None) -> Dict[str, Any]:
         """Get enhanced statistics for a collection including relationship data.
         
+        Statistics are maintained as chunks are written, so this reads
+        counters instead of scanning chunks. Counters that disagree with the
+        collection's size, e.g. of a collection written before they were
+        kept, are returned as they are and rebuilt in the background;
+        'stats_repair_pending' is set meanwhile.
+        
         Args:
             collection_name: Name of the collection. Uses current if None.
             
         Returns:
             Dictionary containing collection statistics.
         """
-        if collection_name and collection_name != self.collection_name:
-            collection = self.client.get_collection(name=collection_name)
-        else:
-            if not self.collection:
-                self.get_or_create_collection()
-            collection = self.collection
+        name = collection_name or self.collection_name
+        collection = self._resolve_collection(collection_name)
         
         try:
             total_count = collection.count()
+            counters = self._current_stats(name, collection, total_count)
             
-            # Get sample of documents to analyze relationship patterns
-            if total_count > 0:
-                sample_size = min(100, total_count)  # Sample up to 100 documents
-                sample_results = collection.get(
-                    limit=sample_size,
-                    include=['metadatas']
-                )
-                
-                # Analyze relationship patterns
-                overlap_count = 0
-                expansion_eligible_count = 0
-                has_neighbors_count = 0
-                has_siblings_count = 0
-                
-                if sample_results['metadatas']:
-                    for raw_metadata in sample_results['metadatas']:
-                        metadata = self._deserialize_metadata_from_storage(raw_metadata)
-                        if metadata.get('overlap_sources'):
-                            overlap_count += 1
-                        if metadata.get('context_expansion_eligible'):
-                            expansion_eligible_count += 1
-                        if metadata.get('previous_chunk_id') or metadata.get('next_chunk_id'):
-                            has_neighbors_count += 1
-                        if metadata.get('section_siblings'):
-                            has_siblings_count += 1
-                
-                # Estimate percentages for full collection
-                overlap_percentage = (overlap_count / sample_size) * 100 if sample_size > 0 else 0
-                expansion_percentage = (expansion_eligible_count / sample_size) * 100 if sample_size > 0 else 0
-                neighbors_percentage = (has_neighbors_count / sample_size) * 100 if sample_size > 0 else 0
-                siblings_percentage = (has_siblings_count / sample_size) * 100 if sample_size > 0 else 0
-            else:
-                overlap_percentage = expansion_percentage = neighbors_percentage = siblings_percentage = 0
+            def percentage(count: int) -> str:
+                return f"{count / total_count * 100 if total_count else 0:.1f}%"
             
             stats = {
-                'collection_name': collection_name or self.collection_name,
+                'collection_name': name,
                 'total_documents': total_count,
+                'total_bytes': counters['bytes'],
+                'file_count': counters['files'],
+                'chunk_types': counters['chunk_types'],
+                'vector_storage': self._collection_vector_storage(collection),
+                'document_storage': collection_document_storage(collection),
+                'tombstones': self._tombstones.count(collection.name),
+                'stats_repair_pending': counters['chunks'] != total_count,
+                'relationship_counts': counters['relationships'],
                 'relationship_analysis': {
-                    'chunks_with_overlap': f"{overlap_percentage:.1f}%",
-                    'expansion_eligible': f"{expansion_percentage:.1f}%",
-                    'has_sequential_neighbors': f"{neighbors_percentage:.1f}%",
-                    'has_section_siblings': f"{siblings_percentage:.1f}%"
-                },
-                'sample_size': sample_size if total_count > 0 else 0
+                    flag: percentage(count) for flag, count in counters['relationships'].items()
+                }
             }
+            index = self._get_quantized_index(collection)
+            if index is not None:
+                stats['quantized_index'] = index.memory_usage()
+            projection = self._load_projection(collection)
+            if projection is not None:
+                stats['projection'] = projection.describe()
             
             logger.info(f"Generated enhanced stats for collection with {total_count} documents")
             return stats
@@ -898,7 +3028,96 @@ class VectorStore:
         except Exception as e:
             logger.error(f"Failed to get collection stats: {str(e)}")
             return {
-                'collection_name': collection_name or self.collection_name,
+                'collection_name': name,
                 'total_documents': -1,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+    
+    def _current_stats(self, collection_name: str, collection: Any, total_count: Optional[int] = None) -> Dict[str, Any]:
+        """Get a collection's statistics, scheduling a rebuild if they disagree with its size."""
+        if total_count is None:
+            total_count = collection.count()
+        counters = self._stats.get_stats(collection_name)
+        if counters['chunks'] != total_count:
+            self._repair_stats_in_background(collection_name)
+        return counters
+    
+    def _repair_stats_in_background(self, collection_name: str) -> Optional[threading.Thread]:
+        """Rebuild a collection's statistics on a worker thread, once at a time."""
+        key = (self.persist_directory, collection_name)
+        with _stats_repairs_lock:
+            if key in _stats_repairs:
+                return None
+            _stats_repairs.add(key)
+        
+        def repair():
+            foreground_activity.wait_idle(COMPACTION_IDLE_WAIT_SECONDS)
+            try:
+                # An explicit repair may have beaten this one to it
+                collection = self._resolve_collection(collection_name)
+                if self._stats.get_stats(collection_name)['chunks'] != collection.count():
+                    self.repair_collection_stats(collection_name)
+            except Exception as e:
+                logger.warning(f"Failed to rebuild statistics of {collection_name}: {str(e)}")
+            finally:
+                with _stats_repairs_lock:
+                    _stats_repairs.discard(key)
+        
+        logger.info(f"Statistics of {collection_name} disagree with its size, rebuilding them in the background")
+        thread = threading.Thread(target=repair, name=f"stats-{collection_name}", daemon=True)
+        thread.start()
+        return thread
+    
+    def repair_collection_stats(self, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """Rebuild a collection's statistics from its stored chunks.
+        
+        Reads never rebuild statistics themselves. This scans every chunk,
+        and writes to the collection wait until it finishes.
+        
+        Args:
+            collection_name: Name of the collection. Uses current if None.
+            
+        Returns:
+            The rebuilt counters.
+        """
+        name = collection_name or self.collection_name
+        with self._routes.switch_lock.switching():
+            self._rebuild_stats(name, self._resolve_collection(collection_name))
+        return self._stats.get_stats(name)
+    
+    def _rebuild_stats(self, collection_name: str, collection: Any) -> None:
+        """Recompute a collection's statistics from its stored chunks."""
+        self._stats.drop_collection(collection_name)
+        ids = collection.get(include=[])['ids']
+        for start in range(0, len(ids), NAMESPACE_COPY_BATCH_SIZE):
+            records = collection.get(ids=ids[start:start + NAMESPACE_COPY_BATCH_SIZE], include=['documents', 'metadatas'])
+            self._stats.index_chunks(
+                collection_name,
+                records['ids'],
+                [self._deserialize_metadata_from_storage(metadata) for metadata in records['metadatas']],
+                records['documents']
+            )
+        logger.info(f"Rebuilt statistics of {collection_name} from {len(ids)} chunks")
+    
+    def get_file_chunk_counts(self, collection_name: Optional[str] = None) -> Dict[str, int]:
+        """Get the number of chunks stored for each file of a collection."""
+        name = collection_name or self.collection_name
+        self._current_stats(name, self._resolve_collection(collection_name))
+        return self._stats.file_chunk_counts(name)
+    
+    def get_file_chunk_ids(self, file_paths: List[str], collection_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """Get the IDs of the chunks stored for files of a collection.
+        
+        Chunks are found by the source file recorded in their metadata, so
+        this works without any record of which chunks a sync created.
+        
+        Args:
+            file_paths: Source file paths within the collection.
+            collection_name: Name of the collection. Uses current if None.
+            
+        Returns:
+            Dictionary mapping each file path with stored chunks to their IDs.
+        """
+        name = collection_name or self.collection_name
+        self._current_stats(name, self._resolve_collection(collection_name))
+        return self._stats.file_chunk_ids(name, file_paths)
@@ -130,6 +130,7 @@ class FileVectorMapping(BaseModel):
     
     # Vector metadata
     chunk_ids: List[str] = Field(default_factory=list, description="List of chunk IDs from this file")
+    chunk_hashes: List[str] = Field(default_factory=list, description="Content hash of each chunk, parallel to chunk_ids")
     chunk_count: int = Field(default=0, description="Number of chunks generated")
     
     # Sync tracking
@@ -186,6 +187,7 @@ class SyncConfiguration(BaseModel):
     max_concurrent_files: int = Field(default=5, description="Max files to process concurrently")
     chunk_cache_size: int = Field(default=1000, description="Number of chunks to cache")
     embedding_batch_size: int = Field(default=32, description="Batch size for embedding generation")
+    projection_sample_size: int = Field(default=1024, description="Number of text samples used to fit a collection's dimensionality-reducing projection")
     
     # Quality control
     min_chunk_size: int = Field(default=50, description="Minimum chunk size in characters")
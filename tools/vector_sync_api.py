@@ -8,8 +8,9 @@ enabling integration with the existing MCP server and frontend applications.
 import asyncio
 import json
 import logging
+import os
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 from fastapi import HTTPException
 from pydantic import BaseModel, Field
 
@@ -18,6 +19,7 @@ from .knowledge_base.vector_sync_schemas import (
     VectorSyncStatus, SyncConfiguration, SyncResult, SyncStatus
 )
 from .knowledge_base.vector_store import VectorStore
+from .knowledge_base.async_vector_store import AsyncVectorStore
 # Support both collection manager types for backward compatibility
 try:
     from .knowledge_base.database_collection_adapter import DatabaseCollectionAdapter
@@ -31,13 +33,22 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# "vector" uses vector similarity only, "hybrid" also fuses in BM25 rankings
+DEFAULT_SEARCH_MODE = os.getenv("RAG_SEARCH_MODE", "vector")
+# Collections a global search queries after ranking them by centroid; 0 searches all
+GLOBAL_SEARCH_COLLECTIONS = int(os.getenv("RAG_GLOBAL_SEARCH_COLLECTIONS", "3"))
+
 
 # Request/Response Models for API
 class SyncCollectionRequest(BaseModel):
     """Request model for syncing a collection."""
     force_reprocess: bool = Field(default=False, description="Force reprocessing of all files")
     chunking_strategy: Optional[str] = Field(None, description="Override chunking strategy")
-    force_delete_vectors: bool = Field(default=False, description="Delete all existing vectors before syncing (force resync)")
+    force_delete_vectors: bool = Field(default=False, description="Replace all existing vectors with a rebuild (force resync)")
+    rebuild: bool = Field(
+        default=False,
+        description="Rebuild all vectors in a staging namespace and swap it in once complete; searches use the current vectors meanwhile"
+    )
 
 
 class SyncCollectionResponse(BaseModel):
@@ -64,6 +75,14 @@ class VectorSearchRequest(BaseModel):
     similarity_threshold: float = Field(default=0.2, description="Minimum similarity score")
     enable_context_expansion: bool = Field(default=False, description="Enable context expansion using chunk relationships")
     relationship_filter: Optional[Dict[str, Any]] = Field(None, description="Filter based on chunk relationships")
+    search_mode: Literal["hybrid", "vector"] = Field(
+        default=DEFAULT_SEARCH_MODE,
+        description="'hybrid' fuses BM25 and vector rankings, 'vector' uses vector similarity only"
+    )
+    exhaustive: bool = Field(
+        default=False,
+        description="Search every collection in a global search instead of only those whose centroids best match the query"
+    )
 
 
 class VectorSearchResponse(BaseModel):
@@ -101,6 +120,8 @@ class VectorSyncAPI:
         """
         self.sync_manager = sync_manager
         self.vector_store = vector_store
+        # Runs store operations off the event loop
+        self.async_vector_store = AsyncVectorStore(vector_store)
         self.collection_manager = collection_manager
         
         # Progress tracking for async operations
@@ -200,7 +221,9 @@ class VectorSyncAPI:
             sync_result = await self.sync_manager.sync_collection(
                 collection_name=collection_name,
                 force_reprocess=request.force_reprocess,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                # A force resync replaces the vectors without ever serving a half-empty index
+                rebuild=request.rebuild or request.force_delete_vectors
             )
             
             # Store job for tracking
@@ -426,6 +449,69 @@ class VectorSyncAPI:
                 'error': str(e)
             }
     
+    async def collect_orphaned_vectors(self, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """Delete vectors of files removed from one or all collections."""
+        try:
+            if collection_name is not None and not await self._collection_exists(collection_name):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Collection '{collection_name}' not found"
+                )
+            
+            result = await self.sync_manager.collect_orphaned_vectors(collection_name)
+            
+            return {
+                'success': True,
+                'message': f"Deleted {result['chunks_deleted']} orphaned chunks",
+                'chunks_deleted': result['chunks_deleted'],
+                'collections': result['collections']
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error collecting orphaned vectors: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def fork_collection(
+        self,
+        collection_name: str,
+        new_collection_name: str,
+        include_patterns: Optional[List[str]] = None,
+        exclude_patterns: Optional[List[str]] = None,
+        description: str = ""
+    ) -> Dict[str, Any]:
+        """Copy a collection into a new one, reusing its chunk vectors."""
+        try:
+            if not await self._collection_exists(collection_name):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Collection '{collection_name}' not found"
+                )
+            
+            result = await self.sync_manager.fork_collection(
+                collection_name, new_collection_name, include_patterns, exclude_patterns, description
+            )
+            
+            return {
+                'success': True,
+                'message': f"Forked '{collection_name}' into '{new_collection_name}' "
+                           f"with {len(result['files'])} files and {result['chunks_copied']} chunks",
+                **result
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error forking collection '{collection_name}': {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     async def search_vectors(
         self,
         request: VectorSearchRequest
@@ -452,7 +538,9 @@ class VectorSyncAPI:
             # Use enhanced search if relationships are requested
             if request.enable_context_expansion or request.relationship_filter:
                 # Use intelligent sync manager's enhanced search
-                search_result = self.sync_manager.search_with_relationships(
+                search_result = await self.async_vector_store.run_read(
+                    "search_with_relationships",
+                    self.sync_manager.search_with_relationships,
                     collection_name=request.collection_name or "default",
                     query=request.query,
                     limit=request.limit,
@@ -476,17 +564,25 @@ class VectorSyncAPI:
                 else:
                     results = []
             else:
-                # Standard vector search with collection filtering
-                filter_dict = None
+                # Standard search within the collection's namespace, or across all of them
+                hybrid = request.search_mode == "hybrid"
                 if request.collection_name:
-                    filter_dict = {'collection_name': request.collection_name}
-                    
-                results = self.vector_store.similarity_search(
-                    query=request.query,
-                    k=request.limit,
-                    score_threshold=request.similarity_threshold,
-                    filter=filter_dict
-                )
+                    store = self.async_vector_store.namespace(request.collection_name)
+                    search = store.hybrid_search if hybrid else store.similarity_search
+                    results = await search(
+                        query=request.query,
+                        k=request.limit,
+                        score_threshold=request.similarity_threshold
+                    )
+                else:
+                    results = await self.async_vector_store.similarity_search_namespaces(
+                        query=request.query,
+                        k=request.limit,
+                        score_threshold=request.similarity_threshold,
+                        hybrid=hybrid,
+                        max_collections=None if request.exhaustive or GLOBAL_SEARCH_COLLECTIONS <= 0
+                        else GLOBAL_SEARCH_COLLECTIONS
+                    )
             
             query_time = time.time() - start_time
             
@@ -509,7 +605,7 @@ class VectorSyncAPI:
                     'programming_language': metadata.get('programming_language'),
                     'word_count': metadata.get('word_count', 0),
                     'created_at': metadata.get('created_at'),
-                    'metadata': metadata,  # Add full metadata as expected by tests
+                    'metadata': dict(metadata),  # Add full metadata as expected by tests
                     'file_location': {
                         'collection': metadata.get('collection_name', ''),
                         'file_path': metadata.get('source_file', ''),
@@ -580,6 +676,7 @@ class VectorSyncAPI:
         """Get overall sync statistics."""
         try:
             stats = self.sync_manager.get_sync_statistics()
+            stats['vector_store_operations'] = self.async_vector_store.metrics.snapshot()
             
             return {
                 'success': True,
@@ -728,6 +825,52 @@ def create_vector_sync_tools(sync_api: VectorSyncAPI) -> List[Dict[str, Any]]:
                 },
                 "required": ["collection_name"]
             }
+        },
+        {
+            "name": "collect_orphaned_vectors",
+            "description": "Delete vectors of files that were removed from collections",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "collection_name": {
+                        "type": "string",
+                        "description": "Collection to clean up (optional, all collections if omitted)"
+                    }
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "fork_collection",
+            "description": "Copy a collection into a new collection, reusing its vectors instead of re-embedding",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "collection_name": {
+                        "type": "string",
+                        "description": "Name of the collection to fork"
+                    },
+                    "new_collection_name": {
+                        "type": "string",
+                        "description": "Name of the new collection"
+                    },
+                    "include_patterns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Glob patterns of file paths to copy (optional, all files if omitted)"
+                    },
+                    "exclude_patterns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Glob patterns of file paths not to copy (optional)"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Description of the new collection (optional)"
+                    }
+                },
+                "required": ["collection_name", "new_collection_name"]
+            }
         }
     ]
     
@@ -779,6 +922,20 @@ async def handle_vector_sync_tool(
                 collection_name=arguments["collection_name"]
             )
         
+        elif tool_name == "collect_orphaned_vectors":
+            return await sync_api.collect_orphaned_vectors(
+                collection_name=arguments.get("collection_name")
+            )
+        
+        elif tool_name == "fork_collection":
+            return await sync_api.fork_collection(
+                collection_name=arguments["collection_name"],
+                new_collection_name=arguments["new_collection_name"],
+                include_patterns=arguments.get("include_patterns"),
+                exclude_patterns=arguments.get("exclude_patterns"),
+                description=arguments.get("description", "")
+            )
+        
         else:
             return {
                 "success": False,
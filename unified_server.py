@@ -398,6 +398,42 @@ class UnifiedServer:
                 logger.error(f"MCP get_collection_sync_status error: {e}")
                 return json.dumps({"success": False, "error": str(e)})
         
+        @mcp_server.tool()
+        async def collect_orphaned_vectors(collection_name: Optional[str] = None) -> str:
+            """Delete vectors of files that were removed from one or all collections."""
+            try:
+                result = await vector_service.collect_orphaned_vectors(collection_name)
+                return json.dumps(result)
+            except Exception as e:
+                logger.error(f"MCP collect_orphaned_vectors error: {e}")
+                return json.dumps({"success": False, "error": str(e)})
+        
+        @mcp_server.tool()
+        async def fork_collection(
+            collection_name: str,
+            new_collection_name: str,
+            include_patterns: Optional[list] = None,
+            exclude_patterns: Optional[list] = None,
+            description: str = ""
+        ) -> str:
+            """Copy a collection into a new collection, reusing its vectors instead of re-embedding.
+            
+            Args:
+                collection_name: Collection to fork
+                new_collection_name: Name of the new collection
+                include_patterns: Glob patterns of file paths to copy (all files if omitted)
+                exclude_patterns: Glob patterns of file paths not to copy
+                description: Description of the new collection
+            """
+            try:
+                result = await vector_service.fork_collection(
+                    collection_name, new_collection_name, include_patterns, exclude_patterns, description
+                )
+                return json.dumps(result)
+            except Exception as e:
+                logger.error(f"MCP fork_collection error: {e}")
+                return json.dumps({"success": False, "error": str(e)})
+        
         @mcp_server.tool()
         async def get_vector_model_info() -> str:
             """Get information about the current embedding model and vector service status."""
@@ -918,6 +954,24 @@ class UnifiedServer:
                 else:
                     raise HTTPException(status_code=500, detail=str(e))
         
+        @app.get("/api/file-collections/{collection_id}/changes")
+        async def get_collection_changes_endpoint(collection_id: str, since: int = 0, limit: int = 1000):
+            """Get the writes made to a collection after a version."""
+            try:
+                if since < 0 or limit < 1:
+                    raise HTTPException(status_code=400, detail="since must be >= 0 and limit >= 1")
+                
+                changes = await collection_service.get_collection_changes(collection_id, since, limit)
+                return {
+                    "success": True,
+                    "data": {key: value for key, value in changes.items() if key != "success"}
+                }
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"HTTP get_collection_changes error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        
         @app.post("/api/crawl/single/{collection_id}")
         async def crawl_single_page_to_collection(collection_id: str, request: dict):
             """Crawl a single page and save to collection."""
@@ -1226,6 +1280,124 @@ class UnifiedServer:
                 logger.error(f"HTTP delete_collection_vectors error: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
         
+        @app.post("/api/vector-sync/collections/{collection_id}/reembed")
+        async def reembed_collection_vectors(collection_id: str, request: dict = None):
+            """Re-embed a collection's vectors with another model in the background."""
+            try:
+                await _validate_collection_exists(collection_id)
+                
+                if not vector_service.vector_available:
+                    raise HTTPException(
+                        status_code=503,
+                        detail={
+                            "error": {
+                                "code": "SERVICE_UNAVAILABLE",
+                                "message": "Vector sync service is not available - RAG dependencies not installed",
+                                "details": {"service": "vector_sync"}
+                            }
+                        }
+                    )
+                
+                model_name = (request or {}).get("model_name")
+                result = await vector_service.reembed_collection(collection_id, model_name=model_name)
+                if not result.get("success"):
+                    not_found = "not found" in str(result.get("error", "")).lower()
+                    raise HTTPException(status_code=404 if not_found else 409, detail=result.get("error"))
+                return result
+                
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"HTTP reembed_collection_vectors error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @app.post("/api/vector-sync/collections/{collection_id}/fork")
+        async def fork_collection_http(collection_id: str, request: dict):
+            """Copy a collection into a new collection, reusing its vectors."""
+            try:
+                await _validate_collection_exists(collection_id)
+                
+                if not vector_service.vector_available:
+                    raise HTTPException(
+                        status_code=503,
+                        detail={
+                            "error": {
+                                "code": "SERVICE_UNAVAILABLE",
+                                "message": "Vector sync service is not available - RAG dependencies not installed",
+                                "details": {"service": "vector_sync"}
+                            }
+                        }
+                    )
+                
+                new_collection_id = request.get("new_collection_id")
+                if not new_collection_id:
+                    raise HTTPException(status_code=400, detail="new_collection_id is required")
+                
+                result = await vector_service.fork_collection(
+                    collection_id,
+                    new_collection_id,
+                    include_patterns=request.get("include_patterns"),
+                    exclude_patterns=request.get("exclude_patterns"),
+                    description=request.get("description", "")
+                )
+                if not result.get("success"):
+                    raise HTTPException(status_code=409, detail=result.get("error"))
+                return result
+                
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"HTTP fork_collection error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @app.get("/api/vector-sync/collections/{collection_id}/reembed")
+        async def get_reembed_status(collection_id: str):
+            """Get the progress of a collection's re-embed job."""
+            try:
+                await _validate_collection_exists(collection_id)
+                result = await vector_service.get_reembed_status(collection_id)
+                if not result.get("success"):
+                    not_found = "not found" in str(result.get("error", "")).lower()
+                    raise HTTPException(status_code=404 if not_found else 503, detail=result.get("error"))
+                return result
+                
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"HTTP get_reembed_status error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @app.post("/api/vector-sync/gc")
+        async def collect_orphaned_vectors_http(request: dict = None):
+            """Delete vectors of files that were removed from one or all collections."""
+            try:
+                collection_id = (request or {}).get("collection_id")
+                if collection_id:
+                    await _validate_collection_exists(collection_id)
+                
+                if not vector_service.vector_available:
+                    raise HTTPException(
+                        status_code=503,
+                        detail={
+                            "error": {
+                                "code": "SERVICE_UNAVAILABLE",
+                                "message": "Vector sync service is not available - RAG dependencies not installed",
+                                "details": {"service": "vector_sync"}
+                            }
+                        }
+                    )
+                
+                result = await vector_service.collect_orphaned_vectors(collection_id)
+                if not result.get("success"):
+                    raise HTTPException(status_code=500, detail=result.get("error"))
+                return result
+                
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"HTTP collect_orphaned_vectors error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        
         
         # ===== RAG QUERY ENDPOINT =====
         